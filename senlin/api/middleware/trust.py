@@ -10,13 +10,19 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from oslo_config import cfg
+from oslo_log import log as logging
+
 from senlin.api.common import util
 from senlin.api.common import wsgi
+from senlin.common import cache
 from senlin.common import context
 from senlin.common import exception
 from senlin.drivers import base as driver_base
 from senlin.rpc import client as rpc
 
+LOG = logging.getLogger(__name__)
+
 
 class TrustMiddleware(wsgi.Middleware):
     """Extract trust info from request.
@@ -24,6 +30,11 @@ class TrustMiddleware(wsgi.Middleware):
     The extracted information is filled into the request context.
     Senlin engine will use this information for access control.
     """
+    def __init__(self, application):
+        super(TrustMiddleware, self).__init__(application)
+        self.cache = cache.TTLCache(cfg.CONF.senlin_api.trust_cache_size,
+                                    cfg.CONF.senlin_api.trust_cache_ttl)
+
     def _get_trust(self, req):
         """List trusts with current user as the trustor.
 
@@ -67,10 +78,20 @@ class TrustMiddleware(wsgi.Middleware):
         cred = {'openstack': {'trust': trust.id}}
         params = {'cred': cred}
         obj = util.parse_request('CredentialCreateRequest', req, params)
+        self.cache.invalidate((ctx.user_id, ctx.project_id))
         rpcc.call(ctx, 'credential_create', obj)
 
         return trust.id
 
     def process_request(self, req):
-        trust_id = self._get_trust(req)
+        ctx = req.context
+        key = (ctx.user_id, ctx.project_id)
+        trust_id = self.cache.get(key)
+        if trust_id is None:
+            trust_id = self._get_trust(req)
+            self.cache.put(key, trust_id)
+            LOG.debug("Trust cache miss for user %(user)s in project "
+                      "%(project)s, cache stats: %(stats)s",
+                      {'user': ctx.user_id, 'project': ctx.project_id,
+                       'stats': self.cache.stats()})
         req.context.trusts = trust_id
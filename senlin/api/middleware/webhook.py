@@ -10,12 +10,18 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import hashlib
+
+from oslo_config import cfg
 from oslo_log import log as logging
+from oslo_serialization import jsonutils
+from oslo_utils import timeutils
 from urllib import parse as urlparse
 import webob
 
 from senlin.api.common import util
 from senlin.api.common import wsgi
+from senlin.common import cache
 from senlin.common import context
 from senlin.common import exception as exc
 from senlin.common.i18n import _
@@ -24,6 +30,12 @@ from senlin.rpc import client as rpc
 
 LOG = logging.getLogger(__name__)
 
+# Seconds before its expiry a cached token is no longer handed out, so that
+# it does not expire while the request is being processed.
+TOKEN_EXPIRY_MARGIN = 60
+# Upper bound of the number of seconds a token is cached.
+TOKEN_CACHE_TTL = 3600
+
 
 class WebhookMiddleware(wsgi.Middleware):
     """Middleware for authenticating webhook triggering requests.
@@ -32,6 +44,14 @@ class WebhookMiddleware(wsgi.Middleware):
     rebuilds the request header so that the request will successfully pass
     the verification of keystone auth_token middleware.
     """
+    def __init__(self, application):
+        super(WebhookMiddleware, self).__init__(application)
+        conf = cfg.CONF.senlin_api
+        self.actors = cache.TTLCache(conf.webhook_cache_size,
+                                     conf.webhook_cache_ttl)
+        self.tokens = cache.TTLCache(conf.webhook_cache_size,
+                                     TOKEN_CACHE_TTL)
+
     def process_request(self, req):
         # We only handle POST requests
         if req.method != 'POST':
@@ -48,10 +68,14 @@ class WebhookMiddleware(wsgi.Middleware):
         ctx = context.RequestContext(is_admin=True, api_version=api_version)
         req.context = ctx
 
-        obj = util.parse_request(
-            'ReceiverGetRequest', req, {'identity': receiver_id})
-        rpcc = rpc.get_engine_client()
-        receiver = rpcc.call(ctx, 'receiver_get', obj)
+        actor = self.actors.get(receiver_id)
+        if actor is None:
+            obj = util.parse_request(
+                'ReceiverGetRequest', req, {'identity': receiver_id})
+            rpcc = rpc.get_engine_client()
+            receiver = rpcc.call(ctx, 'receiver_get', obj)
+            actor = receiver['actor']
+            self.actors.put(receiver_id, actor)
 
         svc_ctx = context.get_service_credentials()
         kwargs = {
@@ -63,7 +87,7 @@ class WebhookMiddleware(wsgi.Middleware):
             'verify': svc_ctx['verify'],
             'interface': svc_ctx['interface'],
         }
-        kwargs.update(receiver['actor'])
+        kwargs.update(actor)
 
         # Get token and fill it into the request header
         token = self._get_token(**kwargs)
@@ -103,12 +127,26 @@ class WebhookMiddleware(wsgi.Middleware):
     def _get_token(self, **kwargs):
         """Get a valid token based on the credential provided.
 
+        Tokens are cached per credential until shortly before they expire.
+
         :param cred: Rebuilt credential dictionary for authentication.
         """
+        key = hashlib.sha256(
+            jsonutils.dumps(kwargs, sort_keys=True).encode()).hexdigest()
+        token = self.tokens.get(key)
+        if token is not None:
+            return token
+
         try:
-            token = driver_base.SenlinDriver().identity.get_token(**kwargs)
+            identity = driver_base.SenlinDriver().identity
+            info = identity.get_token_info(**kwargs)
         except Exception as ex:
             LOG.exception('Webhook failed authentication: %s.', ex)
             raise exc.Forbidden()
 
+        token = info['token']
+        if info['expires_at'] is not None:
+            ttl = (timeutils.normalize_time(info['expires_at']) -
+                   timeutils.utcnow()).total_seconds()
+            self.tokens.put(key, token, ttl=ttl - TOKEN_EXPIRY_MARGIN)
         return token
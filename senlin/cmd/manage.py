@@ -24,6 +24,7 @@ from senlin.common import config
 from senlin.common import context
 from senlin.common.i18n import _
 from senlin.db import api
+from senlin.engine import retention
 from senlin.objects import service as service_obj
 
 CONF = cfg.CONF
@@ -42,15 +43,34 @@ def do_db_sync():
     api.db_sync(api.get_engine(), CONF.command.version)
 
 
+def do_db_explain():
+    """Print the query plans of the queries on the engine's hot paths."""
+    for name, sql, plan in api.db_explain(api.get_engine()):
+        print(name)
+        print('  ' + ' '.join(sql.split()))
+        for row in plan:
+            print('    ' + ' | '.join(str(c) for c in row))
+        print('')
+
+
+def _print_progress(kind):
+    def progress(total):
+        print(_("%(total)d %(kind)s records purged.") % {'total': total,
+                                                         'kind': kind})
+    return progress
+
+
 def do_event_purge():
     """Purge the specified event records in senlin's database."""
     if CONF.command.age < 0:
         print(_("Age must be a positive integer."))
         return
-    api.event_purge(api.get_engine(),
-                    CONF.command.project_id,
-                    CONF.command.granularity,
-                    CONF.command.age)
+    retention.purge(api.event_purge,
+                    progress=_print_progress('event'),
+                    engine=api.get_engine(),
+                    project=CONF.command.project_id,
+                    granularity=CONF.command.granularity,
+                    age=CONF.command.age)
 
 
 def do_action_purge():
@@ -71,10 +91,12 @@ def do_action_purge():
     if age < CONF.default_action_timeout:
         print(_("Age must be greater than the default action timeout."))
         return
-    api.action_purge(api.get_engine(),
-                     CONF.command.project_id,
-                     CONF.command.granularity,
-                     CONF.command.age)
+    retention.purge(api.action_purge,
+                    progress=_print_progress('action'),
+                    engine=api.get_engine(),
+                    project=CONF.command.project_id,
+                    granularity=CONF.command.granularity,
+                    age=CONF.command.age)
 
 
 class ServiceManageCommand(object):
@@ -152,6 +174,9 @@ def add_command_parsers(subparsers):
     parser.add_argument('version', nargs='?')
     parser.add_argument('current_version', nargs='?')
 
+    parser = subparsers.add_parser('db_explain')
+    parser.set_defaults(func=do_db_explain)
+
     parser = subparsers.add_parser('event_purge')
     parser.set_defaults(func=do_event_purge)
     parser.add_argument('-p',
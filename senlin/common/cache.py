@@ -0,0 +1,291 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""In-process caches.
+
+Profiles and policies only change through explicit updates, so the engine,
+conductor and health manager keep the DB objects they load in a size bounded
+LRU cache. Each entry is versioned by the ``updated_at`` timestamp of the
+object. An update or a delete evicts the entry in the local process and is
+broadcast to all senlin services, which evict their copy in turn. The
+version recorded on eviction prevents a load that raced with the update from
+caching the stale object again.
+
+The API keeps trusts, receivers and tokens in TTLCache instances, which
+bound staleness by expiring entries instead of being invalidated.
+"""
+
+import collections
+import threading
+import time
+
+from oslo_config import cfg
+from oslo_context import context as oslo_context
+from oslo_log import log as logging
+import oslo_messaging
+from oslo_utils import timeutils
+
+from senlin.common import consts
+from senlin.common import messaging
+
+LOG = logging.getLogger(__name__)
+
+KINDS = (
+    PROFILE, POLICY,
+) = (
+    'profile', 'policy',
+)
+
+# Version recorded for deleted objects, newer than any timestamp
+DELETED = 'DELETED'
+
+# Topics of the services keeping a cache
+TOPICS = (
+    consts.ENGINE_TOPIC, consts.CONDUCTOR_TOPIC, consts.HEALTH_MANAGER_TOPIC,
+)
+
+
+def _normalize(version):
+    if version is None or version == DELETED:
+        return version
+    if isinstance(version, str):
+        version = timeutils.parse_isotime(version)
+    # Some backends drop the fractional seconds of stored timestamps
+    return timeutils.normalize_time(version).replace(microsecond=0)
+
+
+def _newer(version, other):
+    """Check if a version is strictly newer than another one."""
+    if other == DELETED:
+        return False
+    if version == DELETED:
+        return True
+    if other is None:
+        return version is not None
+    return version is not None and version > other
+
+
+class VersionedCache(object):
+    """A size bounded LRU cache of objects versioned by a timestamp."""
+
+    def __init__(self, size):
+        self.size = size
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        """Get the cached value for a key.
+
+        :param key: Key of the entry, i.e. the ID of the object.
+        :returns: The cached value or None if there is no valid entry.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, version, value):
+        """Cache a value unless a newer version is known.
+
+        :param key: Key of the entry, i.e. the ID of the object.
+        :param version: The ``updated_at`` timestamp of the object.
+        :param value: The value to cache.
+        """
+        if self.size <= 0:
+            return
+        version = _normalize(version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not _newer(version, entry[0]):
+                if entry[0] != version or entry[1] is not None:
+                    return
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key, version=None):
+        """Evict an entry, remembering the version it was evicted for.
+
+        :param key: Key of the entry, i.e. the ID of the object.
+        :param version: The ``updated_at`` timestamp of the new version of
+                        the object, or ``DELETED`` if it was deleted.
+        """
+        version = _normalize(version)
+        with self._lock:
+            self.invalidations += 1
+            entry = self._entries.pop(key, None)
+            if entry is not None and not _newer(version, entry[0]):
+                version = entry[0]
+            if version is not None and self.size > 0:
+                # Keep a tombstone so that stale loads are not cached again
+                self._entries[key] = (version, None)
+                while len(self._entries) > self.size:
+                    self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            size = sum(1 for e in self._entries.values() if e[1] is not None)
+            return {
+                'size': size,
+                'capacity': self.size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+
+class TTLCache(object):
+    """A size bounded LRU cache of values expiring after a while."""
+
+    def __init__(self, size, ttl):
+        self.size = size
+        self.ttl = ttl
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Get the value cached for a key.
+
+        :param key: Key of the entry.
+        :returns: The cached value or None if there is no valid entry.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.time():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value, ttl=None):
+        """Cache a value.
+
+        :param key: Key of the entry.
+        :param value: The value to cache.
+        :param ttl: Number of seconds the entry is valid, defaults to the
+                    TTL of the cache.
+        """
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if self.size <= 0 or ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'capacity': self.size,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+_CACHES = {}
+
+
+def get_cache(kind):
+    """Get the cache for a kind of objects, creating it when needed."""
+    if kind not in _CACHES:
+        _CACHES[kind] = VersionedCache(cfg.CONF.object_cache_size)
+    return _CACHES[kind]
+
+
+def get(kind, obj_id, context, project_safe=True):
+    """Get a cached profile or policy DB object.
+
+    :param kind: Kind of the object, ``profile`` or ``policy``.
+    :param obj_id: ID of the object.
+    :param context: The requesting context.
+    :param project_safe: Whether the object must belong to the project of
+                         the context, as when loading it from the database.
+    :returns: The cached DB object or None.
+    """
+    obj = get_cache(kind).get(obj_id)
+    if obj is None:
+        return None
+    if project_safe and not context.is_admin:
+        if context.project_id != obj.project:
+            return None
+    return obj
+
+
+def put(kind, obj):
+    """Cache a profile or policy DB object."""
+    get_cache(kind).put(obj.id, obj.updated_at, obj)
+
+
+def invalidate(kind, obj_id, updated_at=None):
+    """Evict an object from the cache of this process."""
+    get_cache(kind).invalidate(obj_id, updated_at)
+
+
+def reset():
+    """Drop all caches of this process."""
+    _CACHES.clear()
+
+
+def stats():
+    """Return the hit/miss counters of all caches in this process."""
+    return dict((kind, get_cache(kind).stats()) for kind in KINDS)
+
+
+def notify_invalidate(kind, obj_id, updated_at=None):
+    """Evict an object locally and from the caches of all services.
+
+    :param kind: Kind of the object, ``profile`` or ``policy``.
+    :param obj_id: ID of the object updated or deleted.
+    :param updated_at: The new ``updated_at`` timestamp of the object, or
+                       ``DELETED`` if the object was deleted.
+    """
+    invalidate(kind, obj_id, updated_at)
+
+    if updated_at is not None and updated_at != DELETED:
+        updated_at = timeutils.normalize_time(updated_at).isoformat()
+    for topic in TOPICS:
+        client = messaging.get_rpc_client(topic, cfg.CONF.host)
+        try:
+            client.prepare(fanout=True).cast(
+                oslo_context.get_current(), 'invalidate_cache', kind=kind,
+                obj_id=obj_id, updated_at=updated_at)
+        except oslo_messaging.MessagingException as ex:
+            LOG.warning("Failed in broadcasting invalidation of %(kind)s "
+                        "%(id)s: %(ex)s",
+                        {'kind': kind, 'id': obj_id, 'ex': ex})
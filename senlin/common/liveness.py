@@ -0,0 +1,61 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""In-process view of the liveness of senlin services.
+
+Each senlin service reports its heartbeat to the service table on a timer.
+On the same timer, the heartbeats of all the services are read into this
+view, so that telling whether the engine owning a lock is alive doesn't
+take a database read. A heartbeat in the view is never more recent than the
+one in the database, hence a service alive in the view is alive. Services
+which look dead or are unknown to the view are checked in the database.
+"""
+
+from oslo_log import log as logging
+
+from senlin.objects import service as service_obj
+
+LOG = logging.getLogger(__name__)
+
+# Last heartbeat of each service, keyed by service ID
+_heartbeats = {}
+
+
+def refresh(ctx):
+    """Read the heartbeats of all the services from the database.
+
+    :param ctx: A request context.
+    """
+    global _heartbeats
+
+    try:
+        services = service_obj.Service.get_all(ctx)
+    except Exception as ex:
+        LOG.warning('Failed in reading service heartbeats: %s', ex)
+        return
+    _heartbeats = {s.id: s.updated_at for s in services}
+
+
+def heartbeat(service_id):
+    """Get the last heartbeat of a service known to the view.
+
+    :param service_id: The ID of the service.
+    :returns: The time the service last reported, or None if the service is
+              unknown.
+    """
+    return _heartbeats.get(service_id)
+
+
+def reset():
+    global _heartbeats
+
+    _heartbeats = {}
@@ -19,8 +19,11 @@ from oslo_service import wsgi
 from oslo_utils import netutils
 from oslo_utils import uuidutils
 
+from senlin.common import cache
 from senlin.common import context as senlin_context
+from senlin.common import liveness
 import senlin.conf
+from senlin.drivers import sdk
 from senlin.objects import service as service_obj
 from senlin import version
 
@@ -87,6 +90,13 @@ class Service(service.Service):
             service_obj.Service.delete(self.service_id)
         super(Service, self).stop(graceful)
 
+    def _gc_engine(self, service_id):
+        """Reclaim the actions and locks of a dead service.
+
+        :param service_id: ID of the dead service.
+        """
+        service_obj.Service.gc_by_engine(service_id)
+
     def service_manage_cleanup(self):
         self.cleanup_count += 1
         try:
@@ -103,7 +113,7 @@ class Service(service.Service):
                         'service_id': svc['id'],
                     }
                 )
-                service_obj.Service.gc_by_engine(svc['id'])
+                self._gc_engine(svc['id'])
                 LOG.info(
                     'Done breaking locks for service %(name)s '
                     '(id: %(service_id)s)',
@@ -133,10 +143,16 @@ class Service(service.Service):
         else:
             LOG.info('Service clean-up attempt count: %s', self.cleanup_count)
 
+    def service_report_values(self):
+        """Values to be recorded in the service table with each report."""
+        return None
+
     def service_manage_report(self):
         try:
             ctx = senlin_context.get_admin_context()
-            service_obj.Service.update(ctx, self.service_id)
+            service_obj.Service.update(ctx, self.service_id,
+                                       self.service_report_values())
+            liveness.refresh(ctx)
         except Exception as ex:
             LOG.error(
                 'Error while updating service %(name)s: %(ex)s',
@@ -146,6 +162,18 @@ class Service(service.Service):
                 }
             )
 
+    def invalidate_cache(self, ctxt, kind, obj_id, updated_at=None):
+        """Evict a profile or policy from the in-process cache."""
+        cache.invalidate(kind, obj_id, updated_at)
+
+    def cache_stats(self, ctxt):
+        """Report the hit/miss counters of the in-process caches."""
+        return cache.stats()
+
+    def connection_pool_stats(self, ctxt):
+        """Report the size and hit/miss counters of the connection pool."""
+        return sdk.connection_pool_stats()
+
 
 class WSGIService(service.Service):
     def __init__(self, app, name, listen, max_url_len=None):
@@ -29,6 +29,7 @@ import urllib
 from senlin.common import consts
 from senlin.common import exception
 from senlin.common.i18n import _
+from senlin.common import liveness
 from senlin.objects import service as service_obj
 
 cfg.CONF.import_opt('max_response_size', 'senlin.conf')
@@ -87,12 +88,14 @@ def level_from_number(value):
     return levels.get(n, None)
 
 
-def url_fetch(url, timeout=1, allowed_schemes=('http', 'https'), verify=True):
+def url_fetch(url, timeout=1, allowed_schemes=('http', 'https'), verify=True,
+              session=None):
     """Get the data at the specified URL.
 
     The URL must use the http: or https: schemes.
     The file: scheme is also supported if you override
-    the allowed_schemes argument.
+    the allowed_schemes argument. A requests session can be given to reuse
+    its connections across calls.
     Raise an IOError if getting the data fails.
     """
 
@@ -108,7 +111,8 @@ def url_fetch(url, timeout=1, allowed_schemes=('http', 'https'), verify=True):
             raise URLFetchError(_('Failed to retrieve data: %s') % uex)
 
     try:
-        resp = requests.get(url, stream=True, verify=verify, timeout=timeout)
+        getter = requests.get if session is None else session.get
+        resp = getter(url, stream=True, verify=verify, timeout=timeout)
         resp.raise_for_status()
 
         # We cannot use resp.text here because it would download the entire
@@ -225,7 +229,8 @@ def is_service_dead(ctx, service_id, duration=None):
     """Check if a service is dead.
 
     If the service hasn't reported its status for the given duration, it is
-    treated as a dead service.
+    treated as a dead service. The service table is only read when the
+    service doesn't look alive in the in-process liveness view.
 
     :param ctx: A request context.
     :param service_id: The ID of the service to test.
@@ -234,6 +239,10 @@ def is_service_dead(ctx, service_id, duration=None):
     if not duration:
         duration = 2.2 * cfg.CONF.periodic_interval
 
+    updated_at = liveness.heartbeat(service_id)
+    if updated_at and not timeutils.is_older_than(updated_at, duration):
+        return False
+
     service = service_obj.Service.get(ctx, service_id)
     if not service:
         return True
@@ -33,6 +33,7 @@ from senlin.engine import cluster as cluster_mod
 from senlin.engine import dispatcher
 from senlin.engine import environment
 from senlin.engine import node as node_mod
+from senlin.engine import retention
 from senlin.engine.receivers import base as receiver_mod
 from senlin.objects import action as action_obj
 from senlin.objects import base as obj_base
@@ -89,6 +90,7 @@ class ConductorService(service.Service):
         # The following are initialized here and will be assigned in start()
         # which happens after the fork when spawning multiple worker processes
         self.target = None
+        self.retention_timer = None
 
         # Initialize the global environment
         environment.initialize()
@@ -108,12 +110,27 @@ class ConductorService(service.Service):
                                                    serializer=serializer)
         self.server.start()
 
+        if (CONF.event_retention or CONF.action_retention or
+                CONF.project_retention):
+            self.retention_timer = self.tg.add_timer(
+                CONF.retention_interval, self.service_manage_retention)
+
     def stop(self, graceful=False):
+        if self.retention_timer:
+            self.retention_timer.stop()
+            self.retention_timer = None
         if self.server:
             self.server.stop()
             self.server.wait()
         super(ConductorService, self).stop(graceful)
 
+    def service_manage_retention(self):
+        """Delete the events and actions past their retention period."""
+        try:
+            retention.apply_retention()
+        except Exception as ex:
+            LOG.error('Error while purging old events and actions: %s', ex)
+
     @request_context
     def credential_create(self, ctx, req):
         """Create the credential based on the context.
@@ -699,7 +716,7 @@ class ConductorService(service.Service):
         }
         action_id = action_mod.Action.create(ctx, cluster.id,
                                              consts.CLUSTER_CREATE, **kwargs)
-        dispatcher.start_action()
+        dispatcher.start_actions([action_id])
         LOG.info("Cluster create action queued: %s.", action_id)
 
         result = cluster.to_dict()
@@ -774,7 +791,7 @@ class ConductorService(service.Service):
         }
         action_id = action_mod.Action.create(ctx, cluster.id,
                                              consts.CLUSTER_UPDATE, **kwargs)
-        dispatcher.start_action()
+        dispatcher.start_actions([action_id])
         LOG.info("Cluster update action queued: %s.", action_id)
 
         resp = cluster.to_dict()
@@ -827,7 +844,7 @@ class ConductorService(service.Service):
         action_id = action_mod.Action.create(ctx, cluster.id,
                                              consts.CLUSTER_DELETE,
                                              force=True, **params)
-        dispatcher.start_action()
+        dispatcher.start_actions([action_id])
         LOG.info("Cluster delete action queued: %s", action_id)
 
         return {'action': action_id}
@@ -907,7 +924,7 @@ class ConductorService(service.Service):
         action_id = action_mod.Action.create(context, db_cluster.id,
                                              consts.CLUSTER_ADD_NODES,
                                              **params)
-        dispatcher.start_action()
+        dispatcher.start_actions([action_id])
         LOG.info("Cluster add nodes action queued: %s.", action_id)
 
         return {'action': action_id}
@@ -981,7 +998,7 @@ class ConductorService(service.Service):
         action_id = action_mod.Action.create(ctx, db_cluster.id,
                                              consts.CLUSTER_DEL_NODES,
                                              **params)
-        dispatcher.start_action()
+        dispatcher.start_actions([action_id])
         LOG.info("Cluster delete nodes action queued: %s.", action_id)
 
         return {'action': action_id}
@@ -1084,7 +1101,7 @@ class ConductorService(service.Service):
         action_id = action_mod.Action.create(ctx, db_cluster.id,
                                              consts.CLUSTER_REPLACE_NODES,
                                              **kwargs)
-        dispatcher.start_action()
+        dispatcher.start_actions([action_id])
         LOG.info("Cluster replace nodes action queued: %s.", action_id)
 
         return {'action': action_id}
@@ -1176,7 +1193,7 @@ class ConductorService(service.Service):
         }
         action_id = action_mod.Action.create(
             ctx, db_cluster.id, consts.CLUSTER_RESIZE, **params)
-        dispatcher.start_action()
+        dispatcher.start_actions([action_id])
         LOG.info("Cluster resize action queued: %s.", action_id)
 
         return {'action': action_id}
@@ -1217,7 +1234,7 @@ class ConductorService(service.Service):
         action_id = action_mod.Action.create(ctx, db_cluster.id,
                                              consts.CLUSTER_SCALE_OUT,
                                              **params)
-        dispatcher.start_action()
+        dispatcher.start_actions([action_id])
         LOG.info("Cluster Scale out action queued: %s", action_id)
 
         return {'action': action_id}
@@ -1258,7 +1275,7 @@ class ConductorService(service.Service):
         action_id = action_mod.Action.create(ctx, db_cluster.id,
                                              consts.CLUSTER_SCALE_IN,
                                              **params)
-        dispatcher.start_action()
+        dispatcher.start_actions([action_id])
         LOG.info("Cluster Scale in action queued: %s.", action_id)
 
         return {'action': action_id}
@@ -1322,7 +1339,7 @@ class ConductorService(service.Service):
         action_id = action_mod.Action.create(ctx, db_cluster.id,
                                              consts.CLUSTER_CHECK,
                                              **kwargs)
-        dispatcher.start_action()
+        dispatcher.start_actions([action_id])
         LOG.info("Cluster check action queued: %s.", action_id)
 
         return {'action': action_id}
@@ -1404,7 +1421,7 @@ class ConductorService(service.Service):
         }
         action_id = action_mod.Action.create(ctx, db_cluster.id,
                                              consts.CLUSTER_RECOVER, **params)
-        dispatcher.start_action()
+        dispatcher.start_actions([action_id])
         LOG.info("Cluster recover action queued: %s.", action_id)
 
         return {'action': action_id}
@@ -1484,7 +1501,7 @@ class ConductorService(service.Service):
         }
         action_id = action_mod.Action.create(
             ctx, cluster.id, consts.CLUSTER_OPERATION, **kwargs)
-        dispatcher.start_action()
+        dispatcher.start_actions([action_id])
         LOG.info("Cluster operation action is queued: %s.", action_id)
         return {'action': action_id}
 
@@ -1609,7 +1626,7 @@ class ConductorService(service.Service):
         }
         action_id = action_mod.Action.create(ctx, node.id,
                                              consts.NODE_CREATE, **params)
-        dispatcher.start_action()
+        dispatcher.start_actions([action_id])
         LOG.info("Node create action queued: %s.", action_id)
 
         result = node.to_dict()
@@ -1691,7 +1708,7 @@ class ConductorService(service.Service):
         }
         action_id = action_mod.Action.create(ctx, node.id, consts.NODE_UPDATE,
                                              **params)
-        dispatcher.start_action()
+        dispatcher.start_actions([action_id])
         LOG.info("Node update action is queued: %s.", action_id)
 
         resp = node.to_dict()
@@ -1738,7 +1755,7 @@ class ConductorService(service.Service):
         }
         action_id = action_mod.Action.create(ctx, node.id,
                                              consts.NODE_DELETE, **params)
-        dispatcher.start_action()
+        dispatcher.start_actions([action_id])
         LOG.info("Node delete action is queued: %s.", action_id)
 
         return {'action': action_id}
@@ -1874,7 +1891,7 @@ class ConductorService(service.Service):
             kwargs['inputs'] = req.params
         action_id = action_mod.Action.create(ctx, db_node.id,
                                              consts.NODE_CHECK, **kwargs)
-        dispatcher.start_action()
+        dispatcher.start_actions([action_id])
         LOG.info("Node check action is queued: %s.", action_id)
 
         return {'action': action_id}
@@ -1921,7 +1938,7 @@ class ConductorService(service.Service):
 
         action_id = action_mod.Action.create(ctx, db_node.id,
                                              consts.NODE_RECOVER, **kwargs)
-        dispatcher.start_action()
+        dispatcher.start_actions([action_id])
         LOG.info("Node recover action is queued: %s.", action_id)
 
         return {'action': action_id}
@@ -1968,7 +1985,7 @@ class ConductorService(service.Service):
         }
         action_id = action_mod.Action.create(ctx, db_node.id,
                                              consts.NODE_OPERATION, **kwargs)
-        dispatcher.start_action()
+        dispatcher.start_actions([action_id])
         LOG.info("Node operation action is queued: %s.", action_id)
         return {'action': action_id}
 
@@ -2054,7 +2071,7 @@ class ConductorService(service.Service):
         action_id = action_mod.Action.create(ctx, db_cluster.id,
                                              consts.CLUSTER_ATTACH_POLICY,
                                              **params)
-        dispatcher.start_action()
+        dispatcher.start_actions([action_id])
         LOG.info("Policy attach action queued: %s.", action_id)
 
         return {'action': action_id}
@@ -2097,7 +2114,7 @@ class ConductorService(service.Service):
         action_id = action_mod.Action.create(ctx, db_cluster.id,
                                              consts.CLUSTER_DETACH_POLICY,
                                              **params)
-        dispatcher.start_action()
+        dispatcher.start_actions([action_id])
         LOG.info("Policy detach action queued: %s.", action_id)
 
         return {'action': action_id}
@@ -2143,7 +2160,7 @@ class ConductorService(service.Service):
         action_id = action_mod.Action.create(ctx, db_cluster.id,
                                              consts.CLUSTER_UPDATE_POLICY,
                                              **params)
-        dispatcher.start_action()
+        dispatcher.start_actions([action_id])
         LOG.info("Policy update action queued: %s.", action_id)
 
         return {'action': action_id}
@@ -2478,6 +2495,38 @@ class ConductorService(service.Service):
                                               project_safe=True)
         receiver.notify(ctx)
 
+    def _find_pending_webhook_action(self, ctx, cluster_id, name, action,
+                                     inputs):
+        """Find an action of a recent trigger of a webhook not started yet.
+
+        :param ctx: An instance of the request context.
+        :param cluster_id: ID of the cluster targeted by the webhook.
+        :param name: Name of the actions created by the webhook.
+        :param action: The action the webhook triggers.
+        :param inputs: The inputs of the action to be created.
+        :return: ID of a READY action created by the same webhook within the
+                 coalescing window with the same inputs, or None.
+        """
+        window = cfg.CONF.webhook_coalesce_window
+        if window <= 0:
+            return None
+
+        filters = {
+            'target': cluster_id,
+            'name': name,
+            'action': action,
+            'status': consts.ACTION_READY,
+        }
+        pending_actions = action_obj.Action.get_all(ctx, filters=filters,
+                                                    with_deps=False)
+        for pending in pending_actions:
+            if timeutils.is_older_than(pending.created_at, window):
+                continue
+            if pending.inputs == inputs:
+                return pending.id
+
+        return None
+
     @request_context
     def webhook_trigger(self, ctx, req):
         """trigger the webhook.
@@ -2496,9 +2545,11 @@ class ConductorService(service.Service):
         LOG.info("Triggering webhook (%s)", identity)
         receiver = receiver_obj.Receiver.find(ctx, identity)
 
-        try:
-            db_cluster = co.Cluster.find(ctx, receiver.cluster_id)
-        except (exception.ResourceNotFound, exception.MultipleChoices) as ex:
+        # The receiver stores the ID of its cluster, checking that the
+        # cluster still exists is enough, there is no need to load it.
+        cluster_id = receiver.cluster_id
+        if not co.Cluster.exists(ctx, cluster_id):
+            ex = exception.ResourceNotFound(type='cluster', id=cluster_id)
             msg = ex.enhance_msg('referenced', ex)
             raise exception.BadRequest(msg=msg)
 
@@ -2508,17 +2559,25 @@ class ConductorService(service.Service):
         if params:
             data.update(params)
 
+        name = 'webhook_%s' % receiver.id[:8]
+        action_id = self._find_pending_webhook_action(
+            ctx, cluster_id, name, receiver.action, data)
+        if action_id:
+            LOG.info("Webhook %(w)s coalesced into pending action %(a)s.",
+                     {'w': identity, 'a': action_id})
+            return {'action': action_id}
+
         kwargs = {
-            'name': 'webhook_%s' % receiver.id[:8],
-            'cluster_id': db_cluster.id,
+            'name': name,
+            'cluster_id': cluster_id,
             'cause': consts.CAUSE_RPC,
             'status': action_mod.Action.READY,
             'inputs': data
         }
 
-        action_id = action_mod.Action.create(ctx, db_cluster.id,
+        action_id = action_mod.Action.create(ctx, cluster_id,
                                              receiver.action, **kwargs)
-        dispatcher.start_action()
+        dispatcher.start_actions([action_id])
         LOG.info("Webhook %(w)s triggered with action queued: %(a)s.",
                  {'w': identity, 'a': action_id})
 
@@ -56,6 +56,23 @@ API_OPTS = [
     cfg.IntOpt('max_json_body_size', default=1048576,
                deprecated_group='DEFAULT',
                help=_('Maximum raw byte size of JSON request body.')),
+    cfg.IntOpt('trust_cache_size', default=1000, min=0,
+               help=_('Maximum number of trusts of user and project pairs '
+                      'each API worker keeps in memory, saving a lookup of '
+                      'the stored credential per request. 0 disables the '
+                      'cache.')),
+    cfg.IntOpt('trust_cache_ttl', default=300, min=0,
+               help=_('Number of seconds a trust is kept in the cache of an '
+                      'API worker before it is looked up again.')),
+    cfg.IntOpt('webhook_cache_size', default=1000, min=0,
+               help=_('Maximum number of receivers, and separately of '
+                      'tokens of their actors, each API worker keeps in '
+                      'memory to authenticate webhook triggers. 0 disables '
+                      'the cache.')),
+    cfg.IntOpt('webhook_cache_ttl', default=60, min=0,
+               help=_('Number of seconds a receiver is kept in the cache of '
+                      'an API worker before it is looked up again. Tokens '
+                      'are kept until shortly before they expire.')),
 ]
 
 
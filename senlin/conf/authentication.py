@@ -32,6 +32,13 @@ AUTHENTICATION_OPTS = [
                 help=_('Verify HTTPS connections.')),
     cfg.StrOpt('interface', default='public',
                help=_('Interface to use for the API endpoints.')),
+    cfg.IntOpt('connection_pool_size', default=100, min=0,
+               help=_('Maximum number of connections to OpenStack services '
+                      'each senlin process keeps for reuse. 0 disables '
+                      'connection pooling.')),
+    cfg.IntOpt('connection_idle_timeout', default=600, min=0,
+               help=_('Number of seconds after which an unused pooled '
+                      'connection is dropped.')),
 ]
 
 
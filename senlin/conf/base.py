@@ -71,7 +71,9 @@ ENGINE_OPTS = [
                help=_('Number of times trying to grab a lock.')),
     cfg.IntOpt('lock_retry_interval',
                default=10,
-               help=_('Number of seconds between lock retries.')),
+               help=_('Number of seconds between lock retries. Actions '
+                      'queued on a lock are woken up when it is released, '
+                      'or after this long if the lock is free then.')),
     cfg.IntOpt('database_retry_limit',
                default=10,
                help=_('Number of times retrying a failed operation on the '
@@ -98,6 +100,53 @@ ENGINE_OPTS = [
                 default=[],
                 help=_('The roles which are delegated to the trustee by the '
                        'trustor when a cluster is created.')),
+    cfg.IntOpt('object_cache_size',
+               default=1000,
+               min=0,
+               help=_('Maximum number of profiles, and separately of '
+                      'policies, each senlin service keeps in its in-process '
+                      'cache. 0 disables the cache.')),
+    cfg.IntOpt('webhook_coalesce_window',
+               default=0,
+               min=0,
+               help=_('Number of seconds within which a webhook triggered '
+                      'again with the same inputs reuses the action of the '
+                      'previous trigger if it has not started yet. 0 '
+                      'disables coalescing.')),
+    cfg.IntOpt('purge_batch_size',
+               default=1000,
+               min=1,
+               help=_('Maximum number of events or actions deleted by one '
+                      'transaction when purging old records.')),
+    cfg.FloatOpt('purge_batch_interval',
+                 default=0.5,
+                 min=0,
+                 help=_('Seconds to pause between two batches of deletions '
+                        'when purging old records.')),
+    cfg.IntOpt('event_retention',
+               default=0,
+               min=0,
+               help=_('Number of days events are kept for. Older events are '
+                      'deleted periodically by the conductor. 0 keeps events '
+                      'forever.')),
+    cfg.IntOpt('action_retention',
+               default=0,
+               min=0,
+               help=_('Number of days completed actions are kept for. Older '
+                      'actions are deleted periodically by the conductor. 0 '
+                      'keeps actions forever.')),
+    cfg.DictOpt('project_retention',
+                default={},
+                help=_('Number of days the events and completed actions of '
+                       'some projects are kept for, overriding '
+                       'event_retention and action_retention, as '
+                       'project_id:days pairs. 0 keeps the records of a '
+                       'project forever.')),
+    cfg.IntOpt('retention_interval',
+               default=3600,
+               min=1,
+               help=_('Seconds between two runs of the retention task of the '
+                      'conductor.')),
 ]
 
 CLOUD_BACKEND_OPTS = [
@@ -20,6 +20,21 @@ DISPATCHERS_OPTS = [
                help=_("Lowest event priorities to be dispatched.")),
     cfg.BoolOpt("exclude_derived_actions", default=True,
                 help=_("Exclude derived actions from events dumping.")),
+    cfg.IntOpt('buffer_size', default=1000, min=0,
+               help=_("Maximum number of events buffered by each dispatcher "
+                      "before they are written. Setting it to 0 makes the "
+                      "dispatchers write every event when it is emitted.")),
+    cfg.IntOpt('flush_batch_size', default=100, min=1,
+               help=_("Maximum number of buffered events written at once.")),
+    cfg.FloatOpt('flush_interval', default=1.0, min=0,
+                 help=_("Maximum number of seconds an event stays in the "
+                        "buffer waiting for more events to be written "
+                        "with.")),
+    cfg.StrOpt('buffer_full_policy', default='block',
+               choices=('block', 'drop'),
+               help=_("What to do with an event when the buffer is full, "
+                      "either wait until there is space in the buffer or "
+                      "drop the event.")),
 ]
 
 
@@ -26,6 +26,32 @@ ENGINE_OPTS = [
                deprecated_name='scheduler_thread_pool_size',
                deprecated_group="DEFAULT",
                help=_('Number of senlin-engine threads.')),
+    cfg.IntOpt('action_queue_size',
+               default=1000,
+               min=1,
+               help=_('Maximum number of actions a senlin-engine process '
+                      'claims and runs concurrently. When the limit is '
+                      'reached the engine stops claiming READY actions '
+                      'until some running actions complete.')),
+    cfg.IntOpt('action_claim_batch_size',
+               default=100,
+               min=1,
+               help=_('Maximum number of READY actions claimed from the '
+                      'database in a single statement.')),
+    cfg.IntOpt('dependent_wait_interval',
+               default=15,
+               min=1,
+               help=_('Maximum number of seconds an action waits to be '
+                      'woken up by its dependent actions before polling '
+                      'their status from the database.')),
+    cfg.IntOpt('bulk_check_min_nodes',
+               default=100,
+               min=1,
+               help=_('Minimum number of nodes a cluster must have for a '
+                      'cluster check to list its physical resources at '
+                      'once. The nodes of smaller clusters are checked one '
+                      'by one, which is cheaper than listing all the '
+                      'resources of their project.')),
 ]
 
 
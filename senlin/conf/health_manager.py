@@ -33,6 +33,27 @@ HEALTH_MANAGER_OPTS = [
                deprecated_name='health_manager_thread_pool_size',
                deprecated_group="DEFAULT",
                help=_('Number of senlin-health-manager threads.')),
+    cfg.BoolOpt('bulk_status_polling',
+                default=False,
+                help=_('Whether NODE_STATUS_POLLING and '
+                       'HYPERVISOR_STATUS_POLLING health checks poll the '
+                       'status of all nodes of a cluster in bulk, listing '
+                       'the servers once per project instead of getting '
+                       'them one by one.')),
+    cfg.IntOpt('bulk_status_polling_min_nodes',
+               default=100,
+               min=1,
+               help=_('Minimum number of nodes a cluster must have for its '
+                      'status to be polled in bulk. The servers of smaller '
+                      'clusters are got one by one, which is cheaper than '
+                      'listing all the servers of their project.')),
+    cfg.IntOpt('health_check_concurrency',
+               default=50,
+               min=1,
+               help=_('Maximum number of nodes of a cluster checked '
+                      'concurrently during a health check pass. This also '
+                      'bounds the number of concurrent URL polls and the '
+                      'HTTP connections kept alive per host.')),
 ]
 
 
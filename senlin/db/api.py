@@ -40,6 +40,10 @@ def cluster_get(context, cluster_id, project_safe=True):
     return IMPL.cluster_get(context, cluster_id, project_safe=project_safe)
 
 
+def cluster_exists(context, cluster_id, project_safe=True):
+    return IMPL.cluster_exists(context, cluster_id, project_safe=project_safe)
+
+
 def cluster_get_by_name(context, cluster_name, project_safe=True):
     return IMPL.cluster_get_by_name(context, cluster_name,
                                     project_safe=project_safe)
@@ -50,14 +54,18 @@ def cluster_get_by_short_id(context, short_id, project_safe=True):
                                         project_safe=project_safe)
 
 
+def cluster_find(context, identity, project_safe=True):
+    return IMPL.cluster_find(context, identity, project_safe=project_safe)
+
+
 def cluster_get_all(context, limit=None, marker=None, sort=None, filters=None,
                     project_safe=True):
     return IMPL.cluster_get_all(context, limit=limit, marker=marker, sort=sort,
                                 filters=filters, project_safe=project_safe)
 
 
-def cluster_next_index(context, cluster_id):
-    return IMPL.cluster_next_index(context, cluster_id)
+def cluster_next_index(context, cluster_id, count=1):
+    return IMPL.cluster_next_index(context, cluster_id, count)
 
 
 def cluster_count_all(context, filters=None, project_safe=True):
@@ -91,6 +99,10 @@ def node_get_by_short_id(context, short_id, project_safe=True):
                                      project_safe=project_safe)
 
 
+def node_find(context, identity, project_safe=True):
+    return IMPL.node_find(context, identity, project_safe=project_safe)
+
+
 def node_get_all(context, cluster_id=None, limit=None, marker=None, sort=None,
                  filters=None, project_safe=True):
     return IMPL.node_get_all(context, cluster_id=cluster_id, filters=filters,
@@ -116,6 +128,15 @@ def node_update(context, node_id, values):
     return IMPL.node_update(context, node_id, values)
 
 
+def node_update_data(context, node_id, values=None, removed=None):
+    return IMPL.node_update_data(context, node_id, values=values,
+                                 removed=removed)
+
+
+def node_update_batch(context, node_ids, values, status=None):
+    return IMPL.node_update_batch(context, node_ids, values, status=status)
+
+
 def node_migrate(context, node_id, to_cluster, timestamp, role=None):
     return IMPL.node_migrate(context, node_id, to_cluster, timestamp, role)
 
@@ -149,6 +170,10 @@ def node_is_locked(node_id):
     return IMPL.node_is_locked(node_id)
 
 
+def node_lock_get_locked(node_ids):
+    return IMPL.node_lock_get_locked(node_ids)
+
+
 def node_lock_release(node_id, action_id):
     return IMPL.node_lock_release(node_id, action_id)
 
@@ -157,6 +182,19 @@ def node_lock_steal(node_id, action_id):
     return IMPL.node_lock_steal(node_id, action_id)
 
 
+def lock_wait(context, lock_id, action_id, shared=False, values=None):
+    return IMPL.lock_wait(context, lock_id, action_id, shared=shared,
+                          values=values)
+
+
+def lock_wake(lock_id):
+    return IMPL.lock_wake(lock_id)
+
+
+def lock_waiter_get_stale(timeout):
+    return IMPL.lock_waiter_get_stale(timeout)
+
+
 # Policies
 def policy_create(context, values):
     return IMPL.policy_create(context, values)
@@ -175,6 +213,10 @@ def policy_get_by_short_id(context, short_id, project_safe=True):
                                        project_safe=project_safe)
 
 
+def policy_find(context, identity, project_safe=True):
+    return IMPL.policy_find(context, identity, project_safe=project_safe)
+
+
 def policy_get_all(context, limit=None, marker=None, sort=None, filters=None,
                    project_safe=True):
     return IMPL.policy_get_all(context, limit=limit, marker=marker, sort=sort,
@@ -243,6 +285,10 @@ def profile_get_by_short_id(context, short_id, project_safe=True):
                                         project_safe=project_safe)
 
 
+def profile_find(context, identity, project_safe=True):
+    return IMPL.profile_find(context, identity, project_safe=project_safe)
+
+
 def profile_get_all(context, limit=None, marker=None, sort=None, filters=None,
                     project_safe=True):
     return IMPL.profile_get_all(context, limit=limit, marker=marker,
@@ -284,6 +330,10 @@ def event_create(context, values):
     return IMPL.event_create(context, values)
 
 
+def event_create_batch(context, values):
+    return IMPL.event_create_batch(context, values)
+
+
 def event_get(context, event_id, project_safe=True):
     return IMPL.event_get(context, event_id, project_safe=project_safe)
 
@@ -293,6 +343,10 @@ def event_get_by_short_id(context, short_id, project_safe=True):
                                       project_safe=project_safe)
 
 
+def event_find(context, identity, project_safe=True):
+    return IMPL.event_find(context, identity, project_safe=project_safe)
+
+
 def event_get_all(context, limit=None, marker=None, sort=None, filters=None,
                   project_safe=True):
     return IMPL.event_get_all(context, limit=limit, marker=marker, sort=sort,
@@ -320,10 +374,19 @@ def action_create(context, values):
     return IMPL.action_create(context, values)
 
 
+def action_create_batch(context, values, dependent, nodes=None):
+    return IMPL.action_create_batch(context, values, dependent, nodes=nodes)
+
+
 def action_update(context, action_id, values):
     return IMPL.action_update(context, action_id, values)
 
 
+def action_update_data(context, action_id, values=None, removed=None):
+    return IMPL.action_update_data(context, action_id, values=values,
+                                   removed=removed)
+
+
 def action_get(context, action_id, project_safe=True, refresh=False):
     return IMPL.action_get(context, action_id, project_safe=project_safe,
                            refresh=refresh)
@@ -343,6 +406,10 @@ def action_get_by_short_id(context, short_id, project_safe=True):
                                        project_safe=project_safe)
 
 
+def action_find(context, identity, project_safe=True):
+    return IMPL.action_find(context, identity, project_safe=project_safe)
+
+
 def action_get_all_by_owner(context, owner):
     return IMPL.action_get_all_by_owner(context, owner)
 
@@ -382,6 +449,10 @@ def dependency_get_dependents(context, action_id):
     return IMPL.dependency_get_dependents(context, action_id)
 
 
+def dependency_get_all(context, action_ids):
+    return IMPL.dependency_get_all(context, action_ids)
+
+
 def action_mark_succeeded(context, action_id, timestamp):
     return IMPL.action_mark_succeeded(context, action_id, timestamp)
 
@@ -410,6 +481,11 @@ def action_acquire_first_ready(context, owner, timestamp):
     return IMPL.action_acquire_first_ready(context, owner, timestamp)
 
 
+def action_acquire_ready_batch(context, owner, timestamp, limit, ids=None):
+    return IMPL.action_acquire_ready_batch(context, owner, timestamp, limit,
+                                           ids=ids)
+
+
 def action_abandon(context, action_id, values=None):
     return IMPL.action_abandon(context, action_id, values)
 
@@ -450,6 +526,10 @@ def receiver_get_by_short_id(context, short_id, project_safe=True):
                                          project_safe=project_safe)
 
 
+def receiver_find(context, identity, project_safe=True):
+    return IMPL.receiver_find(context, identity, project_safe=project_safe)
+
+
 def receiver_get_all(context, limit=None, marker=None, filters=None, sort=None,
                      project_safe=True):
     return IMPL.receiver_get_all(context, limit=limit, marker=marker,
@@ -486,6 +566,10 @@ def service_get_all():
     return IMPL.service_get_all()
 
 
+def service_get_all_alive(binary):
+    return IMPL.service_get_all_alive(binary)
+
+
 def service_get_all_expired(binary):
     return IMPL.service_get_all_expired(binary)
 
@@ -530,11 +614,20 @@ def db_version(engine):
     return IMPL.db_version(engine)
 
 
-def event_purge(engine, project, granularity, age):
+def db_explain(engine):
+    """Get the query plans of the queries on the hot paths."""
+    return IMPL.db_explain(engine)
+
+
+def event_purge(engine, project, granularity, age, exclude=None,
+                limit=None):
     """Purge the event records in database."""
-    return IMPL.event_purge(project, granularity, age)
+    return IMPL.event_purge(project, granularity, age, exclude=exclude,
+                            limit=limit)
 
 
-def action_purge(engine, project, granularity, age):
+def action_purge(engine, project, granularity, age, exclude=None,
+                 limit=None, statuses=None):
     """Purge the action records in database."""
-    return IMPL.action_purge(project, granularity, age)
+    return IMPL.action_purge(project, granularity, age, exclude=exclude,
+                             limit=limit, statuses=statuses)
@@ -29,13 +29,18 @@ from oslo_utils import importutils
 from oslo_utils import timeutils
 import sqlalchemy
 from sqlalchemy import and_
+from sqlalchemy import or_
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import noload
+from sqlalchemy.orm import selectinload
 from sqlalchemy.sql.expression import func
 
 from senlin.common import consts
 from senlin.common import exception
 from senlin.db.sqlalchemy import migration
 from senlin.db.sqlalchemy import models
+from senlin.db.sqlalchemy import types
 from senlin.db.sqlalchemy import utils
 
 osprofiler_sqlalchemy = importutils.try_import('osprofiler.sqlalchemy')
@@ -43,6 +48,9 @@ osprofiler_sqlalchemy = importutils.try_import('osprofiler.sqlalchemy')
 LOG = logging.getLogger(__name__)
 CONF = cfg.CONF
 
+# Number of IDs matched by a single IN clause when deleting many rows
+DELETE_CHUNK_SIZE = 1000
+
 _MAIN_CONTEXT_MANAGER = None
 _CONTEXT = threading.local()
 
@@ -74,6 +82,8 @@ def _get_main_context_manager():
     global _MAIN_CONTEXT_MANAGER
     if not _MAIN_CONTEXT_MANAGER:
         _MAIN_CONTEXT_MANAGER = enginefacade.transaction_context()
+        _MAIN_CONTEXT_MANAGER.configure(json_serializer=types.dumps,
+                                        json_deserializer=types.loads)
         add_db_tracing()
     return _MAIN_CONTEXT_MANAGER
 
@@ -109,6 +119,77 @@ def retry_on_deadlock(f):
         max_retry_interval=CONF.database_max_retry_interval)(f)
 
 
+def _json_path(dialect, key):
+    if dialect.name == 'postgresql':
+        return sqlalchemy.literal([key], postgresql.ARRAY(sqlalchemy.Text))
+    return '$."%s"' % key.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def _json_value(dialect, value):
+    value = sqlalchemy.literal(types.dumps(value), sqlalchemy.Text)
+    if dialect.name == 'postgresql':
+        return sqlalchemy.cast(value, postgresql.JSONB)
+    return func.JSON_EXTRACT(value, '$')
+
+
+def update_json_keys(session, model, obj_id, column, values=None,
+                     removed=None):
+    """Set or remove top level keys of a JSON dictionary column.
+
+    On backends storing the column as native JSON the keys are updated in
+    place by the database, so that only the changed keys are sent and other
+    keys updated concurrently are preserved. Other backends read, modify
+    and write back the whole document.
+
+    :param session: The session in which the update is done.
+    :param model: The model class of the object.
+    :param obj_id: ID of the object.
+    :param column: Name of the JSON dictionary column.
+    :param values: A dictionary of keys to set and their new values.
+    :param removed: A list of keys to remove.
+    :returns: True if the object was found, False otherwise.
+    """
+    values = values or {}
+    removed = removed or []
+    dialect = session.get_bind().dialect
+    query = session.query(model).filter_by(id=obj_id)
+
+    if not types.native_json(dialect):
+        obj = query.first()
+        if obj is None:
+            return False
+        doc = dict(getattr(obj, column) or {})
+        doc.update(values)
+        for key in removed:
+            doc.pop(key, None)
+        setattr(obj, column, doc)
+        obj.save(session)
+        return True
+
+    # A document which is not a dictionary, e.g. NULL, is replaced
+    doc = getattr(model, column)
+    if dialect.name == 'postgresql':
+        doc = sqlalchemy.case(
+            [(func.jsonb_typeof(doc) == 'object', doc)],
+            else_=sqlalchemy.cast('{}', postgresql.JSONB))
+        for key, value in values.items():
+            doc = func.jsonb_set(doc, _json_path(dialect, key),
+                                 _json_value(dialect, value))
+        for key in removed:
+            doc = doc.op('-')(key)
+    else:
+        doc = sqlalchemy.case([(func.JSON_TYPE(doc) == 'OBJECT', doc)],
+                              else_=func.JSON_OBJECT())
+        for key, value in values.items():
+            doc = func.JSON_SET(doc, _json_path(dialect, key),
+                                _json_value(dialect, value))
+        for key in removed:
+            doc = func.JSON_REMOVE(doc, _json_path(dialect, key))
+
+    count = query.update({column: doc}, synchronize_session=False)
+    return count > 0
+
+
 def query_by_short_id(context, model_query, model, short_id,
                       project_safe=True):
     q = model_query()
@@ -136,13 +217,87 @@ def query_by_name(context, model_query, name, project_safe=True):
         raise exception.MultipleChoices(arg=name)
 
 
+def query_by_identity(context, model_query, model, identity,
+                      project_safe=True):
+    """Find an object by its ID, its name or a prefix of its ID.
+
+    All three are matched by a single query. An exact ID match wins over a
+    name match, which wins over an ID prefix match. The query returns at
+    most two rows, the second one only telling whether the best match is
+    ambiguous.
+    """
+    id_match = model.id == identity
+    clauses = [id_match, model.id.startswith(identity, autoescape=True)]
+    ranks = [(id_match, 0)]
+    if hasattr(model, 'name'):
+        clauses.append(model.name == identity)
+        ranks.append((model.name == identity, 1))
+
+    q = model_query().filter(sqlalchemy.or_(*clauses))
+    q = utils.filter_query_by_project(q, project_safe, context)
+    q = q.order_by(sqlalchemy.case(ranks, else_=2)).limit(2)
+    rows = q.all()
+    if not rows:
+        return None
+
+    def _rank(row):
+        if row.id == identity:
+            return 0
+        if getattr(row, 'name', None) == identity:
+            return 1
+        return 2
+
+    if len(rows) > 1 and _rank(rows[0]) == _rank(rows[1]):
+        raise exception.MultipleChoices(arg=identity)
+    return rows[0]
+
+
+def _get_marker(model, marker, sort_keys):
+    """Get the sort key values of the row a page starts after.
+
+    Only the sort key columns of the row are read, through its primary key,
+    rather than the full row and its eagerly loaded relationships.
+    """
+    columns = []
+    for key in sort_keys:
+        if not hasattr(model, key):
+            raise db_exc.InvalidSortKey(key=key)
+        columns.append(getattr(model, key).label(key))
+
+    with session_for_read() as session:
+        return session.query(*columns).filter(model.id == marker).first()
+
+
+def paginate_query(query, model, limit=None, marker=None, sort=None,
+                   default_sort_key=None):
+    """Get a page of a query, ordered by the given sort keys.
+
+    :param query: The query to paginate.
+    :param model: The model class the query is for.
+    :param limit: The maximum number of rows to return.
+    :param marker: The ID of the row the page starts after.
+    :param sort: A string of sort keys and directions, see get_sort_params.
+    :param default_sort_key: The key to sort by when none is specified.
+    :returns: A list of rows.
+    """
+    keys, dirs = utils.get_sort_params(sort, default_sort_key)
+    if marker:
+        marker = _get_marker(model, marker, keys)
+    return sa_utils.paginate_query(query, model, limit, keys,
+                                   marker=marker, sort_dirs=dirs).all()
+
+
 # Clusters
 def cluster_model_query():
+    # Cluster objects only expose the IDs of their nodes and policies and
+    # the name of their profile. Load just those, and load the collections
+    # with one extra query each rather than joining them, which would fetch
+    # the product of the nodes and policies of each cluster.
     with session_for_read() as session:
         query = session.query(models.Cluster).options(
-            joinedload(models.Cluster.nodes),
-            joinedload(models.Cluster.profile),
-            joinedload(models.Cluster.policies)
+            selectinload(models.Cluster.nodes).load_only('id'),
+            joinedload(models.Cluster.profile).load_only('name'),
+            selectinload(models.Cluster.policies).load_only('id')
         )
         return query
 
@@ -165,6 +320,13 @@ def cluster_get(context, cluster_id, project_safe=True):
     return utils.check_resource_project(context, cluster, project_safe)
 
 
+def cluster_exists(context, cluster_id, project_safe=True):
+    with session_for_read() as session:
+        query = session.query(models.Cluster.id).filter_by(id=cluster_id)
+        query = utils.filter_query_by_project(query, project_safe, context)
+        return query.first() is not None
+
+
 def cluster_get_by_name(context, name, project_safe=True):
     return query_by_name(context, cluster_model_query, name,
                          project_safe=project_safe)
@@ -175,6 +337,11 @@ def cluster_get_by_short_id(context, short_id, project_safe=True):
                              short_id, project_safe=project_safe)
 
 
+def cluster_find(context, identity, project_safe=True):
+    return query_by_identity(context, cluster_model_query, models.Cluster,
+                             identity, project_safe=project_safe)
+
+
 def _query_cluster_get_all(context, project_safe=True):
     query = cluster_model_query()
     query = utils.filter_query_by_project(query, project_safe, context)
@@ -188,16 +355,12 @@ def cluster_get_all(context, limit=None, marker=None, sort=None, filters=None,
     if filters:
         query = utils.exact_filter(query, models.Cluster, filters)
 
-    keys, dirs = utils.get_sort_params(sort, consts.CLUSTER_INIT_AT)
-    if marker:
-        marker = cluster_model_query().get(marker)
-
-    return sa_utils.paginate_query(query, models.Cluster, limit, keys,
-                                   marker=marker, sort_dirs=dirs).all()
+    return paginate_query(query, models.Cluster, limit=limit, marker=marker,
+                          sort=sort, default_sort_key=consts.CLUSTER_INIT_AT)
 
 
 @retry_on_deadlock
-def cluster_next_index(context, cluster_id):
+def cluster_next_index(context, cluster_id, count=1):
     with session_for_write() as session:
         cluster = session.query(models.Cluster).with_for_update().get(
             cluster_id)
@@ -205,7 +368,7 @@ def cluster_next_index(context, cluster_id):
             return 0
 
         next_index = cluster.next_index
-        cluster.next_index = cluster.next_index + 1
+        cluster.next_index = cluster.next_index + count
         cluster.save(session)
         return next_index
 
@@ -288,6 +451,11 @@ def node_get_by_short_id(context, short_id, project_safe=True):
                              project_safe=project_safe)
 
 
+def node_find(context, identity, project_safe=True):
+    return query_by_identity(context, node_model_query, models.Node,
+                             identity, project_safe=project_safe)
+
+
 def _query_node_get_all(context, project_safe=True, cluster_id=None):
     query = node_model_query()
 
@@ -307,11 +475,8 @@ def node_get_all(context, cluster_id=None, limit=None, marker=None, sort=None,
     if filters:
         query = utils.exact_filter(query, models.Node, filters)
 
-    keys, dirs = utils.get_sort_params(sort, consts.NODE_INIT_AT)
-    if marker:
-        marker = node_model_query().get(marker)
-    return sa_utils.paginate_query(query, models.Node, limit, keys,
-                                   marker=marker, sort_dirs=dirs).all()
+    return paginate_query(query, models.Node, limit=limit, marker=marker,
+                          sort=sort, default_sort_key=consts.NODE_INIT_AT)
 
 
 def node_get_all_by_cluster(context, cluster_id, filters=None,
@@ -371,6 +536,42 @@ def node_update(context, node_id, values):
                 cluster.save(session)
 
 
+@retry_on_deadlock
+def node_update_data(context, node_id, values=None, removed=None):
+    """Set or remove keys in the data of a node.
+
+    :param node_id: ID of the node to be updated.
+    :param values: A dictionary of keys to set in the node data.
+    :param removed: A list of keys to remove from the node data.
+    :raises ResourceNotFound: The specified node does not exist in database.
+    """
+    with session_for_write() as session:
+        if not update_json_keys(session, models.Node, node_id, 'data',
+                                values=values, removed=removed):
+            raise exception.ResourceNotFound(type='node', id=node_id)
+
+
+@retry_on_deadlock
+def node_update_batch(context, node_ids, values, status=None):
+    """Update many nodes with the same property values in one statement.
+
+    :param node_ids: A list of IDs of the nodes to be updated.
+    :param values: A dictionary of values to be updated on the nodes.
+    :param status: If specified, only nodes still in this status are
+                   updated, nodes changed concurrently are left alone.
+    :returns: The number of nodes updated.
+    """
+    if not node_ids:
+        return 0
+
+    with session_for_write() as session:
+        query = session.query(models.Node).filter(
+            models.Node.id.in_(node_ids))
+        if status is not None:
+            query = query.filter_by(status=status)
+        return query.update(values, synchronize_session=False)
+
+
 @retry_on_deadlock
 def node_add_dependents(context, depended, dependent, dep_type=None):
     """Add dependency between nodes.
@@ -462,53 +663,111 @@ def node_delete(context, node_id):
 def cluster_lock_acquire(cluster_id, action_id, scope):
     """Acquire lock on a cluster.
 
+    A cluster-scope lock is recorded in the ``cluster_lock`` row of the
+    cluster. Each node-scope lock is a ``cluster_lock_holder`` row of its
+    own, so taking or releasing one doesn't rewrite the others. Node-scope
+    lockers only take a shared lock on the ``cluster_lock`` row, which keeps
+    them from racing cluster-scope lockers without serializing them.
+
     :param cluster_id: ID of the cluster.
     :param action_id: ID of the action that attempts to lock the cluster.
     :param scope: +1 means a node-level operation lock; -1 indicates
                   a cluster-level lock.
-    :return: A list of action IDs that currently works on the cluster.
+    :return: A list of action IDs that currently works on the cluster. When
+             a node-level lock is acquired, the list only contains the ID of
+             the given action.
     """
+    action_id = str(action_id)
     with session_for_write() as session:
-        query = session.query(models.ClusterLock).with_for_update()
-        lock = query.get(cluster_id)
-        if lock is not None:
-            if scope == 1 and lock.semaphore > 0:
-                if action_id not in lock.action_ids:
-                    lock.action_ids.append(str(action_id))
-                    lock.semaphore += 1
-                    lock.save(session)
-        else:
-            lock = models.ClusterLock(cluster_id=cluster_id,
-                                      action_ids=[str(action_id)],
-                                      semaphore=scope)
-            session.add(lock)
+        if scope == 1:
+            return _acquire_node_scope_lock(session, cluster_id, action_id)
+        return _acquire_cluster_scope_lock(session, cluster_id, action_id)
+
+
+def _acquire_node_scope_lock(session, cluster_id, action_id):
+    query = session.query(models.ClusterLock).with_for_update(read=True)
+    lock = query.get(cluster_id)
+    if lock is None:
+        lock = models.ClusterLock(cluster_id=cluster_id, action_ids=[],
+                                  semaphore=0)
+        session.add(lock)
+    elif lock.semaphore < 0:
         return lock.action_ids
 
+    holder = session.query(models.ClusterLockHolder).get(
+        (cluster_id, action_id))
+    if holder is None:
+        holder = models.ClusterLockHolder(cluster_id=cluster_id,
+                                          action_id=action_id)
+        session.add(holder)
+    return [action_id]
+
+
+def _acquire_cluster_scope_lock(session, cluster_id, action_id):
+    query = session.query(models.ClusterLock).with_for_update()
+    lock = query.get(cluster_id)
+    if lock is not None and lock.semaphore < 0:
+        return lock.action_ids
+
+    query = session.query(models.ClusterLockHolder.action_id).filter_by(
+        cluster_id=cluster_id).with_for_update(read=True)
+    holders = [h[0] for h in query.all()]
+    if holders:
+        return holders
+
+    if lock is None:
+        lock = models.ClusterLock(cluster_id=cluster_id,
+                                  action_ids=[action_id], semaphore=-1)
+        session.add(lock)
+    else:
+        lock.action_ids = [action_id]
+        lock.semaphore = -1
+        lock.save(session)
+    return lock.action_ids
+
 
 @retry_on_deadlock
 def cluster_is_locked(cluster_id):
     with session_for_read() as session:
-        query = session.query(models.ClusterLock)
-        lock = query.get(cluster_id)
-        return lock is not None
+        lock = session.query(models.ClusterLock).get(cluster_id)
+        if lock is not None and lock.semaphore < 0:
+            return True
 
+        query = session.query(models.ClusterLockHolder).filter_by(
+            cluster_id=cluster_id)
+        return session.query(query.exists()).scalar()
 
-@retry_on_deadlock
-def _release_cluster_lock(session, lock, action_id, scope):
-    success = False
-    if (scope == -1 and lock.semaphore < 0) or lock.semaphore == 1:
-        if str(action_id) in lock.action_ids:
-            session.delete(lock)
-            success = True
-    elif str(action_id) in lock.action_ids:
-        if lock.semaphore == 1:
+
+def _release_cluster_scope_lock(session, lock, action_id):
+    if lock.semaphore < 0 and action_id in lock.action_ids:
+        session.delete(lock)
+        return True
+    return False
+
+
+def _release_locks_by_actions(session, action_ids):
+    """Release the cluster and node locks held by some actions.
+
+    :returns: A list of IDs of the clusters and nodes released.
+    """
+    query = session.query(models.NodeLock.node_id).filter(
+        models.NodeLock.action_id.in_(action_ids))
+    released = [r[0] for r in query.all()]
+    query.delete(synchronize_session=False)
+
+    query = session.query(models.ClusterLockHolder.cluster_id).filter(
+        models.ClusterLockHolder.action_id.in_(action_ids))
+    released.extend(r[0] for r in query.distinct().all())
+    query.delete(synchronize_session=False)
+
+    query = session.query(models.ClusterLock).filter(
+        models.ClusterLock.semaphore < 0)
+    for lock in query.all():
+        if set(lock.action_ids or []).intersection(action_ids):
+            released.append(lock.cluster_id)
             session.delete(lock)
-        else:
-            lock.action_ids.remove(str(action_id))
-            lock.semaphore -= 1
-            lock.save(session)
-        success = True
-    return success
+
+    return list(set(released))
 
 
 @retry_on_deadlock
@@ -521,13 +780,19 @@ def cluster_lock_release(cluster_id, action_id, scope):
                   a cluster-level lock.
     :return: True indicates successful release, False indicates failure.
     """
+    action_id = str(action_id)
     with session_for_write() as session:
+        if scope == 1:
+            query = session.query(models.ClusterLockHolder).filter_by(
+                cluster_id=cluster_id, action_id=action_id)
+            return query.delete(synchronize_session=False) > 0
+
         lock = session.query(
             models.ClusterLock).with_for_update().get(cluster_id)
         if lock is None:
             return False
 
-        return _release_cluster_lock(session, lock, action_id, scope)
+        return _release_cluster_scope_lock(session, lock, action_id)
 
 
 @retry_on_deadlock
@@ -545,6 +810,9 @@ def cluster_lock_steal(cluster_id, action_id):
                                       semaphore=-1)
             session.add(lock)
 
+        query = session.query(models.ClusterLockHolder).filter_by(
+            cluster_id=cluster_id)
+        query.delete(synchronize_session=False)
         return lock.action_ids
 
 
@@ -569,6 +837,18 @@ def node_is_locked(node_id):
         return lock is not None
 
 
+@retry_on_deadlock
+def node_lock_get_locked(node_ids):
+    """Get the IDs of the locked nodes among the given ones."""
+    if not node_ids:
+        return []
+
+    with session_for_read() as session:
+        query = session.query(models.NodeLock.node_id)
+        query = query.filter(models.NodeLock.node_id.in_(node_ids))
+        return [r[0] for r in query.all()]
+
+
 @retry_on_deadlock
 def node_lock_release(node_id, action_id):
     with session_for_write() as session:
@@ -596,6 +876,118 @@ def node_lock_steal(node_id, action_id):
         return lock.action_id
 
 
+@retry_on_deadlock
+def lock_wait(context, lock_id, action_id, shared=False, values=None):
+    """Queue an action until a lock it failed to acquire is released.
+
+    This API is always called with the action locked by the current
+    worker. The action is left WAITING without owner, so that engines
+    looking for READY actions don't pick it up before it is woken up.
+
+    :param lock_id: ID of the cluster or node locked.
+    :param action_id: ID of the action waiting for the lock.
+    :param shared: True if the action waits for a node-scope lock on a
+                   cluster.
+    :param values: Other values of the action to update.
+    """
+    with session_for_write() as session:
+        action = session.query(models.Action).get(action_id)
+        action.owner = None
+        action.start_time = None
+        action.status = consts.ACTION_WAITING
+        action.status_reason = 'The action is waiting for a lock.'
+        if values:
+            action.update(values)
+        action.save(session)
+
+        waiter = session.query(models.LockWaiter).get((lock_id, action_id))
+        if waiter is None:
+            waiter = models.LockWaiter(lock_id=lock_id, action_id=action_id,
+                                       created_at=action.created_at)
+            session.add(waiter)
+        waiter.shared = shared
+        waiter.updated_at = timeutils.utcnow(True)
+
+
+def _lock_is_held(session, lock_id):
+    """Check whether a lock is held exclusively or shared.
+
+    :returns: A tuple (exclusive, shared).
+    """
+    if session.query(models.NodeLock).get(lock_id) is not None:
+        return True, False
+
+    lock = session.query(models.ClusterLock).get(lock_id)
+    if lock is not None and lock.semaphore < 0:
+        return True, False
+
+    query = session.query(models.ClusterLockHolder).filter_by(
+        cluster_id=lock_id)
+    return False, session.query(query.exists()).scalar()
+
+
+@retry_on_deadlock
+def lock_wake(lock_id):
+    """Wake up the actions waiting for a lock which can acquire it now.
+
+    Nothing is woken up while the lock is held exclusively. Otherwise the
+    waiters are woken up in the order the actions were created: shared
+    waiters one after the other until an exclusive waiter, or the first
+    exclusive waiter alone if the lock isn't held at all. Woken actions
+    are made READY again.
+
+    :param lock_id: ID of the cluster or node locked.
+    :returns: A list of IDs of the actions woken up.
+    """
+    woken = []
+    # Most locks are released with nobody waiting for them, don't open a
+    # write transaction for those.
+    with session_for_read() as session:
+        query = session.query(models.LockWaiter).filter_by(lock_id=lock_id)
+        if not session.query(query.exists()).scalar():
+            return woken
+
+    with session_for_write() as session:
+        exclusive, shared = _lock_is_held(session, lock_id)
+        if exclusive:
+            return woken
+
+        query = session.query(models.LockWaiter).filter_by(
+            lock_id=lock_id).order_by(models.LockWaiter.created_at,
+                                      models.LockWaiter.action_id)
+        for waiter in query.with_for_update().all():
+            if not waiter.shared and (shared or woken):
+                break
+            session.delete(waiter)
+            # The action may have been cancelled or deleted while waiting
+            query = session.query(models.Action).filter_by(
+                id=waiter.action_id, status=consts.ACTION_WAITING)
+            count = query.update(
+                {'status': consts.ACTION_READY,
+                 'status_reason': 'The lock waited for was released.'},
+                synchronize_session=False)
+            if count == 0:
+                continue
+            woken.append(waiter.action_id)
+            if not waiter.shared:
+                break
+
+    return woken
+
+
+def lock_waiter_get_stale(timeout):
+    """Get the locks of the actions queued for more than a timeout.
+
+    :param timeout: Number of seconds.
+    :returns: A list of lock IDs.
+    """
+    cutoff = timeutils.utcnow(True) - datetime.timedelta(seconds=timeout)
+    with session_for_read() as session:
+        query = session.query(models.LockWaiter.lock_id).filter(
+            models.LockWaiter.updated_at < cutoff).distinct()
+        return [r[0] for r in query.all()]
+
+
 # Policies
 def policy_model_query():
     with session_for_read() as session:
@@ -634,6 +1026,11 @@ def policy_get_by_short_id(context, short_id, project_safe=True):
                              short_id, project_safe=project_safe)
 
 
+def policy_find(context, identity, project_safe=True):
+    return query_by_identity(context, policy_model_query, models.Policy,
+                             identity, project_safe=project_safe)
+
+
 def policy_get_all(context, limit=None, marker=None, sort=None, filters=None,
                    project_safe=True):
     query = policy_model_query()
@@ -642,11 +1039,8 @@ def policy_get_all(context, limit=None, marker=None, sort=None, filters=None,
     if filters:
         query = utils.exact_filter(query, models.Policy, filters)
 
-    keys, dirs = utils.get_sort_params(sort, consts.POLICY_CREATED_AT)
-    if marker:
-        marker = policy_model_query().get(marker)
-    return sa_utils.paginate_query(query, models.Policy, limit, keys,
-                                   marker=marker, sort_dirs=dirs).all()
+    return paginate_query(query, models.Policy, limit=limit, marker=marker,
+                          sort=sort, default_sort_key=consts.POLICY_CREATED_AT)
 
 
 @retry_on_deadlock
@@ -877,19 +1271,28 @@ def profile_get_by_short_id(context, short_id, project_safe=True):
                              short_id, project_safe=project_safe)
 
 
-def profile_get_all(context, limit=None, marker=None, sort=None, filters=None,
-                    project_safe=True):
+def profile_find(context, identity, project_safe=True):
+    return query_by_identity(context, profile_model_query, models.Profile,
+                             identity, project_safe=project_safe)
+
+
+def _query_profile_get_all(context, filters=None, project_safe=True):
     query = profile_model_query()
     query = utils.filter_query_by_project(query, project_safe, context)
 
     if filters:
         query = utils.exact_filter(query, models.Profile, filters)
 
-    keys, dirs = utils.get_sort_params(sort, consts.PROFILE_CREATED_AT)
-    if marker:
-        marker = profile_model_query().get(marker)
-    return sa_utils.paginate_query(query, models.Profile, limit, keys,
-                                   marker=marker, sort_dirs=dirs).all()
+    return query
+
+
+def profile_get_all(context, limit=None, marker=None, sort=None, filters=None,
+                    project_safe=True):
+    query = _query_profile_get_all(context, filters=filters,
+                                   project_safe=project_safe)
+    return paginate_query(query, models.Profile, limit=limit, marker=marker,
+                          sort=sort,
+                          default_sort_key=consts.PROFILE_CREATED_AT)
 
 
 @retry_on_deadlock
@@ -990,6 +1393,16 @@ def event_create(context, values):
         return event
 
 
+@retry_on_deadlock
+def event_create_batch(context, values):
+    """Create event records with a multi-row insert.
+
+    :param values: A list of dicts containing the values of the events.
+    """
+    with session_for_write() as session:
+        session.bulk_insert_mappings(models.Event, values)
+
+
 @retry_on_deadlock
 def event_get(context, event_id, project_safe=True):
     event = event_model_query().get(event_id)
@@ -1001,16 +1414,18 @@ def event_get_by_short_id(context, short_id, project_safe=True):
                              short_id, project_safe=project_safe)
 
 
+def event_find(context, identity, project_safe=True):
+    return query_by_identity(context, event_model_query, models.Event,
+                             identity, project_safe=project_safe)
+
+
 def _event_filter_paginate_query(context, query, filters=None,
                                  limit=None, marker=None, sort=None):
     if filters:
         query = utils.exact_filter(query, models.Event, filters)
 
-    keys, dirs = utils.get_sort_params(sort, consts.EVENT_TIMESTAMP)
-    if marker:
-        marker = event_model_query().get(marker)
-    return sa_utils.paginate_query(query, models.Event, limit, keys,
-                                   marker=marker, sort_dirs=dirs).all()
+    return paginate_query(query, models.Event, limit=limit, marker=marker,
+                          sort=sort, default_sort_key=consts.EVENT_TIMESTAMP)
 
 
 def event_get_all(context, limit=None, marker=None, sort=None, filters=None,
@@ -1051,23 +1466,54 @@ def event_prune(context, cluster_id, project_safe=True):
         return query.delete(synchronize_session='fetch')
 
 
+def _purge_query(query, model, column, project, granularity, age,
+                 exclude=None):
+    if project is not None:
+        query = query.filter(model.project.in_(project))
+    if exclude:
+        query = query.filter(~model.project.in_(exclude))
+    if granularity is not None and age is not None:
+        if granularity == 'days':
+            age = age * 86400
+        elif granularity == 'hours':
+            age = age * 3600
+        elif granularity == 'minutes':
+            age = age * 60
+        time_line = timeutils.utcnow() - datetime.timedelta(seconds=age)
+        query = query.filter(column < time_line)
+    return query
+
+
 @retry_on_deadlock
-def event_purge(project, granularity='days', age=30):
+def event_purge(project, granularity='days', age=30, exclude=None,
+                limit=None):
+    """Delete the events older than a given age.
+
+    :param project: A list of projects whose events are deleted, or None
+                    for all projects.
+    :param granularity: Unit of the age, one of 'days', 'hours', 'minutes'
+                        or 'seconds'.
+    :param age: Age of the oldest events kept.
+    :param exclude: A list of projects whose events are kept.
+    :param limit: Number of events deleted, the oldest ones first. Events
+                  with the same timestamp as the last one are deleted too.
+                  All the matching events are deleted if None.
+    :returns: The number of events deleted.
+    """
     with session_for_write() as session:
-        query = session.query(models.Event).with_for_update()
-        if project is not None:
-            query = query.filter(models.Event.project.in_(project))
-        if granularity is not None and age is not None:
-            if granularity == 'days':
-                age = age * 86400
-            elif granularity == 'hours':
-                age = age * 3600
-            elif granularity == 'minutes':
-                age = age * 60
-            time_line = timeutils.utcnow() - datetime.timedelta(seconds=age)
-            query = query.filter(models.Event.timestamp < time_line)
+        query = _purge_query(session.query(models.Event), models.Event,
+                             models.Event.timestamp, project, granularity,
+                             age, exclude=exclude)
+        if limit is not None:
+            # Delete the oldest events up to the timestamp of the last one of
+            # the batch, a range of the timestamp index. Events sharing that
+            # timestamp may make the batch slightly larger than the limit.
+            boundary = query.with_entities(models.Event.timestamp).order_by(
+                models.Event.timestamp).offset(limit - 1).limit(1).scalar()
+            if boundary is not None:
+                query = query.filter(models.Event.timestamp <= boundary)
 
-        return query.delete(synchronize_session='fetch')
+        return query.delete(synchronize_session=False)
 
 
 # Actions
@@ -1089,6 +1535,29 @@ def action_create(context, values):
     return action_get(context, action.id)
 
 
+@retry_on_deadlock
+def action_create_batch(context, values, dependent, nodes=None):
+    """Create actions depended by another action in a single transaction.
+
+    :param values: A list of dicts containing the values of the actions.
+    :param dependent: ID of the action depending on the new actions.
+    :param nodes: An optional list of dicts containing the values of the
+                  nodes to be created together with the actions.
+    """
+    with session_for_write() as session:
+        if nodes:
+            session.bulk_insert_mappings(models.Node, nodes)
+        session.bulk_insert_mappings(models.Action, values)
+        deps = [{'depended': v['id'], 'dependent': dependent}
+                for v in values]
+        session.bulk_insert_mappings(models.ActionDependency, deps)
+
+        query = session.query(models.Action).filter_by(id=dependent)
+        query.update({'status': consts.ACTION_WAITING,
+                      'status_reason': 'Waiting for depended actions.'},
+                     synchronize_session=False)
+
+
 @retry_on_deadlock
 def action_update(context, action_id, values):
     with session_for_write() as session:
@@ -1100,6 +1569,21 @@ def action_update(context, action_id, values):
         action.save(session)
 
 
+@retry_on_deadlock
+def action_update_data(context, action_id, values=None, removed=None):
+    """Set or remove keys in the data of an action.
+
+    :param action_id: ID of the action to be updated.
+    :param values: A dictionary of keys to set in the action data.
+    :param removed: A list of keys to remove from the action data.
+    :raises ResourceNotFound: The specified action does not exist.
+    """
+    with session_for_write() as session:
+        if not update_json_keys(session, models.Action, action_id, 'data',
+                                values=values, removed=removed):
+            raise exception.ResourceNotFound(type='action', id=action_id)
+
+
 def action_get(context, action_id, project_safe=True, refresh=False):
     action = action_model_query().get(action_id)
     if action is None:
@@ -1136,6 +1620,11 @@ def action_get_by_short_id(context, short_id, project_safe=True):
                              short_id, project_safe=project_safe)
 
 
+def action_find(context, identity, project_safe=True):
+    return query_by_identity(context, action_model_query, models.Action,
+                             identity, project_safe=project_safe)
+
+
 def action_get_all_by_owner(context, owner_id):
     query = action_model_query().filter_by(owner=owner_id)
     return query.all()
@@ -1144,7 +1633,10 @@ def action_get_all_by_owner(context, owner_id):
 def action_get_all_active_by_target(context, target_id, project_safe=True):
     query = action_model_query()
     query = utils.filter_query_by_project(query, project_safe, context)
-    query = query.filter_by(target=target_id)
+    if isinstance(target_id, list):
+        query = query.filter(models.Action.target.in_(target_id))
+    else:
+        query = query.filter_by(target=target_id)
     query = query.filter(
         models.Action.status.in_(
             [consts.ACTION_READY,
@@ -1155,19 +1647,28 @@ def action_get_all_active_by_target(context, target_id, project_safe=True):
     return actions
 
 
-def action_get_all(context, filters=None, limit=None, marker=None, sort=None,
-                   project_safe=True):
-    query = action_model_query()
+def _query_action_get_all(context, filters=None, project_safe=True):
+    # Dependencies are not joined for every row, callers needing them load
+    # them for all the actions listed at once with dependency_get_all.
+    with session_for_read() as session:
+        query = session.query(models.Action).options(
+            noload(models.Action.dep_on),
+            noload(models.Action.dep_by)
+        )
     query = utils.filter_query_by_project(query, project_safe, context)
 
     if filters:
         query = utils.exact_filter(query, models.Action, filters)
 
-    keys, dirs = utils.get_sort_params(sort, consts.ACTION_CREATED_AT)
-    if marker:
-        marker = action_model_query().get(marker)
-    return sa_utils.paginate_query(query, models.Action, limit, keys,
-                                   marker=marker, sort_dirs=dirs).all()
+    return query
+
+
+def action_get_all(context, filters=None, limit=None, marker=None, sort=None,
+                   project_safe=True):
+    query = _query_action_get_all(context, filters=filters,
+                                  project_safe=project_safe)
+    return paginate_query(query, models.Action, limit=limit, marker=marker,
+                          sort=sort, default_sort_key=consts.ACTION_CREATED_AT)
 
 
 @retry_on_deadlock
@@ -1208,6 +1709,21 @@ def dependency_get_dependents(context, action_id):
     return [d.dependent for d in q.all()]
 
 
+def dependency_get_all(context, action_ids):
+    """Get the dependencies of a list of actions in one query.
+
+    :param action_ids: A list of action IDs.
+    :returns: The dependencies in which any of the actions is either the
+              depended or the dependent action.
+    """
+    if not action_ids:
+        return []
+    q = action_dependency_model_query().filter(sqlalchemy.or_(
+        models.ActionDependency.dependent.in_(action_ids),
+        models.ActionDependency.depended.in_(action_ids)))
+    return q.all()
+
+
 @retry_on_deadlock
 def dependency_add(context, depended, dependent):
     if isinstance(depended, list) and isinstance(dependent, list):
@@ -1260,8 +1776,11 @@ def action_mark_succeeded(context, action_id, timestamp):
 
         subquery = session.query(models.ActionDependency).filter_by(
             depended=action_id)
+        dependents = [d.dependent for d in subquery.all()]
         subquery.delete(synchronize_session='fetch')
 
+        return _dependents_cleared(session, dependents)
+
 
 @retry_on_deadlock
 def action_mark_ready(context, action_id, timestamp):
@@ -1277,63 +1796,97 @@ def action_mark_ready(context, action_id, timestamp):
         query.update(values, synchronize_session=False)
 
 
-@retry_on_deadlock
-def _mark_failed(action_id, timestamp, reason=None):
-    # mark myself as failed
-    with session_for_write() as session:
-        query = session.query(models.Action).filter_by(id=action_id)
-        values = {
-            'owner': None,
-            'status': consts.ACTION_FAILED,
-            'status_reason': (str(reason) if reason else
-                              'Action execution failed'),
-            'end_time': timestamp,
-        }
-        query.update(values, synchronize_session=False)
-        action = query.all()
+def _dependents_cleared(session, dependents):
+    """Filter out the dependents which are still waiting for others."""
+    if not dependents:
+        return []
 
-        query = session.query(models.ActionDependency)
-        query = query.filter_by(depended=action_id)
-        dependents = [d.dependent for d in query.all()]
-        query.delete(synchronize_session=False)
+    query = session.query(models.ActionDependency.dependent)
+    query = query.filter(models.ActionDependency.dependent.in_(dependents))
+    waiting = set(d.dependent for d in query.all())
+    return [d for d in dependents if d not in waiting]
 
-    if parent_status_update_needed(action):
-        for d in dependents:
-            _mark_failed(d, timestamp)
 
+def _mark_dependents(session, action_ids, status, reason, default_reason,
+                     timestamp):
+    """Mark actions and the dependents they propagate to with a status.
 
-@retry_on_deadlock
-def action_mark_failed(context, action_id, timestamp, reason=None):
-    _mark_failed(action_id, timestamp, reason)
+    The dependency graph is walked one level at a time to find all the
+    actions to be marked, which are then updated with a single UPDATE and
+    have their dependency rows removed with a single DELETE.
 
+    :param action_ids: A list of IDs of the actions.
+    :param reason: The status reason of the actions.
+    :param default_reason: The status reason of the dependents.
+    :returns: A list of IDs of the dependents to be woken up.
+    """
+    marked = list(action_ids)
+    propagated = []
+    candidates = []
+    frontier = list(action_ids)
+    while frontier:
+        query = session.query(models.Action.id, models.Action.inputs)
+        query = query.filter(models.Action.id.in_(frontier))
+        propagating = set(a.id for a in query.all()
+                          if parent_status_update_needed([a]))
 
-@retry_on_deadlock
-def _mark_cancelled(session, action_id, timestamp, reason=None):
-    query = session.query(models.Action).filter_by(id=action_id)
+        query = session.query(models.ActionDependency)
+        query = query.filter(models.ActionDependency.depended.in_(frontier))
+        frontier = []
+        for dep in query.all():
+            if dep.depended not in propagating:
+                candidates.append(dep.dependent)
+            elif dep.dependent not in marked:
+                marked.append(dep.dependent)
+                propagated.append(dep.dependent)
+                frontier.append(dep.dependent)
+
+    query = session.query(models.Action)
+    query = query.filter(models.Action.id.in_(marked))
     values = {
         'owner': None,
-        'status': consts.ACTION_CANCELLED,
-        'status_reason': (str(reason) if reason else
-                          'Action execution cancelled'),
+        'status': status,
+        'status_reason': sqlalchemy.case(
+            [(models.Action.id.in_(action_ids), reason)],
+            else_=default_reason),
         'end_time': timestamp,
     }
     query.update(values, synchronize_session=False)
-    action = query.all()
 
     query = session.query(models.ActionDependency)
-    query = query.filter_by(depended=action_id)
-    dependents = [d.dependent for d in query.all()]
+    query = query.filter(models.ActionDependency.depended.in_(marked))
     query.delete(synchronize_session=False)
 
-    if parent_status_update_needed(action):
-        for d in dependents:
-            _mark_cancelled(session, d, timestamp)
+    # dependents marked are woken up no matter whether they are still
+    # waiting for other actions
+    candidates = [c for c in candidates if c not in marked]
+    return propagated + _dependents_cleared(session, candidates)
+
+
+def _mark_failed(session, action_id, timestamp, reason=None):
+    default = 'Action execution failed'
+    return _mark_dependents(session, [action_id], consts.ACTION_FAILED,
+                            str(reason) if reason else default, default,
+                            timestamp)
+
+
+@retry_on_deadlock
+def action_mark_failed(context, action_id, timestamp, reason=None):
+    with session_for_write() as session:
+        return _mark_failed(session, action_id, timestamp, reason)
+
+
+def _mark_cancelled(session, action_id, timestamp, reason=None):
+    default = 'Action execution cancelled'
+    return _mark_dependents(session, [action_id], consts.ACTION_CANCELLED,
+                            str(reason) if reason else default, default,
+                            timestamp)
 
 
 @retry_on_deadlock
 def action_mark_cancelled(context, action_id, timestamp, reason=None):
     with session_for_write() as session:
-        _mark_cancelled(session, action_id, timestamp, reason)
+        return _mark_cancelled(session, action_id, timestamp, reason)
 
 
 @retry_on_deadlock
@@ -1387,6 +1940,77 @@ def action_acquire_first_ready(context, owner, timestamp):
         return action_acquire(context, action.id, owner, timestamp)
 
 
+def _skip_locked_supported(session):
+    """Check whether the backend supports SELECT ... FOR UPDATE SKIP LOCKED.
+
+    PostgreSQL (9.5+) and MySQL (8.0.1+) support it. SQLite has no row level
+    locking at all and older MySQL/MariaDB releases reject the clause.
+    """
+    dialect = session.get_bind().dialect
+    if dialect.name == 'postgresql':
+        return True
+    if dialect.name == 'mysql':
+        if getattr(dialect, '_is_mariadb', False):
+            return False
+        version = dialect.server_version_info or (0,)
+        return tuple(version) >= (8, 0, 1)
+    return False
+
+
+@retry_on_deadlock
+def action_acquire_ready_batch(context, owner, timestamp, limit, ids=None):
+    """Claim a batch of READY actions for a worker in one transaction.
+
+    Candidate rows are selected in creation order. Where the backend supports
+    it the selection is done with ``FOR UPDATE SKIP LOCKED`` so that engines
+    claiming concurrently do not block each other on the same rows. For other
+    backends (e.g. SQLite) the claim is emulated by a conditional UPDATE that
+    only takes rows which are still READY and unowned.
+
+    :param owner: ID of the worker claiming the actions.
+    :param timestamp: Start time to be recorded for the claimed actions.
+    :param limit: Maximum number of actions to claim.
+    :param ids: An optional list of IDs of the actions to claim. When
+                specified, only these actions are claimed instead of any
+                READY action.
+    :return: A list of claimed action DB objects, possibly empty.
+    """
+    if limit is not None and limit <= 0:
+        return []
+    if ids is not None and not ids:
+        return []
+
+    with session_for_write() as session:
+        query = session.query(models.Action.id).filter_by(
+            status=consts.ACTION_READY).filter_by(
+            owner=None).order_by(models.Action.created_at)
+        if ids is not None:
+            query = query.filter(models.Action.id.in_(ids))
+        if limit:
+            query = query.limit(limit)
+        if _skip_locked_supported(session):
+            query = query.with_for_update(skip_locked=True)
+
+        candidates = [a[0] for a in query.all()]
+        if not candidates:
+            return []
+
+        query = session.query(models.Action).filter(
+            models.Action.id.in_(candidates))
+        query = query.filter_by(status=consts.ACTION_READY, owner=None)
+        query.update({'owner': owner,
+                      'start_time': timestamp,
+                      'status': consts.ACTION_RUNNING,
+                      'status_reason': 'The action is being processed.'},
+                     synchronize_session=False)
+
+        query = session.query(models.Action).filter(
+            models.Action.id.in_(candidates))
+        query = query.filter_by(status=consts.ACTION_RUNNING, owner=owner)
+        actions = query.order_by(models.Action.created_at).all()
+        return actions
+
+
 @retry_on_deadlock
 def action_abandon(context, action_id, values=None):
     """Abandon an action for other workers to execute again.
@@ -1461,7 +2085,11 @@ def action_delete_by_target(context, target, action=None,
         return None
 
     with session_for_write() as session:
-        q = session.query(models.Action).filter_by(target=target)
+        q = session.query(models.Action)
+        if isinstance(target, list):
+            q = q.filter(models.Action.target.in_(target))
+        else:
+            q = q.filter_by(target=target)
         q = utils.filter_query_by_project(q, project_safe, context)
 
         if action:
@@ -1474,26 +2102,45 @@ def action_delete_by_target(context, target, action=None,
 
 
 @retry_on_deadlock
-def action_purge(project, granularity='days', age=30):
+def action_purge(project, granularity='days', age=30, exclude=None,
+                 limit=None, statuses=None):
+    """Delete the actions created before a given age.
+
+    :param project: A list of projects whose actions are deleted, or None
+                    for all projects.
+    :param granularity: Unit of the age, one of 'days', 'hours', 'minutes'
+                        or 'seconds'.
+    :param age: Age of the oldest actions kept.
+    :param exclude: A list of projects whose actions are kept.
+    :param limit: Maximum number of actions deleted, the oldest ones first.
+                  All the matching actions are deleted if None.
+    :param statuses: A list of statuses the deleted actions must be in, or
+                     None for any status.
+    :returns: The number of actions deleted.
+    """
     with session_for_write() as session:
-        query = session.query(models.Action).with_for_update()
-        if project is not None:
-            query = query.filter(models.Action.project.in_(project))
-        if granularity is not None and age is not None:
-            if granularity == 'days':
-                age = age * 86400
-            elif granularity == 'hours':
-                age = age * 3600
-            elif granularity == 'minutes':
-                age = age * 60
-            time_line = timeutils.utcnow() - datetime.timedelta(seconds=age)
-            query = query.filter(models.Action.created_at < time_line)
+        query = _purge_query(session.query(models.Action.id), models.Action,
+                             models.Action.created_at, project, granularity,
+                             age, exclude=exclude)
+        if statuses:
+            query = query.filter(models.Action.status.in_(statuses))
+        if limit is not None:
+            query = query.order_by(models.Action.created_at).limit(limit)
+        ids = [row.id for row in query]
+        if not ids:
+            return 0
 
-        # Get dependants to delete
-        for d in query.all():
-            q = session.query(models.ActionDependency).filter_by(depended=d.id)
-            q.delete(synchronize_session='fetch')
-        return query.delete(synchronize_session='fetch')
+        deleted = 0
+        for start in range(0, len(ids), DELETE_CHUNK_SIZE):
+            batch = ids[start:start + DELETE_CHUNK_SIZE]
+            q = session.query(models.ActionDependency).filter(
+                sqlalchemy.or_(models.ActionDependency.depended.in_(batch),
+                               models.ActionDependency.dependent.in_(batch)))
+            q.delete(synchronize_session=False)
+            q = session.query(models.Action).filter(
+                models.Action.id.in_(batch))
+            deleted += q.delete(synchronize_session=False)
+        return deleted
 
 
 # Receivers
@@ -1528,11 +2175,8 @@ def receiver_get_all(context, limit=None, marker=None, filters=None, sort=None,
     if filters:
         query = utils.exact_filter(query, models.Receiver, filters)
 
-    keys, dirs = utils.get_sort_params(sort, consts.RECEIVER_NAME)
-    if marker:
-        marker = receiver_model_query().get(marker)
-    return sa_utils.paginate_query(query, models.Receiver, limit, keys,
-                                   marker=marker, sort_dirs=dirs).all()
+    return paginate_query(query, models.Receiver, limit=limit, marker=marker,
+                          sort=sort, default_sort_key=consts.RECEIVER_NAME)
 
 
 def receiver_get_by_name(context, name, project_safe=True):
@@ -1545,6 +2189,11 @@ def receiver_get_by_short_id(context, short_id, project_safe=True):
                              short_id, project_safe=project_safe)
 
 
+def receiver_find(context, identity, project_safe=True):
+    return query_by_identity(context, receiver_model_query, models.Receiver,
+                             identity, project_safe=project_safe)
+
+
 @retry_on_deadlock
 def receiver_delete(context, receiver_id):
     with session_for_write() as session:
@@ -1610,6 +2259,17 @@ def service_get_all():
         return session.query(models.Service).all()
 
 
+def service_get_all_alive(binary):
+    """Get the enabled services of a binary which reported recently."""
+    with session_for_read() as session:
+        date_limit = service_expired_time()
+        svc = models.Service
+        return session.query(models.Service).filter(
+            and_(svc.binary == binary, svc.updated_at > date_limit,
+                 or_(svc.disabled.is_(None), svc.disabled.is_(False)))
+        ).all()
+
+
 def service_get_all_expired(binary):
     with session_for_read() as session:
         date_limit = service_expired_time()
@@ -1650,42 +2310,41 @@ def _mark_engine_failed(session, action_id, timestamp, reason=None):
 @retry_on_deadlock
 def dummy_gc(engine_id):
     with session_for_write() as session:
-        q_actions = session.query(models.Action).filter_by(owner=engine_id)
+        q_actions = session.query(models.Action.id).filter_by(owner=engine_id)
+        action_ids = [a.id for a in q_actions.all()]
+        if not action_ids:
+            return
+
         timestamp = time.time()
-        for action in q_actions.all():
-            _mark_engine_failed(session, action.id, timestamp,
+        for action_id in action_ids:
+            _mark_engine_failed(session, action_id, timestamp,
                                 reason='Engine failure')
-            # Release all node locks
-            query = (session.query(models.NodeLock).
-                     filter_by(action_id=action.id))
-            query.delete(synchronize_session=False)
-
-            # Release all cluster locks
-            for clock in session.query(models.ClusterLock).all():
-                res = _release_cluster_lock(session, clock, action.id, -1)
-                if not res:
-                    _release_cluster_lock(session, clock, action.id, 1)
+        _release_locks_by_actions(session, action_ids)
 
 
 @retry_on_deadlock
 def gc_by_engine(engine_id):
-    # Get all actions locked by an engine
-    with session_for_write() as session:
-        q_actions = session.query(models.Action).filter_by(owner=engine_id)
-        timestamp = time.time()
-        for a in q_actions.all():
-            # Release all node locks
-            query = session.query(models.NodeLock).filter_by(action_id=a.id)
-            query.delete(synchronize_session=False)
+    """Reclaim the actions and locks of a dead engine.
+
+    All the actions owned by the engine are marked failed together with
+    the dependents they propagate to, and all the cluster and node locks
+    they hold are released, in a single transaction.
 
-            # Release all cluster locks
-            for cl in session.query(models.ClusterLock).all():
-                res = _release_cluster_lock(session, cl, a.id, -1)
-                if not res:
-                    _release_cluster_lock(session, cl, a.id, 1)
+    :param engine_id: ID of the dead engine.
+    :returns: A tuple of the list of IDs of the dependents to be woken up
+              and the list of IDs of the clusters and nodes released.
+    """
+    with session_for_write() as session:
+        q_actions = session.query(models.Action.id).filter_by(owner=engine_id)
+        action_ids = [a.id for a in q_actions.all()]
+        if not action_ids:
+            return [], []
 
-            # mark action failed and release lock
-            _mark_failed(a.id, timestamp, reason="Engine failure")
+        released = _release_locks_by_actions(session, action_ids)
+        woken = _mark_dependents(session, action_ids, consts.ACTION_FAILED,
+                                 'Engine failure', 'Action execution failed',
+                                 time.time())
+        return woken, released
 
 
 # HealthRegistry
@@ -1771,6 +2430,68 @@ def db_version(engine):
     return migration.db_version(engine)
 
 
+def _hot_queries():
+    """Get the statements run on the hot paths of the engine."""
+    action = models.Action.__table__
+    node = models.Node.__table__
+    dependency = models.ActionDependency.__table__
+    event = models.Event.__table__
+    registry = models.HealthRegistry.__table__
+    some_id = '00000000-0000-0000-0000-000000000000'
+    active = [consts.ACTION_READY,
+              consts.ACTION_WAITING,
+              consts.ACTION_RUNNING,
+              consts.ACTION_WAITING_LIFECYCLE_COMPLETION]
+
+    return [
+        ('action_acquire_ready_batch',
+         sqlalchemy.select([action.c.id]).where(
+             and_(action.c.status == consts.ACTION_READY,
+                  action.c.owner.is_(None))
+         ).order_by(action.c.created_at).limit(100)),
+        ('action_get_all_active_by_target',
+         sqlalchemy.select([action.c.id]).where(
+             and_(action.c.target == some_id, action.c.status.in_(active)))),
+        ('node_get_all_by_cluster',
+         sqlalchemy.select([node.c.id]).where(
+             node.c.cluster_id == some_id)),
+        ('dependency_get_depended',
+         sqlalchemy.select([dependency.c.depended]).where(
+             dependency.c.dependent == some_id)),
+        ('dependency_get_dependents',
+         sqlalchemy.select([dependency.c.dependent]).where(
+             dependency.c.depended == some_id)),
+        ('event_get_all_by_cluster',
+         sqlalchemy.select([event.c.id]).where(
+             event.c.cluster_id == some_id
+         ).order_by(event.c.timestamp).limit(20)),
+        ('registry_get_by_engine',
+         sqlalchemy.select([registry.c.id]).where(
+             registry.c.engine_id == some_id)),
+    ]
+
+
+def db_explain(engine):
+    """Get the query plans of the queries on the hot paths.
+
+    :returns: A list of (name, statement, plan) tuples where plan is a list
+              of rows returned by the database for the statement.
+    """
+    if engine.dialect.name == 'sqlite':
+        prefix = 'EXPLAIN QUERY PLAN'
+    else:
+        prefix = 'EXPLAIN'
+
+    result = []
+    with engine.connect() as conn:
+        for name, stmt in _hot_queries():
+            sql = str(stmt.compile(dialect=engine.dialect,
+                                   compile_kwargs={'literal_binds': True}))
+            plan = conn.execute('%s %s' % (prefix, sql)).fetchall()
+            result.append((name, sql, [tuple(row) for row in plan]))
+    return result
+
+
 def parent_status_update_needed(action):
     """Return if the status of the parent action needs to be updated
 
@@ -0,0 +1,44 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from sqlalchemy import Index, MetaData, Table
+
+# Indexes on the default sort keys of list queries, followed by the ID that
+# breaks ties, so that each page is a range scan starting after the marker
+INDEXES = {
+    'action': [
+        ('ix_action_created_at_id', ['created_at', 'id']),
+    ],
+    'cluster': [
+        ('ix_cluster_init_at_id', ['init_at', 'id']),
+    ],
+    'event': [
+        ('ix_event_timestamp_id', ['timestamp', 'id']),
+    ],
+    'node': [
+        ('ix_node_init_at_id', ['init_at', 'id']),
+    ],
+    'profile': [
+        ('ix_profile_created_at_id', ['created_at', 'id']),
+    ],
+}
+
+
+def upgrade(migrate_engine):
+    meta = MetaData()
+    meta.bind = migrate_engine
+
+    for table_name, indexes in INDEXES.items():
+        table = Table(table_name, meta, autoload=True)
+        for name, columns in indexes:
+            index = Index(name, *[table.c[c] for c in columns])
+            index.create(migrate_engine)
@@ -0,0 +1,53 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+# Dict and List columns, stored as text before, use the native JSON type on
+# MySQL and PostgreSQL. SQLite keeps storing them as text.
+COLUMNS = {
+    'action': ['context', 'inputs', 'outputs', 'data'],
+    'cluster': ['meta_data', 'data', 'dependents', 'config'],
+    'cluster_lock': ['action_ids'],
+    'cluster_policy': ['data'],
+    'credential': ['cred', 'data'],
+    'event': ['meta_data'],
+    'health_registry': ['params'],
+    'node': ['meta_data', 'data', 'dependents'],
+    'policy': ['spec', 'data'],
+    'profile': ['context', 'spec', 'meta_data'],
+    'receiver': ['actor', 'params', 'channel'],
+}
+
+NOT_NULL = {
+    ('credential', 'cred'),
+}
+
+
+def upgrade(migrate_engine):
+    if migrate_engine.name not in ('mysql', 'postgresql'):
+        return
+
+    quote = migrate_engine.dialect.identifier_preparer.quote
+    for table, columns in COLUMNS.items():
+        # All the columns of a table are altered by one statement so that
+        # the table is rebuilt once
+        clauses = []
+        for column in columns:
+            if migrate_engine.name == 'mysql':
+                clause = 'MODIFY %s JSON' % quote(column)
+                if (table, column) in NOT_NULL:
+                    clause += ' NOT NULL'
+            else:
+                clause = 'ALTER COLUMN %(c)s TYPE JSONB USING %(c)s::jsonb' % {
+                    'c': quote(column)}
+            clauses.append(clause)
+        migrate_engine.execute('ALTER TABLE %s %s' % (quote(table),
+                                                      ', '.join(clauses)))
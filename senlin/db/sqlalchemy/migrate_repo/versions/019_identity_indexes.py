@@ -0,0 +1,39 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from sqlalchemy import Index, MetaData, Table
+
+# Tables of the objects found by ID, name or short ID. Names are looked up
+# within the project of the requester.
+TABLES = ['action', 'cluster', 'node', 'policy', 'profile', 'receiver']
+
+# Tables whose IDs are matched by prefix
+PREFIX_TABLES = TABLES + ['event']
+
+
+def upgrade(migrate_engine):
+    meta = MetaData()
+    meta.bind = migrate_engine
+
+    for table_name in TABLES:
+        table = Table(table_name, meta, autoload=True)
+        index = Index('ix_%s_project_name' % table_name,
+                      table.c.project, table.c.name)
+        index.create(migrate_engine)
+
+    # The primary key index of MySQL serves prefix matches already, that of
+    # PostgreSQL does not unless the database uses the C collation
+    if migrate_engine.name == 'postgresql':
+        for table_name in PREFIX_TABLES:
+            migrate_engine.execute(
+                'CREATE INDEX ix_%(t)s_id_pattern ON %(t)s '
+                '(id varchar_pattern_ops)' % {'t': table_name})
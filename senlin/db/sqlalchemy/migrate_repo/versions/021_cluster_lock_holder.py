@@ -0,0 +1,53 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from sqlalchemy import Column, Index, Integer, MetaData, String, Table
+
+from senlin.db.sqlalchemy import types
+
+
+def upgrade(migrate_engine):
+    meta = MetaData()
+    meta.bind = migrate_engine
+
+    # Declared rather than reflected to get the action IDs decoded
+    cluster_lock = Table(
+        'cluster_lock', meta,
+        Column('cluster_id', String(36), primary_key=True, nullable=False),
+        Column('action_ids', types.List),
+        Column('semaphore', Integer),
+    )
+
+    holder = Table(
+        'cluster_lock_holder', meta,
+        Column('cluster_id', String(36), primary_key=True, nullable=False),
+        Column('action_id', String(36), primary_key=True, nullable=False),
+        Index('ix_cluster_lock_holder_action_id', 'action_id'),
+        mysql_engine='InnoDB',
+        mysql_charset='utf8'
+    )
+    holder.create()
+
+    # Move the holders of node-scope locks out of the lock rows
+    rows = migrate_engine.execute(
+        cluster_lock.select().where(cluster_lock.c.semaphore > 0)).fetchall()
+    for row in rows:
+        action_ids = row.action_ids or []
+        if action_ids:
+            migrate_engine.execute(holder.insert(), [
+                {'cluster_id': row.cluster_id, 'action_id': a}
+                for a in set(action_ids)
+            ])
+        migrate_engine.execute(
+            cluster_lock.update().where(
+                cluster_lock.c.cluster_id == row.cluster_id).values(
+                action_ids=[], semaphore=0))
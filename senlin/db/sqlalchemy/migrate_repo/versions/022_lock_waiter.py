@@ -0,0 +1,34 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from sqlalchemy import Boolean, Column, Index, MetaData, String, Table
+
+from senlin.db.sqlalchemy import types
+
+
+def upgrade(migrate_engine):
+    meta = MetaData()
+    meta.bind = migrate_engine
+
+    lock_waiter = Table(
+        'lock_waiter', meta,
+        Column('lock_id', String(36), primary_key=True, nullable=False),
+        Column('action_id', String(36), primary_key=True, nullable=False),
+        Column('shared', Boolean),
+        Column('created_at', types.TZAwareDateTime),
+        Column('updated_at', types.TZAwareDateTime),
+        Index('ix_lock_waiter_lock_id_created_at', 'lock_id', 'created_at'),
+        Index('ix_lock_waiter_updated_at', 'updated_at'),
+        mysql_engine='InnoDB',
+        mysql_charset='utf8'
+    )
+    lock_waiter.create()
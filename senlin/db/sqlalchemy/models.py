@@ -16,7 +16,7 @@ SQLAlchemy models for Senlin data.
 
 from oslo_db.sqlalchemy import models
 from oslo_utils import uuidutils
-from sqlalchemy import Boolean, Column, Numeric, ForeignKey, Integer
+from sqlalchemy import Boolean, Column, Numeric, ForeignKey, Index, Integer
 from sqlalchemy import String, Text
 from sqlalchemy.ext import declarative
 from sqlalchemy.orm import backref
@@ -35,7 +35,11 @@ class TimestampMixin(object):
 
 class Profile(BASE, TimestampMixin, models.ModelBase):
     """Profile objects."""
-    __table_args__ = {'mysql_engine': 'InnoDB'}
+    __table_args__ = (
+        Index('ix_profile_created_at_id', 'created_at', 'id'),
+        Index('ix_profile_project_name', 'project', 'name'),
+        {'mysql_engine': 'InnoDB'}
+    )
     __tablename__ = 'profile'
 
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
@@ -52,7 +56,10 @@ class Profile(BASE, TimestampMixin, models.ModelBase):
 
 class Policy(BASE, TimestampMixin, models.ModelBase):
     """Policy objects."""
-    __table_args__ = {'mysql_engine': 'InnoDB'}
+    __table_args__ = (
+        Index('ix_policy_project_name', 'project', 'name'),
+        {'mysql_engine': 'InnoDB'}
+    )
     __tablename__ = 'policy'
 
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
@@ -69,7 +76,11 @@ class Policy(BASE, TimestampMixin, models.ModelBase):
 
 class Cluster(BASE, TimestampMixin, models.ModelBase):
     """Cluster objects."""
-    __table_args__ = {'mysql_engine': 'InnoDB'}
+    __table_args__ = (
+        Index('ix_cluster_init_at_id', 'init_at', 'id'),
+        Index('ix_cluster_project_name', 'project', 'name'),
+        {'mysql_engine': 'InnoDB'}
+    )
     __tablename__ = 'cluster'
 
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
@@ -101,7 +112,12 @@ class Cluster(BASE, TimestampMixin, models.ModelBase):
 class Node(BASE, TimestampMixin, models.ModelBase):
     """Node objects."""
 
-    __table_args__ = {'mysql_engine': 'InnoDB'}
+    __table_args__ = (
+        Index('ix_node_cluster_id', 'cluster_id'),
+        Index('ix_node_init_at_id', 'init_at', 'id'),
+        Index('ix_node_project_name', 'project', 'name'),
+        {'mysql_engine': 'InnoDB'}
+    )
     __tablename__ = 'node'
 
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
@@ -130,7 +146,12 @@ class Node(BASE, TimestampMixin, models.ModelBase):
 
 
 class ClusterLock(BASE, models.ModelBase):
-    """Cluster locks for actions."""
+    """Cluster locks for actions.
+
+    A semaphore of -1 marks the cluster as locked by the single action in
+    ``action_ids``. Otherwise the actions holding node-scope locks on the
+    cluster are recorded in the ``cluster_lock_holder`` table.
+    """
     __table_args__ = {'mysql_engine': 'InnoDB'}
     __tablename__ = 'cluster_lock'
 
@@ -139,6 +160,18 @@ class ClusterLock(BASE, models.ModelBase):
     semaphore = Column(Integer)
 
 
+class ClusterLockHolder(BASE, models.ModelBase):
+    """Actions holding node-scope locks on clusters."""
+    __table_args__ = (
+        Index('ix_cluster_lock_holder_action_id', 'action_id'),
+        {'mysql_engine': 'InnoDB'}
+    )
+    __tablename__ = 'cluster_lock_holder'
+
+    cluster_id = Column(String(36), primary_key=True, nullable=False)
+    action_id = Column(String(36), primary_key=True, nullable=False)
+
+
 class NodeLock(BASE, models.ModelBase):
     """Node locks for actions."""
     __table_args__ = {'mysql_engine': 'InnoDB'}
@@ -148,6 +181,28 @@ class NodeLock(BASE, models.ModelBase):
     action_id = Column(String(36))
 
 
+class LockWaiter(BASE, models.ModelBase):
+    """Actions waiting for cluster or node locks to be released.
+
+    Waiters of a lock are woken up in the order the actions were created.
+    A shared waiter waits for a node-scope lock on a cluster.
+    """
+    __table_args__ = (
+        Index('ix_lock_waiter_lock_id_created_at', 'lock_id', 'created_at'),
+        Index('ix_lock_waiter_updated_at', 'updated_at'),
+        {'mysql_engine': 'InnoDB'}
+    )
+    __tablename__ = 'lock_waiter'
+
+    lock_id = Column(String(36), primary_key=True, nullable=False)
+    action_id = Column(String(36), primary_key=True, nullable=False)
+    shared = Column(Boolean)
+    # Creation time of the action
+    created_at = Column(types.TZAwareDateTime)
+    # Last time the action was queued
+    updated_at = Column(types.TZAwareDateTime)
+
+
 class ClusterPolicies(BASE, models.ModelBase):
     """Association between clusters and policies."""
     __table_args__ = {'mysql_engine': 'InnoDB'}
@@ -167,7 +222,10 @@ class ClusterPolicies(BASE, models.ModelBase):
 class HealthRegistry(BASE, models.ModelBase):
     """Clusters registered for health management."""
 
-    __table_args__ = {'mysql_engine': 'InnoDB'}
+    __table_args__ = (
+        Index('ix_health_registry_engine_id', 'engine_id'),
+        {'mysql_engine': 'InnoDB'}
+    )
     __tablename__ = 'health_registry'
 
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
@@ -181,7 +239,10 @@ class HealthRegistry(BASE, models.ModelBase):
 
 class Receiver(BASE, TimestampMixin, models.ModelBase):
     """Receiver objects associated with clusters."""
-    __table_args__ = {'mysql_engine': 'InnoDB'}
+    __table_args__ = (
+        Index('ix_receiver_project_name', 'project', 'name'),
+        {'mysql_engine': 'InnoDB'}
+    )
     __tablename__ = 'receiver'
 
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
@@ -211,7 +272,11 @@ class Credential(BASE, models.ModelBase):
 
 class ActionDependency(BASE, models.ModelBase):
     """Action dependencies."""
-    __table_args__ = {'mysql_engine': 'InnoDB'}
+    __table_args__ = (
+        Index('ix_dependency_depended', 'depended'),
+        Index('ix_dependency_dependent', 'dependent'),
+        {'mysql_engine': 'InnoDB'}
+    )
     __tablename__ = 'dependency'
 
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
@@ -223,7 +288,13 @@ class ActionDependency(BASE, models.ModelBase):
 
 class Action(BASE, TimestampMixin, models.ModelBase):
     """Action objects."""
-    __table_args__ = {'mysql_engine': 'InnoDB'}
+    __table_args__ = (
+        Index('ix_action_status_owner', 'status', 'owner'),
+        Index('ix_action_target_status', 'target', 'status'),
+        Index('ix_action_created_at_id', 'created_at', 'id'),
+        Index('ix_action_project_name', 'project', 'name'),
+        {'mysql_engine': 'InnoDB'}
+    )
     __tablename__ = 'action'
 
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
@@ -258,7 +329,11 @@ class Action(BASE, TimestampMixin, models.ModelBase):
 
 class Event(BASE, models.ModelBase):
     """Events generated by the Senin engine."""
-    __table_args__ = {'mysql_engine': 'InnoDB'}
+    __table_args__ = (
+        Index('ix_event_cluster_id_timestamp', 'cluster_id', 'timestamp'),
+        Index('ix_event_timestamp_id', 'timestamp', 'id'),
+        {'mysql_engine': 'InnoDB'}
+    )
     __tablename__ = 'event'
 
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
@@ -294,3 +369,5 @@ class Service(BASE, TimestampMixin, models.ModelBase):
     topic = Column(String(255))
     disabled = Column(Boolean, default=False)
     disabled_reason = Column(String(255))
+    # Number of actions running on the service when it last reported
+    load = Column(Integer, default=0)
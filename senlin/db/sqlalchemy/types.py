@@ -10,14 +10,66 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import json
+
 from oslo_serialization import jsonutils
 from oslo_utils import timeutils
 import pytz
 
 from sqlalchemy.dialects import mysql
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext import mutable
 from sqlalchemy import types
 
+# Backends storing Dict and List columns with their native JSON type
+NATIVE_JSON_DIALECTS = ('mysql', 'postgresql')
+
+
+def dumps(value):
+    """Serialize a value to compact JSON.
+
+    Values of types unknown to the json module, such as datetimes, are
+    converted the same way as by jsonutils.
+    """
+    return json.dumps(value, separators=(',', ':'),
+                      default=jsonutils.to_primitive)
+
+
+def loads(value):
+    return json.loads(value)
+
+
+def native_json(dialect):
+    """Check if Dict and List columns use a native JSON type on a backend."""
+    return dialect.name in NATIVE_JSON_DIALECTS
+
+
+class _JSONType(types.TypeDecorator):
+    """A JSON document stored as native JSON or as text.
+
+    MySQL and PostgreSQL store the document in their native JSON type, which
+    serializes it with the json_serializer of the engine. Other backends
+    store it as text.
+    """
+    impl = types.Text
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'mysql':
+            return dialect.type_descriptor(mysql.JSON())
+        if dialect.name == 'postgresql':
+            return dialect.type_descriptor(postgresql.JSONB())
+        return self.impl
+
+    def process_bind_param(self, value, dialect):
+        if native_json(dialect):
+            return value
+        return dumps(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None or native_json(dialect):
+            return value
+        return loads(value)
+
 
 class MutableList(mutable.Mutable, list):
     @classmethod
@@ -74,40 +126,12 @@ class MutableList(mutable.Mutable, list):
         self.changed()
 
 
-class Dict(types.TypeDecorator):
-    impl = types.Text
-
-    def load_dialect_impl(self, dialect):
-        if dialect.name == 'mysql':
-            return dialect.type_descriptor(mysql.LONGTEXT())
-        else:
-            return self.impl
-
-    def process_bind_param(self, value, dialect):
-        return jsonutils.dumps(value)
-
-    def process_result_value(self, value, dialect):
-        if value is None:
-            return None
-        return jsonutils.loads(value)
+class Dict(_JSONType):
+    pass
 
 
-class List(types.TypeDecorator):
-    impl = types.Text
-
-    def load_dialect_impl(self, dialect):
-        if dialect.name == 'mysql':
-            return dialect.type_descriptor(mysql.LONGTEXT())
-        else:
-            return self.impl
-
-    def process_bind_param(self, value, dialect):
-        return jsonutils.dumps(value)
-
-    def process_result_value(self, value, dialect):
-        if value is None:
-            return None
-        return jsonutils.loads(value)
+class List(_JSONType):
+    pass
 
 
 class TZAwareDateTime(types.TypeDecorator):
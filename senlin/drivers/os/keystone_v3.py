@@ -25,7 +25,7 @@ class KeystoneClient(base.DriverBase):
 
     def __init__(self, params):
         super(KeystoneClient, self).__init__(params)
-        self.conn = sdk.create_connection(params)
+        self.conn = sdk.get_connection(params)
         self.session = self.conn.session
 
     @sdk.translate_exception
@@ -96,6 +96,17 @@ class KeystoneClient(base.DriverBase):
         access_info = sdk.authenticate(**creds)
         return access_info['token']
 
+    @classmethod
+    @sdk.translate_exception
+    def get_token_info(cls, **creds):
+        """Get token and its expiry time using given credential"""
+
+        access_info = sdk.authenticate(**creds)
+        return {
+            'token': access_info['token'],
+            'expires_at': access_info['expires_at'],
+        }
+
     @classmethod
     @sdk.translate_exception
     def get_user_id(cls, **creds):
@@ -21,7 +21,7 @@ class MistralClient(base.DriverBase):
 
     def __init__(self, params):
         super(MistralClient, self).__init__(params)
-        self.conn = sdk.create_connection(params)
+        self.conn = sdk.get_connection(params)
         self.session = self.conn.session
 
     @sdk.translate_exception
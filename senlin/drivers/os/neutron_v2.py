@@ -21,7 +21,7 @@ class NeutronClient(base.DriverBase):
 
     def __init__(self, params):
         super(NeutronClient, self).__init__(params)
-        self.conn = sdk.create_connection(params)
+        self.conn = sdk.get_connection(params)
 
     @sdk.translate_exception
     def network_get(self, name_or_id, ignore_missing=False):
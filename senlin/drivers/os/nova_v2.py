@@ -26,7 +26,7 @@ class NovaClient(base.DriverBase):
 
     def __init__(self, params):
         super(NovaClient, self).__init__(params)
-        self.conn = sdk.create_connection(params)
+        self.conn = sdk.get_connection(params)
         self.session = self.conn.session
 
     @sdk.translate_exception
@@ -54,6 +54,10 @@ class NovaClient(base.DriverBase):
     def server_get(self, server):
         return self.conn.compute.get_server(server)
 
+    @sdk.translate_exception
+    def server_list(self, **query):
+        return [s for s in self.conn.compute.servers(details=True, **query)]
+
     @sdk.translate_exception
     def server_update(self, server, **attrs):
         return self.conn.compute.update_server(server, **attrs)
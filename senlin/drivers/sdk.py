@@ -13,7 +13,10 @@
 """
 SDK Client
 """
+import collections
 import sys
+import threading
+import time
 
 import functools
 import openstack
@@ -136,6 +139,129 @@ def create_connection(params=None):
     return conn
 
 
+class ConnectionPool(object):
+    """A process-wide pool of SDK connections.
+
+    Connections are keyed by the parameters they are created with, i.e. by
+    the trust, the region and the identity endpoint. A pooled connection
+    keeps its keystone session, so the token it holds is reused until it is
+    about to expire, when keystoneauth fetches a new one. Connections idle
+    for longer than ``idle_timeout`` seconds are dropped, and so are the
+    least recently used ones when there are more than ``max_size`` of them.
+    New connections are created without holding the pool lock. When two
+    callers race to create a connection for the same parameters, the one
+    pooled first wins and the other one is closed.
+    """
+
+    def __init__(self, max_size, idle_timeout):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._conns = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(params):
+        return jsonutils.dumps(params, sort_keys=True, default=str)
+
+    def _evict_idle(self, now):
+        while self._conns:
+            key, (conn, last_used) = next(iter(self._conns.items()))
+            if now - last_used <= self.idle_timeout:
+                break
+            del self._conns[key]
+            self.evictions += 1
+
+    def get(self, params):
+        """Get a pooled connection or create one.
+
+        :param params: A dict containing the connection parameters.
+        :returns: An ``openstack.connection.Connection`` object.
+        """
+        if (self.max_size <= 0 or not isinstance(params, dict) or
+                'token' in params):
+            # Connections using a user token end with that token
+            return create_connection(params)
+
+        key = self._key(params)
+        with self._lock:
+            now = time.time()
+            self._evict_idle(now)
+            entry = self._conns.pop(key, None)
+            if entry is not None:
+                self.hits += 1
+                self._conns[key] = (entry[0], now)
+                return entry[0]
+            self.misses += 1
+
+        # Creating a connection authenticates with keystone, don't block
+        # the other callers meanwhile
+        conn = create_connection(params)
+
+        with self._lock:
+            now = time.time()
+            entry = self._conns.pop(key, None)
+            if entry is not None:
+                # Another caller created a connection for the same key first
+                duplicate, conn = conn, entry[0]
+            else:
+                duplicate = None
+            self._conns[key] = (conn, now)
+            while len(self._conns) > self.max_size:
+                self._conns.popitem(last=False)
+                self.evictions += 1
+
+        if duplicate is not None:
+            try:
+                duplicate.close()
+            except Exception as ex:
+                LOG.debug('Failed in closing a duplicate connection: %s', ex)
+        return conn
+
+    def clear(self):
+        with self._lock:
+            self._conns.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._conns),
+                'capacity': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+_POOL = None
+
+
+def _get_pool():
+    global _POOL
+    if _POOL is None:
+        _POOL = ConnectionPool(cfg.CONF.authentication.connection_pool_size,
+                               cfg.CONF.authentication.connection_idle_timeout)
+    return _POOL
+
+
+def get_connection(params):
+    """Get a connection from the process-wide connection pool."""
+    return _get_pool().get(params)
+
+
+def reset_connection_pool():
+    """Drop all pooled connections of this process."""
+    global _POOL
+    _POOL = None
+
+
+def connection_pool_stats():
+    """Return the size and hit/miss counters of the connection pool."""
+    return _get_pool().stats()
+
+
 def authenticate(**kwargs):
     """Authenticate using openstack sdk based on user credential"""
 
@@ -143,7 +269,8 @@ def authenticate(**kwargs):
     access_info = {
         'token': conn.session.get_token(),
         'user_id': conn.session.get_user_id(),
-        'project_id': conn.session.get_project_id()
+        'project_id': conn.session.get_project_id(),
+        'expires_at': conn.session.auth.get_access(conn.session).expires,
     }
 
     return access_info
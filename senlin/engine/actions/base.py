@@ -16,6 +16,7 @@ import time
 from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_utils import timeutils
+from oslo_utils import uuidutils
 
 from senlin.common import consts
 from senlin.common import context as req_context
@@ -23,6 +24,7 @@ from senlin.common import exception
 from senlin.common import utils
 from senlin.engine import dispatcher
 from senlin.engine import event as EVENT
+from senlin.engine import senlin_lock
 from senlin.objects import action as ao
 from senlin.objects import cluster_lock as cl
 from senlin.objects import cluster_policy as cpo
@@ -139,6 +141,10 @@ class Action(object):
 
         self.data = kwargs.get('data', {})
 
+        # The lock the action failed to acquire when its execution returns
+        # RES_RETRY, as a tuple (lock_id, shared)
+        self.waiting_lock = None
+
     def store(self, ctx):
         """Store the action record into database table.
 
@@ -256,6 +262,74 @@ class Action(object):
             cls._check_action_lock(target, action)
             cls._check_conflicting_actions(ctx, target, action)
 
+        c = cls._action_context(ctx)
+
+        if action in consts.CLUSTER_SCALE_ACTIONS:
+            Action.validate_scaling_action(c, target, action)
+
+        obj = cls(target, action, c, **kwargs)
+        return obj.store(ctx)
+
+    @classmethod
+    def create_batch(cls, ctx, dependent, children, nodes=None, force=True):
+        """Create child actions of an action in a single transaction.
+
+        The child actions are created in READY status unless a ``status``
+        is given in their keyword arguments, with the dependent action
+        depending on all of them. By default no lock or conflict checking
+        is done, so the targets are expected to be owned by the dependent
+        action, e.g. nodes being created by it.
+
+        :param ctx: The requesting context.
+        :param dependent: ID of the action depending on the children.
+        :param children: A list of (target, action, kwargs) tuples, where
+                         kwargs are the keyword arguments for the action.
+        :param nodes: An optional list of node values to be created in the
+                      same transaction.
+        :param force: Skip checking locks/conflicts. If False, the targets
+                      of all the children are checked before any action is
+                      created.
+        :return: A list of IDs of the actions created.
+        """
+        if not force:
+            cls._check_batch(ctx, children)
+
+        c = cls._action_context(ctx)
+        timestamp = timeutils.utcnow(True)
+        values = []
+        for target, action, kwargs in children:
+            values.append({
+                'id': uuidutils.generate_uuid(),
+                'name': kwargs.get('name', ''),
+                'cluster_id': kwargs.get('cluster_id', ''),
+                'context': c.to_dict(),
+                'target': target,
+                'action': action,
+                'cause': kwargs.get('cause', ''),
+                'owner': kwargs.get('owner', None),
+                'interval': -1,
+                'start_time': None,
+                'end_time': None,
+                'timeout': kwargs.get('timeout',
+                                      cfg.CONF.default_action_timeout),
+                'status': kwargs.get('status', cls.READY),
+                'status_reason': '',
+                'inputs': kwargs.get('inputs', {}),
+                'outputs': {},
+                'data': {},
+                'created_at': timestamp,
+                'updated_at': None,
+                'user': c.user_id,
+                'project': c.project_id,
+                'domain': c.domain_id,
+            })
+
+        ao.Action.create_batch(ctx, values, dependent, nodes=nodes)
+        return [v['id'] for v in values]
+
+    @staticmethod
+    def _action_context(ctx):
+        """Build the context persisted with an action."""
         params = {
             'user_id': ctx.user_id,
             'project_id': ctx.project_id,
@@ -264,13 +338,7 @@ class Action(object):
             'request_id': ctx.request_id,
             'trusts': ctx.trusts,
         }
-        c = req_context.RequestContext.from_dict(params)
-
-        if action in consts.CLUSTER_SCALE_ACTIONS:
-            Action.validate_scaling_action(c, target, action)
-
-        obj = cls(target, action, c, **kwargs)
-        return obj.store(ctx)
+        return req_context.RequestContext.from_dict(params)
 
     @staticmethod
     def _check_action_lock(target, action):
@@ -296,6 +364,37 @@ class Action(object):
             raise exception.ActionConflict(
                 type=action, target=target, actions=",".join(action_ids))
 
+    @classmethod
+    def _check_batch(cls, ctx, children):
+        """Check the locks and conflicting actions of child actions.
+
+        Node locks and active actions are queried for all the targets at
+        once instead of once per target.
+        """
+        node_targets = [t for t, a, kw in children
+                        if a in list(consts.NODE_ACTION_NAMES) and
+                        a not in consts.LOCK_BYPASS_ACTIONS]
+        locked = set(nl.NodeLock.get_locked(node_targets))
+
+        active = {}
+        targets = list(set(t for t, a, kw in children))
+        for obj in ao.Action.get_all_active_by_target(ctx, targets):
+            active.setdefault(obj.target, []).append(obj.id)
+
+        for target, action, kwargs in children:
+            if action not in list(consts.NODE_ACTION_NAMES):
+                cls._check_action_lock(target, action)
+            elif (action not in consts.LOCK_BYPASS_ACTIONS and
+                  target in locked):
+                raise exception.ResourceIsLocked(
+                    action=action, type='node', id=target)
+
+            if (target in active and
+                    action not in consts.CONFLICT_BYPASS_ACTIONS):
+                raise exception.ActionConflict(
+                    type=action, target=target,
+                    actions=",".join(active[target]))
+
     @classmethod
     def delete(cls, ctx, action_id):
         """Delete an action from database.
@@ -352,6 +451,9 @@ class Action(object):
 
         if self.status in (self.WAITING_LIFECYCLE_COMPLETION, self.INIT):
             self.set_status(self.RES_CANCEL, 'Action execution cancelled')
+        elif self.status == self.WAITING:
+            # Let the action notice the signal without waiting for a poll
+            self._wake_actions([self.id])
 
         depended = dobj.Dependency.get_depended(self.context, self.id)
         if not depended:
@@ -420,45 +522,60 @@ class Action(object):
 
         if result == self.RES_OK:
             status = self.SUCCEEDED
-            ao.Action.mark_succeeded(self.context, self.id, timestamp)
+            woken = ao.Action.mark_succeeded(self.context, self.id, timestamp)
 
         elif result == self.RES_ERROR:
             status = self.FAILED
-            ao.Action.mark_failed(self.context, self.id, timestamp,
-                                  reason or 'ERROR')
+            woken = ao.Action.mark_failed(self.context, self.id, timestamp,
+                                          reason or 'ERROR')
 
         elif result == self.RES_TIMEOUT:
             status = self.FAILED
-            ao.Action.mark_failed(self.context, self.id, timestamp,
-                                  reason or 'TIMEOUT')
+            woken = ao.Action.mark_failed(self.context, self.id, timestamp,
+                                          reason or 'TIMEOUT')
 
         elif result == self.RES_CANCEL:
             status = self.CANCELLED
-            ao.Action.mark_cancelled(self.context, self.id, timestamp)
+            woken = ao.Action.mark_cancelled(self.context, self.id, timestamp)
 
         else:  # result == self.RES_RETRY:
+            woken = None
             retries = self.data.get('retries', 0)
             # Action failed at the moment, but can be retried
             # retries time is configurable
             if retries < cfg.CONF.lock_retry_times:
-                status = self.READY
                 retries += 1
-
                 self.data.update({'retries': retries})
-                ao.Action.abandon(self.context, self.id, {'data': self.data})
-                # sleep for a while
-                eventlet.sleep(cfg.CONF.lock_retry_interval)
-                dispatcher.start_action(self.id)
+
+                if self.waiting_lock:
+                    # Queue the action on the lock, it is dispatched again
+                    # when the lock is released
+                    status = self.WAITING
+                    lock_id, shared = self.waiting_lock
+                    senlin_lock.lock_wait(self.context, lock_id, self.id,
+                                          shared=shared,
+                                          values={'data': self.data})
+                else:
+                    status = self.READY
+                    ao.Action.abandon(self.context, self.id,
+                                      {'data': self.data})
+                    # sleep for a while
+                    eventlet.sleep(cfg.CONF.lock_retry_interval)
+                    dispatcher.start_action(self.id)
             else:
                 status = self.RES_ERROR
                 if not reason:
                     reason = ('Exceeded maximum number of retries (%d)'
                               '') % cfg.CONF.lock_retry_times
-                ao.Action.mark_failed(self.context, self.id, timestamp, reason)
+                woken = ao.Action.mark_failed(self.context, self.id,
+                                              timestamp, reason)
+
+        if woken:
+            self._wake_actions(woken, timestamp)
 
         if status == self.SUCCEEDED:
             EVENT.info(self, consts.PHASE_END, reason or 'SUCCEEDED')
-        elif status == self.READY:
+        elif status in (self.READY, self.WAITING):
             EVENT.warning(self, consts.PHASE_ERROR, reason or 'RETRY')
         else:
             EVENT.error(self, consts.PHASE_ERROR, reason or 'ERROR')
@@ -466,6 +583,14 @@ class Action(object):
         self.status = status
         self.status_reason = reason
 
+    def _wake_actions(self, action_ids, timestamp=None):
+        """Wake up actions waiting for their dependents.
+
+        :param action_ids: A list of IDs of the actions to wake up.
+        :param timestamp: The time when the dependent action completed.
+        """
+        dispatcher.wake_actions(self.context, action_ids, timestamp)
+
     def get_status(self):
         timestamp = wallclock()
         status = ao.Action.check_status(self.context, self.id, timestamp)
@@ -617,12 +742,14 @@ class Action(object):
             return None
 
     def to_dict(self):
+        dep_on = []
+        dep_by = []
         if self.id:
-            dep_on = dobj.Dependency.get_depended(self.context, self.id)
-            dep_by = dobj.Dependency.get_dependents(self.context, self.id)
-        else:
-            dep_on = []
-            dep_by = []
+            for dep in dobj.Dependency.get_all(self.context, [self.id]):
+                if dep.dependent == self.id:
+                    dep_on.append(dep.depended)
+                if dep.depended == self.id:
+                    dep_by.append(dep.dependent)
         action_dict = {
             'id': self.id,
             'name': self.name,
@@ -13,8 +13,10 @@
 import copy
 import eventlet
 
+from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_utils import timeutils
+from oslo_utils import uuidutils
 from osprofiler import profiler
 
 from senlin.common import consts
@@ -27,6 +29,7 @@ from senlin.engine import dispatcher
 from senlin.engine import node as node_mod
 from senlin.engine.notifications import message as msg
 from senlin.engine import senlin_lock
+from senlin.engine import waiter
 from senlin.objects import action as ao
 from senlin.objects import cluster as co
 from senlin.objects import cluster_policy as cp_obj
@@ -61,11 +64,33 @@ class ClusterAction(base.Action):
         if period:
             eventlet.sleep(period)
 
+    def _wait_for_wakeup(self, lifecycle_hook_timeout=None):
+        """Wait until a dependent action completes or the poll interval ends.
+
+        :returns: True if woken up by a dependent action, or False otherwise.
+        """
+        timeout = cfg.CONF.engine.dependent_wait_interval
+        if lifecycle_hook_timeout is not None and self.start_time:
+            remaining = (self.start_time + lifecycle_hook_timeout -
+                         base.wallclock())
+            timeout = max(min(timeout, remaining), 0)
+        return waiter.wait(self.id, timeout)
+
     def _wait_for_dependents(self, lifecycle_hook_timeout=None):
         """Wait for dependent actions to complete.
 
+        The action is woken up when a dependent action completes. Polling the
+        status is kept as a fallback in case a wake-up is lost.
+
         :returns: A tuple containing the result and the corresponding reason.
         """
+        waiter.register(self.id)
+        try:
+            return self._check_dependents(lifecycle_hook_timeout)
+        finally:
+            waiter.unregister(self.id)
+
+    def _check_dependents(self, lifecycle_hook_timeout=None):
         status = self.get_status()
         while status != self.READY:
             if status == self.FAILED:
@@ -108,11 +133,13 @@ class ClusterAction(base.Action):
                 LOG.debug(reason)
                 return self.RES_LIFECYCLE_HOOK_TIMEOUT, reason
 
-            # Continue waiting (with reschedule)
-            LOG.debug('Action %s sleep for 3 seconds ', self.id)
-            self._sleep(3)
+            # Continue waiting, reschedule only if no dependents woke us up
+            woken = self._wait_for_wakeup(lifecycle_hook_timeout)
             status = self.get_status()
-            dispatcher.start_action()
+            if not woken:
+                LOG.debug('Action %s not woken up, polling dependents',
+                          self.id)
+                dispatcher.start_action()
 
         return self.RES_OK, 'All dependents ended with success'
 
@@ -129,6 +156,29 @@ class ClusterAction(base.Action):
                 return False
         return True
 
+    def _start_children(self, stage, children, nodes=None, force=False):
+        """Create child actions in a single transaction and dispatch them.
+
+        :param stage: Name of the stage fanning out the children, used for
+                      reporting the time taken.
+        :param children: A list of (target, action, kwargs) tuples, where
+                         kwargs are the keyword arguments for the action.
+        :param nodes: An optional list of node values to be created in the
+                      same transaction.
+        :param force: Skip checking locks/conflicts of the targets.
+        :returns: A list of IDs of the child actions created.
+        """
+        watch = timeutils.StopWatch()
+        watch.start()
+        action_ids = base.Action.create_batch(self.context, self.id, children,
+                                              nodes=nodes, force=force)
+        dispatcher.start_action()
+        LOG.debug('Action %(action)s started %(num)s child action(s) for '
+                  '%(stage)s in %(time).3f seconds.',
+                  {'action': self.id, 'num': len(action_ids), 'stage': stage,
+                   'time': watch.elapsed()})
+        return action_ids
+
     def _create_nodes(self, count):
         """Utility method for node creation.
 
@@ -140,14 +190,23 @@ class ClusterAction(base.Action):
             return self.RES_OK, ''
 
         placement = self.data.get('placement', None)
+        name_format = self.entity.config.get("node.name.format", "")
+        profile = self.entity.rt.get('profile')
+
+        # Reserve a block of indexes for all the new nodes at once
+        first_index = co.Cluster.get_next_index(self.context, self.entity.id,
+                                                count)
+        init_at = timeutils.utcnow(True)
 
         nodes = []
-        child = []
+        children = []
         # conunt >= 1
         for m in range(count):
-            index = co.Cluster.get_next_index(self.context, self.entity.id)
+            index = first_index + m
             kwargs = {
+                'id': uuidutils.generate_uuid(),
                 'index': index,
+                'init_at': init_at,
                 'metadata': {},
                 'user': self.entity.user,
                 'project': self.entity.project,
@@ -157,13 +216,10 @@ class ClusterAction(base.Action):
                 # We assume placement is a list
                 kwargs['data'] = {'placement': placement['placements'][m]}
 
-            name_format = self.entity.config.get("node.name.format", "")
             name = utils.format_node_name(name_format, self.entity, index)
             node = node_mod.Node(name, self.entity.profile_id,
-                                 self.entity.id, context=self.context,
-                                 **kwargs)
-
-            node.store(self.context)
+                                 self.entity.id, **kwargs)
+            node.rt = {'profile': profile}
             nodes.append(node)
 
             kwargs = {
@@ -171,16 +227,12 @@ class ClusterAction(base.Action):
                 'cluster_id': self.entity.id,
                 'cause': consts.CAUSE_DERIVED,
             }
-            action_id = base.Action.create(self.context, node.id,
-                                           consts.NODE_CREATE, **kwargs)
-            child.append(action_id)
-
-        # Build dependency and make the new action ready
-        dobj.Dependency.create(self.context, [a for a in child], self.id)
-        for cid in child:
-            ao.Action.update(self.context, cid,
-                             {'status': base.Action.READY})
-        dispatcher.start_action()
+            children.append((node.id, consts.NODE_CREATE, kwargs))
+
+        # Create the nodes and the ready actions with their dependencies in
+        # a single transaction
+        values = [dict(n.db_values(), id=n.id) for n in nodes]
+        self._start_children('create', children, nodes=values, force=True)
 
         # Wait for cluster creation to complete
         res, reason = self._wait_for_dependents()
@@ -250,21 +302,10 @@ class ClusterAction(base.Action):
                     'inputs': self.entity.config,
                 }
                 kwargs['inputs']['new_profile_id'] = profile_id
-
-                action_id = base.Action.create(self.context, node,
-                                               consts.NODE_UPDATE, **kwargs)
-                child.append(action_id)
+                child.append((node, consts.NODE_UPDATE, kwargs))
 
             if child:
-                dobj.Dependency.create(self.context, [c for c in child],
-                                       self.id)
-                for cid in child:
-                    ao.Action.update(self.context, cid,
-                                     {'status': base.Action.READY})
-
-                dispatcher.start_action()
-                # clear the action list
-                child = []
+                self._start_children('update', child)
                 result, new_reason = self._wait_for_dependents()
                 if result != self.RES_OK:
                     self.entity.eval_status(self.context,
@@ -357,7 +398,8 @@ class ClusterAction(base.Action):
             # lifecycle_hook_target = lifecycle_hook_params.get('url')
             return self.RES_ERROR, ("Lifecycle hook type '%s' is not "
                                     "implemented") % lifecycle_hook_type
-        child = []
+        children = []
+        hooked = []
         for node_id in node_ids:
             kwargs = {
                 'name': 'node_delete_%s' % node_id[:8],
@@ -366,13 +408,29 @@ class ClusterAction(base.Action):
                 'inputs': inputs or {},
             }
 
-            action_id = base.Action.create(self.context, node_id, action_name,
-                                           **kwargs)
-            child.append((action_id, node_id))
+            # wait lifecycle complete if node exists and is active
+            node = no.Node.get(self.context, node_id)
+            if not node:
+                LOG.warning('Node %s is not found. '
+                            'Skipping wait for lifecycle completion.',
+                            node_id)
+            elif node.status != consts.NS_ACTIVE or not node.physical_id:
+                LOG.warning('Node %s is not in ACTIVE status. '
+                            'Skipping wait for lifecycle completion.',
+                            node_id)
+            else:
+                kwargs['status'] = base.Action.WAITING_LIFECYCLE_COMPLETION
+                # set owner for actions in waiting for lifecycle completion
+                # so that they will get cleaned up by dead engine gc
+                # if the engine dies
+                kwargs['owner'] = self.owner
+                hooked.append((len(children), node))
+
+            children.append((node_id, action_name, kwargs))
+
+        if children:
+            action_ids = self._start_children('delete', children)
 
-        if child:
-            dobj.Dependency.create(self.context, [aid for aid, nid in child],
-                                   self.id)
             # lifecycle_hook_type has to be "zaqar"
             # post message to zaqar
             kwargs = {
@@ -383,39 +441,14 @@ class ClusterAction(base.Action):
 
             notifier = msg.Message(lifecycle_hook_target, **kwargs)
 
-            child_copy = list(child)
-            for action_id, node_id in child_copy:
-                # wait lifecycle complete if node exists and is active
-                node = no.Node.get(self.context, node_id)
-                owner = None
-                if not node:
-                    LOG.warning('Node %s is not found. '
-                                'Skipping wait for lifecycle completion.',
-                                node_id)
-                    status = base.Action.READY
-                    child.remove((action_id, node_id))
-                elif node.status != consts.NS_ACTIVE or not node.physical_id:
-                    LOG.warning('Node %s is not in ACTIVE status. '
-                                'Skipping wait for lifecycle completion.',
-                                node_id)
-                    status = base.Action.READY
-                    child.remove((action_id, node_id))
-                else:
-                    status = base.Action.WAITING_LIFECYCLE_COMPLETION
-                    # set owner for actions in waiting for lifecycle completion
-                    # so that they will get cleaned up by dead engine gc
-                    # if the engine dies
-                    owner = self.owner
+            child = []
+            for index, node in hooked:
+                action_id = action_ids[index]
+                notifier.post_lifecycle_hook_message(
+                    action_id, node.id, node.physical_id,
+                    consts.LIFECYCLE_NODE_TERMINATION)
+                child.append((action_id, node.id))
 
-                ao.Action.update(self.context, action_id,
-                                 {'status': status,
-                                  'owner': owner})
-                if status == base.Action.WAITING_LIFECYCLE_COMPLETION:
-                    notifier.post_lifecycle_hook_message(
-                        action_id, node_id, node.physical_id,
-                        consts.LIFECYCLE_NODE_TERMINATION)
-
-            dispatcher.start_action()
             res, reason = self._wait_for_dependents(lifecycle_hook_timeout)
 
             if res == self.RES_LIFECYCLE_HOOK_TIMEOUT:
@@ -438,19 +471,10 @@ class ClusterAction(base.Action):
                 'cause': consts.CAUSE_DERIVED,
                 'inputs': inputs or {},
             }
-
-            action_id = base.Action.create(self.context, node_id, action_name,
-                                           **kwargs)
-            child.append((action_id, node_id))
+            child.append((node_id, action_name, kwargs))
 
         if child:
-            dobj.Dependency.create(self.context, [aid for aid, nid in child],
-                                   self.id)
-            for action_id, node_id in child:
-                ao.Action.update(self.context, action_id,
-                                 {'status': base.Action.READY})
-
-            dispatcher.start_action()
+            self._start_children('delete', child)
             res, reason = self._wait_for_dependents()
             return res, reason
 
@@ -601,16 +625,10 @@ class ClusterAction(base.Action):
                 'cause': consts.CAUSE_DERIVED,
                 'inputs': {'cluster_id': self.target},
             }
-            action_id = base.Action.create(self.context, nid, consts.NODE_JOIN,
-                                           **kwargs)
-            child.append(action_id)
+            child.append((nid, consts.NODE_JOIN, kwargs))
 
         if child:
-            dobj.Dependency.create(self.context, [c for c in child], self.id)
-            for cid in child:
-                ao.Action.update(self.context, cid,
-                                 {'status': base.Action.READY})
-            dispatcher.start_action()
+            self._start_children('add_nodes', child)
 
         # Wait for dependent action if any
         result, new_reason = self._wait_for_dependents()
@@ -751,37 +769,25 @@ class ClusterAction(base.Action):
 
         children = []
         for (original, replacement) in node_dict.items():
+            # node_leave action
             kwargs = {
+                'name': 'node_leave_%s' % original[:8],
                 'cluster_id': self.entity.id,
                 'cause': consts.CAUSE_DERIVED,
             }
+            children.append((original, consts.NODE_LEAVE, kwargs))
 
-            # node_leave action
-            kwargs['name'] = 'node_leave_%s' % original[:8]
-            leave_action_id = base.Action.create(self.context, original,
-                                                 consts.NODE_LEAVE, **kwargs)
             # node_join action
-            kwargs['name'] = 'node_join_%s' % replacement[:8]
-            kwargs['inputs'] = {'cluster_id': self.target}
-            join_action_id = base.Action.create(self.context, replacement,
-                                                consts.NODE_JOIN, **kwargs)
-
-            children.append((join_action_id, leave_action_id))
+            kwargs = {
+                'name': 'node_join_%s' % replacement[:8],
+                'cluster_id': self.entity.id,
+                'cause': consts.CAUSE_DERIVED,
+                'inputs': {'cluster_id': self.target},
+            }
+            children.append((replacement, consts.NODE_JOIN, kwargs))
 
         if children:
-            dobj.Dependency.create(self.context, [c[0] for c in children],
-                                   self.id)
-            for child in children:
-                join_id = child[0]
-                leave_id = child[1]
-                ao.Action.update(self.context, join_id,
-                                 {'status': base.Action.READY})
-
-                dobj.Dependency.create(self.context, [join_id], leave_id)
-                ao.Action.update(self.context, leave_id,
-                                 {'status': base.Action.READY})
-
-                dispatcher.start_action()
+            self._start_children('replace_nodes', children)
 
             result, new_reason = self._wait_for_dependents()
             if result != self.RES_OK:
@@ -805,30 +811,30 @@ class ClusterAction(base.Action):
         child = []
         res = self.RES_OK
         reason = 'Cluster checking completed.'
-        for node in self.entity.nodes:
-            node_id = node.id
-            need_delete = self.inputs.get('delete_check_action', False)
-            # delete some records of NODE_CHECK
-            if need_delete:
-                ao.Action.delete_by_target(
-                    self.context, node_id, action=[consts.NODE_CHECK],
-                    status=[consts.ACTION_SUCCEEDED, consts.ACTION_FAILED])
-
-            name = 'node_check_%s' % node_id[:8]
-            action_id = base.Action.create(
-                self.context, node_id, consts.NODE_CHECK, name=name,
-                cause=consts.CAUSE_DERIVED,
-                inputs=self.inputs
-            )
-
-            child.append(action_id)
+        node_ids = [node.id for node in self.entity.nodes]
+        need_delete = self.inputs.get('delete_check_action', False)
+        # delete some records of NODE_CHECK
+        if need_delete and node_ids:
+            ao.Action.delete_by_target(
+                self.context, node_ids, action=[consts.NODE_CHECK],
+                status=[consts.ACTION_SUCCEEDED, consts.ACTION_FAILED])
+
+        # Nodes of large clusters whose status can be told from a listing
+        # of the physical objects are updated in bulk, only the others get
+        # a NODE_CHECK.
+        nodes = self.entity.nodes
+        if len(nodes) >= cfg.CONF.engine.bulk_check_min_nodes:
+            nodes = node_mod.Node.check_batch(self.context, nodes)
+        for node in nodes:
+            kwargs = {
+                'name': 'node_check_%s' % node.id[:8],
+                'cause': consts.CAUSE_DERIVED,
+                'inputs': self.inputs,
+            }
+            child.append((node.id, consts.NODE_CHECK, kwargs))
 
         if child:
-            dobj.Dependency.create(self.context, [c for c in child], self.id)
-            for cid in child:
-                ao.Action.update(self.context, cid,
-                                 {'status': base.Action.READY})
-            dispatcher.start_action()
+            self._start_children('check', child)
 
             # Wait for dependent action if any
             res, new_reason = self._wait_for_dependents()
@@ -877,22 +883,17 @@ class ClusterAction(base.Action):
 
             if node.status == consts.NS_ACTIVE:
                 continue
-            action_id = base.Action.create(
-                self.context, node_id, consts.NODE_RECOVER,
-                name='node_recover_%s' % node_id[:8],
-                cause=consts.CAUSE_DERIVED, inputs=inputs,
-            )
-            children.append(action_id)
+            kwargs = {
+                'name': 'node_recover_%s' % node_id[:8],
+                'cause': consts.CAUSE_DERIVED,
+                'inputs': inputs,
+            }
+            children.append((node_id, consts.NODE_RECOVER, kwargs))
 
         res = self.RES_OK
         reason = 'Cluster recovery succeeded.'
         if children:
-            dobj.Dependency.create(self.context, [c for c in children],
-                                   self.id)
-            for cid in children:
-                ao.Action.update(self.context, cid,
-                                 {'status': consts.ACTION_READY})
-            dispatcher.start_action()
+            self._start_children('recover', children)
 
             # Wait for dependent action if any
             res, new_reason = self._wait_for_dependents()
@@ -1136,20 +1137,15 @@ class ClusterAction(base.Action):
         reason = "Cluster operation '%s' completed." % operation
         nodes = inputs.pop('nodes')
         for node_id in nodes:
-            action_id = base.Action.create(
-                self.context, node_id, consts.NODE_OPERATION,
-                name='node_%s_%s' % (operation, node_id[:8]),
-                cause=consts.CAUSE_DERIVED,
-                inputs=inputs,
-            )
-            child.append(action_id)
+            kwargs = {
+                'name': 'node_%s_%s' % (operation, node_id[:8]),
+                'cause': consts.CAUSE_DERIVED,
+                'inputs': inputs,
+            }
+            child.append((node_id, consts.NODE_OPERATION, kwargs))
 
         if child:
-            dobj.Dependency.create(self.context, [c for c in child], self.id)
-            for cid in child:
-                ao.Action.update(self.context, cid,
-                                 {'status': base.Action.READY})
-            dispatcher.start_action()
+            self._start_children('operation', child)
 
             # Wait for dependent action if any
             res, new_reason = self._wait_for_dependents()
@@ -1209,6 +1205,7 @@ class ClusterAction(base.Action):
                                                forced)
         # Failed to acquire lock, return RES_RETRY
         if not res:
+            self.waiting_lock = (self.target, False)
             return self.RES_RETRY, 'Failed in locking cluster.'
 
         try:
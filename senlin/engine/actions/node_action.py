@@ -245,6 +245,7 @@ class NodeAction(base.Action):
                     senlin_lock.NODE_SCOPE, False)
 
                 if not res:
+                    self.waiting_lock = (saved_cluster_id, True)
                     return self.RES_RETRY, 'Failed in locking cluster'
 
                 try:
@@ -264,6 +265,7 @@ class NodeAction(base.Action):
             res = senlin_lock.node_lock_acquire(self.context, self.entity.id,
                                                 self.id, self.owner, forced)
             if not res:
+                self.waiting_lock = (self.entity.id, False)
                 res = self.RES_RETRY
                 reason = 'Failed in locking node'
             else:
@@ -10,22 +10,80 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import time
+
 from oslo_config import cfg
 from oslo_context import context as oslo_context
 from oslo_log import log as logging
 import oslo_messaging
 
 from senlin.common import consts
+from senlin.common import context as senlin_context
 from senlin.common import messaging
+from senlin.engine import waiter
+from senlin.objects import action as ao
+from senlin.objects import service as service_obj
 
 LOG = logging.getLogger(__name__)
 
 OPERATIONS = (
-    START_ACTION, CANCEL_ACTION, STOP
+    START_ACTION, START_ACTIONS, CANCEL_ACTION, STOP, WAKE_ACTION,
 ) = (
-    'start_action', 'cancel_action', 'stop'
+    'start_action', 'start_actions', 'cancel_action', 'stop', 'wake_action',
 )
 
+# RPC client reused across notifications, along with the transport and host
+# it was built for
+_client = None
+
+# Load of the engines alive as last read from the service table, adjusted by
+# the actions dispatched since then
+_engines = {
+    'loads': {},
+    'expires': 0,
+}
+
+
+def _get_client():
+    global _client
+
+    key = (messaging.TRANSPORT, cfg.CONF.host)
+    if _client is None or _client[0] != key:
+        client = messaging.get_rpc_client(consts.ENGINE_TOPIC, cfg.CONF.host)
+        _client = (key, client)
+    return _client[1]
+
+
+def _select_engine():
+    """Select the least loaded engine among the engines alive.
+
+    The engines and their load are read from the service table at most once
+    per ``periodic_interval``, which is also how often engines report their
+    load. In between, each dispatched action is counted towards the load of
+    the engine it was sent to, so that actions are spread over engines.
+
+    :returns: ID of the selected engine or None if no engine is known alive.
+    """
+    now = time.monotonic()
+    if now >= _engines['expires']:
+        loads = {}
+        try:
+            ctx = senlin_context.get_admin_context()
+            for svc in service_obj.Service.get_all_alive(
+                    ctx, 'senlin-engine'):
+                loads[svc.id] = svc.load or 0
+        except Exception as ex:
+            LOG.error('Failed in getting engines alive: %s', ex)
+        _engines['loads'] = loads
+        _engines['expires'] = now + cfg.CONF.periodic_interval
+
+    loads = _engines['loads']
+    if not loads:
+        return None
+    engine_id = min(loads, key=loads.get)
+    loads[engine_id] += 1
+    return engine_id
+
 
 def notify(method, engine_id=None, **kwargs):
     """Send notification to dispatcher.
@@ -36,7 +94,7 @@ def notify(method, engine_id=None, **kwargs):
     :param method: remote method to call
     :param engine_id: dispatcher to notify; None implies broadcast
     """
-    client = messaging.get_rpc_client(consts.ENGINE_TOPIC, cfg.CONF.host)
+    client = _get_client()
 
     if engine_id:
         # Notify specific dispatcher identified by engine_id
@@ -57,3 +115,45 @@ def notify(method, engine_id=None, **kwargs):
 
 def start_action(engine_id=None, **kwargs):
     return notify(START_ACTION, engine_id, **kwargs)
+
+
+def start_actions(ids):
+    """Start the given READY actions on the least loaded engine.
+
+    The selected engine claims exactly these actions instead of scanning the
+    action table. If no engine is known alive, all engines are notified to
+    scan for READY actions instead. Actions sent to an engine which is gone
+    are left READY until an engine runs its periodic scan.
+
+    :param ids: A list of IDs of the actions to start.
+    """
+    engine_id = _select_engine()
+    if engine_id is None:
+        return start_action()
+    return notify(START_ACTIONS, engine_id, ids=list(ids))
+
+
+def wake_action(engine_id, **kwargs):
+    return notify(WAKE_ACTION, engine_id, **kwargs)
+
+
+def wake_actions(context, action_ids, timestamp=None):
+    """Wake up actions waiting for their dependents.
+
+    Actions waiting in this process are woken up directly, the others are
+    woken up through a cast to the engine owning them.
+
+    :param context: The context used for DB operations.
+    :param action_ids: A list of IDs of the actions to wake up.
+    :param timestamp: The time when the dependent action completed.
+    """
+    remote = [a for a in action_ids if not waiter.wake(a, timestamp)]
+    if not remote:
+        return
+
+    actions = ao.Action.get_all(context, filters={'id': remote},
+                                project_safe=False, with_deps=False)
+    for action in actions:
+        if action.owner:
+            wake_action(action.owner, action_id=action.id,
+                        timestamp=timestamp)
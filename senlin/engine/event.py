@@ -38,6 +38,38 @@ def load_dispatcher():
         LOG.info("Loaded dispatchers: %s", dispatchers.names())
 
 
+def _backends():
+    if dispatchers is None:
+        return []
+    return [(ext.name, ext.obj) for ext in dispatchers]
+
+
+def start_buffers():
+    """Start buffering the events of the loaded dispatchers."""
+    for name, backend in _backends():
+        backend.start_buffer()
+
+
+def stop_buffers():
+    """Write the buffered events and stop buffering."""
+    for name, backend in _backends():
+        try:
+            backend.stop_buffer()
+        except Exception as ex:
+            LOG.exception("Failed in stopping event buffer of dispatcher "
+                          "%(name)s: %(ex)s", {'name': name, 'ex': ex})
+
+
+def buffer_stats():
+    """Report the statistics of event buffers keyed by dispatcher name."""
+    stats = {}
+    for name, backend in _backends():
+        buf_stats = backend.buffer_stats()
+        if buf_stats is not None:
+            stats[name] = buf_stats
+    return stats
+
+
 def _event_data(action, phase=None, reason=None):
     action_name = action.action
     if action_name in [consts.NODE_OPERATION, consts.CLUSTER_OPERATION]:
@@ -24,7 +24,7 @@ from oslo_log import log as logging
 import oslo_messaging as messaging
 from oslo_utils import timeutils
 import re
-import tenacity
+import requests
 
 from senlin.common import consts
 from senlin.common import context
@@ -34,6 +34,7 @@ from senlin.engine import node as node_mod
 from senlin.engine.notifications import heat_endpoint
 from senlin.engine.notifications import nova_endpoint
 from senlin import objects
+from senlin.profiles import base as profile_base
 from senlin.rpc import client as rpc_client
 
 LOG = logging.getLogger(__name__)
@@ -124,6 +125,14 @@ class HealthCheckType(object):
         self.node_update_timeout = node_update_timeout
         self.params = params
 
+    def prepare(self, ctx, nodes):
+        """Prepare a health check pass over a list of nodes
+
+        Detection modes able to check many nodes at once override this, it
+        is called before run_health_check is called on each of the nodes.
+        """
+        pass
+
     def run_health_check(self, ctx, node):
         """Run health check on node
 
@@ -159,42 +168,47 @@ class HealthCheckType(object):
 
 
 class NodePollStatusHealthCheck(HealthCheckType):
-    def run_health_check(self, ctx, node):
-        """Routine to be executed for polling node status.
+    DETECTION_TYPE = consts.NODE_STATUS_POLLING
 
-        :returns: True if node is healthy. False otherwise.
-        """
-        try:
-            # create engine node from db node
-            entity = node_mod.Node._from_object(ctx, node)
+    def __init__(self, cluster_id, interval, node_update_timeout, params):
+        super(NodePollStatusHealthCheck, self).__init__(
+            cluster_id, interval, node_update_timeout, params)
+        self._results = {}
 
-            # If health check returns True, return True to mark node as
-            # healthy. Else return True to mark node as healthy if we are still
-            # within the node's grace period to allow the node to warm-up.
-            # Return False to mark the node as unhealthy if we are outside the
-            # grace period.
+    def prepare(self, ctx, nodes):
+        """Check the status of all nodes in bulk.
 
-            return (entity.do_healthcheck(ctx, consts.NODE_STATUS_POLLING) or
-                    self._node_within_grace_period(node))
+        The profile of the nodes polls the backend for all of them at once,
+        the results are used by the run_health_check calls that follow.
+        Clusters with fewer nodes than ``bulk_status_polling_min_nodes`` are
+        checked one node at a time.
+        """
+        self._results = {}
+        conf = cfg.CONF.health_manager
+        if (not conf.bulk_status_polling or
+                len(nodes) < conf.bulk_status_polling_min_nodes):
+            return
+
+        try:
+            self._results = profile_base.Profile.healthcheck_objects(
+                ctx, nodes, self.DETECTION_TYPE)
         except Exception as ex:
             LOG.warning(
-                'Error when performing health check on node %s: %s',
-                node.id, ex
+                'Error when performing bulk health check on cluster %s, '
+                'checking nodes one by one: %s', self.cluster_id, ex
             )
 
-            # treat node as healthy when an exception is encountered
-            return True
-
-
-class HypervisorPollStatusHealthCheck(HealthCheckType):
     def run_health_check(self, ctx, node):
-        """Routine to be executed for polling hypervisor status.
+        """Routine to be executed for polling node status.
 
         :returns: True if node is healthy. False otherwise.
         """
         try:
-            # create engine node from db node
-            entity = node_mod.Node._from_object(ctx, node)
+            healthy = self._results.pop(node.id, None)
+            if healthy is None:
+                # create engine node from db node
+                entity = node_mod.Node._from_object(ctx, node)
+                healthy = entity.do_healthcheck(ctx, self.DETECTION_TYPE)
 
             # If health check returns True, return True to mark node as
             # healthy. Else return True to mark node as healthy if we are still
@@ -202,9 +216,7 @@ class HypervisorPollStatusHealthCheck(HealthCheckType):
             # Return False to mark the node as unhealthy if we are outside the
             # grace period.
 
-            return (entity.do_healthcheck(ctx,
-                                          consts.HYPERVISOR_STATUS_POLLING) or
-                    self._node_within_grace_period(node))
+            return healthy or self._node_within_grace_period(node)
         except Exception as ex:
             LOG.warning(
                 'Error when performing health check on node %s: %s',
@@ -215,7 +227,35 @@ class HypervisorPollStatusHealthCheck(HealthCheckType):
             return True
 
 
+class HypervisorPollStatusHealthCheck(NodePollStatusHealthCheck):
+    DETECTION_TYPE = consts.HYPERVISOR_STATUS_POLLING
+
+
 class NodePollUrlHealthCheck(HealthCheckType):
+    """Health check polling a URL of each node.
+
+    The URLs of all nodes are polled concurrently once per pass, through a
+    session reusing its connections to each host. A node failing a poll is
+    polled again in the next pass instead of being retried inline, it is
+    considered unhealthy once ``poll_url_retry_limit`` consecutive polls
+    have failed.
+    """
+
+    def __init__(self, cluster_id, interval, node_update_timeout, params):
+        super(NodePollUrlHealthCheck, self).__init__(
+            cluster_id, interval, node_update_timeout, params)
+        self._healthy_response = re.compile(
+            params['poll_url_healthy_response'])
+        self._failures = {}
+        self._results = {}
+
+        concurrency = cfg.CONF.health_manager.health_check_concurrency
+        adapter = requests.adapters.HTTPAdapter(pool_connections=concurrency,
+                                                pool_maxsize=concurrency)
+        self._session = requests.Session()
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
     @staticmethod
     def convert_detection_tuple(dictionary):
         return namedtuple('DetectionMode', dictionary.keys())(**dictionary)
@@ -247,7 +287,8 @@ class NodePollUrlHealthCheck(HealthCheckType):
 
         try:
             result = utils.url_fetch(url, timeout=timeout,
-                                     verify=verify_ssl)
+                                     verify=verify_ssl,
+                                     session=self._session)
         except Exception as ex:
             if conn_error_as_unhealthy:
                 LOG.info("%s for %s: connection error when polling URL (%s)",
@@ -259,7 +300,7 @@ class NodePollUrlHealthCheck(HealthCheckType):
                          consts.POLL_URL_PASS, node.name, ex)
                 return True
 
-        if not re.search(expected_resp_str, result):
+        if not self._healthy_response.search(result):
             LOG.info("%s for %s: did not find expected response string %s in "
                      "URL result (%s)",
                      consts.POLL_URL_FAIL, node.name, expected_resp_str,
@@ -270,46 +311,43 @@ class NodePollUrlHealthCheck(HealthCheckType):
                  consts.POLL_URL_PASS, node.name)
         return True
 
-    def run_health_check(self, ctx, node):
-        """Routine to check a node status from a url and recovery if necessary
+    def _check_node(self, node):
+        """Poll the URL of a node once and update its failure count
 
         :param node: The node to be checked.
         :returns: True if node is healthy. False otherwise.
         """
-
         max_unhealthy_retry = self.params['poll_url_retry_limit']
-        retry_interval = self.params['poll_url_retry_interval']
-
-        def _return_last_value(retry_state):
-            return retry_state.outcome.result()
-
-        @tenacity.retry(
-            retry=tenacity.retry_if_result(lambda x: x is False),
-            wait=tenacity.wait_fixed(retry_interval),
-            retry_error_callback=_return_last_value,
-            stop=tenacity.stop_after_attempt(max_unhealthy_retry)
-        )
-        def _poll_url_with_retry(url):
-            return self._poll_url(url, node)
 
         try:
             if node.status != consts.NS_ACTIVE:
                 LOG.info("%s for %s: node is not in ACTIVE state, so skip "
                          "poll url",
                          consts.POLL_URL_PASS, node.name)
+                self._failures.pop(node.id, None)
                 return True
 
             url_template = self.params['poll_url']
             url = self._expand_url_template(url_template, node)
 
-            # If health check returns True, return True to mark node as
-            # healthy. Else return True to mark node as healthy if we are still
-            # within the node's grace period to allow the node to warm-up.
-            # Return False to mark the node as unhealthy if we are outside the
-            # grace period.
+            if self._poll_url(url, node):
+                self._failures.pop(node.id, None)
+                return True
+
+            failures = self._failures.get(node.id, 0) + 1
+            self._failures[node.id] = failures
+            if failures < max_unhealthy_retry:
+                LOG.info("%s for %s: poll %s of %s failed, polling again in "
+                         "the next pass",
+                         consts.POLL_URL_PASS, node.name, failures,
+                         max_unhealthy_retry)
+                return True
 
-            return (_poll_url_with_retry(url) or
-                    self._node_within_grace_period(node))
+            # Return True to mark node as healthy if we are still within the
+            # node's grace period to allow the node to warm-up. Return False
+            # to mark the node as unhealthy if we are outside the grace
+            # period.
+            return self._node_within_grace_period(node)
         except Exception as ex:
             LOG.warning(
                 "%s for %s: Ignoring error on poll URL: %s",
@@ -319,6 +357,27 @@ class NodePollUrlHealthCheck(HealthCheckType):
             # treat node as healthy when an exception is encountered
             return True
 
+    def prepare(self, ctx, nodes):
+        """Poll the URLs of all nodes concurrently."""
+        pool = eventlet.GreenPool(
+            cfg.CONF.health_manager.health_check_concurrency)
+        self._results = dict(zip([n.id for n in nodes],
+                                 pool.imap(self._check_node, nodes)))
+
+        # forget the failures of nodes no longer in the cluster
+        for node_id in set(self._failures) - set(self._results):
+            del self._failures[node_id]
+
+    def run_health_check(self, ctx, node):
+        """Routine to check a node status from a url and recovery if necessary
+
+        :param node: The node to be checked.
+        :returns: True if node is healthy. False otherwise.
+        """
+        if node.id in self._results:
+            return self._results.pop(node.id)
+        return self._check_node(node)
+
 
 class HealthCheck(object):
 
@@ -336,6 +395,9 @@ class HealthCheck(object):
         self.enabled = enabled
         self.timer = None
         self.listener = None
+        self.last_pass = {}
+        # recovery actions in flight, keyed by action ID
+        self.recoveries = {}
 
         self.health_check_types = []
         self.recover_action = {}
@@ -392,24 +454,44 @@ class HealthCheck(object):
             ctx = context.get_service_context(user_id=cluster.user,
                                               project_id=cluster.project)
 
-            actions = []
+            # track the recoveries started by previous passes and leave the
+            # nodes still being recovered alone
+            self._check_recoveries(ctx)
+            recovering = set(r['node_id'] for r in self.recoveries.values())
 
-            # loop through nodes and run all health checks on each node
-            nodes = objects.Node.get_all_by_cluster(ctx, self.cluster_id)
+            # run all health checks on each node, the detection modes that
+            # support it check all nodes in bulk first
+            nodes = [n for n in objects.Node.get_all_by_cluster(
+                ctx, self.cluster_id) if n.id not in recovering]
+            for hc in self.health_check_types:
+                hc.prepare(ctx, nodes)
 
-            for node in nodes:
-                action = self._check_node_health(ctx, node, cluster)
+            pool = eventlet.GreenPool(
+                cfg.CONF.health_manager.health_check_concurrency)
+            actions = []
+            results = pool.imap(
+                lambda node: self._check_node_health(ctx, node, cluster),
+                nodes)
+            for node, action in zip(nodes, results):
                 if action:
                     actions.append(action)
-
-            for a in actions:
-                # wait for action to complete
-                res, reason = self._wait_for_action(
-                    ctx, a['action'], self.node_update_timeout)
-                if not res:
-                    LOG.warning("Node recovery action %s did not complete "
-                                "within specified timeout: %s", a['action'],
-                                reason)
+                    # do not wait for the action, it is checked in the next
+                    # passes until it completes or times out
+                    self.recoveries[action['action']] = {
+                        'node_id': node.id,
+                        'started_at': timeutils.utcnow(True),
+                    }
+            self.last_pass = {
+                'nodes': len(nodes),
+                'unhealthy': len(actions),
+                'recovering': len(self.recoveries),
+                'duration': timeutils.delta_seconds(
+                    start_time, timeutils.utcnow(True)),
+            }
+            LOG.info("Health check of %(nodes)s nodes in cluster %(cid)s "
+                     "took %(duration).2f seconds, %(unhealthy)s nodes are "
+                     "unhealthy, %(recovering)s nodes are being recovered.",
+                     dict(self.last_pass, cid=self.cluster_id))
 
             if len(actions) == 0:
                 LOG.info("Health check passed for all nodes in cluster %s.",
@@ -447,30 +529,41 @@ class HealthCheck(object):
                      node.name, cluster.name)
             return self._recover_node(ctx, node.id)
 
-    def _wait_for_action(self, ctx, action_id, timeout):
-        req = objects.ActionGetRequest(identity=action_id)
-        action = {}
-        with timeutils.StopWatch(timeout) as timeout_watch:
-            while not timeout_watch.expired():
-                action = self.rpc_client.call(ctx, 'action_get', req)
-                if action['status'] in [consts.ACTION_SUCCEEDED,
-                                        consts.ACTION_FAILED,
-                                        consts.ACTION_CANCELLED]:
-                    break
-                eventlet.sleep(2)
-
-        if not action:
-            return False, "Failed to retrieve action."
-
-        elif action['status'] == consts.ACTION_SUCCEEDED:
-            return True, ""
-
-        elif (action['status'] == consts.ACTION_FAILED or
-              action['status'] == consts.ACTION_CANCELLED):
-            return False, "Cluster check action failed or cancelled"
-
-        return False, ("Timeout while waiting for node recovery action to "
-                       "finish")
+    def _check_recoveries(self, ctx):
+        """Check the recovery actions started by previous passes
+
+        The status of all actions in flight is retrieved with a single
+        query. Actions that completed, or did not complete within the node
+        update timeout, are no longer tracked so that their nodes are
+        checked again.
+        """
+        if not self.recoveries:
+            return
+
+        actions = objects.Action.get_all(
+            ctx, filters={'id': list(self.recoveries)}, project_safe=False,
+            with_deps=False)
+        statuses = dict((a.id, a.status) for a in actions)
+
+        for action_id, recovery in list(self.recoveries.items()):
+            status = statuses.get(action_id)
+            if status is None:
+                LOG.warning("Failed to retrieve node recovery action %s.",
+                            action_id)
+            elif status == consts.ACTION_SUCCEEDED:
+                LOG.info("Node recovery action %s for node %s succeeded.",
+                         action_id, recovery['node_id'])
+            elif status in [consts.ACTION_FAILED, consts.ACTION_CANCELLED]:
+                LOG.warning("Node recovery action %s for node %s failed or "
+                            "cancelled.", action_id, recovery['node_id'])
+            elif timeutils.is_older_than(recovery['started_at'],
+                                         self.node_update_timeout):
+                LOG.warning("Node recovery action %s for node %s did not "
+                            "complete within specified timeout.",
+                            action_id, recovery['node_id'])
+            else:
+                continue
+            del self.recoveries[action_id]
 
     def _recover_node(self, ctx, node_id):
         """Recover node
@@ -277,7 +277,8 @@ class Message(base.Receiver):
             LOG.info('Actions %(actions)s were successfully built.',
                      {'actions': actions})
 
-            dispatcher.start_action()
+            if actions:
+                dispatcher.start_actions(actions)
 
         return actions
 
@@ -0,0 +1,96 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Retention of events and actions.
+
+Old records are deleted in batches of ``purge_batch_size`` rows, each in its
+own transaction, pausing ``purge_batch_interval`` seconds in between. This
+keeps the locks held by a purge short, so that services writing events and
+actions are not stalled while a large table is cleaned up.
+"""
+
+import eventlet
+from oslo_config import cfg
+from oslo_log import log as logging
+
+from senlin.common import consts
+from senlin.db import api as db_api
+
+LOG = logging.getLogger(__name__)
+
+# Statuses of the actions deleted by the retention task
+COMPLETED_STATUSES = [
+    consts.ACTION_SUCCEEDED, consts.ACTION_FAILED, consts.ACTION_CANCELLED,
+]
+
+
+def purge(func, progress=None, **kwargs):
+    """Delete records in batches until none is left.
+
+    :param func: The DB API purge function deleting the records, which takes
+                 a ``limit`` argument and returns the number of records
+                 deleted.
+    :param progress: An optional callable invoked with the total number of
+                     records deleted after each batch.
+    :param kwargs: Other arguments of the function.
+    :returns: The total number of records deleted.
+    """
+    batch_size = cfg.CONF.purge_batch_size
+    total = 0
+    while True:
+        count = func(limit=batch_size, **kwargs)
+        total += count
+        if progress is not None:
+            progress(total)
+        if count < batch_size:
+            return total
+        eventlet.sleep(cfg.CONF.purge_batch_interval)
+
+
+def _get_project_retention():
+    retention = {}
+    for project, days in cfg.CONF.project_retention.items():
+        try:
+            retention[project] = int(days)
+        except ValueError:
+            LOG.warning('Invalid retention %(days)s for project %(p)s.',
+                        {'days': days, 'p': project})
+    return retention
+
+
+def apply_retention():
+    """Delete the events and actions older than their retention period.
+
+    :returns: A dict with the number of events and actions deleted.
+    """
+    overrides = _get_project_retention()
+    tasks = (
+        ('events', db_api.event_purge, cfg.CONF.event_retention, {}),
+        ('actions', db_api.action_purge, cfg.CONF.action_retention,
+         {'statuses': COMPLETED_STATUSES}),
+    )
+    result = {}
+    for kind, func, days, kwargs in tasks:
+        count = 0
+        if days:
+            count += purge(func, engine=None, project=None, granularity='days',
+                           age=days, exclude=list(overrides), **kwargs)
+        for project, project_days in overrides.items():
+            if project_days:
+                count += purge(func, engine=None, project=[project],
+                               granularity='days', age=project_days,
+                               **kwargs)
+        if count:
+            LOG.info('Purged %(count)s %(kind)s.',
+                     {'count': count, 'kind': kind})
+        result[kind] = count
+    return result
@@ -12,17 +12,18 @@
 
 import eventlet
 import random
-import time
 
 from oslo_config import cfg
 from oslo_db import exception
 from oslo_log import log as logging
 
-from senlin.common.i18n import _
+from senlin.common import context as senlin_context
 from senlin.common import utils
+from senlin.engine import dispatcher
 from senlin import objects
 from senlin.objects import action as ao
 from senlin.objects import cluster_lock as cl_obj
+from senlin.objects import lock_waiter as lw_obj
 from senlin.objects import node_lock as nl_obj
 
 CONF = cfg.CONF
@@ -38,6 +39,56 @@ LOCK_SCOPES = (
     -1, 1,
 )
 
+# Number of attempts to lock a cluster before checking the lock owners
+CLUSTER_LOCK_ATTEMPTS = 3
+
+# Bounds in seconds of the random delay between attempts to lock a cluster,
+# the upper bound doubles with each attempt up to LOCK_BACKOFF_MAX
+LOCK_BACKOFF_BASE = 0.1
+LOCK_BACKOFF_MAX = 1.0
+
+
+def _backoff(attempt):
+    """Sleep for a random time before attempting to lock again.
+
+    :param attempt: Number of the attempts made so far, starting from 0.
+    """
+    limit = min(LOCK_BACKOFF_MAX, LOCK_BACKOFF_BASE * 2 ** attempt)
+    eventlet.sleep(random.uniform(0, limit))
+
+
+def gc_by_engine(engine_id):
+    """Reclaim the actions and locks of a dead engine.
+
+    The actions waiting for the reclaimed actions and those queued on the
+    released locks are woken up.
+
+    :param engine_id: ID of the dead engine.
+    """
+    woken, lock_ids = objects.Service.gc_by_engine(engine_id)
+    if woken:
+        dispatcher.wake_actions(senlin_context.get_admin_context(), woken)
+    for lock_id in lock_ids:
+        lock_wake(lock_id)
+
+
+def _reclaim_dead_owner(context, owner_id, engine):
+    """Reclaim the actions and locks of a dead engine owning a lock.
+
+    :param context: the context used for DB operations.
+    :param owner_id: ID of the action owning the lock.
+    :param engine: ID of the engine that attempts to get the lock.
+    :returns: True if the engine running the action was dead and has been
+              reclaimed, or False otherwise.
+    """
+    action = ao.Action.get(context, owner_id)
+    if not (action and action.owner and action.owner != engine and
+            utils.is_service_dead(context, action.owner)):
+        return False
+
+    gc_by_engine(action.owner)
+    return True
+
 
 def cluster_lock_acquire(context, cluster_id, action_id, engine=None,
                          scope=CLUSTER_SCOPE, forced=False):
@@ -56,7 +107,10 @@ def cluster_lock_acquire(context, cluster_id, action_id, engine=None,
 
     # Step 1: try lock the cluster - if the returned owner_id is the
     #         action id, it was a success
-    for retries in range(3):
+    owners = []
+    for attempt in range(CLUSTER_LOCK_ATTEMPTS):
+        if attempt:
+            _backoff(attempt - 1)
         try:
             owners = cl_obj.ClusterLock.acquire(cluster_id, action_id, scope)
             if action_id in owners:
@@ -65,25 +119,24 @@ def cluster_lock_acquire(context, cluster_id, action_id, engine=None,
             LOG.info('Duplicate entry in cluster_lock table for %(c)s.  '
                      'Retrying cluster lock.',
                      {'c': cluster_id})
-        eventlet.sleep(random.randrange(1, 3))
 
     # Step 2: Last resort is 'forced locking', only needed when retry failed
     if forced:
         owners = cl_obj.ClusterLock.steal(cluster_id, action_id)
         return action_id in owners
 
-    # Step 3: check if the owner is a dead engine, if so, steal the lock.
-    # Will reach here only because scope == CLUSTER_SCOPE
-    action = ao.Action.get(context, owners[0])
-    if (action and action.owner and action.owner != engine and
-            utils.is_service_dead(context, action.owner)):
-        LOG.info('The cluster %(c)s is locked by dead action %(a)s, '
-                 'try to steal the lock.',
+    if not owners:
+        LOG.warning('Action %(a)s failed grabbing the lock of cluster %(c)s',
+                    {'a': action_id[:8], 'c': cluster_id})
+        return False
+
+    # Step 3: check if the owner is a dead engine, if so, reclaim all the
+    # actions and locks of the engine and try again.
+    if _reclaim_dead_owner(context, owners[0], engine):
+        LOG.info('The cluster %(c)s was locked by dead action %(a)s, '
+                 'try to lock it again.',
                  {'c': cluster_id, 'a': owners[0]})
-        dead_engine = action.owner
-        owners = cl_obj.ClusterLock.steal(cluster_id, action_id)
-        # Cleanse locks affected by the dead engine
-        objects.Service.gc_by_engine(dead_engine)
+        owners = cl_obj.ClusterLock.acquire(cluster_id, action_id, scope)
         return action_id in owners
 
     lock_owners = []
@@ -103,7 +156,10 @@ def cluster_lock_release(cluster_id, action_id, scope):
     :param action_id: ID of the action that attempts to release the cluster.
     :param scope: The scope of the lock to be released.
     """
-    return cl_obj.ClusterLock.release(cluster_id, action_id, scope)
+    res = cl_obj.ClusterLock.release(cluster_id, action_id, scope)
+    if res:
+        lock_wake(cluster_id)
+    return res
 
 
 def node_lock_acquire(context, node_id, action_id, engine=None,
@@ -129,18 +185,14 @@ def node_lock_acquire(context, node_id, action_id, engine=None,
         owner = nl_obj.NodeLock.steal(node_id, action_id)
         return action_id == owner
 
-    # Step 3: Try to steal a lock if it's owner is a dead engine.
-    # if this node lock by dead engine
-    action = ao.Action.get(context, owner)
-    if (action and action.owner and action.owner != engine and
-            utils.is_service_dead(context, action.owner)):
-        LOG.info('The node %(n)s is locked by dead action %(a)s, '
-                 'try to steal the lock.',
+    # Step 3: check if the owner is a dead engine, if so, reclaim all the
+    # actions and locks of the engine and try again.
+    if _reclaim_dead_owner(context, owner, engine):
+        LOG.info('The node %(n)s was locked by dead action %(a)s, '
+                 'try to lock it again.',
                  {'n': node_id, 'a': owner})
-        reason = _('Engine died when executing this action.')
-        nl_obj.NodeLock.steal(node_id, action_id)
-        ao.Action.mark_failed(context, action.id, time.time(), reason)
-        return True
+        owner = nl_obj.NodeLock.acquire(node_id, action_id)
+        return action_id == owner
 
     LOG.warning('Node is already locked by action %(old)s, '
                 'action %(new)s failed grabbing the lock',
@@ -155,4 +207,42 @@ def node_lock_release(node_id, action_id):
     :param node_id: ID of the node to be released.
     :param action_id: ID of the action that attempts to release the node.
     """
-    return nl_obj.NodeLock.release(node_id, action_id)
+    res = nl_obj.NodeLock.release(node_id, action_id)
+    if res:
+        lock_wake(node_id)
+    return res
+
+
+def lock_wait(context, lock_id, action_id, shared=False, values=None):
+    """Queue an action until a lock it failed to acquire is released.
+
+    :param context: the context used for DB operations.
+    :param lock_id: ID of the cluster or node locked.
+    :param action_id: ID of the action waiting for the lock.
+    :param shared: True if the action waits for a node-scope lock on a
+                   cluster.
+    :param values: Other values of the action to update.
+    """
+    lw_obj.LockWaiter.wait(context, lock_id, action_id, shared=shared,
+                           values=values)
+    # The lock may have been released before the action was queued
+    lock_wake(lock_id)
+
+
+def lock_wake(lock_id):
+    """Dispatch the actions waiting for a lock which can acquire it now.
+
+    :param lock_id: ID of the cluster or node locked.
+    :returns: A list of IDs of the actions woken up.
+    """
+    try:
+        woken = lw_obj.LockWaiter.wake(lock_id)
+    except Exception as ex:
+        # Waiters are woken up again by the engines later on
+        LOG.warning('Failed in waking up the waiters of lock %(l)s: %(ex)s',
+                    {'l': lock_id, 'ex': ex})
+        return []
+
+    if woken:
+        dispatcher.start_actions(woken)
+    return woken
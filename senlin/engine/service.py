@@ -16,6 +16,7 @@ from oslo_config import cfg
 from oslo_context import context as oslo_context
 from oslo_log import log as logging
 import oslo_messaging
+from oslo_utils import timeutils
 from osprofiler import profiler
 
 from senlin.common import consts
@@ -24,7 +25,10 @@ from senlin.common import messaging
 from senlin.common import service
 from senlin.engine.actions import base as action_mod
 from senlin.engine import event as EVENT
+from senlin.engine import senlin_lock
+from senlin.engine import waiter
 from senlin.objects import action as ao
+from senlin.objects import lock_waiter as lw_obj
 
 LOG = logging.getLogger(__name__)
 CONF = cfg.CONF
@@ -47,11 +51,27 @@ class EngineService(service.Service):
         self.version = consts.RPC_API_VERSION
 
         self.target = None
+        self.lock_wait_timer = None
+        self.ready_scan_timer = None
 
         # TODO(Yanyan Hu): Build a DB session with full privilege
         # for DB accessing in scheduler module
         self.db_session = context.RequestContext(is_admin=True)
 
+        # Book-keeping for the actions claimed by this engine. The engine
+        # stops claiming READY actions once 'action_queue_size' of them are
+        # running and resumes claiming when one of them completes.
+        self.actions_running = 0
+        self.queue_throttled = False
+        self.queue_stats = {
+            'claims': 0,
+            'claimed': 0,
+            'throttled': 0,
+            'claim_latency_last': 0.0,
+            'claim_latency_max': 0.0,
+            'claim_latency_total': 0.0,
+        }
+
         # Initialize the global environment
         EVENT.load_dispatcher()
 
@@ -71,19 +91,35 @@ class EngineService(service.Service):
                                             topic=self.topic,
                                             version=self.version)
 
+        EVENT.start_buffers()
         self.server = messaging.get_rpc_server(self.target, self)
         self.server.start()
+        self.lock_wait_timer = self.tg.add_timer(
+            CONF.lock_retry_interval, self.service_manage_lock_waiters
+        )
+        # Runs right away, then once per periodic interval
+        self.ready_scan_timer = self.tg.add_timer(
+            CONF.periodic_interval, self.service_manage_ready_actions
+        )
 
     def stop(self, graceful=False):
+        if self.lock_wait_timer:
+            self.lock_wait_timer.stop()
+            self.lock_wait_timer = None
+        if self.ready_scan_timer:
+            self.ready_scan_timer.stop()
+            self.ready_scan_timer = None
         if self.server:
             self.server.stop()
             self.server.wait()
+        # Actions still running log their events without buffering
+        EVENT.stop_buffers()
         super(EngineService, self).stop(graceful)
 
     def execute(self, func, *args, **kwargs):
         """Run the given method in a thread."""
         req_cnxt = oslo_context.get_current()
-        self.tg.add_thread(
+        return self.tg.add_thread(
             self._start_with_trace, req_cnxt,
             self._serialize_profile_info(),
             func, *args, **kwargs
@@ -111,9 +147,104 @@ class EngineService(service.Service):
         """Respond affirmatively to confirm that engine is still alive."""
         return True
 
+    def service_report_values(self):
+        return {'load': self.actions_running}
+
+    def _gc_engine(self, service_id):
+        """Reclaim the actions and locks of a dead engine.
+
+        The actions waiting for the reclaimed actions and those queued on
+        the released locks are woken up as well.
+
+        :param service_id: ID of the dead engine.
+        """
+        senlin_lock.gc_by_engine(service_id)
+
+    def service_manage_lock_waiters(self):
+        """Wake up the actions queued on locks whose release was missed.
+
+        A lock released while an action was being queued on it doesn't
+        wake the action up, nor does a lock taken back from a dead engine.
+        """
+        try:
+            lock_ids = lw_obj.LockWaiter.get_stale(CONF.lock_retry_interval)
+        except Exception as ex:
+            LOG.error('Error while checking lock waiters: %s', ex)
+            return
+
+        for lock_id in lock_ids:
+            senlin_lock.lock_wake(lock_id)
+
+    def service_manage_ready_actions(self):
+        """Claim the READY actions no engine was notified of.
+
+        Actions are sent to an engine picked from a list of engines alive
+        which is cached for a while, so the engine may have stopped or died
+        in the meantime. Such actions are left READY until an engine scans
+        the action table for them.
+        """
+        try:
+            self.start_action(self.db_session)
+        except Exception as ex:
+            LOG.error('Error while claiming READY actions: %s', ex)
+
+    def action_queue_stats(self, ctxt):
+        """Report the depth and claim statistics of the action queue."""
+        stats = dict(self.queue_stats)
+        stats['depth'] = self.actions_running
+        stats['capacity'] = CONF.engine.action_queue_size
+        stats['wakeup_latency'] = waiter.latency_histogram()
+        return stats
+
+    def event_buffer_stats(self, ctxt):
+        """Report the depth and flush statistics of the event buffers."""
+        return EVENT.buffer_stats()
+
+    def _launch_action(self, action_id):
+        """Run a claimed action and track it in the action queue."""
+        self.actions_running += 1
+        thread = self.execute(action_mod.ActionProc, self.db_session,
+                              action_id)
+        if thread is not None:
+            thread.link(self._action_done)
+
+    def _action_done(self, *args, **kwargs):
+        """Callback invoked when an action thread has completed."""
+        self.actions_running = max(self.actions_running - 1, 0)
+        if self.queue_throttled:
+            # Capacity freed up, pick up actions we skipped while throttled
+            self.queue_throttled = False
+            self.start_action(self.db_session)
+
+    def _claim_actions(self, limit, ids=None):
+        """Claim a batch of READY actions and record the claim latency."""
+        watch = timeutils.StopWatch()
+        watch.start()
+        actions = ao.Action.acquire_ready_batch(self.db_session,
+                                                self.service_id,
+                                                wallclock(), limit, ids=ids)
+        elapsed = watch.elapsed()
+
+        stats = self.queue_stats
+        stats['claims'] += 1
+        stats['claimed'] += len(actions)
+        stats['claim_latency_last'] = elapsed
+        stats['claim_latency_total'] += elapsed
+        stats['claim_latency_max'] = max(stats['claim_latency_max'], elapsed)
+        LOG.debug('Engine %(id)s claimed %(num)s action(s) in %(time).3f '
+                  'seconds, %(depth)s action(s) running.',
+                  {'id': self.service_id, 'num': len(actions),
+                   'time': elapsed, 'depth': self.actions_running})
+        return actions
+
     def start_action(self, ctxt, action_id=None):
         """Run action(s) in sub-thread(s).
 
+        READY actions are claimed from the database in batches, each batch in
+        a single statement, until either no READY action is left or the
+        number of actions running on this engine reaches the configured
+        queue size.
+
         :param action_id: ID of the action to be executed. None means all
                           ready actions will be acquired and scheduled to run.
         """
@@ -127,40 +258,75 @@ class EngineService(service.Service):
                                        self.service_id,
                                        timestamp)
             if action:
-                self.execute(action_mod.ActionProc, self.db_session, action.id)
+                self._launch_action(action.id)
                 actions_launched += 1
 
         while True:
-            timestamp = wallclock()
-            action = ao.Action.acquire_first_ready(self.db_session,
-                                                   self.service_id,
-                                                   timestamp)
-            if not action:
+            room = CONF.engine.action_queue_size - self.actions_running
+            if room <= 0:
+                self.queue_throttled = True
+                self.queue_stats['throttled'] += 1
+                LOG.debug('Engine %(id)s has %(num)s actions running, stop '
+                          'claiming actions until some of them complete.',
+                          {'id': self.service_id,
+                           'num': self.actions_running})
                 break
 
-            if max_batch_size == 0 or 'NODE' not in action.action:
-                self.execute(action_mod.ActionProc, self.db_session, action.id)
-                continue
+            limit = min(room, CONF.engine.action_claim_batch_size)
+            if max_batch_size:
+                # Don't claim node actions we won't launch before sleeping
+                limit = min(limit, max_batch_size)
+
+            actions = self._claim_actions(limit)
+            for action in actions:
+                if max_batch_size == 0 or 'NODE' not in action.action:
+                    self._launch_action(action.id)
+                    continue
+
+                if max_batch_size > actions_launched:
+                    self._launch_action(action.id)
+                    actions_launched += 1
+                    continue
+
+                self._launch_action(action.id)
+
+                LOG.debug(
+                    'Engine %(id)s has launched %(num)s node actions '
+                    'consecutively, stop scheduling node action for '
+                    '%(interval)s second...',
+                    {
+                        'id': self.service_id,
+                        'num': max_batch_size,
+                        'interval': batch_interval
+                    })
+
+                sleep(batch_interval)
+                actions_launched = 1
+
+            if len(actions) < limit:
+                break
 
-            if max_batch_size > actions_launched:
-                self.execute(action_mod.ActionProc, self.db_session, action.id)
-                actions_launched += 1
-                continue
+    def start_actions(self, ctxt, ids):
+        """Run the given actions in sub-threads.
 
-            self.execute(action_mod.ActionProc, self.db_session, action.id)
+        Only the given actions are claimed, the action table is not scanned
+        for other READY actions. Actions which are not READY any more, e.g.
+        because another engine claimed them, are skipped. If the queue of
+        this engine is full, the actions not claimed are left READY and are
+        picked up by the next scan.
 
-            LOG.debug(
-                'Engine %(id)s has launched %(num)s node actions '
-                'consecutively, stop scheduling node action for '
-                '%(interval)s second...',
-                {
-                    'id': self.service_id,
-                    'num': max_batch_size,
-                    'interval': batch_interval
-                })
+        :param ids: A list of IDs of the actions to be executed.
+        """
+        room = CONF.engine.action_queue_size - self.actions_running
+        if room < len(ids):
+            self.queue_throttled = True
+            self.queue_stats['throttled'] += 1
+        if room <= 0:
+            return
 
-            sleep(batch_interval)
-            actions_launched = 1
+        actions = self._claim_actions(room, ids=ids)
+        for action in actions:
+            self._launch_action(action.id)
 
     def cancel_action(self, ctxt, action_id):
         """Cancel an action execution progress."""
@@ -168,6 +334,10 @@ class EngineService(service.Service):
                                         project_safe=False)
         action.signal(action.SIG_CANCEL)
 
+    def wake_action(self, ctxt, action_id, timestamp=None):
+        """Wake up an action waiting for its dependents on this engine."""
+        waiter.wake(action_id, timestamp)
+
     def suspend_action(self, ctxt, action_id):
         """Suspend an action execution progress."""
         action = action_mod.Action.load(self.db_session, action_id,
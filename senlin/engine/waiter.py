@@ -0,0 +1,102 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""In-process registry of actions waiting for their dependent actions.
+
+An action that waits for its dependents registers itself here. When a
+dependent action completes in the same process, the waiting action is woken
+up directly. Dependents completing in another engine process wake it up
+through the dispatcher, which ends up calling :func:`wake` in this process.
+"""
+
+import time
+
+from eventlet import event
+
+# Upper bounds (in seconds) of the wake-up latency histogram buckets
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, float('inf'))
+
+_WAITERS = {}
+_LATENCY = [0] * len(LATENCY_BUCKETS)
+
+
+def register(action_id):
+    """Register an action as waiting for its dependents."""
+    if action_id not in _WAITERS:
+        _WAITERS[action_id] = event.Event()
+
+
+def unregister(action_id):
+    """Remove an action from the waiting registry."""
+    _WAITERS.pop(action_id, None)
+
+
+def is_waiting(action_id):
+    return action_id in _WAITERS
+
+
+def wake(action_id, timestamp=None):
+    """Wake up an action waiting in this process.
+
+    :param action_id: ID of the action to wake up.
+    :param timestamp: Time when the dependent action completed, used for
+                      measuring the wake-up latency.
+    :returns: True if the action is waiting in this process, or False
+              otherwise.
+    """
+    ev = _WAITERS.get(action_id)
+    if ev is None:
+        return False
+
+    if not ev.ready():
+        ev.send(timestamp)
+    return True
+
+
+def wait(action_id, timeout):
+    """Wait until an action is woken up or a timeout is reached.
+
+    :param action_id: ID of the waiting action, which must be registered.
+    :param timeout: Maximum number of seconds to wait.
+    :returns: True if the action was woken up, or False on timeout.
+    """
+    ev = _WAITERS.get(action_id)
+    if ev is None:
+        return False
+
+    if not ev.ready():
+        ev.wait(timeout)
+        if not ev.ready():
+            return False
+
+    timestamp = ev.wait()
+    ev.reset()
+    if timestamp is not None:
+        _record_latency(time.time() - timestamp)
+    return True
+
+
+def _record_latency(latency):
+    for index, bound in enumerate(LATENCY_BUCKETS):
+        if latency <= bound:
+            _LATENCY[index] += 1
+            return
+
+
+def latency_histogram():
+    """Return the wake-up latency histogram as a dict.
+
+    The keys are the upper bounds of the buckets in seconds and the values
+    are the number of wake-ups observed in the bucket.
+    """
+    return dict((str(bound), count)
+                for bound, count in zip(LATENCY_BUCKETS, _LATENCY))
@@ -10,11 +10,17 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from oslo_config import cfg
 from oslo_utils import reflection
 
+from senlin.events import buffer as event_buffer
+
 
 class EventBackend(object):
 
+    # Buffer of the records to write, None if they are written when emitted
+    buffer = None
+
     @classmethod
     def _check_entity(cls, e):
         e_type = reflection.get_class_name(e, fully_qualified=False)
@@ -47,3 +53,52 @@ class EventBackend(object):
         :returns: None
         """
         raise NotImplementedError
+
+    @classmethod
+    def start_buffer(cls):
+        """Start buffering the records of this backend if configured."""
+        conf = cfg.CONF.dispatchers
+        if conf.buffer_size <= 0 or cls.buffer is not None:
+            return
+        buf = event_buffer.EventBuffer(cls.__name__, cls._write,
+                                       conf.buffer_size,
+                                       conf.flush_batch_size,
+                                       conf.flush_interval,
+                                       policy=conf.buffer_full_policy)
+        buf.start()
+        cls.buffer = buf
+
+    @classmethod
+    def stop_buffer(cls):
+        """Stop buffering records after writing the buffered ones."""
+        buf = cls.buffer
+        if buf is None:
+            return
+        # Records emitted from now on are written without buffering
+        cls.buffer = None
+        buf.stop()
+
+    @classmethod
+    def buffer_stats(cls):
+        return cls.buffer.stats() if cls.buffer is not None else None
+
+    @classmethod
+    def _submit(cls, record):
+        """Buffer a record or write it if there is no buffer.
+
+        :param record: A record to be passed to :meth:`_write`.
+        """
+        buf = cls.buffer
+        if buf is None:
+            cls._write([record])
+        else:
+            buf.put(record)
+
+    @classmethod
+    def _write(cls, records):
+        """A method for sub-class to override if it buffers records.
+
+        :param records: A list of records submitted with :meth:`_submit`.
+        :returns: None
+        """
+        raise NotImplementedError
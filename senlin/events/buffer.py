@@ -0,0 +1,170 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Bounded buffer of events written in batches by a green thread.
+
+Actions emit events while they run. Instead of writing each event in the
+thread of the action, an event backend may put its records into a buffer.
+A green thread takes the records out of the buffer and writes them in
+batches, once ``flush_batch_size`` records are waiting or ``flush_interval``
+seconds after the first record of a batch was put, whichever comes first.
+"""
+
+import eventlet
+from eventlet import queue
+from oslo_log import log as logging
+from oslo_utils import timeutils
+
+LOG = logging.getLogger(__name__)
+
+FULL_POLICIES = (
+    BLOCK, DROP,
+) = (
+    'block', 'drop',
+)
+
+# Put into the buffer to stop the flush thread
+_STOP = object()
+
+
+class EventBuffer(object):
+    """A bounded buffer of event records flushed by a green thread."""
+
+    def __init__(self, name, write, size, batch_size, interval,
+                 policy=BLOCK):
+        """Initialize the buffer.
+
+        :param name: Name of the buffer, used in logs.
+        :param write: A callable writing a list of records.
+        :param size: Maximum number of records in the buffer.
+        :param batch_size: Maximum number of records written at once.
+        :param interval: Maximum number of seconds a record waits for more
+                         records to be written with.
+        :param policy: What happens to a record put into a full buffer, it
+                       either waits for space (``block``) or is dropped
+                       (``drop``).
+        """
+        self.name = name
+        self.write = write
+        self.size = size
+        self.batch_size = batch_size
+        self.interval = interval
+        self.policy = policy
+        self._queue = queue.LightQueue(size)
+        self._thread = None
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.flushes = 0
+        self.flush_latency_last = 0.0
+        self.flush_latency_max = 0.0
+        self.flush_latency_total = 0.0
+
+    def start(self):
+        self._thread = eventlet.spawn(self._run)
+
+    def stop(self):
+        """Stop the flush thread once all the buffered records are written."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.wait()
+        self._thread = None
+        # Records put by writers blocked on a full buffer while stopping
+        self._drain()
+
+    def put(self, record):
+        """Put a record into the buffer.
+
+        :param record: The record to write.
+        :returns: True if the record was buffered, False if it was dropped
+                  because the buffer is full.
+        """
+        if self.policy == BLOCK:
+            self._queue.put(record)
+            return True
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                LOG.warning('Event buffer %(name)s is full, %(num)s event(s) '
+                            'dropped so far.',
+                            {'name': self.name, 'num': self.dropped})
+            return False
+        return True
+
+    def _run(self):
+        while True:
+            record = self._queue.get()
+            if record is _STOP:
+                return
+            records = [record]
+            watch = timeutils.StopWatch(duration=self.interval)
+            watch.start()
+            while len(records) < self.batch_size:
+                leftover = watch.leftover()
+                if leftover <= 0:
+                    break
+                try:
+                    record = self._queue.get(timeout=leftover)
+                except queue.Empty:
+                    break
+                if record is _STOP:
+                    self._flush(records)
+                    return
+                records.append(record)
+            self._flush(records)
+
+    def _drain(self):
+        records = []
+        while True:
+            try:
+                record = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if record is not _STOP:
+                records.append(record)
+        for i in range(0, len(records), self.batch_size):
+            self._flush(records[i:i + self.batch_size])
+
+    def _flush(self, records):
+        if not records:
+            return
+        watch = timeutils.StopWatch()
+        watch.start()
+        try:
+            self.write(records)
+            self.written += len(records)
+        except Exception as ex:
+            self.failed += len(records)
+            LOG.exception('Failed in writing %(num)s event(s) of buffer '
+                          '%(name)s: %(ex)s',
+                          {'num': len(records), 'name': self.name, 'ex': ex})
+        elapsed = watch.elapsed()
+        self.flushes += 1
+        self.flush_latency_last = elapsed
+        self.flush_latency_max = max(self.flush_latency_max, elapsed)
+        self.flush_latency_total += elapsed
+
+    def stats(self):
+        return {
+            'depth': self._queue.qsize(),
+            'capacity': self.size,
+            'written': self.written,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'flushes': self.flushes,
+            'flush_latency_last': self.flush_latency_last,
+            'flush_latency_max': self.flush_latency_max,
+            'flush_latency_total': self.flush_latency_total,
+        }
@@ -60,4 +60,16 @@ class DBEvent(base.EventBackend):
             'meta_data': extra,
         }
 
-        eo.Event.create(ctx, values)
+        cls._submit((ctx, values))
+
+    @classmethod
+    def _write(cls, records):
+        """Write event records into database.
+
+        :param records: A list of tuples of request context and event values.
+        """
+        if len(records) == 1:
+            eo.Event.create(*records[0])
+        else:
+            ctx = records[0][0]
+            eo.Event.create_batch(ctx, [values for _ctx, values in records])
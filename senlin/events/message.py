@@ -34,7 +34,7 @@ class MessageEvent(base.EventBackend):
         notification = nobj.ClusterActionNotification(
             context=ctx, priority=priority, publisher=publisher,
             event_type=event_type, payload=payload)
-        notification.emit(ctx)
+        cls._submit((ctx, notification))
 
     @classmethod
     def _notify_node_action(cls, ctx, level, node, action, **kwargs):
@@ -50,7 +50,7 @@ class MessageEvent(base.EventBackend):
         notification = nobj.NodeActionNotification(
             context=ctx, priority=priority, publisher=publisher,
             event_type=event_type, payload=payload)
-        notification.emit(ctx)
+        cls._submit((ctx, notification))
 
     @classmethod
     def dump(cls, level, action, **kwargs):
@@ -67,3 +67,12 @@ class MessageEvent(base.EventBackend):
             cls._notify_cluster_action(ctx, level, entity, action, **kwargs)
         else:
             cls._notify_node_action(ctx, level, entity, action, **kwargs)
+
+    @classmethod
+    def _write(cls, records):
+        """Send notifications to message queue.
+
+        :param records: A list of tuples of request context and notification.
+        """
+        for ctx, notification in records:
+            notification.emit(ctx)
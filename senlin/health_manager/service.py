@@ -123,3 +123,14 @@ class HealthManagerService(service.Service):
 
     def disable_cluster(self, ctx, cluster_id, params=None):
         self.health_registry.disable_cluster(cluster_id)
+
+    def health_check_stats(self, ctx):
+        """Report the last health check pass of each registered cluster.
+
+        :param ctx: The context of notify request.
+        :return: A dict mapping cluster IDs to the number of nodes checked,
+                 the number of unhealthy nodes and the duration in seconds of
+                 the last pass.
+        """
+        return dict((cluster_id, entry.last_pass) for cluster_id, entry in
+                    self.health_registry.registries.items())
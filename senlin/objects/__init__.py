@@ -25,6 +25,7 @@ def register_all():
     __import__('senlin.objects.dependency')
     __import__('senlin.objects.event')
     __import__('senlin.objects.health_registry')
+    __import__('senlin.objects.lock_waiter')
     __import__('senlin.objects.node')
     __import__('senlin.objects.node_lock')
     __import__('senlin.objects.notification')
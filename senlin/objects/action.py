@@ -12,8 +12,6 @@
 
 """Action object."""
 
-from oslo_utils import uuidutils
-
 from senlin.common import exception
 from senlin.common import utils
 from senlin.db import api as db_api
@@ -58,6 +56,11 @@ class Action(base.SenlinObject, base.VersionedObjectDictCompat):
         obj = db_api.action_create(context, values)
         return cls._from_db_object(context, cls(context), obj)
 
+    @classmethod
+    def create_batch(cls, context, values, dependent, nodes=None):
+        return db_api.action_create_batch(context, values, dependent,
+                                          nodes=nodes)
+
     @classmethod
     def find(cls, context, identity, **kwargs):
         """Find an action with the given identity.
@@ -68,19 +71,11 @@ class Action(base.SenlinObject, base.VersionedObjectDictCompat):
         :return: A DB object of action or an exception `ResourceNotFound` if
                  no matching action is found.
         """
-        if uuidutils.is_uuid_like(identity):
-            action = cls.get(context, identity, **kwargs)
-            if not action:
-                action = cls.get_by_name(context, identity, **kwargs)
-        else:
-            action = cls.get_by_name(context, identity, **kwargs)
-            if not action:
-                action = cls.get_by_short_id(context, identity, **kwargs)
-
-        if not action:
+        obj = db_api.action_find(context, identity, **kwargs)
+        if obj is None:
             raise exception.ResourceNotFound(type='action', id=identity)
 
-        return action
+        return cls._from_db_object(context, cls(), obj)
 
     @classmethod
     def get(cls, context, action_id, **kwargs):
@@ -103,9 +98,40 @@ class Action(base.SenlinObject, base.VersionedObjectDictCompat):
         return [cls._from_db_object(context, cls(), obj) for obj in objs]
 
     @classmethod
-    def get_all(cls, context, **kwargs):
+    def _load_dependencies(cls, context, actions):
+        """Fill in the dependencies of actions using a single query.
+
+        :param context: An instance of the request context.
+        :param actions: A list of action objects loaded without their
+                        dependencies.
+        """
+        dep_on = dict((a.id, []) for a in actions)
+        dep_by = dict((a.id, []) for a in actions)
+        for dep in db_api.dependency_get_all(context, list(dep_on)):
+            if dep.dependent in dep_on:
+                dep_on[dep.dependent].append(dep)
+            if dep.depended in dep_by:
+                dep_by[dep.depended].append(dep)
+
+        for action in actions:
+            action.dep_on = dep_on[action.id]
+            action.dep_by = dep_by[action.id]
+            action.obj_reset_changes(['dep_on', 'dep_by'])
+
+    @classmethod
+    def get_all(cls, context, with_deps=True, **kwargs):
+        """Get actions matching the given criteria.
+
+        :param context: An instance of the request context.
+        :param with_deps: Whether the dependencies of the actions are
+                          loaded, they are left empty otherwise.
+        :param dict kwargs: Other query parameters.
+        """
         objs = db_api.action_get_all(context, **kwargs)
-        return [cls._from_db_object(context, cls(), obj) for obj in objs]
+        actions = [cls._from_db_object(context, cls(), obj) for obj in objs]
+        if with_deps and actions:
+            cls._load_dependencies(context, actions)
+        return actions
 
     @classmethod
     def get_all_by_owner(cls, context, owner):
@@ -149,6 +175,11 @@ class Action(base.SenlinObject, base.VersionedObjectDictCompat):
     def acquire_first_ready(cls, context, owner, timestamp):
         return db_api.action_acquire_first_ready(context, owner, timestamp)
 
+    @classmethod
+    def acquire_ready_batch(cls, context, owner, timestamp, limit, ids=None):
+        return db_api.action_acquire_ready_batch(context, owner, timestamp,
+                                                 limit, ids=ids)
+
     @classmethod
     def abandon(cls, context, action_id, values=None):
         return db_api.action_abandon(context, action_id, values)
@@ -169,6 +200,16 @@ class Action(base.SenlinObject, base.VersionedObjectDictCompat):
     def update(cls, context, action_id, values):
         return db_api.action_update(context, action_id, values)
 
+    @classmethod
+    def update_data(cls, context, action_id, values=None, removed=None):
+        """Set or remove keys in the data of an action.
+
+        Only the given keys are written, so changes made concurrently to
+        other keys are preserved.
+        """
+        return db_api.action_update_data(context, action_id, values=values,
+                                         removed=removed)
+
     @classmethod
     def delete(cls, context, action_id):
         db_api.action_delete(context, action_id)
@@ -178,7 +219,7 @@ class Action(base.SenlinObject, base.VersionedObjectDictCompat):
                          action_excluded=None, status=None):
         """Delete an action with the target and other given params.
 
-        :param target: The ID of the target cluster/node
+        :param target: The ID of the target cluster/node, or a list of IDs.
         :param action: A list of actions to be included.
         :param action_excluded: A list of actions to be excluded.
         :param status: A list of statuses to be delete filtered.
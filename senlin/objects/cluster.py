@@ -13,7 +13,6 @@
 """Cluster object."""
 
 from oslo_utils import timeutils
-from oslo_utils import uuidutils
 
 from senlin.common import exception as exc
 from senlin.common import utils
@@ -79,30 +78,21 @@ class Cluster(base.SenlinObject, base.VersionedObjectDictCompat):
 
     @classmethod
     def find(cls, context, identity, project_safe=True):
-        cluster = None
-        if uuidutils.is_uuid_like(identity):
-            cluster = cls.get(context, identity, project_safe=project_safe)
-            if not cluster:
-                cluster = cls.get_by_name(context, identity,
-                                          project_safe=project_safe)
-        else:
-            cluster = cls.get_by_name(context, identity,
-                                      project_safe=project_safe)
-            # maybe it is a short form of UUID
-            if not cluster:
-                cluster = cls.get_by_short_id(context, identity,
-                                              project_safe=project_safe)
-
-        if not cluster:
+        obj = db_api.cluster_find(context, identity, project_safe=project_safe)
+        if obj is None:
             raise exc.ResourceNotFound(type='cluster', id=identity)
 
-        return cluster
+        return cls._from_db_object(context, cls(), obj)
 
     @classmethod
     def get(cls, context, cluster_id, **kwargs):
         obj = db_api.cluster_get(context, cluster_id, **kwargs)
         return cls._from_db_object(context, cls(), obj)
 
+    @classmethod
+    def exists(cls, context, cluster_id, **kwargs):
+        return db_api.cluster_exists(context, cluster_id, **kwargs)
+
     @classmethod
     def get_by_name(cls, context, name, **kwargs):
         obj = db_api.cluster_get_by_name(context, name, **kwargs)
@@ -119,8 +109,8 @@ class Cluster(base.SenlinObject, base.VersionedObjectDictCompat):
         return [cls._from_db_object(context, cls(), obj) for obj in objs]
 
     @classmethod
-    def get_next_index(cls, context, cluster_id):
-        return db_api.cluster_next_index(context, cluster_id)
+    def get_next_index(cls, context, cluster_id, count=1):
+        return db_api.cluster_next_index(context, cluster_id, count)
 
     @classmethod
     def count_all(cls, context, **kwargs):
@@ -38,3 +38,7 @@ class Dependency(base.SenlinObject, base.VersionedObjectDictCompat):
     @classmethod
     def get_dependents(cls, context, action_id):
         return db_api.dependency_get_dependents(context, action_id)
+
+    @classmethod
+    def get_all(cls, context, action_ids):
+        return db_api.dependency_get_all(context, action_ids)
@@ -12,8 +12,6 @@
 
 """Event object."""
 
-from oslo_utils import uuidutils
-
 from senlin.common import exception
 from senlin.db import api as db_api
 from senlin.objects import base
@@ -45,6 +43,10 @@ class Event(base.SenlinObject, base.VersionedObjectDictCompat):
         obj = db_api.event_create(context, values)
         return cls._from_db_object(context, cls(context), obj)
 
+    @classmethod
+    def create_batch(cls, context, values):
+        db_api.event_create_batch(context, values)
+
     @classmethod
     def find(cls, context, identity, **kwargs):
         """Find an event with the given identity.
@@ -55,12 +57,8 @@ class Event(base.SenlinObject, base.VersionedObjectDictCompat):
 
         :return: A dictionary containing the details of the event.
         """
-        event = None
-        if uuidutils.is_uuid_like(identity):
-            event = cls.get(context, identity, **kwargs)
-        if not event:
-            event = cls.get_by_short_id(context, identity, **kwargs)
-        if not event:
+        event = db_api.event_find(context, identity, **kwargs)
+        if event is None:
             raise exception.ResourceNotFound(type='event', id=identity)
 
         return event
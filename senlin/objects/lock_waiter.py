@@ -0,0 +1,43 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Lock waiter object."""
+
+from senlin.db import api as db_api
+from senlin.objects import base
+from senlin.objects import fields
+
+
+@base.SenlinObjectRegistry.register
+class LockWaiter(base.SenlinObject, base.VersionedObjectDictCompat):
+    """Senlin lock waiter object."""
+
+    fields = {
+        'lock_id': fields.UUIDField(),
+        'action_id': fields.UUIDField(),
+        'shared': fields.BooleanField(),
+        'created_at': fields.DateTimeField(nullable=True),
+        'updated_at': fields.DateTimeField(nullable=True),
+    }
+
+    @classmethod
+    def wait(cls, context, lock_id, action_id, shared=False, values=None):
+        return db_api.lock_wait(context, lock_id, action_id, shared=shared,
+                                values=values)
+
+    @classmethod
+    def wake(cls, lock_id):
+        return db_api.lock_wake(lock_id)
+
+    @classmethod
+    def get_stale(cls, timeout):
+        return db_api.lock_waiter_get_stale(timeout)
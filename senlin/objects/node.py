@@ -12,8 +12,6 @@
 
 """Node object."""
 
-from oslo_utils import uuidutils
-
 from senlin.common import exception
 from senlin.common import utils
 from senlin.db import api as db_api
@@ -96,23 +94,11 @@ class Node(base.SenlinObject, base.VersionedObjectDictCompat):
                  or an exception of ``MultipleChoices`` more than one node
                  found matching the criteria.
         """
-        node = None
-        if uuidutils.is_uuid_like(identity):
-            node = cls.get(context, identity, project_safe=project_safe)
-            if not node:
-                node = cls.get_by_name(context, identity,
-                                       project_safe=project_safe)
-        else:
-            node = cls.get_by_name(context, identity,
-                                   project_safe=project_safe)
-            if not node:
-                node = cls.get_by_short_id(context, identity,
-                                           project_safe=project_safe)
-
-        if node is None:
+        obj = db_api.node_find(context, identity, project_safe=project_safe)
+        if obj is None:
             raise exception.ResourceNotFound(type='node', id=identity)
 
-        return node
+        return cls._from_db_object(context, cls(), obj)
 
     @classmethod
     def get(cls, context, node_id, **kwargs):
@@ -155,6 +141,23 @@ class Node(base.SenlinObject, base.VersionedObjectDictCompat):
         values = cls._transpose_metadata(values)
         db_api.node_update(context, obj_id, values)
 
+    @classmethod
+    def update_data(cls, context, obj_id, values=None, removed=None):
+        """Set or remove keys in the data of a node.
+
+        Only the given keys are written, so changes made concurrently to
+        other keys are preserved.
+        """
+        db_api.node_update_data(context, obj_id, values=values,
+                                removed=removed)
+
+    @classmethod
+    def update_batch(cls, context, node_ids, values, status=None):
+        """Update many nodes with the same values in one statement."""
+        values = cls._transpose_metadata(values)
+        return db_api.node_update_batch(context, node_ids, values,
+                                        status=status)
+
     @classmethod
     def migrate(cls, context, obj_id, to_cluster, timestamp, role=None):
         return db_api.node_migrate(context, obj_id, to_cluster, timestamp,
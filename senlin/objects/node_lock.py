@@ -34,6 +34,10 @@ class NodeLock(base.SenlinObject, base.VersionedObjectDictCompat):
     def is_locked(cls, cluster_id):
         return db_api.node_is_locked(cluster_id)
 
+    @classmethod
+    def get_locked(cls, node_ids):
+        return db_api.node_lock_get_locked(node_ids)
+
     @classmethod
     def release(cls, node_id, action_id):
         return db_api.node_lock_release(node_id, action_id)
@@ -12,8 +12,6 @@
 
 """Policy object."""
 
-from oslo_utils import uuidutils
-
 from senlin.common import exception
 from senlin.db import api as db_api
 from senlin.objects import base
@@ -57,19 +55,11 @@ class Policy(base.SenlinObject, base.VersionedObjectDictCompat):
         :return: A DB object of policy or an exception of `ResourceNotFound`
                  if no matching object is found.
         """
-        if uuidutils.is_uuid_like(identity):
-            policy = cls.get(context, identity, **kwargs)
-            if not policy:
-                policy = cls.get_by_name(context, identity, **kwargs)
-        else:
-            policy = cls.get_by_name(context, identity, **kwargs)
-            if not policy:
-                policy = cls.get_by_short_id(context, identity, **kwargs)
-
-        if not policy:
+        obj = db_api.policy_find(context, identity, **kwargs)
+        if obj is None:
             raise exception.ResourceNotFound(type='policy', id=identity)
 
-        return policy
+        return cls._from_db_object(context, cls(), obj)
 
     @classmethod
     def get(cls, context, policy_id, **kwargs):
@@ -11,7 +11,6 @@
 # under the License.
 
 """Profile object."""
-from oslo_utils import uuidutils
 
 from senlin.common import exception
 from senlin.common import utils
@@ -57,19 +56,11 @@ class Profile(base.SenlinObject, base.VersionedObjectDictCompat):
         :return: A DB object of profile or an exception `ResourceNotFound`
                  if no matching object is found.
         """
-        if uuidutils.is_uuid_like(identity):
-            profile = cls.get(context, identity, **kwargs)
-            if not profile:
-                profile = cls.get_by_name(context, identity, **kwargs)
-        else:
-            profile = cls.get_by_name(context, identity, **kwargs)
-            if not profile:
-                profile = cls.get_by_short_id(context, identity, **kwargs)
-
-        if not profile:
+        obj = db_api.profile_find(context, identity, **kwargs)
+        if obj is None:
             raise exception.ResourceNotFound(type='profile', id=identity)
 
-        return profile
+        return cls._from_db_object(context, cls(), obj)
 
     @classmethod
     def get(cls, context, profile_id, **kwargs):
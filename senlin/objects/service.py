@@ -28,6 +28,7 @@ class Service(base.SenlinObject, base.VersionedObjectDictCompat):
         'topic': fields.StringField(),
         'disabled': fields.BooleanField(),
         'disabled_reason': fields.StringField(nullable=True),
+        'load': fields.IntegerField(nullable=True),
         'created_at': fields.DateTimeField(),
         'updated_at': fields.DateTimeField(),
     }
@@ -48,6 +49,11 @@ class Service(base.SenlinObject, base.VersionedObjectDictCompat):
         objs = db_api.service_get_all()
         return [cls._from_db_object(context, cls(), obj) for obj in objs]
 
+    @classmethod
+    def get_all_alive(cls, context, binary):
+        objs = db_api.service_get_all_alive(binary)
+        return [cls._from_db_object(context, cls(), obj) for obj in objs]
+
     @classmethod
     def get_all_expired(cls, context, binary):
         objs = db_api.service_get_all_expired(binary)
@@ -64,4 +70,4 @@ class Service(base.SenlinObject, base.VersionedObjectDictCompat):
 
     @classmethod
     def gc_by_engine(cls, engine_id):
-        db_api.gc_by_engine(engine_id)
+        return db_api.gc_by_engine(engine_id)
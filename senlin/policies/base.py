@@ -14,6 +14,7 @@ from oslo_context import context as oslo_context
 from oslo_utils import reflection
 from oslo_utils import timeutils
 
+from senlin.common import cache
 from senlin.common import context as senlin_context
 from senlin.common import exception
 from senlin.common.i18n import _
@@ -153,17 +154,22 @@ class Policy(object):
                              loaded.
         :returns: An object of the proper policy class.
         """
+        if db_policy is None:
+            db_policy = cache.get(cache.POLICY, policy_id, context,
+                                  project_safe=project_safe)
         if db_policy is None:
             db_policy = po.Policy.get(context, policy_id,
                                       project_safe=project_safe)
             if db_policy is None:
                 raise exception.ResourceNotFound(type='policy', id=policy_id)
+            cache.put(cache.POLICY, db_policy)
 
         return cls._from_object(db_policy)
 
     @classmethod
     def delete(cls, context, policy_id):
         po.Policy.delete(context, policy_id)
+        cache.notify_invalidate(cache.POLICY, policy_id, cache.DELETED)
 
     def store(self, context):
         """Store the policy object into database table."""
@@ -183,6 +189,7 @@ class Policy(object):
             self.updated_at = timestamp
             values['updated_at'] = timestamp
             po.Policy.update(context, self.id, values)
+            cache.notify_invalidate(cache.POLICY, self.id, timestamp)
         else:
             self.created_at = timestamp
             values['created_at'] = timestamp
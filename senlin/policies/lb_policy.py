@@ -440,8 +440,8 @@ class LoadBalancingPolicy(base.Policy):
                 return False, 'Failed in adding node into lb pool'
 
             node.data.update({'lb_member': member_id})
-            values = {'data': node.data}
-            no.Node.update(oslo_context.get_current(), node.id, values)
+            no.Node.update_data(oslo_context.get_current(), node.id,
+                                {'lb_member': member_id})
 
         cluster_data_lb = cluster.data.get('loadbalancers', {})
         cluster_data_lb[self.id] = {'vip_address': data.pop('vip_address')}
@@ -480,9 +480,8 @@ class LoadBalancingPolicy(base.Policy):
             for node in cluster.nodes:
                 if 'lb_member' in node.data:
                     node.data.pop('lb_member')
-                    values = {'data': node.data}
-                    no.Node.update(oslo_context.get_current(),
-                                   node.id, values)
+                    no.Node.update_data(oslo_context.get_current(),
+                                        node.id, removed=['lb_member'])
         else:
             # the lb pool is existed, we need to remove servers from it
             nodes = cluster.nodes
@@ -569,16 +568,17 @@ class LoadBalancingPolicy(base.Policy):
                 continue
 
             res = driver.member_remove(lb_id, pool_id, member_id)
-            values = {}
             if res is not True and handle_err is True:
                 failed_nodes.append(node.id)
-                values['status'] = consts.NS_WARNING
-                values['status_reason'] = _(
-                    'Failed in removing node from lb pool.')
+                values = {
+                    'status': consts.NS_WARNING,
+                    'status_reason': _(
+                        'Failed in removing node from lb pool.'),
+                }
+                no.Node.update(context, node_id, values)
             else:
                 node.data.pop('lb_member', None)
-                values['data'] = node.data
-            no.Node.update(context, node_id, values)
+                no.Node.update_data(context, node_id, removed=['lb_member'])
 
         return failed_nodes
 
@@ -601,16 +601,17 @@ class LoadBalancingPolicy(base.Policy):
                 continue
 
             member_id = driver.member_add(node, lb_id, pool_id, port, subnet)
-            values = {}
             if member_id is None:
                 failed_nodes.append(node.id)
-                values['status'] = consts.NS_WARNING
-                values['status_reason'] = _(
-                    'Failed in adding node into lb pool.')
+                values = {
+                    'status': consts.NS_WARNING,
+                    'status_reason': _('Failed in adding node into lb pool.'),
+                }
+                no.Node.update(context, node_id, values)
             else:
                 node.data.update({'lb_member': member_id})
-                values['data'] = node.data
-            no.Node.update(context, node_id, values)
+                no.Node.update_data(context, node_id,
+                                    {'lb_member': member_id})
 
         return failed_nodes
 
@@ -633,12 +634,10 @@ class LoadBalancingPolicy(base.Policy):
         data = node.data
         lb_member = data.get('lb_member', None)
         recovery = data.pop('recovery', None)
-        values = {}
 
         # lb_member is None, need to add to lb pool
         if not lb_member:
-            values['data'] = data
-            no.Node.update(action.context, node.id, values)
+            no.Node.update_data(action.context, node.id, removed=['recovery'])
             return candidates
 
         # was a member of lb pool, check whether has been recreated
@@ -646,8 +645,8 @@ class LoadBalancingPolicy(base.Policy):
             self._remove_member(action.context, candidates, policy, driver,
                                 handle_err=False)
             data.pop('lb_member', None)
-            values['data'] = data
-            no.Node.update(action.context, node.id, values)
+            no.Node.update_data(action.context, node.id,
+                                removed=['recovery', 'lb_member'])
             return candidates
 
         return None
@@ -10,6 +10,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
 import copy
 import eventlet
 import inspect
@@ -17,9 +18,11 @@ import inspect
 from oslo_config import cfg
 from oslo_context import context as oslo_context
 from oslo_log import log as logging
+from oslo_serialization import jsonutils
 from oslo_utils import timeutils
 from osprofiler import profiler
 
+from senlin.common import cache
 from senlin.common import consts
 from senlin.common import context
 from senlin.common import exception as exc
@@ -152,12 +155,16 @@ class Profile(object):
 
     @classmethod
     def load(cls, ctx, profile=None, profile_id=None, project_safe=True):
-        """Retrieve a profile object from database."""
+        """Retrieve a profile object from cache or database."""
+        if profile is None:
+            profile = cache.get(cache.PROFILE, profile_id, ctx,
+                                project_safe=project_safe)
         if profile is None:
             profile = po.Profile.get(ctx, profile_id,
                                      project_safe=project_safe)
             if profile is None:
                 raise exc.ResourceNotFound(type='profile', id=profile_id)
+            cache.put(cache.PROFILE, profile)
 
         return cls._from_object(profile)
 
@@ -191,6 +198,7 @@ class Profile(object):
     @classmethod
     def delete(cls, ctx, profile_id):
         po.Profile.delete(ctx, profile_id)
+        cache.notify_invalidate(cache.PROFILE, profile_id, cache.DELETED)
 
     def store(self, ctx):
         """Store the profile into database and return its ID."""
@@ -211,6 +219,7 @@ class Profile(object):
             self.updated_at = timestamp
             values['updated_at'] = timestamp
             po.Profile.update(ctx, self.id, values)
+            cache.notify_invalidate(cache.PROFILE, self.id, timestamp)
         else:
             self.created_at = timestamp
             values['created_at'] = timestamp
@@ -303,12 +312,71 @@ class Profile(object):
         profile = cls.load(ctx, profile_id=obj.profile_id)
         return profile.do_check(obj)
 
+    @classmethod
+    def _load_batches(cls, ctx, objs):
+        """Group nodes whose physical objects can be checked together.
+
+        Profiles of the same type and with the same context reach the same
+        backend, so the nodes of all of them are handled by one profile.
+        This way the backend is queried once per batch instead of once per
+        profile, e.g. after a cluster was updated to a new profile.
+
+        :param ctx: The request context.
+        :param objs: A list of node objects.
+        :returns: A list of (profile, node objects) tuples.
+        """
+        profiles = {}
+        batches = collections.OrderedDict()
+        for obj in objs:
+            profile = profiles.get(obj.profile_id)
+            if profile is None:
+                profile = cls.load(ctx, profile_id=obj.profile_id)
+                profiles[obj.profile_id] = profile
+            key = (profile.type,
+                   jsonutils.dumps(profile.context, sort_keys=True))
+            batches.setdefault(key, (profile, []))[1].append(obj)
+        return list(batches.values())
+
+    @classmethod
+    @profiler.trace('Profile.check_objects', hide_args=False)
+    def check_objects(cls, ctx, objs):
+        """Check a list of nodes in batches.
+
+        :param ctx: The request context.
+        :param objs: A list of node objects to check.
+        :returns: A dict mapping node IDs to True if the physical object is
+                  active, False if it is not, or None if the node has to be
+                  checked on its own.
+        """
+        result = {}
+        for profile, group in cls._load_batches(ctx, objs):
+            result.update(profile.do_check_batch(group))
+        return result
+
     @classmethod
     @profiler.trace('Profile.check_object', hide_args=False)
     def healthcheck_object(cls, ctx, obj, health_check_type):
         profile = cls.load(ctx, profile_id=obj.profile_id)
         return profile.do_healthcheck(obj, health_check_type)
 
+    @classmethod
+    @profiler.trace('Profile.healthcheck_objects', hide_args=False)
+    def healthcheck_objects(cls, ctx, objs, health_check_type):
+        """Health check a list of nodes in batches.
+
+        :param ctx: The request context.
+        :param objs: A list of node objects to check.
+        :param health_check_type: The type of health check.
+        :returns: A dict mapping node IDs to True if the node is healthy or
+                  False otherwise. Nodes left out have to be checked on
+                  their own.
+        """
+        result = {}
+        for profile, group in cls._load_batches(ctx, objs):
+            result.update(profile.do_healthcheck_batch(group,
+                                                       health_check_type))
+        return result
+
     @classmethod
     @profiler.trace('Profile.recover_object', hide_args=False)
     def recover_object(cls, ctx, obj, **options):
@@ -476,6 +544,19 @@ class Profile(object):
         LOG.warning("Check operation not supported.")
         return True
 
+    def do_check_batch(self, objs):
+        """Default batch check operation.
+
+        Profile types able to check many nodes from a single listing of
+        their physical objects should override this, by default every node
+        is left to be checked on its own.
+
+        :param objs: The node objects to operate on.
+        :return: A dict mapping node IDs to True if the physical object is
+                 active, False if it is not, or None if unknown.
+        """
+        return dict((obj.id, None) for obj in objs)
+
     def do_healthcheck(self, obj):
         """Default healthcheck operation.
 
@@ -488,6 +569,19 @@ class Profile(object):
         """
         return self.do_check(obj)
 
+    def do_healthcheck_batch(self, objs, health_check_type):
+        """Default batch healthcheck operation.
+
+        Profile types able to check many nodes at once should override this,
+        by default every node is left to be checked on its own.
+
+        :param objs: The node objects to operate on.
+        :param health_check_type: The type of health check.
+        :return: A dict mapping node IDs to True if the node is healthy or
+                 False otherwise. Nodes left out are unknown.
+        """
+        return {}
+
     def do_get_details(self, obj):
         """For subclass to override."""
         LOG.warning("Get_details operation not supported.")
@@ -23,6 +23,7 @@ from senlin.common import context
 from senlin.common import exception as exc
 from senlin.common.i18n import _
 from senlin.common import schema
+from senlin.drivers import base as driver_base
 from senlin.objects import node as node_obj
 from senlin.profiles import base
 
@@ -1785,6 +1786,55 @@ class ServerProfile(base.Profile):
 
         return True
 
+    def _list_servers(self, objs):
+        """List the servers of the projects the given nodes belong to.
+
+        The servers of each project are listed once. A node whose server is
+        not in the listing has to be checked on its own, which tells a
+        deleted server apart from one created after the listing.
+
+        :param objs: The node objects to list the servers for.
+        :return: A dict mapping project IDs to a dict of the servers of the
+            project by ID, or to None if they could not be listed.
+        """
+        projects = {}
+        for obj in objs:
+            projects.setdefault(obj.project, obj.user)
+
+        result = {}
+        for project, user in projects.items():
+            try:
+                params = self._build_conn_params(user, project)
+                cc = driver_base.SenlinDriver().compute(params)
+                result[project] = dict((s.id, s) for s in cc.server_list())
+            except Exception as ex:
+                LOG.info('Failed in listing servers of project %s, checking '
+                         'its nodes one by one: %s', project, ex)
+                result[project] = None
+        return result
+
+    def do_check_batch(self, objs):
+        """Check operation for many nodes.
+
+        Every node is checked against a listing of the servers of its
+        project. Nodes whose server is not in the listing are reported as
+        unknown.
+
+        :param objs: The node objects to operate on.
+        :return: A dict mapping node IDs to True if the server is active,
+            False if it is not, or None if unknown.
+        """
+        listings = self._list_servers(objs)
+
+        result = {}
+        for obj in objs:
+            server = (listings[obj.project] or {}).get(obj.physical_id)
+            if server is None:
+                result[obj.id] = None
+            else:
+                result[obj.id] = server.status == consts.VS_ACTIVE
+        return result
+
     def do_healthcheck(self, obj, health_check_type):
         """Healthcheck operation.
 
@@ -1832,6 +1882,32 @@ class ServerProfile(base.Profile):
                 consts.POLL_STATUS_PASS, obj.name)
             return True
 
+        return self._do_healthcheck_by_type(obj, server, health_check_type)
+
+    def do_healthcheck_batch(self, objs, health_check_type):
+        """Healthcheck operation for many nodes.
+
+        Every node is checked against a listing of the servers of its
+        project. Nodes whose server is not in the listing are left out of
+        the result, so that the caller checks them one by one.
+
+        :param objs: The node objects to operate on.
+        :param health_check_type: The type of health check.  Either
+        NODE_STATUS_POLLING or HYPERVISOR_STATUS_POLLING.
+        :return: A dict mapping node IDs to True if the node is healthy or
+            False otherwise.
+        """
+        listings = self._list_servers(objs)
+
+        result = {}
+        for obj in objs:
+            server = (listings[obj.project] or {}).get(obj.physical_id)
+            if server is not None:
+                result[obj.id] = self._do_healthcheck_by_type(
+                    obj, server, health_check_type)
+        return result
+
+    def _do_healthcheck_by_type(self, obj, server, health_check_type):
         if health_check_type == consts.NODE_STATUS_POLLING:
             return self._do_healthcheck_server(obj, server)
         elif health_check_type == consts.HYPERVISOR_STATUS_POLLING:
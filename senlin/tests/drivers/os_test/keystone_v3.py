@@ -94,6 +94,17 @@ class KeystoneClient(base.DriverBase):
         access_info = sdk.authenticate(**creds)
         return access_info['token']
 
+    @classmethod
+    @sdk.translate_exception
+    def get_token_info(cls, **creds):
+        """Get token and its expiry time using given credential"""
+
+        access_info = sdk.authenticate(**creds)
+        return {
+            'token': access_info['token'],
+            'expires_at': access_info['expires_at'],
+        }
+
     @classmethod
     @sdk.translate_exception
     def get_user_id(cls, **creds):
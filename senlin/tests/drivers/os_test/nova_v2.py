@@ -200,6 +200,9 @@ class NovaClient(base.DriverBase):
     def server_get(self, server):
         return sdk.FakeResourceObject(self.fake_server_get)
 
+    def server_list(self, **query):
+        return [sdk.FakeResourceObject(self.fake_server_get)]
+
     def wait_for_server(self, server, status=consts.VS_ACTIVE,
                         failures=None,
                         interval=2, timeout=None):
@@ -12,6 +12,8 @@
 
 from unittest import mock
 
+from oslo_config import cfg
+
 from senlin.api.middleware import trust
 from senlin.common import context
 from senlin.common import exception
@@ -214,3 +216,27 @@ class TestTrustMiddleware(base.SenlinTestCase):
             uid='FAKE_ID', passwd='FAKE_PASS')
         mock_keystone.trust_get_by_trustor.assert_called_once_with(
             self.context.user_id, 'FAKE_ADMIN_ID', self.context.project_id)
+
+    @mock.patch.object(trust.TrustMiddleware, '_get_trust')
+    def test_process_request(self, mock_get):
+        mock_get.return_value = 'FAKE_TRUST_ID'
+
+        self.middleware.process_request(self.req)
+        self.middleware.process_request(self.req)
+
+        self.assertEqual('FAKE_TRUST_ID', self.context.trusts)
+        mock_get.assert_called_once_with(self.req)
+        stats = self.middleware.cache.stats()
+        self.assertEqual(1, stats['hits'])
+        self.assertEqual(1, stats['misses'])
+
+    @mock.patch.object(trust.TrustMiddleware, '_get_trust')
+    def test_process_request_cache_disabled(self, mock_get):
+        cfg.CONF.set_override('trust_cache_size', 0, group='senlin_api')
+        middleware = trust.TrustMiddleware(None)
+        mock_get.return_value = 'FAKE_TRUST_ID'
+
+        middleware.process_request(self.req)
+        middleware.process_request(self.req)
+
+        self.assertEqual(2, mock_get.call_count)
@@ -10,9 +10,11 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import datetime
 from unittest import mock
 
 from oslo_config import cfg
+from oslo_utils import timeutils
 from oslo_utils import uuidutils
 import webob
 
@@ -117,23 +119,49 @@ class TestWebhookMiddleware(base.SenlinTestCase):
 
     @mock.patch.object(driver_base, 'SenlinDriver')
     def test_get_token_succeeded(self, mock_senlindriver):
-        class FakeAccessInfo(object):
-            def __init__(self, auth_token):
-                self.auth_token = auth_token
+        sd = mock.Mock()
+        sd.identity.get_token_info.return_value = {
+            'token': 'TEST_TOKEN',
+            'expires_at': timeutils.utcnow(True) + datetime.timedelta(
+                hours=1),
+        }
+        mock_senlindriver.return_value = sd
+
+        token = self.middleware._get_token(**self.credential)
+        self.assertEqual('TEST_TOKEN', token)
+        sd.identity.get_token_info.assert_called_once_with(**self.credential)
+
+        # the token is cached for the same credential
+        token = self.middleware._get_token(**self.credential)
+        self.assertEqual('TEST_TOKEN', token)
+        self.assertEqual(1, sd.identity.get_token_info.call_count)
 
+        self.credential['password'] = 'xyz'
+        self.middleware._get_token(**self.credential)
+        self.assertEqual(2, sd.identity.get_token_info.call_count)
+
+    @mock.patch.object(driver_base, 'SenlinDriver')
+    def test_get_token_expiring(self, mock_senlindriver):
         sd = mock.Mock()
-        sd.identity.get_token.return_value = 'TEST_TOKEN'
+        sd.identity.get_token_info.return_value = {
+            'token': 'TEST_TOKEN',
+            'expires_at': timeutils.utcnow(True) + datetime.timedelta(
+                seconds=webhook_middleware.TOKEN_EXPIRY_MARGIN - 1),
+        }
         mock_senlindriver.return_value = sd
 
+        self.middleware._get_token(**self.credential)
         token = self.middleware._get_token(**self.credential)
+
         self.assertEqual('TEST_TOKEN', token)
+        self.assertEqual(2, sd.identity.get_token_info.call_count)
 
     @mock.patch.object(driver_base, 'SenlinDriver')
     def test_get_token_failed(self, mock_senlindriver):
         self.credential['webhook_id'] = 'WEBHOOK_ID'
 
         sd = mock.Mock()
-        sd.identity.get_token.side_effect = Exception()
+        sd.identity.get_token_info.side_effect = Exception()
         mock_senlindriver.return_value = sd
 
         self.assertRaises(exception.Forbidden, self.middleware._get_token,
@@ -198,6 +226,11 @@ class TestWebhookMiddleware(base.SenlinTestCase):
                                            {'identity': 'WEBHOOK'})
         rpcc.call.assert_called_with(dbctx, 'receiver_get', obj)
 
+        # the actor of the receiver is cached
+        self.middleware.process_request(req)
+        self.assertEqual(1, rpcc.call.call_count)
+        self.assertEqual(2, mock_token.call_count)
+
     def test_process_request_method_not_post(self):
         # Request method is not POST
         req = mock.Mock()
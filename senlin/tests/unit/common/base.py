@@ -21,7 +21,9 @@ from oslo_serialization import jsonutils
 import testscenarios
 import testtools
 
+from senlin.common import cache
 from senlin.common import messaging
+from senlin.drivers import sdk
 from senlin.engine import service
 from senlin.tests.unit.common import utils
 
@@ -76,6 +78,11 @@ class SenlinTestCase(testscenarios.WithScenarios,
         messaging.setup("fake://", optional=True)
         self.addCleanup(messaging.cleanup)
 
+        cache.reset()
+        self.addCleanup(cache.reset)
+        sdk.reset_connection_pool()
+        self.addCleanup(sdk.reset_connection_pool)
+
         utils.setup_dummy_db()
         self.addCleanup(utils.reset_dummy_db)
 
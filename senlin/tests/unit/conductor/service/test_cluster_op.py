@@ -34,7 +34,7 @@ class ClusterOpTest(base.SenlinTestCase):
         self.ctx = utils.dummy_context(project='cluster_op_test_project')
         self.svc = service.ConductorService('host-a', 'topic-a')
 
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     @mock.patch.object(am.Action, 'create')
     @mock.patch.object(no.Node, 'ids_by_cluster')
     @mock.patch.object(cm.Cluster, 'load')
@@ -77,7 +77,7 @@ class ClusterOpTest(base.SenlinTestCase):
                 'nodes': ['NODE1', 'NODE2']
             }
         )
-        mock_start.assert_called_once_with()
+        mock_start.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(co.Cluster, 'find')
     def test_cluster_op_cluster_not_found(self, mock_find):
@@ -140,7 +140,7 @@ class ClusterOpTest(base.SenlinTestCase):
         mock_cluster.assert_called_once_with(self.ctx, dbcluster=x_db_cluster)
         x_schema.validate.assert_called_once_with({'style': 'tango'})
 
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     @mock.patch.object(am.Action, 'create')
     @mock.patch.object(no.Node, 'ids_by_cluster')
     @mock.patch.object(cm.Cluster, 'load')
@@ -181,9 +181,9 @@ class ClusterOpTest(base.SenlinTestCase):
                 'nodes': ['NODE1', 'NODE2']
             }
         )
-        mock_start.assert_called_once_with()
+        mock_start.assert_called_once_with(['ACTION_ID'])
 
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     @mock.patch.object(am.Action, 'create')
     @mock.patch.object(no.Node, 'ids_by_cluster')
     @mock.patch.object(cm.Cluster, 'load')
@@ -221,7 +221,7 @@ class ClusterOpTest(base.SenlinTestCase):
                 'nodes': ['NODE1', 'NODE2']
             }
         )
-        mock_start.assert_called_once_with()
+        mock_start.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(am.Action, 'create')
     @mock.patch.object(no.Node, 'ids_by_cluster')
@@ -175,7 +175,7 @@ class ClusterPolicyTest(base.SenlinTestCase):
     @mock.patch.object(action_mod.Action, 'create')
     @mock.patch.object(co.Cluster, 'find')
     @mock.patch.object(po.Policy, 'find')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     def test_attach2(self, notify, mock_policy, mock_cluster, mock_action):
         mock_cluster.return_value = mock.Mock(id='12345678abcd')
         mock_policy.return_value = mock.Mock(id='87654321abcd')
@@ -197,7 +197,7 @@ class ClusterPolicyTest(base.SenlinTestCase):
             status=action_mod.Action.READY,
             inputs={'policy_id': '87654321abcd', 'enabled': True},
         )
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(co.Cluster, 'find')
     def test_attach2_cluster_not_found(self, mock_cluster):
@@ -238,7 +238,7 @@ class ClusterPolicyTest(base.SenlinTestCase):
     @mock.patch.object(cpo.ClusterPolicy, 'get')
     @mock.patch.object(co.Cluster, 'find')
     @mock.patch.object(po.Policy, 'find')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     def test_detach2(self, notify, mock_policy, mock_cluster, mock_cp,
                      mock_action):
         mock_cluster.return_value = mock.Mock(id='12345678abcd')
@@ -262,7 +262,7 @@ class ClusterPolicyTest(base.SenlinTestCase):
             status=action_mod.Action.READY,
             inputs={'policy_id': '87654321abcd'},
         )
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(co.Cluster, 'find')
     def test_detach2_cluster_not_found(self, mock_cluster):
@@ -325,7 +325,7 @@ class ClusterPolicyTest(base.SenlinTestCase):
     @mock.patch.object(cpo.ClusterPolicy, 'get')
     @mock.patch.object(co.Cluster, 'find')
     @mock.patch.object(po.Policy, 'find')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     def test_update2(self, notify, mock_policy, mock_cluster, mock_cp,
                      mock_action):
         mock_cluster.return_value = mock.Mock(id='12345678abcd')
@@ -350,7 +350,7 @@ class ClusterPolicyTest(base.SenlinTestCase):
             status=action_mod.Action.READY,
             inputs={'policy_id': '87654321abcd', 'enabled': False},
         )
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(co.Cluster, 'find')
     def test_update2_cluster_not_found(self, mock_cluster):
@@ -118,7 +118,7 @@ class ClusterTest(base.SenlinTestCase):
     @mock.patch.object(am.Action, 'create')
     @mock.patch.object(co.Cluster, "create")
     @mock.patch.object(po.Profile, 'find')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     def test_cluster_create(self, notify, mock_profile, mock_cluster,
                             mock_action, mock_check, mock_quota):
         x_profile = mock.Mock(id='PROFILE_ID')
@@ -154,14 +154,14 @@ class ClusterTest(base.SenlinTestCase):
             cause=consts.CAUSE_RPC,
             status=am.Action.READY,
         )
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(service.ConductorService, 'check_cluster_quota')
     @mock.patch.object(su, 'check_size_params')
     @mock.patch.object(am.Action, 'create')
     @mock.patch.object(co.Cluster, "create")
     @mock.patch.object(po.Profile, 'find')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     def test_cluster_create_desired_null(self, notify, mock_profile,
                                          mock_cluster, mock_action,
                                          mock_check, mock_quota):
@@ -199,7 +199,7 @@ class ClusterTest(base.SenlinTestCase):
             cause=consts.CAUSE_RPC,
             status=am.Action.READY,
         )
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(service.ConductorService, 'check_cluster_quota')
     def test_cluster_create_exceeding_quota(self, mock_quota):
@@ -300,7 +300,7 @@ class ClusterTest(base.SenlinTestCase):
     @mock.patch.object(am.Action, 'create')
     @mock.patch.object(po.Profile, 'find')
     @mock.patch.object(co.Cluster, 'find')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     def test_cluster_update(self, notify, mock_find, mock_profile,
                             mock_action):
         x_cluster = mock.Mock(id='12345678AB', status='ACTIVE',
@@ -423,7 +423,7 @@ class ClusterTest(base.SenlinTestCase):
     @mock.patch.object(am.Action, 'create')
     @mock.patch.object(po.Profile, 'find')
     @mock.patch.object(co.Cluster, 'find')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     def test_cluster_update_same_profile(self, notify, mock_find,
                                          mock_profile, mock_action):
         x_cluster = mock.Mock(id='12345678AB', status='ACTIVE',
@@ -457,11 +457,11 @@ class ClusterTest(base.SenlinTestCase):
                 'name': 'NEW_NAME',
             },
         )
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(am.Action, 'create')
     @mock.patch.object(co.Cluster, 'find')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     def test_cluster_update_same_metadata(self, notify, mock_find,
                                           mock_action):
         x_cluster = mock.Mock(id='12345678AB', status='ACTIVE',
@@ -488,11 +488,11 @@ class ClusterTest(base.SenlinTestCase):
                 'name': 'NEW_NAME',
             },
         )
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(am.Action, 'create')
     @mock.patch.object(co.Cluster, 'find')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     def test_cluster_update_same_timeout(self, notify, mock_find,
                                          mock_action):
         x_cluster = mock.Mock(id='12345678AB', status='ACTIVE',
@@ -520,11 +520,11 @@ class ClusterTest(base.SenlinTestCase):
                 'name': 'NEW_NAME',
             },
         )
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(am.Action, 'create')
     @mock.patch.object(co.Cluster, 'find')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     def test_cluster_update_same_name(self, notify, mock_find,
                                       mock_action):
         x_cluster = mock.Mock(id='12345678AB', status='ACTIVE',
@@ -552,7 +552,7 @@ class ClusterTest(base.SenlinTestCase):
                 'timeout': 100,
             },
         )
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(co.Cluster, 'find')
     def test_cluster_update_all_property_same(self, mock_find):
@@ -607,7 +607,7 @@ class ClusterTest(base.SenlinTestCase):
     @mock.patch.object(po.Profile, 'get')
     @mock.patch.object(no.Node, 'find')
     @mock.patch.object(co.Cluster, 'find')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     def test_cluster_add_nodes(self, notify, mock_find, mock_node,
                                mock_profile, mock_action, mock_check):
         x_cluster = mock.Mock(id='12345678AB', profile_id='FAKE_ID',
@@ -642,7 +642,7 @@ class ClusterTest(base.SenlinTestCase):
             inputs={'nodes': ['NODE1', 'NODE2']},
         )
         self.assertEqual(3, mock_profile.call_count)
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(po.Profile, 'get')
     @mock.patch.object(no.Node, 'find')
@@ -815,7 +815,7 @@ class ClusterTest(base.SenlinTestCase):
     @mock.patch.object(am.Action, 'create')
     @mock.patch.object(no.Node, 'find')
     @mock.patch.object(co.Cluster, 'find')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     def test_cluster_del_nodes(self, notify, mock_find, mock_node,
                                mock_action, mock_check):
         x_cluster = mock.Mock(id='1234', desired_capacity=2)
@@ -843,7 +843,7 @@ class ClusterTest(base.SenlinTestCase):
                 'candidates': ['NODE2'],
             },
         )
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(co.Cluster, 'find')
     def test_cluster_del_nodes_cluster_not_found(self, mock_find):
@@ -978,7 +978,7 @@ class ClusterTest(base.SenlinTestCase):
     @mock.patch.object(no.Node, 'count_by_cluster')
     @mock.patch.object(su, 'calculate_desired')
     @mock.patch.object(su, 'check_size_params')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     @mock.patch.object(am.Action, 'create')
     @mock.patch.object(co.Cluster, 'find')
     def test_cluster_resize_exact_capacity(self, mock_find, mock_action,
@@ -1017,12 +1017,12 @@ class ClusterTest(base.SenlinTestCase):
                 consts.ADJUSTMENT_STRICT: True
             },
         )
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(no.Node, 'count_by_cluster')
     @mock.patch.object(su, 'calculate_desired')
     @mock.patch.object(su, 'check_size_params')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     @mock.patch.object(am.Action, 'create')
     @mock.patch.object(co.Cluster, 'find')
     def test_cluster_resize_change_in_capacity(self, mock_find, mock_action,
@@ -1062,12 +1062,12 @@ class ClusterTest(base.SenlinTestCase):
                 consts.ADJUSTMENT_STRICT: True
             },
         )
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(no.Node, 'count_by_cluster')
     @mock.patch.object(su, 'calculate_desired')
     @mock.patch.object(su, 'check_size_params')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     @mock.patch.object(am.Action, 'create')
     @mock.patch.object(co.Cluster, 'find')
     def test_cluster_resize_change_in_percentage(self, mock_find, mock_action,
@@ -1107,7 +1107,7 @@ class ClusterTest(base.SenlinTestCase):
                 consts.ADJUSTMENT_STRICT: True
             },
         )
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     def test_cluster_resize_type_missing_number(self):
         req = orco.ClusterResizeRequest(
@@ -1199,7 +1199,7 @@ class ClusterTest(base.SenlinTestCase):
         self.assertEqual("size check.",
                          str(ex.exc_info[1]))
 
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     @mock.patch.object(am.Action, 'create')
     @mock.patch.object(su, 'check_size_params')
     @mock.patch.object(co.Cluster, 'find')
@@ -1224,7 +1224,7 @@ class ClusterTest(base.SenlinTestCase):
             status=am.Action.READY,
             inputs={'count': 1},
         )
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(co.Cluster, 'find')
     def test_cluster_scale_out_cluster_not_found(self, mock_find):
@@ -1241,7 +1241,7 @@ class ClusterTest(base.SenlinTestCase):
                          str(ex.exc_info[1]))
         mock_find.assert_called_once_with(self.ctx, 'Bogus')
 
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     @mock.patch.object(am.Action, 'create')
     @mock.patch.object(co.Cluster, 'find')
     def test_cluster_scale_out_count_is_none(self, mock_find, mock_action,
@@ -1263,7 +1263,7 @@ class ClusterTest(base.SenlinTestCase):
             status=am.Action.READY,
             inputs={},
         )
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(co.Cluster, 'find')
     def test_cluster_scale_out_count_zero(self, mock_find):
@@ -1296,7 +1296,7 @@ class ClusterTest(base.SenlinTestCase):
         mock_find.assert_called_once_with(self.ctx, 'CLUSTER')
         mock_check.assert_called_once_with(x_cluster, 6)
 
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     @mock.patch.object(am.Action, 'create')
     @mock.patch.object(su, 'check_size_params')
     @mock.patch.object(co.Cluster, 'find')
@@ -1321,7 +1321,7 @@ class ClusterTest(base.SenlinTestCase):
             status=am.Action.READY,
             inputs={'count': 2},
         )
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(co.Cluster, 'find')
     def test_cluster_scale_in_cluster_not_found(self, mock_find):
@@ -1338,7 +1338,7 @@ class ClusterTest(base.SenlinTestCase):
                          str(ex.exc_info[1]))
         mock_find.assert_called_once_with(self.ctx, 'Bogus')
 
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     @mock.patch.object(am.Action, 'create')
     @mock.patch.object(co.Cluster, 'find')
     def test_cluster_scale_in_count_is_none(self, mock_find, mock_action,
@@ -1359,7 +1359,7 @@ class ClusterTest(base.SenlinTestCase):
             status=am.Action.READY,
             inputs={},
         )
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(co.Cluster, 'find')
     def test_cluster_scale_in_count_zero(self, mock_find):
@@ -1394,7 +1394,7 @@ class ClusterTest(base.SenlinTestCase):
 
     @mock.patch.object(am.Action, 'create')
     @mock.patch.object(co.Cluster, 'find')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     def test_cluster_check(self, notify, mock_find, mock_action):
         x_cluster = mock.Mock(id='CID', user='USER', project='PROJECT')
         mock_find.return_value = x_cluster
@@ -1413,12 +1413,12 @@ class ClusterTest(base.SenlinTestCase):
             status=am.Action.READY,
             inputs={'foo': 'bar'},
         )
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(ao.Action, 'delete_by_target')
     @mock.patch.object(am.Action, 'create')
     @mock.patch.object(co.Cluster, 'find')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     def test_cluster_check_with_delete(self, notify, mock_find, mock_action,
                                        mock_delete):
         x_cluster = mock.Mock(id='CID', user='USER', project='PROJECT')
@@ -1443,11 +1443,11 @@ class ClusterTest(base.SenlinTestCase):
             status=am.Action.READY,
             inputs={'delete_check_action': True},
         )
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(am.Action, 'create')
     @mock.patch.object(co.Cluster, 'find')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     def test_cluster_check_user_is_none(self, notify, mock_find, mock_action):
         x_cluster = mock.Mock(id='CID', project='PROJECT')
         mock_find.return_value = x_cluster
@@ -1467,11 +1467,11 @@ class ClusterTest(base.SenlinTestCase):
             status=am.Action.READY,
             inputs={},
         )
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(am.Action, 'create')
     @mock.patch.object(co.Cluster, 'find')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     def test_cluster_check_project_is_none(self, notify, mock_find,
                                            mock_action):
         x_cluster = mock.Mock(id='CID', user='USER')
@@ -1492,7 +1492,7 @@ class ClusterTest(base.SenlinTestCase):
             status=am.Action.READY,
             inputs={},
         )
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(co.Cluster, 'find')
     def test_cluster_check_cluster_not_found(self, mock_find):
@@ -1511,7 +1511,7 @@ class ClusterTest(base.SenlinTestCase):
 
     @mock.patch.object(am.Action, 'create')
     @mock.patch.object(co.Cluster, 'find')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     def test_cluster_recover(self, notify, mock_find, mock_action):
         x_cluster = mock.Mock(id='CID')
         mock_find.return_value = x_cluster
@@ -1531,11 +1531,11 @@ class ClusterTest(base.SenlinTestCase):
             status=am.Action.READY,
             inputs={'operation': 'RECREATE'},
         )
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(am.Action, 'create')
     @mock.patch.object(co.Cluster, 'find')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     def test_cluster_recover_rebuild(self, notify, mock_find, mock_action):
         x_cluster = mock.Mock(id='CID')
         mock_find.return_value = x_cluster
@@ -1555,11 +1555,11 @@ class ClusterTest(base.SenlinTestCase):
             status=am.Action.READY,
             inputs={'operation': 'REBUILD'},
         )
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(am.Action, 'create')
     @mock.patch.object(co.Cluster, 'find')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     def test_cluster_recover_reboot(self, notify, mock_find, mock_action):
         x_cluster = mock.Mock(id='CID')
         mock_find.return_value = x_cluster
@@ -1579,11 +1579,11 @@ class ClusterTest(base.SenlinTestCase):
             status=am.Action.READY,
             inputs={'operation': 'REBOOT'},
         )
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(am.Action, 'create')
     @mock.patch.object(co.Cluster, 'find')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     def test_cluster_recover_default(self, notify, mock_find, mock_action):
         x_cluster = mock.Mock(id='CID')
         mock_find.return_value = x_cluster
@@ -1602,7 +1602,7 @@ class ClusterTest(base.SenlinTestCase):
             status=am.Action.READY,
             inputs={}
         )
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(co.Cluster, 'find')
     def test_cluster_recover_cluster_not_found(self, mock_find):
@@ -1678,7 +1678,7 @@ class ClusterTest(base.SenlinTestCase):
 
     @mock.patch.object(am.Action, 'create')
     @mock.patch.object(co.Cluster, 'find')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     def test_cluster_recover_user_is_none(self, notify, mock_find,
                                           mock_action):
         x_cluster = mock.Mock(id='CID', project='PROJECT')
@@ -1699,7 +1699,7 @@ class ClusterTest(base.SenlinTestCase):
             status=am.Action.READY,
             inputs={},
         )
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(no.Node, 'find')
     @mock.patch.object(po.Profile, 'get')
@@ -1888,7 +1888,7 @@ class ClusterTest(base.SenlinTestCase):
     @mock.patch.object(no.Node, 'find')
     @mock.patch.object(po.Profile, 'find')
     @mock.patch.object(co.Cluster, 'find')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     def test_cluster_replace_nodes(self, notify, mock_find,
                                    mock_profile, mock_node,
                                    mock_validate, mock_action):
@@ -1918,7 +1918,7 @@ class ClusterTest(base.SenlinTestCase):
             cause=consts.CAUSE_RPC,
             status=am.Action.READY,
             inputs={'candidates': {'ORIGINAL': 'REPLACE'}})
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(service.ConductorService, '_validate_replace_nodes')
     @mock.patch.object(co.Cluster, 'find')
@@ -2069,7 +2069,7 @@ class ClusterTest(base.SenlinTestCase):
 
     @mock.patch.object(am.Action, 'create')
     @mock.patch.object(co.Cluster, 'find')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     def test_cluster_delete(self, notify, mock_find, mock_action):
         x_obj = mock.Mock(id='12345678AB', status='ACTIVE', dependents={})
         mock_find.return_value = x_obj
@@ -2088,7 +2088,7 @@ class ClusterTest(base.SenlinTestCase):
             force=True,
             status=am.Action.READY)
 
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(co.Cluster, 'find')
     def test_cluster_delete_with_containers(self, mock_find):
@@ -2145,7 +2145,7 @@ class ClusterTest(base.SenlinTestCase):
     @mock.patch.object(ro.Receiver, 'get_all')
     @mock.patch.object(cpo.ClusterPolicy, 'get_all')
     @mock.patch.object(co.Cluster, 'find')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     def test_cluster_delete_force(self, notify, mock_find, mock_policies,
                                   mock_receivers, mock_action):
         for bad_status in [consts.CS_CREATING, consts.CS_UPDATING,
@@ -2172,7 +2172,7 @@ class ClusterTest(base.SenlinTestCase):
                 force=True,
                 status=am.Action.READY)
 
-            notify.assert_called_with()
+            notify.assert_called_with(['ACTION_ID'])
 
     @mock.patch.object(ca, 'CompleteLifecycleProc')
     def test_cluster_complete_lifecycle(self, mock_lifecycle):
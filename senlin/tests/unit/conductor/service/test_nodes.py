@@ -143,7 +143,7 @@ class NodeTest(base.SenlinTestCase):
     @mock.patch.object(action_mod.Action, 'create')
     @mock.patch.object(no.Node, 'create')
     @mock.patch.object(po.Profile, 'find')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     def test_node_create(self, notify, mock_profile, mock_node, mock_action):
         mock_profile.return_value = mock.Mock(id='PROFILE_ID')
         x_node = mock.Mock(id='NODE_ID')
@@ -182,7 +182,7 @@ class NodeTest(base.SenlinTestCase):
             cluster_id='',
             cause=consts.CAUSE_RPC,
             status=action_mod.Action.READY)
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(common_utils, 'format_node_name')
     @mock.patch.object(action_mod.Action, 'create')
@@ -190,7 +190,7 @@ class NodeTest(base.SenlinTestCase):
     @mock.patch.object(co.Cluster, 'get_next_index')
     @mock.patch.object(co.Cluster, 'find')
     @mock.patch.object(po.Profile, 'find')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     def test_node_create_same_profile(self, notify, mock_profile,
                                       mock_cluster, mock_index,
                                       mock_node, mock_action,
@@ -241,7 +241,7 @@ class NodeTest(base.SenlinTestCase):
             name='node_create_NODE_ID',
             cause=consts.CAUSE_RPC,
             status=action_mod.Action.READY)
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(common_utils, "format_node_name")
     @mock.patch.object(action_mod.Action, 'create')
@@ -249,7 +249,7 @@ class NodeTest(base.SenlinTestCase):
     @mock.patch.object(co.Cluster, 'get_next_index')
     @mock.patch.object(co.Cluster, 'find')
     @mock.patch.object(po.Profile, 'find')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     def test_node_create_same_profile_type(self, notify, mock_profile,
                                            mock_cluster, mock_index,
                                            mock_node, mock_action,
@@ -305,7 +305,7 @@ class NodeTest(base.SenlinTestCase):
             cluster_id='CLUSTER_ID',
             cause=consts.CAUSE_RPC,
             status=action_mod.Action.READY)
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(po.Profile, 'find')
     @mock.patch.object(no.Node, 'get_by_name')
@@ -444,7 +444,7 @@ class NodeTest(base.SenlinTestCase):
         mock_find.assert_called_once_with(self.ctx, 'NODE1')
         x_obj.to_dict.assert_called_once_with()
 
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     @mock.patch.object(action_mod.Action, 'create')
     @mock.patch.object(no.Node, 'find')
     def test_node_update(self, mock_find, mock_action, mock_start):
@@ -478,9 +478,9 @@ class NodeTest(base.SenlinTestCase):
                     'foo1': 'bar1',
                 }
             })
-        mock_start.assert_called_once_with()
+        mock_start.assert_called_once_with(['ACTION_ID'])
 
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     @mock.patch.object(action_mod.Action, 'create')
     @mock.patch.object(po.Profile, 'find')
     @mock.patch.object(no.Node, 'find')
@@ -523,7 +523,7 @@ class NodeTest(base.SenlinTestCase):
             inputs={
                 'new_profile_id': 'NEW_PROFILE_ID',
             })
-        mock_start.assert_called_once_with()
+        mock_start.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(no.Node, 'find')
     def test_node_update_node_not_found(self, mock_find):
@@ -624,7 +624,7 @@ class NodeTest(base.SenlinTestCase):
                          str(ex.exc_info[1]))
         mock_find.assert_called_once_with(self.ctx, 'FAKE_NODE')
 
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     @mock.patch.object(action_mod.Action, 'create')
     @mock.patch.object(no.Node, 'find')
     def test_node_delete(self, mock_find, mock_action, mock_start):
@@ -644,7 +644,7 @@ class NodeTest(base.SenlinTestCase):
             cluster_id='',
             cause=consts.CAUSE_RPC,
             status=action_mod.Action.READY)
-        mock_start.assert_called_once_with()
+        mock_start.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(no.Node, 'find')
     def test_node_delete_node_not_found(self, mock_find):
@@ -690,7 +690,7 @@ class NodeTest(base.SenlinTestCase):
                          "by other clusters and/or nodes.",
                          str(ex.exc_info[1]))
 
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     @mock.patch.object(action_mod.Action, 'create')
     @mock.patch.object(no.Node, 'find')
     def test_node_delete_force(self, mock_find, mock_action, mock_start):
@@ -714,7 +714,7 @@ class NodeTest(base.SenlinTestCase):
                 cluster_id='',
                 cause=consts.CAUSE_RPC,
                 status=action_mod.Action.READY)
-            mock_start.assert_called_with()
+            mock_start.assert_called_with(['ACTION_ID'])
 
     @mock.patch.object(environment.Environment, 'get_profile')
     @mock.patch.object(pb.Profile, 'adopt_node')
@@ -903,7 +903,7 @@ class NodeTest(base.SenlinTestCase):
         self.assertEqual(exc.BadRequest, ex.exc_info[0])
         self.assertEqual("boom.", str(ex.exc_info[1]))
 
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     @mock.patch.object(action_mod.Action, 'create')
     @mock.patch.object(no.Node, 'find')
     def test_node_check(self, mock_find, mock_action, mock_start):
@@ -924,7 +924,7 @@ class NodeTest(base.SenlinTestCase):
             cause=consts.CAUSE_RPC,
             status=action_mod.Action.READY,
             inputs={'k1': 'v1'})
-        mock_start.assert_called_once_with()
+        mock_start.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(no.Node, 'find')
     def test_node_check_not_found(self, mock_find):
@@ -940,7 +940,7 @@ class NodeTest(base.SenlinTestCase):
                          str(ex.exc_info[1]))
         mock_find.assert_called_once_with(self.ctx, 'Bogus')
 
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     @mock.patch.object(action_mod.Action, 'create')
     @mock.patch.object(no.Node, 'find')
     def test_node_recover(self, mock_find, mock_action, mock_start):
@@ -961,9 +961,9 @@ class NodeTest(base.SenlinTestCase):
             cause=consts.CAUSE_RPC,
             status=action_mod.Action.READY,
             inputs={'operation': 'REBOOT'})
-        mock_start.assert_called_once_with()
+        mock_start.assert_called_once_with(['ACTION_ID'])
 
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     @mock.patch.object(action_mod.Action, 'create')
     @mock.patch.object(no.Node, 'find')
     def test_node_recover_with_check(self, mock_find, mock_action, mock_start):
@@ -983,9 +983,9 @@ class NodeTest(base.SenlinTestCase):
             cause=consts.CAUSE_RPC,
             status=action_mod.Action.READY,
             inputs={'check': True, 'operation': 'REBUILD'})
-        mock_start.assert_called_once_with()
+        mock_start.assert_called_once_with(['ACTION_ID'])
 
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     @mock.patch.object(action_mod.Action, 'create')
     @mock.patch.object(no.Node, 'find')
     def test_node_recover_with_delete_timeout(self, mock_find, mock_action,
@@ -1007,9 +1007,9 @@ class NodeTest(base.SenlinTestCase):
             status=action_mod.Action.READY,
             inputs={'delete_timeout': 20,
                     'operation': 'RECREATE'})
-        mock_start.assert_called_once_with()
+        mock_start.assert_called_once_with(['ACTION_ID'])
 
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     @mock.patch.object(action_mod.Action, 'create')
     @mock.patch.object(no.Node, 'find')
     def test_node_recover_with_force_recreate(self, mock_find, mock_action,
@@ -1034,7 +1034,7 @@ class NodeTest(base.SenlinTestCase):
             inputs={'force_recreate': True,
                     'operation': 'reboot',
                     'operation_params': {'type': 'soft'}})
-        mock_start.assert_called_once_with()
+        mock_start.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(no.Node, 'find')
     def test_node_recover_not_found(self, mock_find):
@@ -1109,7 +1109,7 @@ class NodeTest(base.SenlinTestCase):
         mock_find.assert_called_once_with(self.ctx, 'FAKE_NODE')
         self.assertEqual(0, mock_action.call_count)
 
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     @mock.patch.object(action_mod.Action, 'create')
     @mock.patch.object(node_mod.Node, 'load')
     @mock.patch.object(no.Node, 'find')
@@ -1140,7 +1140,7 @@ class NodeTest(base.SenlinTestCase):
             cause=consts.CAUSE_RPC,
             status=action_mod.Action.READY,
             inputs={'operation': 'dance', 'params': {'style': 'tango'}})
-        mock_start.assert_called_once_with()
+        mock_start.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(no.Node, 'find')
     def test_node_op_node_not_found(self, mock_find):
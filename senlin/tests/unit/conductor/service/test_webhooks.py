@@ -10,15 +10,19 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import datetime
 from unittest import mock
 
+from oslo_config import cfg
 from oslo_messaging.rpc import dispatcher as rpc
+from oslo_utils import timeutils
 
 from senlin.common import consts
 from senlin.common import exception
 from senlin.conductor import service
 from senlin.engine.actions import base as action_mod
 from senlin.engine import dispatcher
+from senlin.objects import action as ao
 from senlin.objects import cluster as co
 from senlin.objects import receiver as ro
 from senlin.objects.requests import webhooks as vorw
@@ -32,13 +36,13 @@ class WebhookTest(base.SenlinTestCase):
         self.ctx = utils.dummy_context(project='webhook_test_project')
         self.svc = service.ConductorService('host-a', 'topic-a')
 
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     @mock.patch.object(action_mod.Action, 'create')
-    @mock.patch.object(co.Cluster, 'find')
+    @mock.patch.object(co.Cluster, 'exists')
     @mock.patch.object(ro.Receiver, 'find')
     def test_webhook_trigger_params_in_body_with_params(
             self, mock_get, mock_find, mock_action, notify):
-        mock_find.return_value = mock.Mock(id='FAKE_CLUSTER')
+        mock_find.return_value = True
         mock_get.return_value = mock.Mock(id='01234567-abcd-efef',
                                           cluster_id='FAKE_CLUSTER',
                                           action='DANCE',
@@ -62,15 +66,15 @@ class WebhookTest(base.SenlinTestCase):
             status=action_mod.Action.READY,
             inputs={'kee': 'vee', 'foo': 'bar'},
         )
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     @mock.patch.object(action_mod.Action, 'create')
-    @mock.patch.object(co.Cluster, 'find')
+    @mock.patch.object(co.Cluster, 'exists')
     @mock.patch.object(ro.Receiver, 'find')
     def test_webhook_trigger_params_in_body_no_params(
             self, mock_get, mock_find, mock_action, notify):
-        mock_find.return_value = mock.Mock(id='FAKE_CLUSTER')
+        mock_find.return_value = True
         mock_get.return_value = mock.Mock(id='01234567-abcd-efef',
                                           cluster_id='FAKE_CLUSTER',
                                           action='DANCE',
@@ -94,7 +98,7 @@ class WebhookTest(base.SenlinTestCase):
             status=action_mod.Action.READY,
             inputs={'foo': 'bar'},
         )
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(ro.Receiver, 'find')
     def test_webhook_trigger_params_in_body_receiver_not_found(
@@ -113,14 +117,13 @@ class WebhookTest(base.SenlinTestCase):
         mock_find.assert_called_once_with(self.ctx, 'RRR')
 
     @mock.patch.object(ro.Receiver, 'find')
-    @mock.patch.object(co.Cluster, 'find')
+    @mock.patch.object(co.Cluster, 'exists')
     def test_webhook_trigger_params_in_body_cluster_not_found(
             self, mock_cluster, mock_find):
         receiver = mock.Mock()
         receiver.cluster_id = 'BOGUS'
         mock_find.return_value = receiver
-        mock_cluster.side_effect = exception.ResourceNotFound(type='cluster',
-                                                              id='BOGUS')
+        mock_cluster.return_value = False
         body = None
         req = vorw.WebhookTriggerRequestParamsInBody(identity='RRR', body=body)
         ex = self.assertRaises(rpc.ExpectedException,
@@ -133,13 +136,13 @@ class WebhookTest(base.SenlinTestCase):
         mock_find.assert_called_once_with(self.ctx, 'RRR')
         mock_cluster.assert_called_once_with(self.ctx, 'BOGUS')
 
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     @mock.patch.object(action_mod.Action, 'create')
-    @mock.patch.object(co.Cluster, 'find')
+    @mock.patch.object(co.Cluster, 'exists')
     @mock.patch.object(ro.Receiver, 'find')
     def test_webhook_trigger_with_params(self, mock_get, mock_find,
                                          mock_action, notify):
-        mock_find.return_value = mock.Mock(id='FAKE_CLUSTER')
+        mock_find.return_value = True
         mock_get.return_value = mock.Mock(id='01234567-abcd-efef',
                                           cluster_id='FAKE_CLUSTER',
                                           action='DANCE',
@@ -163,15 +166,15 @@ class WebhookTest(base.SenlinTestCase):
             status=action_mod.Action.READY,
             inputs={'kee': 'vee', 'foo': 'bar'},
         )
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     @mock.patch.object(action_mod.Action, 'create')
-    @mock.patch.object(co.Cluster, 'find')
+    @mock.patch.object(co.Cluster, 'exists')
     @mock.patch.object(ro.Receiver, 'find')
     def test_webhook_trigger_no_params(self, mock_get, mock_find,
                                        mock_action, notify):
-        mock_find.return_value = mock.Mock(id='FAKE_CLUSTER')
+        mock_find.return_value = True
         mock_get.return_value = mock.Mock(id='01234567-abcd-efef',
                                           cluster_id='FAKE_CLUSTER',
                                           action='DANCE',
@@ -195,7 +198,7 @@ class WebhookTest(base.SenlinTestCase):
             status=action_mod.Action.READY,
             inputs={'foo': 'bar'},
         )
-        notify.assert_called_once_with()
+        notify.assert_called_once_with(['ACTION_ID'])
 
     @mock.patch.object(ro.Receiver, 'find')
     def test_webhook_trigger_receiver_not_found(self, mock_find):
@@ -213,13 +216,12 @@ class WebhookTest(base.SenlinTestCase):
         mock_find.assert_called_once_with(self.ctx, 'RRR')
 
     @mock.patch.object(ro.Receiver, 'find')
-    @mock.patch.object(co.Cluster, 'find')
+    @mock.patch.object(co.Cluster, 'exists')
     def test_webhook_trigger_cluster_not_found(self, mock_cluster, mock_find):
         receiver = mock.Mock()
         receiver.cluster_id = 'BOGUS'
         mock_find.return_value = receiver
-        mock_cluster.side_effect = exception.ResourceNotFound(type='cluster',
-                                                              id='BOGUS')
+        mock_cluster.return_value = False
         body = vorw.WebhookTriggerRequestBody(params=None)
         req = vorw.WebhookTriggerRequest(identity='RRR', body=body)
         ex = self.assertRaises(rpc.ExpectedException,
@@ -231,3 +233,74 @@ class WebhookTest(base.SenlinTestCase):
                          str(ex.exc_info[1]))
         mock_find.assert_called_once_with(self.ctx, 'RRR')
         mock_cluster.assert_called_once_with(self.ctx, 'BOGUS')
+
+    @mock.patch.object(dispatcher, 'start_actions')
+    @mock.patch.object(action_mod.Action, 'create')
+    @mock.patch.object(ao.Action, 'get_all')
+    @mock.patch.object(co.Cluster, 'exists')
+    @mock.patch.object(ro.Receiver, 'find')
+    def test_webhook_trigger_coalesced(self, mock_get, mock_find, mock_all,
+                                       mock_action, notify):
+        cfg.CONF.set_override('webhook_coalesce_window', 10)
+        mock_find.return_value = True
+        mock_get.return_value = mock.Mock(id='01234567-abcd-efef',
+                                          cluster_id='FAKE_CLUSTER',
+                                          action='DANCE',
+                                          params={'foo': 'bar'})
+        now = timeutils.utcnow(True)
+        mock_all.return_value = [
+            mock.Mock(id='OLD', inputs={'foo': 'bar'},
+                      created_at=now - datetime.timedelta(seconds=20)),
+            mock.Mock(id='OTHER', inputs={'foo': 'baz'}, created_at=now),
+            mock.Mock(id='PENDING', inputs={'foo': 'bar'}, created_at=now),
+        ]
+
+        body = vorw.WebhookTriggerRequestBody(params={})
+        req = vorw.WebhookTriggerRequest(identity='FAKE_RECEIVER',
+                                         body=body)
+        res = self.svc.webhook_trigger(self.ctx, req.obj_to_primitive())
+
+        self.assertEqual({'action': 'PENDING'}, res)
+        mock_all.assert_called_once_with(
+            self.ctx, filters={'target': 'FAKE_CLUSTER',
+                               'name': 'webhook_01234567',
+                               'action': 'DANCE',
+                               'status': consts.ACTION_READY},
+            with_deps=False)
+        self.assertFalse(mock_action.called)
+        self.assertFalse(notify.called)
+
+    @mock.patch.object(dispatcher, 'start_actions')
+    @mock.patch.object(action_mod.Action, 'create')
+    @mock.patch.object(ao.Action, 'get_all')
+    @mock.patch.object(co.Cluster, 'exists')
+    @mock.patch.object(ro.Receiver, 'find')
+    def test_webhook_trigger_not_coalesced(self, mock_get, mock_find,
+                                           mock_all, mock_action, notify):
+        cfg.CONF.set_override('webhook_coalesce_window', 10)
+        mock_find.return_value = True
+        mock_get.return_value = mock.Mock(id='01234567-abcd-efef',
+                                          cluster_id='FAKE_CLUSTER',
+                                          action='DANCE',
+                                          params={'foo': 'bar'})
+        mock_all.return_value = [
+            mock.Mock(id='OTHER', inputs={'foo': 'baz'},
+                      created_at=timeutils.utcnow(True)),
+        ]
+        mock_action.return_value = 'ACTION_ID'
+
+        body = vorw.WebhookTriggerRequestBody(params={})
+        req = vorw.WebhookTriggerRequest(identity='FAKE_RECEIVER',
+                                         body=body)
+        res = self.svc.webhook_trigger(self.ctx, req.obj_to_primitive())
+
+        self.assertEqual({'action': 'ACTION_ID'}, res)
+        mock_action.assert_called_once_with(
+            self.ctx, 'FAKE_CLUSTER', 'DANCE',
+            name='webhook_01234567',
+            cluster_id='FAKE_CLUSTER',
+            cause=consts.CAUSE_RPC,
+            status=action_mod.Action.READY,
+            inputs={'foo': 'bar'},
+        )
+        notify.assert_called_once_with(['ACTION_ID'])
@@ -21,6 +21,7 @@ from oslo_utils import uuidutils
 
 from senlin.common import consts
 from senlin.conductor import service
+from senlin.engine import retention
 from senlin.objects.requests import build_info as vorb
 from senlin.objects import service as service_obj
 from senlin.tests.unit.common import base
@@ -74,6 +75,21 @@ class ConductorTest(base.SenlinTestCase):
         self.svc.server.start.assert_called_once()
 
         self.assertEqual(service_uuid, self.svc.service_id)
+        self.assertIsNone(self.svc.retention_timer)
+
+    @mock.patch.object(oslo_messaging, 'get_rpc_server')
+    @mock.patch.object(service_obj.Service, 'create')
+    def test_service_start_retention(self, mock_service_create,
+                                     mock_rpc_server):
+        cfg.CONF.set_override('event_retention', 7)
+        cfg.CONF.set_override('retention_interval', 600)
+
+        self.svc.start()
+
+        self.tg.add_timer.assert_called_with(
+            600, self.svc.service_manage_retention)
+        self.assertEqual(self.tg.add_timer.return_value,
+                         self.svc.retention_timer)
 
     @mock.patch.object(service_obj.Service, 'delete')
     def test_service_stop(self, mock_delete):
@@ -99,7 +115,7 @@ class ConductorTest(base.SenlinTestCase):
         mock_update.return_value = mock.Mock()
         self.svc.service_manage_report()
         mock_update.assert_called_once_with(mock.ANY,
-                                            self.svc.service_id)
+                                            self.svc.service_id, None)
 
     @mock.patch.object(service_obj.Service, 'update')
     def test_service_manage_report_with_exception(self, mock_update):
@@ -107,6 +123,14 @@ class ConductorTest(base.SenlinTestCase):
         self.svc.service_manage_report()
         self.assertEqual(mock_update.call_count, 1)
 
+    @mock.patch.object(retention, 'apply_retention')
+    def test_service_manage_retention_with_exception(self, mock_apply):
+        mock_apply.side_effect = Exception('blah')
+
+        self.svc.service_manage_retention()
+
+        mock_apply.assert_called_once_with()
+
     def test_get_revision(self):
         self.assertEqual(
             cfg.CONF.revision['senlin_engine_revision'],
@@ -56,6 +56,66 @@ class DBAPIActionTest(base.SenlinTestCase):
         self.assertEqual(self.ctx.domain_id, action.domain)
         self.assertIsNone(action.outputs)
 
+    def test_action_create_batch(self):
+        parent = _create_action(self.ctx)
+        profile = shared.create_profile(self.ctx)
+        cluster = shared.create_cluster(self.ctx, profile)
+        nodes = []
+        values = []
+        for i in range(3):
+            node_id = 'NODE_ID_%s' % i
+            nodes.append({
+                'id': node_id,
+                'name': 'node-%s' % i,
+                'cluster_id': cluster.id,
+                'profile_id': profile.id,
+                'user': self.ctx.user_id,
+                'project': self.ctx.project_id,
+                'index': i + 1,
+                'meta_data': {},
+            })
+            values.append({
+                'id': 'ACTION_ID_%s' % i,
+                'name': 'node_create_%s' % i,
+                'target': node_id,
+                'action': consts.NODE_CREATE,
+                'status': consts.ACTION_READY,
+                'inputs': {'key': i},
+                'user': self.ctx.user_id,
+                'project': self.ctx.project_id,
+            })
+
+        db_api.action_create_batch(self.ctx, values, parent.id, nodes=nodes)
+
+        for i in range(3):
+            node = db_api.node_get(self.ctx, 'NODE_ID_%s' % i)
+            self.assertEqual(cluster.id, node.cluster_id)
+            self.assertEqual(i + 1, node.index)
+            self.assertEqual({}, node.meta_data)
+            action = db_api.action_get(self.ctx, 'ACTION_ID_%s' % i)
+            self.assertEqual('NODE_ID_%s' % i, action.target)
+            self.assertEqual(consts.ACTION_READY, action.status)
+            self.assertEqual({'key': i}, action.inputs)
+        res = db_api.dependency_get_depended(self.ctx, parent.id)
+        self.assertEqual(['ACTION_ID_0', 'ACTION_ID_1', 'ACTION_ID_2'],
+                         sorted(res))
+        parent = db_api.action_get(self.ctx, parent.id)
+        self.assertEqual(consts.ACTION_WAITING, parent.status)
+
+    def test_action_create_batch_no_nodes(self):
+        parent = _create_action(self.ctx)
+        values = [{'id': 'ACTION_ID', 'target': 'NODE_ID',
+                   'action': consts.NODE_CHECK,
+                   'status': consts.ACTION_READY,
+                   'project': self.ctx.project_id}]
+
+        db_api.action_create_batch(self.ctx, values, parent.id)
+
+        action = db_api.action_get(self.ctx, 'ACTION_ID')
+        self.assertEqual(consts.NODE_CHECK, action.action)
+        res = db_api.dependency_get_depended(self.ctx, parent.id)
+        self.assertEqual(['ACTION_ID'], res)
+
     def test_action_update(self):
         action = _create_action(self.ctx)
         values = {
@@ -72,6 +132,23 @@ class DBAPIActionTest(base.SenlinTestCase):
         self.assertRaises(exception.ResourceNotFound,
                           db_api.action_update, self.ctx, 'fake-uuid', values)
 
+    def test_action_update_data(self):
+        action = _create_action(self.ctx, data={'key1': 'value1'})
+
+        db_api.action_update_data(self.ctx, action.id,
+                                  values={'placement': {'count': 2}})
+        action = db_api.action_get(self.ctx, action.id)
+        self.assertEqual({'key1': 'value1', 'placement': {'count': 2}},
+                         action.data)
+
+        db_api.action_update_data(self.ctx, action.id, removed=['key1'])
+        action = db_api.action_get(self.ctx, action.id)
+        self.assertEqual({'placement': {'count': 2}}, action.data)
+
+        self.assertRaises(exception.ResourceNotFound,
+                          db_api.action_update_data, self.ctx, 'fake-uuid',
+                          {'key1': 'value1'})
+
     def test_action_get(self):
         data = parser.simple_parse(shared.sample_action)
         action = _create_action(self.ctx)
@@ -190,6 +267,74 @@ class DBAPIActionTest(base.SenlinTestCase):
                                                    time.time())
         self.assertEqual(action1.id, result.id)
 
+    def test_acquire_ready_batch(self):
+        specs = [
+            {'name': 'A01', 'status': 'READY'},
+            {'name': 'A02', 'status': 'READY', 'owner': 'worker1'},
+            {'name': 'A03', 'status': 'INIT'},
+            {'name': 'A04', 'status': 'READY'},
+            {'name': 'A05', 'status': 'READY'},
+        ]
+        for spec in specs:
+            spec['created_at'] = tu.utcnow(True)
+            _create_action(self.ctx, **spec)
+
+        timestamp = time.time()
+        actions = db_api.action_acquire_ready_batch(self.ctx, 'worker2',
+                                                    timestamp, 2)
+
+        self.assertEqual(['A01', 'A04'], [a.name for a in actions])
+        for action in actions:
+            self.assertEqual('worker2', action.owner)
+            self.assertEqual(consts.ACTION_RUNNING, action.status)
+            self.assertAlmostEqual(timestamp, float(action.start_time),
+                                   places=5)
+
+        actions = db_api.action_acquire_ready_batch(self.ctx, 'worker3',
+                                                    timestamp, 2)
+        self.assertEqual(['A05'], [a.name for a in actions])
+
+        actions = db_api.action_acquire_ready_batch(self.ctx, 'worker3',
+                                                    timestamp, 2)
+        self.assertEqual([], actions)
+
+    def test_acquire_ready_batch_ids(self):
+        specs = [
+            {'name': 'A01', 'status': 'READY'},
+            {'name': 'A02', 'status': 'READY'},
+            {'name': 'A03', 'status': 'READY', 'owner': 'worker1'},
+            {'name': 'A04', 'status': 'READY'},
+        ]
+        ids = {}
+        for spec in specs:
+            spec['created_at'] = tu.utcnow(True)
+            ids[spec['name']] = _create_action(self.ctx, **spec).id
+
+        actions = db_api.action_acquire_ready_batch(
+            self.ctx, 'worker2', time.time(), 10,
+            ids=[ids['A02'], ids['A03'], ids['A04']])
+
+        self.assertEqual(['A02', 'A04'], [a.name for a in actions])
+        action = db_api.action_get(self.ctx, ids['A01'])
+        self.assertEqual(consts.ACTION_READY, action.status)
+        self.assertIsNone(action.owner)
+
+    def test_acquire_ready_batch_empty_ids(self):
+        _create_action(self.ctx, status='READY')
+
+        actions = db_api.action_acquire_ready_batch(self.ctx, 'worker1',
+                                                    time.time(), 10, ids=[])
+
+        self.assertEqual([], actions)
+
+    def test_acquire_ready_batch_zero_limit(self):
+        _create_action(self.ctx, status='READY')
+
+        actions = db_api.action_acquire_ready_batch(self.ctx, 'worker1',
+                                                    time.time(), 0)
+
+        self.assertEqual([], actions)
+
     def test_action_acquire_random_ready(self):
         specs = [
             {'name': 'A01', 'status': 'INIT'},
@@ -273,6 +418,21 @@ class DBAPIActionTest(base.SenlinTestCase):
         for name in names:
             self.assertIn(name, ['A01', 'A04', 'A05', 'A06', 'A10'])
 
+    def test_action_get_all_active_by_target_list(self):
+        specs = [
+            {'name': 'A01', 'target': 'node_001', 'status': 'READY'},
+            {'name': 'A02', 'target': 'node_002', 'status': 'RUNNING'},
+            {'name': 'A03', 'target': 'node_002', 'status': 'SUCCEEDED'},
+            {'name': 'A04', 'target': 'node_003', 'status': 'WAITING'},
+        ]
+
+        for spec in specs:
+            _create_action(self.ctx, **spec)
+
+        actions = db_api.action_get_all_active_by_target(
+            self.ctx, ['node_001', 'node_002'])
+        self.assertEqual(['A01', 'A02'], sorted(a.name for a in actions))
+
     def test_action_get_all_project_safe(self):
         parser.simple_parse(shared.sample_action)
         _create_action(self.ctx)
@@ -282,6 +442,17 @@ class DBAPIActionTest(base.SenlinTestCase):
         actions = db_api.action_get_all(new_ctx, project_safe=False)
         self.assertEqual(1, len(actions))
 
+    def test_action_get_all_marker(self):
+        now = tu.utcnow(True)
+        actions = [
+            _create_action(self.ctx, name='A%s' % i,
+                           created_at=now + datetime.timedelta(seconds=i))
+            for i in range(3)]
+
+        res = db_api.action_get_all(self.ctx, marker=actions[0].id)
+
+        self.assertEqual([actions[1].id, actions[2].id], [a.id for a in res])
+
     def test_action_check_status(self):
         specs = [
             {'name': 'A01', 'target': 'cluster_001'},
@@ -394,12 +565,42 @@ class DBAPIActionTest(base.SenlinTestCase):
     def test_dependency_add_dependent_list(self):
         self._check_dependency_add_dependent_list()
 
+    def test_dependency_get_all(self):
+        id_of = self._check_dependency_add_dependent_list()
+        other = _create_action(self.ctx).id
+
+        res = db_api.dependency_get_all(self.ctx, [id_of['A01'],
+                                                   id_of['A02']])
+
+        self.assertEqual(3, len(res))
+        for dep in res:
+            self.assertEqual(id_of['A01'], dep.depended)
+        self.assertEqual(sorted([id_of['A02'], id_of['A03'], id_of['A04']]),
+                         sorted(d.dependent for d in res))
+        self.assertEqual([], db_api.dependency_get_all(self.ctx, [other]))
+        self.assertEqual([], db_api.dependency_get_all(self.ctx, []))
+
+    def test_action_get_all_without_dependencies(self):
+        id_of = self._check_dependency_add_dependent_list()
+
+        actions = db_api.action_get_all(self.ctx)
+
+        self.assertEqual(4, len(actions))
+        for action in actions:
+            self.assertEqual([], action.dep_on)
+            self.assertEqual([], action.dep_by)
+        action = db_api.action_get(self.ctx, id_of['A01'])
+        self.assertEqual(3, len(action.dep_by))
+
     def test_action_mark_succeeded(self):
         timestamp = time.time()
         id_of = self._check_dependency_add_dependent_list()
 
-        db_api.action_mark_succeeded(self.ctx, id_of['A01'], timestamp)
+        woken = db_api.action_mark_succeeded(self.ctx, id_of['A01'],
+                                             timestamp)
 
+        self.assertEqual(sorted([id_of['A02'], id_of['A03'], id_of['A04']]),
+                         sorted(woken))
         res = db_api.dependency_get_depended(self.ctx, id_of['A01'])
         self.assertEqual(0, len(res))
 
@@ -411,6 +612,20 @@ class DBAPIActionTest(base.SenlinTestCase):
             res = db_api.dependency_get_dependents(self.ctx, aid)
             self.assertEqual(0, len(res))
 
+    def test_action_mark_succeeded_wake_cleared_only(self):
+        timestamp = time.time()
+        id_of = self._prepare_action_mark_failed_cancel()
+
+        woken = db_api.action_mark_succeeded(self.ctx, id_of['A02'],
+                                             timestamp)
+        self.assertEqual([], woken)
+        woken = db_api.action_mark_succeeded(self.ctx, id_of['A03'],
+                                             timestamp)
+        self.assertEqual([], woken)
+        woken = db_api.action_mark_succeeded(self.ctx, id_of['A04'],
+                                             timestamp)
+        self.assertEqual([id_of['A01']], woken)
+
     def _prepare_action_mark_failed_cancel(self):
         specs = [
             {'name': 'A01', 'status': 'INIT', 'target': 'cluster_001'},
@@ -539,7 +754,11 @@ class DBAPIActionTest(base.SenlinTestCase):
     def test_action_mark_failed_parent_status_update_needed(self):
         timestamp = time.time()
         id_of = self._prepare_action_mark_failed_cancel()
-        db_api.action_mark_failed(self.ctx, id_of['A04'], timestamp)
+        woken = db_api.action_mark_failed(self.ctx, id_of['A04'], timestamp)
+
+        self.assertEqual(sorted([id_of['A01'], id_of['A05'], id_of['A06'],
+                                 id_of['A07']]),
+                         sorted(woken))
 
         action = db_api.action_get(self.ctx, id_of['A01'])
         self.assertEqual(consts.ACTION_FAILED, action.status)
@@ -548,10 +767,44 @@ class DBAPIActionTest(base.SenlinTestCase):
         result = db_api.dependency_get_dependents(self.ctx, id_of['A01'])
         self.assertEqual(0, len(result))
 
+    def test_action_mark_failed_transitive(self):
+        timestamp = time.time()
+        id_of = self._prepare_action_mark_failed_cancel()
+        # A08 depends on A05 and A06, A09 depends on A08
+        for name in ['A08', 'A09']:
+            action = _create_action(self.ctx, name=name, status='INIT')
+            id_of[name] = action.id
+        db_api.dependency_add(self.ctx, [id_of['A05'], id_of['A06']],
+                              id_of['A08'])
+        db_api.dependency_add(self.ctx, id_of['A08'], id_of['A09'])
+
+        woken = db_api.action_mark_failed(self.ctx, id_of['A02'], timestamp,
+                                          'BOOM')
+
+        self.assertEqual(sorted([id_of[n] for n in ['A01', 'A05', 'A06',
+                                                    'A07', 'A08', 'A09']]),
+                         sorted(woken))
+        action = db_api.action_get(self.ctx, id_of['A02'])
+        self.assertEqual(consts.ACTION_FAILED, action.status)
+        self.assertEqual('BOOM', action.status_reason)
+        for name in ['A01', 'A05', 'A06', 'A07', 'A08', 'A09']:
+            action = db_api.action_get(self.ctx, id_of[name])
+            self.assertEqual(consts.ACTION_FAILED, action.status)
+            self.assertEqual('Action execution failed', action.status_reason)
+            self.assertEqual(round(timestamp, 6), float(action.end_time))
+            self.assertIsNone(action.owner)
+            res = db_api.dependency_get_dependents(self.ctx, id_of[name])
+            self.assertEqual(0, len(res))
+        for name in ['A03', 'A04']:
+            action = db_api.action_get(self.ctx, id_of[name])
+            self.assertEqual('INIT', action.status)
+
     def test_action_mark_failed_parent_status_update_not_needed(self):
         timestamp = time.time()
         id_of = self._prepare_action_mark_failed_cancel()
-        db_api.action_mark_failed(self.ctx, id_of['A03'], timestamp)
+        woken = db_api.action_mark_failed(self.ctx, id_of['A03'], timestamp)
+
+        self.assertEqual([], woken)
 
         action = db_api.action_get(self.ctx, id_of['A01'])
         self.assertEqual(consts.ACTION_WAITING, action.status)
@@ -563,7 +816,11 @@ class DBAPIActionTest(base.SenlinTestCase):
     def test_action_mark_cancelled(self):
         timestamp = time.time()
         id_of = self._prepare_action_mark_failed_cancel()
-        db_api.action_mark_cancelled(self.ctx, id_of['A01'], timestamp)
+        woken = db_api.action_mark_cancelled(self.ctx, id_of['A01'],
+                                             timestamp)
+
+        self.assertEqual(sorted([id_of['A05'], id_of['A06'], id_of['A07']]),
+                         sorted(woken))
 
         for aid in [id_of['A05'], id_of['A06'], id_of['A07']]:
             action = db_api.action_get(self.ctx, aid)
@@ -576,7 +833,12 @@ class DBAPIActionTest(base.SenlinTestCase):
     def test_action_mark_cancelled_parent_status_update_needed(self):
         timestamp = time.time()
         id_of = self._prepare_action_mark_failed_cancel()
-        db_api.action_mark_cancelled(self.ctx, id_of['A04'], timestamp)
+        woken = db_api.action_mark_cancelled(self.ctx, id_of['A04'],
+                                             timestamp)
+
+        self.assertEqual(sorted([id_of['A01'], id_of['A05'], id_of['A06'],
+                                 id_of['A07']]),
+                         sorted(woken))
 
         action = db_api.action_get(self.ctx, id_of['A01'])
         self.assertEqual(consts.ACTION_CANCELLED, action.status)
@@ -588,7 +850,10 @@ class DBAPIActionTest(base.SenlinTestCase):
     def test_action_mark_cancelled_parent_status_update_not_needed(self):
         timestamp = time.time()
         id_of = self._prepare_action_mark_failed_cancel()
-        db_api.action_mark_cancelled(self.ctx, id_of['A03'], timestamp)
+        woken = db_api.action_mark_cancelled(self.ctx, id_of['A03'],
+                                             timestamp)
+
+        self.assertEqual([], woken)
 
         action = db_api.action_get(self.ctx, id_of['A01'])
         self.assertEqual(consts.ACTION_WAITING, action.status)
@@ -674,6 +939,17 @@ class DBAPIActionTest(base.SenlinTestCase):
         actions = db_api.action_get_all(self.ctx)
         self.assertEqual(3, len(actions))
 
+    def test_action_delete_by_target_list(self):
+        for target in ['NODE_1', 'NODE_2', 'NODE_3']:
+            action = _create_action(self.ctx, action='NODE_CHECK',
+                                    target=target)
+            self.assertIsNotNone(action)
+
+        db_api.action_delete_by_target(self.ctx, ['NODE_1', 'NODE_2'])
+        actions = db_api.action_get_all(self.ctx)
+        self.assertEqual(1, len(actions))
+        self.assertEqual('NODE_3', actions[0].target)
+
     def test_action_delete_by_target_with_action(self):
         for name in ['CLUSTER_CREATE', 'CLUSTER_DELETE', 'CLUSTER_DELETE']:
             action = _create_action(self.ctx, action=name, target='CLUSTER_ID')
@@ -805,3 +1081,32 @@ class DBAPIActionTest(base.SenlinTestCase):
 
         actions = db_api.action_get_all(self.ctx)
         self.assertEqual(3, len(actions))
+
+    def test_action_purge_limit_statuses(self):
+        old_timestamp = tu.utcnow(True) - datetime.timedelta(days=6)
+        a1 = _create_action(self.ctx, created_at=old_timestamp,
+                            status=consts.ACTION_SUCCEEDED)
+        a2 = _create_action(self.ctx, created_at=old_timestamp,
+                            status=consts.ACTION_FAILED)
+        a3 = _create_action(self.ctx, created_at=old_timestamp,
+                            status=consts.ACTION_RUNNING)
+        db_api.dependency_add(self.ctx, a1.id, a3.id)
+        db_api.dependency_add(self.ctx, a3.id, a2.id)
+        # the dependent action is waiting after adding the dependency
+        db_api.action_update(self.ctx, a2.id,
+                             {'status': consts.ACTION_FAILED})
+        statuses = [consts.ACTION_SUCCEEDED, consts.ACTION_FAILED]
+
+        res = db_api.action_purge(project=None, granularity='days', age=5,
+                                  limit=1, statuses=statuses)
+        self.assertEqual(1, res)
+        res = db_api.action_purge(project=None, granularity='days', age=5,
+                                  limit=1, statuses=statuses)
+        self.assertEqual(1, res)
+        res = db_api.action_purge(project=None, granularity='days', age=5,
+                                  limit=1, statuses=statuses)
+        self.assertEqual(0, res)
+
+        actions = db_api.action_get_all(self.ctx)
+        self.assertEqual([a3.id], [a.id for a in actions])
+        self.assertEqual([], db_api.dependency_get_all(self.ctx, [a3.id]))
@@ -12,8 +12,10 @@
 
 from unittest import mock
 
+from oslo_db import exception as db_exc
 from oslo_db.sqlalchemy import utils as sa_utils
 from oslo_utils import timeutils as tu
+import sqlalchemy
 
 from senlin.common import exception
 from senlin.db.sqlalchemy import api as db_api
@@ -60,6 +62,26 @@ class DBAPIClusterTest(base.SenlinTestCase):
         self.assertEqual(cluster.id, ret_cluster.id)
         self.assertEqual('db_test_cluster_name', ret_cluster.name)
 
+    def test_cluster_get_loads_ids_only(self):
+        cluster = shared.create_cluster(self.ctx, self.profile)
+        node1 = shared.create_node(self.ctx, cluster, self.profile)
+        node2 = shared.create_node(self.ctx, cluster, self.profile)
+        policy = shared.create_policy(self.ctx)
+        binding = db_api.cluster_policy_attach(self.ctx, cluster.id,
+                                               policy.id, {})
+
+        ret_cluster = db_api.cluster_get(self.ctx, cluster.id)
+
+        self.assertEqual(sorted([node1.id, node2.id]),
+                         sorted(n.id for n in ret_cluster.nodes))
+        self.assertEqual([binding.id], [b.id for b in ret_cluster.policies])
+        self.assertEqual(self.profile.name, ret_cluster.profile.name)
+        # the other columns of nodes and of the profile are not loaded
+        node = sqlalchemy.inspect(ret_cluster.nodes[0])
+        self.assertIn('name', node.unloaded)
+        profile = sqlalchemy.inspect(ret_cluster.profile)
+        self.assertIn('spec', profile.unloaded)
+
     def test_cluster_get_not_found(self):
         cluster = db_api.cluster_get(self.ctx, UUID1)
         self.assertIsNone(cluster)
@@ -89,6 +111,17 @@ class DBAPIClusterTest(base.SenlinTestCase):
         self.assertEqual(cluster.id, ret_cluster.id)
         self.assertEqual('db_test_cluster_name', ret_cluster.name)
 
+    def test_cluster_exists(self):
+        cluster = shared.create_cluster(self.ctx, self.profile)
+
+        self.assertTrue(db_api.cluster_exists(self.ctx, cluster.id))
+        self.assertFalse(db_api.cluster_exists(self.ctx, UUID1))
+
+        self.ctx.project_id = 'abc'
+        self.assertFalse(db_api.cluster_exists(self.ctx, cluster.id))
+        self.assertTrue(db_api.cluster_exists(self.ctx, cluster.id,
+                                              project_safe=False))
+
     def test_cluster_get_by_name(self):
         cluster = shared.create_cluster(self.ctx, self.profile)
         ret_cluster = db_api.cluster_get_by_name(self.ctx, cluster.name)
@@ -169,6 +202,57 @@ class DBAPIClusterTest(base.SenlinTestCase):
         res = db_api.cluster_get_by_short_id(ctx_new, UUID1[:11])
         self.assertIsNone(res)
 
+    def test_cluster_find(self):
+        cluster1 = shared.create_cluster(self.ctx, self.profile, id=UUID1,
+                                         name='cluster-1')
+        cluster2 = shared.create_cluster(self.ctx, self.profile, id=UUID2,
+                                         name=UUID1[:8])
+
+        res = db_api.cluster_find(self.ctx, UUID1)
+        self.assertEqual(cluster1.id, res.id)
+        res = db_api.cluster_find(self.ctx, 'cluster-1')
+        self.assertEqual(cluster1.id, res.id)
+        res = db_api.cluster_find(self.ctx, UUID2[:8])
+        self.assertEqual(cluster2.id, res.id)
+        # a name match wins over an ID prefix match
+        res = db_api.cluster_find(self.ctx, UUID1[:8])
+        self.assertEqual(cluster2.id, res.id)
+        res = db_api.cluster_find(self.ctx, 'non-existent')
+        self.assertIsNone(res)
+
+        ctx_new = utils.dummy_context(project='different_project_id')
+        res = db_api.cluster_find(ctx_new, UUID1)
+        self.assertIsNone(res)
+        res = db_api.cluster_find(ctx_new, 'cluster-1')
+        self.assertIsNone(res)
+        res = db_api.cluster_find(ctx_new, 'cluster-1', project_safe=False)
+        self.assertEqual(cluster1.id, res.id)
+
+    def test_cluster_find_id_over_name(self):
+        cluster1 = shared.create_cluster(self.ctx, self.profile, id=UUID1)
+        shared.create_cluster(self.ctx, self.profile, id=UUID2, name=UUID1)
+        shared.create_cluster(self.ctx, self.profile, id=UUID3, name=UUID1)
+
+        res = db_api.cluster_find(self.ctx, UUID1)
+
+        self.assertEqual(cluster1.id, res.id)
+
+    def test_cluster_find_multiple_choices(self):
+        shared.create_cluster(self.ctx, self.profile,
+                              id='same-part-unique-part', name='cluster')
+        shared.create_cluster(self.ctx, self.profile,
+                              id='same-part-part-unique', name='cluster')
+
+        self.assertRaises(exception.MultipleChoices,
+                          db_api.cluster_find, self.ctx, 'cluster')
+        self.assertRaises(exception.MultipleChoices,
+                          db_api.cluster_find, self.ctx, 'same-part')
+        res = db_api.cluster_find(self.ctx, 'same-part-u')
+        self.assertEqual('same-part-unique-part', res.id)
+        # wildcards are matched literally
+        self.assertIsNone(db_api.cluster_find(self.ctx, 'same_part'))
+        self.assertIsNone(db_api.cluster_find(self.ctx, '%unique'))
+
     def test_cluster_get_all(self):
         values = [
             {'name': 'cluster1'},
@@ -305,6 +389,25 @@ class DBAPIClusterTest(base.SenlinTestCase):
         st_db = db_api.cluster_get_all(self.ctx, marker=uuid)
         self.assertEqual(3, len(st_db))
 
+    def test_cluster_get_all_marker_invalid_sort_key(self):
+        cluster = shared.create_cluster(self.ctx, self.profile)
+
+        self.assertRaises(db_exc.InvalidSortKey, db_api.cluster_get_all,
+                          self.ctx, marker=cluster.id, sort='foo')
+
+    def test_cluster_get_all_marker_no_model_query(self):
+        clusters = [shared.create_cluster(self.ctx, self.profile,
+                                          init_at=tu.utcnow(True))
+                    for x in range(2)]
+
+        with mock.patch.object(db_api, 'cluster_model_query',
+                               wraps=db_api.cluster_model_query) as mock_q:
+            res = db_api.cluster_get_all(self.ctx, marker=clusters[0].id)
+
+        self.assertEqual([clusters[1].id], [c.id for c in res])
+        # the marker is not loaded with its nodes, profile and policies
+        mock_q.assert_called_once_with()
+
     def test_cluster_next_index(self):
         cluster = shared.create_cluster(self.ctx, self.profile)
         cluster_id = cluster.id
@@ -319,6 +422,15 @@ class DBAPIClusterTest(base.SenlinTestCase):
         res = db_api.cluster_get(self.ctx, cluster_id)
         self.assertEqual(3, res.next_index)
 
+    def test_cluster_next_index_block(self):
+        cluster = shared.create_cluster(self.ctx, self.profile)
+        res = db_api.cluster_next_index(self.ctx, cluster.id, 5)
+        self.assertEqual(1, res)
+        res = db_api.cluster_next_index(self.ctx, cluster.id)
+        self.assertEqual(6, res)
+        res = db_api.cluster_get(self.ctx, cluster.id)
+        self.assertEqual(7, res.next_index)
+
     def test_cluster_count_all(self):
         clusters = [shared.create_cluster(self.ctx, self.profile)
                     for i in range(3)]
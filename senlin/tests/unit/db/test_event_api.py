@@ -10,6 +10,8 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import datetime
+
 from oslo_log import log as logging
 from oslo_utils import reflection
 from oslo_utils import timeutils as tu
@@ -88,6 +90,25 @@ class DBAPIEventTest(base.SenlinTestCase):
         self.assertEqual(self.ctx.user_id, ret_event.user)
         self.assertEqual(self.ctx.project_id, ret_event.project)
 
+    def test_event_create_batch(self):
+        values = [{
+            'timestamp': tu.utcnow(True),
+            'level': '20',
+            'oid': 'NODE%s' % i,
+            'otype': 'NODE',
+            'user': self.ctx.user_id,
+            'project': self.ctx.project_id,
+        } for i in range(3)]
+
+        res = db_api.event_create_batch(self.ctx, values)
+
+        self.assertIsNone(res)
+        events = db_api.event_get_all(self.ctx)
+        self.assertEqual(3, len(events))
+        self.assertEqual(3, len(set(e.id for e in events)))
+        self.assertEqual(['NODE0', 'NODE1', 'NODE2'],
+                         sorted(e.oid for e in events))
+
     def test_event_get_diff_project(self):
         event = self.create_event(self.ctx)
         new_ctx = utils.dummy_context(project='a-different-project')
@@ -131,6 +152,20 @@ class DBAPIEventTest(base.SenlinTestCase):
         self.assertIsNotNone(res)
         self.assertEqual(event.id, res.id)
 
+    def test_event_find(self):
+        event = self.create_event(self.ctx)
+
+        res = db_api.event_find(self.ctx, event.id)
+        self.assertEqual(event.id, res.id)
+        res = db_api.event_find(self.ctx, event.id[:8])
+        self.assertEqual(event.id, res.id)
+        res = db_api.event_find(self.ctx, 'non-existent')
+        self.assertIsNone(res)
+
+        new_ctx = utils.dummy_context(project='a-different-project')
+        res = db_api.event_find(new_ctx, event.id)
+        self.assertIsNone(res)
+
     def test_event_get_all(self):
         cluster1 = shared.create_cluster(self.ctx, self.profile)
         cluster2 = shared.create_cluster(self.ctx, self.profile)
@@ -550,3 +585,47 @@ class DBAPIEventTest(base.SenlinTestCase):
         db_api.event_purge(project=None, granularity='days', age=5)
         res = db_api.event_get_all_by_cluster(self.ctx, cluster1.id)
         self.assertEqual(1, len(res))
+
+    def test_event_purge_limit(self):
+        cluster1 = shared.create_cluster(self.ctx, self.profile)
+        old_timestamp = tu.utcnow() - datetime.timedelta(days=10)
+        for i in range(5):
+            self.create_event(self.ctx, entity=cluster1,
+                              timestamp=old_timestamp + datetime.timedelta(
+                                  seconds=i))
+        self.create_event(self.ctx, timestamp=tu.utcnow(), entity=cluster1)
+
+        res = db_api.event_purge(project=None, granularity='days', age=5,
+                                 limit=3)
+        self.assertEqual(3, res)
+        res = db_api.event_purge(project=None, granularity='days', age=5,
+                                 limit=3)
+        self.assertEqual(2, res)
+        res = db_api.event_purge(project=None, granularity='days', age=5,
+                                 limit=3)
+        self.assertEqual(0, res)
+
+        res = db_api.event_get_all_by_cluster(self.ctx, cluster1.id)
+        self.assertEqual(1, len(res))
+
+    def test_event_purge_exclude(self):
+        ctx2 = utils.dummy_context(project='another-project')
+        self.create_event(self.ctx)
+        self.create_event(ctx2)
+
+        res = db_api.event_purge(project=None, granularity='days', age=5,
+                                 exclude=[ctx2.project_id], limit=10)
+
+        self.assertEqual(1, res)
+        self.assertEqual(0, len(db_api.event_get_all(self.ctx)))
+        self.assertEqual(1, len(db_api.event_get_all(ctx2)))
+
+    def test_event_purge_limit_same_timestamp(self):
+        for i in range(3):
+            self.create_event(self.ctx)
+
+        res = db_api.event_purge(project=None, granularity='days', age=5,
+                                 limit=2)
+
+        # events sharing the timestamp of the last one are deleted together
+        self.assertEqual(3, res)
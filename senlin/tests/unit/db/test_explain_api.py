@@ -0,0 +1,38 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from senlin.db.sqlalchemy import api as db_api
+from senlin.tests.unit.common import base
+
+
+class DBAPIExplainTest(base.SenlinTestCase):
+
+    def test_db_explain(self):
+        res = db_api.db_explain(db_api.get_engine())
+
+        plans = dict((name, plan) for name, sql, plan in res)
+        self.assertEqual(7, len(plans))
+        expected = {
+            'action_acquire_ready_batch': 'ix_action_status_owner',
+            'action_get_all_active_by_target': 'ix_action_target_status',
+            'node_get_all_by_cluster': 'ix_node_cluster_id',
+            'dependency_get_depended': 'ix_dependency_dependent',
+            'dependency_get_dependents': 'ix_dependency_depended',
+            'event_get_all_by_cluster': 'ix_event_cluster_id_timestamp',
+            'registry_get_by_engine': 'ix_health_registry_engine_id',
+        }
+        for name, index in expected.items():
+            plan = ' '.join(str(c) for row in plans[name] for c in row)
+            self.assertIn(index, plan)
+
+        for name, sql, plan in res:
+            self.assertIn('SELECT', sql)
@@ -10,8 +10,16 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import datetime
+import time
+from unittest import mock
+
+from oslo_utils import timeutils
 from oslo_utils import uuidutils
+
+from senlin.common import consts
 from senlin.db.sqlalchemy import api as db_api
+from senlin.db.sqlalchemy import models
 from senlin.tests.unit.common import base
 from senlin.tests.unit.common import utils
 from senlin.tests.unit.db import shared
@@ -45,13 +53,13 @@ class DBAPILockTest(base.SenlinTestCase):
         self.assertNotIn(UUID2, observed)
 
         observed = db_api.cluster_lock_acquire(self.cluster.id, UUID2, 1)
-        self.assertIn(UUID1, observed)
-        self.assertIn(UUID2, observed)
+        self.assertEqual([UUID2], observed)
 
         observed = db_api.cluster_lock_acquire(self.cluster.id, UUID2, 1)
-        self.assertIn(UUID1, observed)
-        self.assertIn(UUID2, observed)
-        self.assertEqual(2, len(observed))
+        self.assertEqual([UUID2], observed)
+
+        observed = db_api.cluster_lock_acquire(self.cluster.id, UUID3, -1)
+        self.assertEqual([UUID1, UUID2], sorted(observed))
 
         observed = db_api.cluster_lock_release(self.cluster.id, UUID1, 1)
         self.assertTrue(observed)
@@ -105,8 +113,7 @@ class DBAPILockTest(base.SenlinTestCase):
         self.assertNotIn(UUID2, observed)
 
         observed = db_api.cluster_lock_acquire(self.cluster.id, UUID2, 1)
-        self.assertIn(UUID1, observed)
-        self.assertIn(UUID2, observed)
+        self.assertEqual([UUID2], observed)
 
         observed = db_api.cluster_lock_acquire(self.cluster.id, UUID3, -1)
         self.assertIn(UUID1, observed)
@@ -174,6 +181,26 @@ class DBAPILockTest(base.SenlinTestCase):
         observed = db_api.cluster_lock_release(self.cluster.id, UUID1, -1)
         self.assertTrue(observed)
 
+    def test_cluster_lock_node_scope_holders(self):
+        for action_id in (UUID1, UUID2, UUID3):
+            db_api.cluster_lock_acquire(self.cluster.id, action_id, 1)
+
+        with db_api.session_for_read() as session:
+            query = session.query(models.ClusterLockHolder).filter_by(
+                cluster_id=self.cluster.id)
+            self.assertEqual(3, query.count())
+            lock = session.query(models.ClusterLock).get(self.cluster.id)
+            self.assertEqual(0, lock.semaphore)
+            self.assertEqual([], lock.action_ids)
+
+        self.assertTrue(db_api.cluster_is_locked(self.cluster.id))
+        for action_id in (UUID1, UUID2, UUID3):
+            db_api.cluster_lock_release(self.cluster.id, action_id, 1)
+        self.assertFalse(db_api.cluster_is_locked(self.cluster.id))
+
+        observed = db_api.cluster_lock_acquire(self.cluster.id, UUID1, -1)
+        self.assertEqual([UUID1], observed)
+
     def test_cluster_is_locked(self):
         # newly created cluster should not be locked
         observed = db_api.cluster_is_locked(self.cluster.id)
@@ -263,6 +290,132 @@ class DBAPILockTest(base.SenlinTestCase):
         observed = db_api.node_is_locked(self.node.id)
         self.assertFalse(observed)
 
+    def test_node_lock_get_locked(self):
+        node2 = shared.create_node(self.ctx, self.cluster, self.profile)
+        db_api.node_lock_acquire(self.node.id, UUID1)
+
+        observed = db_api.node_lock_get_locked([self.node.id, node2.id])
+        self.assertEqual([self.node.id], observed)
+
+        observed = db_api.node_lock_get_locked([node2.id])
+        self.assertEqual([], observed)
+
+        observed = db_api.node_lock_get_locked([])
+        self.assertEqual([], observed)
+
+
+class DBAPILockWaiterTest(base.SenlinTestCase):
+    def setUp(self):
+        super(DBAPILockWaiterTest, self).setUp()
+        self.ctx = utils.dummy_context()
+        self.profile = shared.create_profile(self.ctx)
+        self.cluster = shared.create_cluster(self.ctx, self.profile)
+        self.node = shared.create_node(self.ctx, self.cluster, self.profile)
+        now = timeutils.utcnow(True)
+        self.actions = [
+            shared.create_action(
+                self.ctx, target=self.cluster.id, action='NODE_UPDATE',
+                status=consts.ACTION_RUNNING, owner=UUID1,
+                project=self.ctx.project_id,
+                created_at=now + datetime.timedelta(seconds=i))
+            for i in range(4)
+        ]
+
+    def _status(self, action):
+        return db_api.action_get(self.ctx, action.id).status
+
+    def test_lock_wait(self):
+        action = self.actions[0]
+
+        db_api.lock_wait(self.ctx, self.cluster.id, action.id, shared=True,
+                         values={'data': {'retries': 1}})
+
+        action = db_api.action_get(self.ctx, action.id)
+        self.assertEqual(consts.ACTION_WAITING, action.status)
+        self.assertIsNone(action.owner)
+        self.assertEqual({'retries': 1}, action.data)
+        with db_api.session_for_read() as session:
+            waiter = session.query(models.LockWaiter).get(
+                (self.cluster.id, action.id))
+            self.assertTrue(waiter.shared)
+            self.assertEqual(action.created_at, waiter.created_at)
+            self.assertIsNotNone(waiter.updated_at)
+
+    def test_lock_wake_held(self):
+        db_api.node_lock_acquire(self.node.id, UUID2)
+        db_api.lock_wait(self.ctx, self.node.id, self.actions[0].id)
+
+        self.assertEqual([], db_api.lock_wake(self.node.id))
+        self.assertEqual(consts.ACTION_WAITING, self._status(self.actions[0]))
+
+        db_api.node_lock_release(self.node.id, UUID2)
+        self.assertEqual([self.actions[0].id], db_api.lock_wake(self.node.id))
+        self.assertEqual(consts.ACTION_READY, self._status(self.actions[0]))
+        self.assertEqual([], db_api.lock_wake(self.node.id))
+
+    def test_lock_wake_no_waiter(self):
+        db_api.lock_wait(self.ctx, self.cluster.id, self.actions[0].id)
+
+        with mock.patch.object(db_api, '_lock_is_held') as mock_held:
+            self.assertEqual([], db_api.lock_wake(self.node.id))
+
+        self.assertEqual(0, mock_held.call_count)
+        self.assertEqual(consts.ACTION_WAITING, self._status(self.actions[0]))
+
+    def test_lock_wake_fifo(self):
+        # Queued in reverse order, woken up in the order of creation
+        for action in reversed(self.actions[:2]):
+            db_api.lock_wait(self.ctx, self.node.id, action.id)
+
+        self.assertEqual([self.actions[0].id], db_api.lock_wake(self.node.id))
+        self.assertEqual([self.actions[1].id], db_api.lock_wake(self.node.id))
+
+    def test_lock_wake_shared(self):
+        cluster_id = self.cluster.id
+        a1, a2, a3, a4 = [a.id for a in self.actions]
+        db_api.cluster_lock_acquire(cluster_id, UUID2, -1)
+        db_api.lock_wait(self.ctx, cluster_id, a1, shared=True)
+        db_api.lock_wait(self.ctx, cluster_id, a2, shared=True)
+        db_api.lock_wait(self.ctx, cluster_id, a3)
+        db_api.lock_wait(self.ctx, cluster_id, a4, shared=True)
+        self.assertEqual([], db_api.lock_wake(cluster_id))
+
+        db_api.cluster_lock_release(cluster_id, UUID2, -1)
+        self.assertEqual([a1, a2], db_api.lock_wake(cluster_id))
+
+        # The exclusive waiter waits for the shared locks to be released
+        db_api.cluster_lock_acquire(cluster_id, a1, 1)
+        self.assertEqual([], db_api.lock_wake(cluster_id))
+        db_api.cluster_lock_release(cluster_id, a1, 1)
+        self.assertEqual([a3], db_api.lock_wake(cluster_id))
+        db_api.cluster_lock_acquire(cluster_id, a3, -1)
+        self.assertEqual([], db_api.lock_wake(cluster_id))
+        db_api.cluster_lock_release(cluster_id, a3, -1)
+        self.assertEqual([a4], db_api.lock_wake(cluster_id))
+
+    def test_lock_wake_skip_not_waiting(self):
+        a1, a2 = [a.id for a in self.actions[:2]]
+        db_api.lock_wait(self.ctx, self.node.id, a1)
+        db_api.lock_wait(self.ctx, self.node.id, a2)
+        db_api.action_mark_cancelled(self.ctx, a1, time.time())
+
+        self.assertEqual([a2], db_api.lock_wake(self.node.id))
+        with db_api.session_for_read() as session:
+            query = session.query(models.LockWaiter)
+            self.assertEqual(0, query.count())
+
+    def test_lock_waiter_get_stale(self):
+        db_api.lock_wait(self.ctx, self.node.id, self.actions[0].id)
+        db_api.lock_wait(self.ctx, self.cluster.id, self.actions[1].id)
+        with db_api.session_for_write() as session:
+            waiter = session.query(models.LockWaiter).get(
+                (self.node.id, self.actions[0].id))
+            waiter.updated_at = (timeutils.utcnow(True) -
+                                 datetime.timedelta(seconds=60))
+
+        self.assertEqual([self.node.id], db_api.lock_waiter_get_stale(10))
+        self.assertEqual([], db_api.lock_waiter_get_stale(120))
+
 
 class GCByEngineTest(base.SenlinTestCase):
 
@@ -359,9 +512,9 @@ class GCByEngineTest(base.SenlinTestCase):
         # assertion
         # a read lock is okay now and cluster lock state not broken
         observed = db_api.cluster_lock_acquire(self.cluster.id, UUID3, 1)
-        self.assertIn(UUID2, observed)
-        self.assertIn(UUID3, observed)
-        self.assertNotIn(action.id, observed)
+        self.assertEqual([UUID3], observed)
+        observed = db_api.cluster_lock_acquire(self.cluster.id, UUID1, -1)
+        self.assertEqual([UUID2, UUID3], sorted(observed))
 
         # node can be locked again
         observed = db_api.node_lock_acquire(self.node.id, UUID2)
@@ -371,6 +524,75 @@ class GCByEngineTest(base.SenlinTestCase):
         self.assertEqual('FAILED', new_action.status)
         self.assertEqual("Engine failure", new_action.status_reason)
 
+    def test_reclaim_all_actions_and_locks(self):
+        # All the actions and locks of the dead engine are reclaimed
+        # together, the locks of other engines are left untouched
+        engine_id = UUID1
+        cluster2 = shared.create_cluster(self.ctx, self.profile)
+        node2 = shared.create_node(self.ctx, self.cluster, self.profile)
+        actions = [
+            shared.create_action(self.ctx, target=self.node.id,
+                                 status='RUNNING', owner=engine_id,
+                                 project=self.ctx.project_id)
+            for i in range(2)
+        ]
+        cluster_action = shared.create_action(
+            self.ctx, target=cluster2.id, status='RUNNING', owner=engine_id,
+            project=self.ctx.project_id)
+        other = shared.create_action(self.ctx, target=node2.id,
+                                     status='RUNNING', owner=UUID2,
+                                     project=self.ctx.project_id)
+        for a in actions + [other]:
+            db_api.cluster_lock_acquire(self.cluster.id, a.id, 1)
+        db_api.node_lock_acquire(self.node.id, actions[0].id)
+        db_api.node_lock_acquire(node2.id, other.id)
+        db_api.cluster_lock_acquire(cluster2.id, cluster_action.id, -1)
+
+        woken, released = db_api.gc_by_engine(engine_id)
+
+        self.assertEqual([], woken)
+        self.assertEqual(sorted([self.cluster.id, cluster2.id, self.node.id]),
+                         sorted(released))
+
+        for a in actions + [cluster_action]:
+            new_action = db_api.action_get(self.ctx, a.id)
+            self.assertEqual('FAILED', new_action.status)
+            self.assertEqual('Engine failure', new_action.status_reason)
+            self.assertIsNone(new_action.owner)
+        self.assertEqual('RUNNING', db_api.action_get(self.ctx,
+                                                      other.id).status)
+
+        observed = db_api.cluster_lock_acquire(self.cluster.id, UUID3, -1)
+        self.assertEqual([other.id], observed)
+        observed = db_api.cluster_lock_acquire(cluster2.id, UUID3, -1)
+        self.assertEqual([UUID3], observed)
+        self.assertFalse(db_api.node_is_locked(self.node.id))
+        self.assertTrue(db_api.node_is_locked(node2.id))
+
+    def test_wake_dependents(self):
+        # The parent of a reclaimed action is returned to be woken up
+        engine_id = UUID1
+        parent = shared.create_action(self.ctx, target=self.cluster.id,
+                                      status='WAITING', owner=UUID2,
+                                      project=self.ctx.project_id)
+        child = shared.create_action(self.ctx, target=self.node.id,
+                                     status='RUNNING', owner=engine_id,
+                                     project=self.ctx.project_id)
+        db_api.dependency_add(self.ctx, [child.id], parent.id)
+
+        woken, released = db_api.gc_by_engine(engine_id)
+
+        self.assertEqual([parent.id], woken)
+        self.assertEqual([], released)
+
+    def test_no_action(self):
+        db_api.cluster_lock_acquire(self.cluster.id, UUID2, -1)
+
+        res = db_api.gc_by_engine(UUID1)
+
+        self.assertEqual(([], []), res)
+        self.assertTrue(db_api.cluster_is_locked(self.cluster.id))
+
 
 class DummyGCByEngineTest(base.SenlinTestCase):
 
@@ -467,9 +689,9 @@ class DummyGCByEngineTest(base.SenlinTestCase):
         # assertion
         # a read lock is okay now and cluster lock state not broken
         observed = db_api.cluster_lock_acquire(self.cluster.id, UUID3, 1)
-        self.assertIn(UUID2, observed)
-        self.assertIn(UUID3, observed)
-        self.assertNotIn(action.id, observed)
+        self.assertEqual([UUID3], observed)
+        observed = db_api.cluster_lock_acquire(self.cluster.id, UUID1, -1)
+        self.assertEqual([UUID2, UUID3], sorted(observed))
 
         # node can be locked again
         observed = db_api.node_lock_acquire(self.node.id, UUID2)
@@ -15,10 +15,14 @@ from unittest import mock
 from oslo_db.sqlalchemy import utils as sa_utils
 from oslo_serialization import jsonutils
 from oslo_utils import timeutils as tu
+import sqlalchemy
+from sqlalchemy.dialects import mysql
+from sqlalchemy.dialects import postgresql
 
 from senlin.common import consts
 from senlin.common import exception
 from senlin.db.sqlalchemy import api as db_api
+from senlin.db.sqlalchemy import models
 from senlin.tests.unit.common import base
 from senlin.tests.unit.common import utils
 from senlin.tests.unit.db import shared
@@ -562,6 +566,83 @@ class DBAPINodeTest(base.SenlinTestCase):
         self.assertEqual("The node 'BogusId' could not be found.",
                          str(ex))
 
+    def test_node_update_batch(self):
+        node1 = shared.create_node(self.ctx, self.cluster, self.profile,
+                                   status='ACTIVE')
+        node2 = shared.create_node(self.ctx, self.cluster, self.profile,
+                                   status='ACTIVE')
+        node3 = shared.create_node(self.ctx, self.cluster, self.profile,
+                                   status='RECOVERING')
+        node4 = shared.create_node(self.ctx, self.cluster, self.profile,
+                                   status='ACTIVE')
+
+        res = db_api.node_update_batch(
+            self.ctx, [node1.id, node2.id, node3.id],
+            {'status': 'ERROR', 'status_reason': 'gone'}, status='ACTIVE')
+
+        self.assertEqual(2, res)
+        for node_id in [node1.id, node2.id]:
+            node = db_api.node_get(self.ctx, node_id)
+            self.assertEqual('ERROR', node.status)
+            self.assertEqual('gone', node.status_reason)
+        self.assertEqual('RECOVERING',
+                         db_api.node_get(self.ctx, node3.id).status)
+        self.assertEqual('ACTIVE', db_api.node_get(self.ctx, node4.id).status)
+
+    def test_node_update_batch_empty(self):
+        res = db_api.node_update_batch(self.ctx, [], {'status': 'ERROR'})
+
+        self.assertEqual(0, res)
+
+    def test_node_update_data(self):
+        node = shared.create_node(self.ctx, self.cluster, self.profile,
+                                  data={'foo': 'bar', 'old': 1})
+
+        db_api.node_update_data(self.ctx, node.id,
+                                values={'lb_member': 'M1', 'foo': [1]},
+                                removed=['old', 'missing'])
+
+        node = db_api.node_get(self.ctx, node.id)
+        self.assertEqual({'foo': [1], 'lb_member': 'M1'}, node.data)
+
+    def test_node_update_data_not_found(self):
+        ex = self.assertRaises(exception.ResourceNotFound,
+                               db_api.node_update_data,
+                               self.ctx, 'BogusId', {'foo': 'bar'})
+        self.assertEqual("The node 'BogusId' could not be found.",
+                         str(ex))
+
+    def test_update_json_keys_native(self):
+        for dialect, expected in [
+                (mysql.dialect(),
+                 "UPDATE node SET data=JSON_REMOVE(JSON_SET(CASE WHEN "
+                 "(JSON_TYPE(node.data) = %s) THEN node.data ELSE "
+                 "JSON_OBJECT() END, %s, JSON_EXTRACT(%s, %s)), %s)"),
+                (postgresql.dialect(),
+                 "UPDATE node SET data=(jsonb_set(CASE WHEN "
+                 "(jsonb_typeof(node.data) = %(jsonb_typeof_1)s) THEN "
+                 "node.data ELSE CAST(%(param_1)s AS JSONB) END, "
+                 "%(param_2)s::TEXT[], CAST(%(param_3)s AS JSONB)) - "
+                 "%(jsonb_set_1)s)")]:
+            session = mock.Mock()
+            session.get_bind.return_value.dialect = dialect
+            query = session.query.return_value.filter_by.return_value
+            query.update.return_value = 1
+
+            res = db_api.update_json_keys(session, models.Node, 'ID', 'data',
+                                          values={'lb_member': {'id': 'M'}},
+                                          removed=['old'])
+
+            self.assertTrue(res)
+            session.query.return_value.filter_by.assert_called_once_with(
+                id='ID')
+            values, = query.update.call_args[0]
+            stmt = sqlalchemy.update(models.Node.__table__).values(values)
+            compiled = stmt.compile(dialect=dialect)
+            self.assertEqual(expected, str(compiled))
+            self.assertIn('{"id":"M"}', compiled.params.values())
+            self.assertFalse(session.query.return_value.first.called)
+
     def test_node_update_cluster_status_updated(self):
         cluster = db_api.cluster_get(self.ctx, self.cluster.id)
         self.assertEqual('INIT', cluster.status)
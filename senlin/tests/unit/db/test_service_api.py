@@ -41,6 +41,7 @@ class DBAPIServiceTest(base.SenlinTestCase):
                 host=values.get('host'),
                 binary=values.get('binary'),
                 topic=values.get('topic'),
+                disabled=values.get('disabled', False),
                 created_at=values.get('created_at') or time_now,
                 updated_at=values.get('updated_at') or time_now,
             )
@@ -98,6 +99,30 @@ class DBAPIServiceTest(base.SenlinTestCase):
         services = db_api.service_get_all_expired('senlin-engine')
         self.assertEqual(5, len(services.all()))
 
+    def test_service_get_all_alive(self):
+        for index in range(4):
+            dt = timeutils.utcnow() - datetime.timedelta(seconds=60 * index)
+            values = {
+                'host': 'host-%s' % index,
+                'updated_at': dt
+            }
+            self._create_service('engine-%s' % index, **values)
+        self._create_service('engine-disabled', disabled=True)
+        self._create_service('health-manager',
+                             binary='senlin-health-manager')
+
+        services = db_api.service_get_all_alive('senlin-engine')
+
+        self.assertEqual(['engine-0', 'engine-1', 'engine-2'],
+                         sorted(s.id for s in services))
+
+    def test_service_update_load(self):
+        service = self._create_service()
+
+        db_api.service_update(service.id, {'load': 7})
+
+        self.assertEqual(7, db_api.service_get(service.id).load)
+
     def test_service_update(self):
         old_service = self._create_service()
         old_updated_time = old_service.updated_at
@@ -14,9 +14,11 @@
 
 from unittest import mock
 
+from oslo_serialization import jsonutils
 from oslo_utils import timeutils
 import pytz
 from sqlalchemy.dialects.mysql import base as mysql_base
+from sqlalchemy.dialects.postgresql import base as pg_base
 from sqlalchemy.dialects.sqlite import base as sqlite_base
 from sqlalchemy import types
 import testtools
@@ -24,6 +26,21 @@ import testtools
 from senlin.db.sqlalchemy import types as db_types
 
 
+class JSONTest(testtools.TestCase):
+
+    def test_dumps(self):
+        now = timeutils.utcnow(True)
+
+        value = {'foo': [1, 2], 'at': now}
+
+        result = db_types.dumps(value)
+
+        # values are converted the same way as before
+        self.assertEqual(jsonutils.loads(jsonutils.dumps(value)),
+                         db_types.loads(result))
+        self.assertNotIn(' ', db_types.dumps({'foo': [1, 2]}))
+
+
 class DictTest(testtools.TestCase):
 
     def setUp(self):
@@ -39,29 +56,40 @@ class DictTest(testtools.TestCase):
         self.assertEqual(types.Text, type(impl))
 
     def test_process_bind_param(self):
-        dialect = None
+        dialect = sqlite_base.SQLiteDialect()
         value = {'foo': 'bar'}
         result = self.sqltype.process_bind_param(value, dialect)
-        self.assertEqual('{"foo": "bar"}', result)
+        self.assertEqual('{"foo":"bar"}', result)
 
     def test_process_bind_param_null(self):
-        dialect = None
+        dialect = sqlite_base.SQLiteDialect()
         value = None
         result = self.sqltype.process_bind_param(value, dialect)
         self.assertEqual('null', result)
 
     def test_process_result_value(self):
-        dialect = None
+        dialect = sqlite_base.SQLiteDialect()
         value = '{"foo": "bar"}'
         result = self.sqltype.process_result_value(value, dialect)
         self.assertEqual({'foo': 'bar'}, result)
 
     def test_process_result_value_null(self):
-        dialect = None
+        dialect = sqlite_base.SQLiteDialect()
         value = None
         result = self.sqltype.process_result_value(value, dialect)
         self.assertIsNone(result)
 
+    def test_native_json(self):
+        for dialect in (mysql_base.MySQLDialect(), pg_base.PGDialect()):
+            impl = self.sqltype.load_dialect_impl(dialect)
+            self.assertIsInstance(impl, types.JSON)
+            # serialization is left to the native type
+            value = {'foo': 'bar'}
+            self.assertIs(value,
+                          self.sqltype.process_bind_param(value, dialect))
+            self.assertIs(value,
+                          self.sqltype.process_result_value(value, dialect))
+
 
 class ListTest(testtools.TestCase):
 
@@ -78,25 +106,25 @@ class ListTest(testtools.TestCase):
         self.assertEqual(types.Text, type(impl))
 
     def test_process_bind_param(self):
-        dialect = None
+        dialect = sqlite_base.SQLiteDialect()
         value = ['foo', 'bar']
         result = self.sqltype.process_bind_param(value, dialect)
-        self.assertEqual('["foo", "bar"]', result)
+        self.assertEqual('["foo","bar"]', result)
 
     def test_process_bind_param_null(self):
-        dialect = None
+        dialect = sqlite_base.SQLiteDialect()
         value = None
         result = self.sqltype.process_bind_param(value, dialect)
         self.assertEqual('null', result)
 
     def test_process_result_value(self):
-        dialect = None
+        dialect = sqlite_base.SQLiteDialect()
         value = '["foo", "bar"]'
         result = self.sqltype.process_result_value(value, dialect)
         self.assertEqual(['foo', 'bar'], result)
 
     def test_process_result_value_null(self):
-        dialect = None
+        dialect = sqlite_base.SQLiteDialect()
         value = None
         result = self.sqltype.process_result_value(value, dialect)
         self.assertIsNone(result)
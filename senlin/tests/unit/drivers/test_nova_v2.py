@@ -94,6 +94,15 @@ class TestNovaV2(base.SenlinTestCase):
         d.server_get('foo')
         self.compute.get_server.assert_called_once_with('foo')
 
+    def test_server_list(self):
+        d = nova_v2.NovaClient(self.conn_params)
+        self.compute.servers.return_value = ['s1', 's2']
+
+        res = d.server_list(tags='foo')
+
+        self.assertEqual(['s1', 's2'], res)
+        self.compute.servers.assert_called_once_with(details=True, tags='foo')
+
     def test_server_update(self):
         d = nova_v2.NovaClient(self.conn_params)
         attrs = {'mem': 2}
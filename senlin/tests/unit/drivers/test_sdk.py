@@ -14,6 +14,7 @@ import types
 from unittest import mock
 
 from openstack import connection
+from oslo_config import cfg
 from oslo_serialization import jsonutils
 from requests import exceptions as req_exc
 
@@ -224,13 +225,153 @@ class OpenStackSDKTest(base.SenlinTestCase):
         x_conn.session.get_token.return_value = 'TOKEN'
         x_conn.session.get_user_id.return_value = 'test-user-id'
         x_conn.session.get_project_id.return_value = 'test-project-id'
+        x_access = x_conn.session.auth.get_access.return_value
+        x_access.expires = 'EXPIRES_AT'
         access_info = {
             'token': 'TOKEN',
             'user_id': 'test-user-id',
-            'project_id': 'test-project-id'
+            'project_id': 'test-project-id',
+            'expires_at': 'EXPIRES_AT',
         }
 
         res = sdk.authenticate(foo='bar')
 
         self.assertEqual(access_info, res)
         mock_conn.assert_called_once_with({'foo': 'bar'})
+        x_conn.session.auth.get_access.assert_called_once_with(
+            x_conn.session)
+
+
+class ConnectionPoolTest(base.SenlinTestCase):
+
+    def setUp(self):
+        super(ConnectionPoolTest, self).setUp()
+        self.mock_create = self.patchobject(
+            sdk, 'create_connection',
+            side_effect=lambda params: mock.Mock(params=dict(params)))
+
+    def test_get_reuse(self):
+        pool = sdk.ConnectionPool(10, 600)
+
+        conn1 = pool.get({'trust_id': 'TRUST1', 'region_name': 'R1'})
+        conn2 = pool.get({'region_name': 'R1', 'trust_id': 'TRUST1'})
+        conn3 = pool.get({'trust_id': 'TRUST1', 'region_name': 'R2'})
+        conn4 = pool.get({'trust_id': 'TRUST2', 'region_name': 'R1'})
+
+        self.assertIs(conn1, conn2)
+        self.assertIsNot(conn1, conn3)
+        self.assertIsNot(conn1, conn4)
+        self.assertEqual(3, self.mock_create.call_count)
+        stats = pool.stats()
+        self.assertEqual(3, stats['size'])
+        self.assertEqual(1, stats['hits'])
+        self.assertEqual(3, stats['misses'])
+
+    def test_get_token_not_pooled(self):
+        pool = sdk.ConnectionPool(10, 600)
+
+        conn1 = pool.get({'token': 'TOKEN'})
+        conn2 = pool.get({'token': 'TOKEN'})
+
+        self.assertIsNot(conn1, conn2)
+        self.assertEqual(0, pool.stats()['size'])
+
+    def test_get_disabled(self):
+        pool = sdk.ConnectionPool(0, 600)
+
+        conn1 = pool.get({'trust_id': 'TRUST1'})
+        conn2 = pool.get({'trust_id': 'TRUST1'})
+
+        self.assertIsNot(conn1, conn2)
+
+    def test_get_max_size(self):
+        pool = sdk.ConnectionPool(2, 600)
+        conn1 = pool.get({'trust_id': 'TRUST1'})
+        pool.get({'trust_id': 'TRUST2'})
+        # TRUST1 becomes the most recently used connection
+        pool.get({'trust_id': 'TRUST1'})
+
+        pool.get({'trust_id': 'TRUST3'})
+
+        self.assertIs(conn1, pool.get({'trust_id': 'TRUST1'}))
+        stats = pool.stats()
+        self.assertEqual(2, stats['size'])
+        self.assertEqual(1, stats['evictions'])
+
+    def test_get_create_unlocked(self):
+        pool = sdk.ConnectionPool(10, 600)
+
+        def create(params):
+            self.assertFalse(pool._lock.locked())
+            return mock.Mock()
+
+        self.mock_create.side_effect = create
+
+        conn = pool.get({'trust_id': 'TRUST1'})
+
+        self.assertIs(conn, pool.get({'trust_id': 'TRUST1'}))
+        self.assertEqual(1, self.mock_create.call_count)
+
+    def test_get_create_race(self):
+        pool = sdk.ConnectionPool(10, 600)
+        winner = mock.Mock()
+        loser = mock.Mock()
+
+        def create(params):
+            # Another caller pools its connection while this one is created
+            pool._conns[pool._key(params)] = (winner, 0)
+            return loser
+
+        self.mock_create.side_effect = create
+
+        conn = pool.get({'trust_id': 'TRUST1'})
+
+        self.assertIs(winner, conn)
+        loser.close.assert_called_once_with()
+        winner.close.assert_not_called()
+        stats = pool.stats()
+        self.assertEqual(1, stats['size'])
+        self.assertEqual(1, stats['misses'])
+
+    def test_get_create_race_close_failed(self):
+        pool = sdk.ConnectionPool(10, 600)
+        winner = mock.Mock()
+        loser = mock.Mock()
+        loser.close.side_effect = Exception('boom')
+
+        def create(params):
+            pool._conns[pool._key(params)] = (winner, 0)
+            return loser
+
+        self.mock_create.side_effect = create
+
+        self.assertIs(winner, pool.get({'trust_id': 'TRUST1'}))
+
+    @mock.patch('time.time')
+    def test_get_idle_eviction(self, mock_time):
+        pool = sdk.ConnectionPool(10, 600)
+        mock_time.return_value = 1000
+        conn1 = pool.get({'trust_id': 'TRUST1'})
+        mock_time.return_value = 1500
+        pool.get({'trust_id': 'TRUST2'})
+
+        mock_time.return_value = 1700
+        conn3 = pool.get({'trust_id': 'TRUST1'})
+
+        self.assertIsNot(conn1, conn3)
+        stats = pool.stats()
+        self.assertEqual(2, stats['size'])
+        self.assertEqual(1, stats['evictions'])
+
+    def test_get_connection(self):
+        cfg.CONF.set_override('connection_pool_size', 5,
+                              group='authentication')
+        sdk.reset_connection_pool()
+
+        conn1 = sdk.get_connection({'trust_id': 'TRUST1'})
+        conn2 = sdk.get_connection({'trust_id': 'TRUST1'})
+
+        self.assertIs(conn1, conn2)
+        stats = sdk.connection_pool_stats()
+        self.assertEqual(5, stats['capacity'])
+        self.assertEqual(1, stats['hits'])
@@ -27,6 +27,7 @@ from senlin.engine import dispatcher
 from senlin.engine import environment
 from senlin.engine import event as EVENT
 from senlin.engine import node as node_mod
+from senlin.engine import senlin_lock
 from senlin.objects import action as ao
 from senlin.objects import cluster_lock as cl
 from senlin.objects import cluster_policy as cpo
@@ -257,6 +258,117 @@ class ActionBaseTest(base.SenlinTestCase):
         self.assertEqual('FAKE_ID', result)
         mock_store.assert_called_once_with(self.ctx)
 
+    @mock.patch.object(ao.Action, 'create_batch')
+    def test_action_create_batch(self, mock_batch):
+        children = [
+            ('NODE_1', 'NODE_CREATE', {'name': 'node_create_1',
+                                       'cause': consts.CAUSE_DERIVED}),
+            ('NODE_2', 'NODE_CHECK', {'inputs': {'foo': 'bar'}}),
+        ]
+
+        res = ab.Action.create_batch(self.ctx, 'PARENT_ID', children,
+                                     nodes=['NODE_VALUES'])
+
+        self.assertEqual(2, len(res))
+        mock_batch.assert_called_once_with(self.ctx, mock.ANY, 'PARENT_ID',
+                                           nodes=['NODE_VALUES'])
+        values = mock_batch.call_args[0][1]
+        self.assertEqual(res, [v['id'] for v in values])
+        self.assertEqual('NODE_1', values[0]['target'])
+        self.assertEqual('NODE_CREATE', values[0]['action'])
+        self.assertEqual('node_create_1', values[0]['name'])
+        self.assertEqual(consts.CAUSE_DERIVED, values[0]['cause'])
+        self.assertEqual({}, values[0]['inputs'])
+        self.assertEqual('NODE_CHECK', values[1]['action'])
+        self.assertEqual({'foo': 'bar'}, values[1]['inputs'])
+        for v in values:
+            self.assertEqual(ab.Action.READY, v['status'])
+            self.assertEqual(self.ctx.user_id, v['user'])
+            self.assertEqual(self.ctx.project_id, v['project'])
+            self.assertEqual(self.ctx.user_id, v['context']['user_id'])
+            self.assertIsNone(v['owner'])
+
+    @mock.patch.object(ao.Action, 'create_batch')
+    def test_action_create_batch_with_status(self, mock_batch):
+        kwargs = {
+            'status': 'WAITING_LIFECYCLE_COMPLETION',
+            'owner': 'OWNER_ID',
+        }
+        children = [('NODE_1', 'NODE_DELETE', kwargs)]
+
+        ab.Action.create_batch(self.ctx, 'PARENT_ID', children)
+
+        values = mock_batch.call_args[0][1]
+        self.assertEqual('WAITING_LIFECYCLE_COMPLETION', values[0]['status'])
+        self.assertEqual('OWNER_ID', values[0]['owner'])
+
+    @mock.patch.object(ao.Action, 'create_batch')
+    @mock.patch.object(ab.Action, '_check_batch')
+    def test_action_create_batch_not_forced(self, mock_check, mock_batch):
+        children = [('NODE_1', 'NODE_CHECK', {})]
+        mock_check.side_effect = exception.ActionConflict(
+            type='NODE_CHECK', target='NODE_1', actions='ACTION_1')
+
+        self.assertRaises(exception.ActionConflict,
+                          ab.Action.create_batch,
+                          self.ctx, 'PARENT_ID', children, force=False)
+
+        mock_check.assert_called_once_with(self.ctx, children)
+        mock_batch.assert_not_called()
+
+    @mock.patch.object(ao.Action, 'get_all_active_by_target')
+    @mock.patch.object(nl.NodeLock, 'get_locked')
+    def test_check_batch(self, mock_locked, mock_active):
+        mock_locked.return_value = []
+        mock_active.return_value = []
+        children = [
+            ('NODE_1', 'NODE_CHECK', {}),
+            ('NODE_2', 'NODE_DELETE', {}),
+        ]
+
+        ab.Action._check_batch(self.ctx, children)
+
+        mock_locked.assert_called_once_with(['NODE_1'])
+        mock_active.assert_called_once_with(self.ctx, mock.ANY)
+        self.assertEqual(['NODE_1', 'NODE_2'],
+                         sorted(mock_active.call_args[0][1]))
+
+    @mock.patch.object(ao.Action, 'get_all_active_by_target')
+    @mock.patch.object(nl.NodeLock, 'get_locked')
+    def test_check_batch_node_locked(self, mock_locked, mock_active):
+        mock_locked.return_value = ['NODE_2']
+        mock_active.return_value = []
+        children = [
+            ('NODE_1', 'NODE_CHECK', {}),
+            ('NODE_2', 'NODE_CHECK', {}),
+        ]
+
+        ex = self.assertRaises(exception.ResourceIsLocked,
+                               ab.Action._check_batch,
+                               self.ctx, children)
+
+        self.assertIn('NODE_2', str(ex))
+
+    @mock.patch.object(ao.Action, 'get_all_active_by_target')
+    @mock.patch.object(nl.NodeLock, 'get_locked')
+    def test_check_batch_conflict(self, mock_locked, mock_active):
+        mock_locked.return_value = []
+        mock_active.return_value = [
+            mock.Mock(target='NODE_1', id='ACTION_1'),
+            mock.Mock(target='NODE_2', id='ACTION_2'),
+        ]
+        children = [
+            ('NODE_1', 'NODE_DELETE', {}),
+            ('NODE_2', 'NODE_CHECK', {}),
+        ]
+
+        ex = self.assertRaises(exception.ActionConflict,
+                               ab.Action._check_batch,
+                               self.ctx, children)
+
+        self.assertIn('NODE_2', str(ex))
+        self.assertIn('ACTION_2', str(ex))
+
     @mock.patch.object(ab.Action, 'store')
     @mock.patch.object(ao.Action, 'get_all_active_by_target')
     @mock.patch.object(cl.ClusterLock, 'is_locked')
@@ -551,6 +663,20 @@ class ActionBaseTest(base.SenlinTestCase):
         mock_signal.assert_called_once_with(action.context, action.id,
                                             action.SIG_CANCEL)
 
+    @mock.patch.object(ao.Action, 'signal')
+    @mock.patch.object(dobj.Dependency, 'get_depended')
+    def test_signal_cancel_waiting(self, mock_dobj, mock_signal):
+        action = ab.Action(OBJID, 'OBJECT_ACTION', self.ctx, id=ACTION_ID)
+        self.patchobject(action, '_wake_actions')
+        mock_dobj.return_value = None
+
+        action.status = action.WAITING
+        action.signal_cancel()
+
+        action._wake_actions.assert_called_once_with([ACTION_ID])
+        mock_signal.assert_called_once_with(action.context, action.id,
+                                            action.SIG_CANCEL)
+
     @mock.patch.object(ao.Action, 'signal')
     @mock.patch.object(dobj.Dependency, 'get_depended')
     def test_signal_cancel_children(self, mock_dobj, mock_signal):
@@ -738,6 +864,30 @@ class ActionBaseTest(base.SenlinTestCase):
         mark_fail.assert_called_once_with(action.context, 'FAKE_ID', mock.ANY,
                                           'BUSY')
 
+    @mock.patch.object(EVENT, 'warning')
+    @mock.patch.object(ao.Action, 'abandon')
+    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(eventlet, 'sleep')
+    @mock.patch.object(senlin_lock, 'lock_wait')
+    def test_set_status_retry_waiting_lock(self, mock_wait, mock_sleep,
+                                           mock_start, mock_abandon,
+                                           mock_warning):
+        action = ab.Action(OBJID, 'OBJECT_ACTION', self.ctx, id='FAKE_ID')
+        action.waiting_lock = ('CLUSTER_ID', True)
+
+        action.set_status(action.RES_RETRY, 'BUSY')
+
+        self.assertEqual(action.WAITING, action.status)
+        self.assertEqual('BUSY', action.status_reason)
+        mock_wait.assert_called_once_with(
+            action.context, 'CLUSTER_ID', 'FAKE_ID', shared=True,
+            values={'data': {'retries': 1}})
+        mock_warning.assert_called_once_with(action, consts.PHASE_ERROR,
+                                             'BUSY')
+        self.assertEqual(0, mock_abandon.call_count)
+        self.assertEqual(0, mock_sleep.call_count)
+        self.assertEqual(0, mock_start.call_count)
+
     @mock.patch.object(EVENT, 'info')
     @mock.patch.object(EVENT, 'error')
     @mock.patch.object(EVENT, 'warning')
@@ -786,6 +936,25 @@ class ActionBaseTest(base.SenlinTestCase):
         mock_warning.assert_called_once_with(action, consts.PHASE_ERROR,
                                              'RETRY')
 
+    @mock.patch.object(EVENT, 'info')
+    @mock.patch.object(ao.Action, 'mark_succeeded')
+    def test_set_status_wake_dependents(self, mark_succeed, mock_info):
+        action = ab.Action(OBJID, 'OBJECT_ACTION', self.ctx, id='FAKE_ID')
+        mark_succeed.return_value = CHILD_IDS
+        self.patchobject(action, '_wake_actions')
+
+        action.set_status(action.RES_OK)
+
+        action._wake_actions.assert_called_once_with(CHILD_IDS, mock.ANY)
+
+    @mock.patch.object(dispatcher, 'wake_actions')
+    def test_wake_actions(self, mock_wake):
+        action = ab.Action(OBJID, 'OBJECT_ACTION', self.ctx, id='FAKE_ID')
+
+        action._wake_actions(CHILD_IDS, 123.4)
+
+        mock_wake.assert_called_once_with(action.context, CHILD_IDS, 123.4)
+
     @mock.patch.object(ao.Action, 'check_status')
     def test_get_status(self, mock_get):
         mock_get.return_value = 'FAKE_STATUS'
@@ -916,11 +1085,12 @@ class ActionBaseTest(base.SenlinTestCase):
                                           sort='priority',
                                           filters={'enabled': True})
 
-    @mock.patch.object(dobj.Dependency, 'get_depended')
-    @mock.patch.object(dobj.Dependency, 'get_dependents')
-    def test_action_to_dict(self, mock_dep_by, mock_dep_on):
-        mock_dep_on.return_value = ['ACTION_1']
-        mock_dep_by.return_value = ['ACTION_2']
+    @mock.patch.object(dobj.Dependency, 'get_all')
+    def test_action_to_dict(self, mock_deps):
+        mock_deps.return_value = [
+            mock.Mock(depended='ACTION_1', dependent='FAKE_ID'),
+            mock.Mock(depended='FAKE_ID', dependent='ACTION_2'),
+        ]
         action = ab.Action(OBJID, 'OBJECT_ACTION', self.ctx,
                            **self.action_values)
         action.id = 'FAKE_ID'
@@ -952,8 +1122,7 @@ class ActionBaseTest(base.SenlinTestCase):
 
         res = action.to_dict()
         self.assertEqual(expected, res)
-        mock_dep_on.assert_called_once_with(action.context, 'FAKE_ID')
-        mock_dep_by.assert_called_once_with(action.context, 'FAKE_ID')
+        mock_deps.assert_called_once_with(action.context, ['FAKE_ID'])
 
 
 class ActionPolicyCheckTest(base.SenlinTestCase):
@@ -18,8 +18,6 @@ from senlin.engine.actions import cluster_action as ca
 from senlin.engine import cluster as cm
 from senlin.engine import dispatcher
 from senlin.engine import node as nm
-from senlin.objects import action as ao
-from senlin.objects import dependency as dobj
 from senlin.objects import node as no
 from senlin.tests.unit.common import base
 from senlin.tests.unit.common import utils
@@ -34,15 +32,12 @@ class ClusterAddNodesTest(base.SenlinTestCase):
 
     @mock.patch.object(no.Node, 'get')
     @mock.patch.object(no.Node, 'count_by_cluster')
-    @mock.patch.object(ab.Action, 'create')
-    @mock.patch.object(dobj.Dependency, 'create')
-    @mock.patch.object(ao.Action, 'update')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
     @mock.patch.object(nm.Node, 'load')
     def test_do_add_nodes_single(self, mock_load_node, mock_wait, mock_start,
-                                 mock_update, mock_dep, mock_action,
-                                 mock_count, mock_get, mock_load):
+                                 mock_batch, mock_count, mock_get, mock_load):
         cluster = mock.Mock(id='CLUSTER_ID', min_size=1, max_size=5)
         mock_load.return_value = cluster
         mock_count.return_value = 2
@@ -53,7 +48,7 @@ class ClusterAddNodesTest(base.SenlinTestCase):
         db_node = mock.Mock(id='NODE_1', cluster_id='', ACTIVE='ACTIVE',
                             status='ACTIVE')
         mock_get.return_value = db_node
-        mock_action.return_value = 'NODE_ACTION_ID'
+        mock_batch.return_value = ['NODE_ACTION_ID']
         mock_wait.return_value = (action.RES_OK, 'Good to go!')
 
         # do it
@@ -66,15 +61,14 @@ class ClusterAddNodesTest(base.SenlinTestCase):
         mock_load.assert_called_once_with(action.context, 'CLUSTER_ID')
         mock_get.assert_called_once_with(action.context, 'NODE_1')
         mock_count.assert_called_once_with(action.context, 'CLUSTER_ID')
-        mock_action.assert_called_once_with(
-            action.context, 'NODE_1', 'NODE_JOIN',
-            name='node_join_NODE_1',
-            cluster_id='CLUSTER_ID', cause='Derived Action',
-            inputs={'cluster_id': 'CLUSTER_ID'})
-        mock_dep.assert_called_once_with(action.context, ['NODE_ACTION_ID'],
-                                         'CLUSTER_ACTION_ID')
-        mock_update.assert_called_once_with(
-            action.context, 'NODE_ACTION_ID', {'status': 'READY'})
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID',
+            [('NODE_1', 'NODE_JOIN',
+              {'name': 'node_join_NODE_1',
+               'cluster_id': 'CLUSTER_ID',
+               'cause': 'Derived Action',
+               'inputs': {'cluster_id': 'CLUSTER_ID'}})],
+            nodes=None, force=False)
         mock_start.assert_called_once_with()
         mock_wait.assert_called_once_with()
         cluster.eval_status.assert_called_once_with(
@@ -87,15 +81,12 @@ class ClusterAddNodesTest(base.SenlinTestCase):
 
     @mock.patch.object(no.Node, 'get')
     @mock.patch.object(no.Node, 'count_by_cluster')
-    @mock.patch.object(ab.Action, 'create')
-    @mock.patch.object(dobj.Dependency, 'create')
-    @mock.patch.object(ao.Action, 'update')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
     @mock.patch.object(nm.Node, 'load')
     def test_do_add_nodes_multi(self, mock_load_node, mock_wait, mock_start,
-                                mock_update, mock_dep, mock_action,
-                                mock_count, mock_get, mock_load):
+                                mock_batch, mock_count, mock_get, mock_load):
 
         cluster = mock.Mock(id='CLUSTER_ID', min_size=1, max_size=5)
         mock_load.return_value = cluster
@@ -113,7 +104,7 @@ class ClusterAddNodesTest(base.SenlinTestCase):
         node_obj_1 = mock.Mock()
         node_obj_2 = mock.Mock()
         mock_load_node.side_effect = [node_obj_1, node_obj_2]
-        mock_action.side_effect = ['NODE_ACTION_1', 'NODE_ACTION_2']
+        mock_batch.return_value = ['NODE_ACTION_1', 'NODE_ACTION_2']
         mock_wait.return_value = (action.RES_OK, 'Good to go!')
 
         # do it
@@ -128,24 +119,20 @@ class ClusterAddNodesTest(base.SenlinTestCase):
             mock.call(action.context, 'NODE_1'),
             mock.call(action.context, 'NODE_2')])
         mock_count.assert_called_once_with(action.context, 'CLUSTER_ID')
-        mock_action.assert_has_calls([
-            mock.call(action.context, 'NODE_1', 'NODE_JOIN',
-                      name='node_join_NODE_1', cause='Derived Action',
-                      cluster_id='CLUSTER_ID',
-                      inputs={'cluster_id': 'CLUSTER_ID'}),
-            mock.call(action.context, 'NODE_2', 'NODE_JOIN',
-                      name='node_join_NODE_2', cause='Derived Action',
-                      cluster_id='CLUSTER_ID',
-                      inputs={'cluster_id': 'CLUSTER_ID'})])
-
-        mock_dep.assert_called_once_with(
-            action.context,
-            ['NODE_ACTION_1', 'NODE_ACTION_2'],
-            'CLUSTER_ACTION_ID')
-        mock_update.assert_has_calls([
-            mock.call(action.context, 'NODE_ACTION_1', {'status': 'READY'}),
-            mock.call(action.context, 'NODE_ACTION_2', {'status': 'READY'})
-        ])
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID',
+            [('NODE_1', 'NODE_JOIN',
+              {'name': 'node_join_NODE_1',
+               'cause': 'Derived Action',
+               'cluster_id': 'CLUSTER_ID',
+               'inputs': {'cluster_id': 'CLUSTER_ID'}}),
+             ('NODE_2', 'NODE_JOIN',
+              {'name': 'node_join_NODE_2',
+               'cause': 'Derived Action',
+               'cluster_id': 'CLUSTER_ID',
+               'inputs': {'cluster_id': 'CLUSTER_ID'}})],
+            nodes=None, force=False)
+
         mock_start.assert_called_once_with()
         mock_wait.assert_called_once_with()
         cluster.eval_status.assert_called_once_with(
@@ -249,16 +236,13 @@ class ClusterAddNodesTest(base.SenlinTestCase):
 
     @mock.patch.object(no.Node, 'get')
     @mock.patch.object(no.Node, 'count_by_cluster')
-    @mock.patch.object(ab.Action, 'create')
-    @mock.patch.object(dobj.Dependency, 'create')
-    @mock.patch.object(ao.Action, 'update')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
     @mock.patch.object(nm.Node, 'load')
     def test_do_add_nodes_failed_waiting(self, mock_load_node, mock_wait,
-                                         mock_start, mock_update, mock_dep,
-                                         mock_action, mock_count, mock_get,
-                                         mock_load):
+                                         mock_start, mock_batch, mock_count,
+                                         mock_get, mock_load):
         cluster = mock.Mock(id='CLUSTER_ID', min_size=1, max_size=5)
         mock_load.return_value = cluster
 
@@ -268,7 +252,7 @@ class ClusterAddNodesTest(base.SenlinTestCase):
         mock_get.return_value = mock.Mock(id='NODE_1', cluster_id='',
                                           status='ACTIVE', ACTIVE='ACTIVE')
         mock_count.return_value = 3
-        mock_action.return_value = 'NODE_ACTION_ID'
+        mock_batch.return_value = ['NODE_ACTION_ID']
         mock_wait.return_value = (action.RES_TIMEOUT, 'Timeout!')
 
         # do it
@@ -278,15 +262,14 @@ class ClusterAddNodesTest(base.SenlinTestCase):
         mock_load.assert_called_once_with(action.context, 'CLUSTER_ID')
         mock_get.assert_called_once_with(action.context, 'NODE_1')
         mock_count.assert_called_once_with(action.context, 'CLUSTER_ID')
-        mock_action.assert_called_once_with(
-            action.context, 'NODE_1', 'NODE_JOIN',
-            name='node_join_NODE_1', cluster_id='CLUSTER_ID',
-            cause='Derived Action',
-            inputs={'cluster_id': 'CLUSTER_ID'})
-        mock_dep.assert_called_once_with(action.context, ['NODE_ACTION_ID'],
-                                         'CLUSTER_ACTION_ID')
-        mock_update.assert_called_once_with(
-            action.context, 'NODE_ACTION_ID', {'status': 'READY'})
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID',
+            [('NODE_1', 'NODE_JOIN',
+              {'name': 'node_join_NODE_1',
+               'cluster_id': 'CLUSTER_ID',
+               'cause': 'Derived Action',
+               'inputs': {'cluster_id': 'CLUSTER_ID'}})],
+            nodes=None, force=False)
         mock_start.assert_called_once_with()
         mock_wait.assert_called_once_with()
         self.assertEqual(0, cluster.eval_status.call_count)
@@ -12,13 +12,15 @@
 
 from unittest import mock
 
+from oslo_config import cfg
+
 from senlin.common import consts
 from senlin.engine.actions import base as ab
 from senlin.engine.actions import cluster_action as ca
 from senlin.engine import cluster as cm
 from senlin.engine import dispatcher
+from senlin.engine import node as nm
 from senlin.objects import action as ao
-from senlin.objects import dependency as dobj
 from senlin.tests.unit.common import base
 from senlin.tests.unit.common import utils
 
@@ -30,13 +32,10 @@ class ClusterCheckTest(base.SenlinTestCase):
         super(ClusterCheckTest, self).setUp()
         self.ctx = utils.dummy_context()
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
-    @mock.patch.object(dobj.Dependency, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
-    def test_do_check(self, mock_wait, mock_start, mock_dep, mock_action,
-                      mock_update, mock_load):
+    def test_do_check(self, mock_wait, mock_start, mock_batch, mock_load):
         node1 = mock.Mock(id='NODE_1')
         node2 = mock.Mock(id='NODE_2')
         cluster = mock.Mock(id='FAKE_ID', status='old status',
@@ -44,7 +43,7 @@ class ClusterCheckTest(base.SenlinTestCase):
         cluster.nodes = [node1, node2]
         cluster.do_check.return_value = True
         mock_load.return_value = cluster
-        mock_action.side_effect = ['NODE_ACTION_1', 'NODE_ACTION_2']
+        mock_batch.return_value = ['NODE_ACTION_1', 'NODE_ACTION_2']
 
         action = ca.ClusterAction('FAKE_CLUSTER', 'CLUSTER_CHECK', self.ctx)
         action.id = 'CLUSTER_ACTION_ID'
@@ -60,37 +59,28 @@ class ClusterCheckTest(base.SenlinTestCase):
 
         mock_load.assert_called_once_with(action.context, 'FAKE_CLUSTER')
         cluster.do_check.assert_called_once_with(action.context)
-        mock_action.assert_has_calls([
-            mock.call(action.context, 'NODE_1', 'NODE_CHECK',
-                      name='node_check_NODE_1',
-                      cause=consts.CAUSE_DERIVED,
-                      inputs={}),
-            mock.call(action.context, 'NODE_2', 'NODE_CHECK',
-                      name='node_check_NODE_2',
-                      cause=consts.CAUSE_DERIVED,
-                      inputs={})
-        ])
-        mock_dep.assert_called_once_with(action.context,
-                                         ['NODE_ACTION_1', 'NODE_ACTION_2'],
-                                         'CLUSTER_ACTION_ID')
-        mock_update.assert_has_calls([
-            mock.call(action.context, 'NODE_ACTION_1', {'status': 'READY'}),
-            mock.call(action.context, 'NODE_ACTION_2', {'status': 'READY'}),
-        ])
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID',
+            [('NODE_1', 'NODE_CHECK',
+              {'name': 'node_check_NODE_1',
+               'cause': consts.CAUSE_DERIVED,
+               'inputs': {}}),
+             ('NODE_2', 'NODE_CHECK',
+              {'name': 'node_check_NODE_2',
+               'cause': consts.CAUSE_DERIVED,
+               'inputs': {}})],
+            nodes=None, force=False)
         mock_start.assert_called_once_with()
         mock_wait.assert_called_once_with()
         cluster.eval_status.assert_called_once_with(
             action.context, consts.CLUSTER_CHECK)
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(ao.Action, 'delete_by_target')
-    @mock.patch.object(dobj.Dependency, 'create')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
-    def test_do_check_need_delete(self, mock_wait, mock_start, mock_dep,
-                                  mock_delete, mock_action, mock_update,
-                                  mock_load):
+    def test_do_check_need_delete(self, mock_wait, mock_start, mock_delete,
+                                  mock_batch, mock_load):
         node1 = mock.Mock(id='NODE_1')
         node2 = mock.Mock(id='NODE_2')
         cluster = mock.Mock(id='FAKE_ID', status='old status',
@@ -98,7 +88,7 @@ class ClusterCheckTest(base.SenlinTestCase):
         cluster.nodes = [node1, node2]
         cluster.do_check.return_value = True
         mock_load.return_value = cluster
-        mock_action.side_effect = ['NODE_ACTION_1', 'NODE_ACTION_2']
+        mock_batch.return_value = ['NODE_ACTION_1', 'NODE_ACTION_2']
         action = ca.ClusterAction('FAKE_CLUSTER', 'CLUSTER_CHECK', self.ctx,
                                   inputs={'delete_check_action': True})
         action.id = 'CLUSTER_ACTION_ID'
@@ -114,34 +104,112 @@ class ClusterCheckTest(base.SenlinTestCase):
 
         mock_load.assert_called_once_with(action.context, 'FAKE_CLUSTER')
         cluster.do_check.assert_called_once_with(action.context)
-        mock_delete.assert_has_calls([
-            mock.call(action.context, 'NODE_1', action=['NODE_CHECK'],
-                      status=['SUCCEEDED', 'FAILED']),
-            mock.call(action.context, 'NODE_2', action=['NODE_CHECK'],
-                      status=['SUCCEEDED', 'FAILED'])
-        ])
-        mock_action.assert_has_calls([
-            mock.call(action.context, 'NODE_1', 'NODE_CHECK',
-                      name='node_check_NODE_1',
-                      cause=consts.CAUSE_DERIVED,
-                      inputs={'delete_check_action': True}),
-            mock.call(action.context, 'NODE_2', 'NODE_CHECK',
-                      name='node_check_NODE_2',
-                      cause=consts.CAUSE_DERIVED,
-                      inputs={'delete_check_action': True})
-        ])
-        mock_dep.assert_called_once_with(action.context,
-                                         ['NODE_ACTION_1', 'NODE_ACTION_2'],
-                                         'CLUSTER_ACTION_ID')
-        mock_update.assert_has_calls([
-            mock.call(action.context, 'NODE_ACTION_1', {'status': 'READY'}),
-            mock.call(action.context, 'NODE_ACTION_2', {'status': 'READY'}),
-        ])
+        mock_delete.assert_called_once_with(
+            action.context, ['NODE_1', 'NODE_2'], action=['NODE_CHECK'],
+            status=['SUCCEEDED', 'FAILED'])
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID',
+            [('NODE_1', 'NODE_CHECK',
+              {'name': 'node_check_NODE_1',
+               'cause': consts.CAUSE_DERIVED,
+               'inputs': {'delete_check_action': True}}),
+             ('NODE_2', 'NODE_CHECK',
+              {'name': 'node_check_NODE_2',
+               'cause': consts.CAUSE_DERIVED,
+               'inputs': {'delete_check_action': True}})],
+            nodes=None, force=False)
         mock_start.assert_called_once_with()
         mock_wait.assert_called_once_with()
         cluster.eval_status.assert_called_once_with(
             action.context, consts.CLUSTER_CHECK)
 
+    @mock.patch.object(nm.Node, 'check_batch')
+    @mock.patch.object(ab.Action, 'create_batch')
+    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
+    def test_do_check_in_batch(self, mock_wait, mock_start, mock_batch,
+                               mock_check, mock_load):
+        node1 = mock.Mock(id='NODE_1')
+        node2 = mock.Mock(id='NODE_2')
+        cluster = mock.Mock(id='FAKE_ID', status='old status',
+                            status_reason='old reason')
+        cluster.nodes = [node1, node2]
+        mock_load.return_value = cluster
+        mock_check.return_value = [node2]
+        mock_batch.return_value = ['NODE_ACTION_2']
+        cfg.CONF.set_override('bulk_check_min_nodes', 2, group='engine')
+
+        action = ca.ClusterAction('FAKE_CLUSTER', 'CLUSTER_CHECK', self.ctx)
+        action.id = 'CLUSTER_ACTION_ID'
+        mock_wait.return_value = (action.RES_OK, 'Everything is Okay')
+
+        res_code, res_msg = action.do_check()
+
+        self.assertEqual(action.RES_OK, res_code)
+        self.assertEqual('Cluster checking completed.', res_msg)
+        mock_check.assert_called_once_with(action.context, [node1, node2])
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID',
+            [('NODE_2', 'NODE_CHECK',
+              {'name': 'node_check_NODE_2',
+               'cause': consts.CAUSE_DERIVED,
+               'inputs': {}})],
+            nodes=None, force=False)
+        mock_start.assert_called_once_with()
+        mock_wait.assert_called_once_with()
+        cluster.eval_status.assert_called_once_with(
+            action.context, consts.CLUSTER_CHECK)
+
+    @mock.patch.object(nm.Node, 'check_batch')
+    @mock.patch.object(ab.Action, 'create_batch')
+    def test_do_check_in_batch_no_divergent(self, mock_batch, mock_check,
+                                            mock_load):
+        cluster = mock.Mock(id='FAKE_ID', status='old status',
+                            status_reason='old reason')
+        cluster.nodes = [mock.Mock(id='NODE_1')]
+        mock_load.return_value = cluster
+        mock_check.return_value = []
+        cfg.CONF.set_override('bulk_check_min_nodes', 1, group='engine')
+
+        action = ca.ClusterAction('FAKE_CLUSTER', 'CLUSTER_CHECK', self.ctx)
+
+        res_code, res_msg = action.do_check()
+
+        self.assertEqual(action.RES_OK, res_code)
+        self.assertEqual('Cluster checking completed.', res_msg)
+        self.assertEqual(0, mock_batch.call_count)
+        cluster.eval_status.assert_called_once_with(
+            action.context, consts.CLUSTER_CHECK)
+
+    @mock.patch.object(nm.Node, 'check_batch')
+    @mock.patch.object(ab.Action, 'create_batch')
+    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
+    def test_do_check_small_cluster(self, mock_wait, mock_start, mock_batch,
+                                    mock_check, mock_load):
+        cluster = mock.Mock(id='FAKE_ID', status='old status',
+                            status_reason='old reason')
+        cluster.nodes = [mock.Mock(id='NODE_1')]
+        mock_load.return_value = cluster
+        mock_batch.return_value = ['NODE_ACTION_1']
+        cfg.CONF.set_override('bulk_check_min_nodes', 2, group='engine')
+
+        action = ca.ClusterAction('FAKE_CLUSTER', 'CLUSTER_CHECK', self.ctx)
+        action.id = 'CLUSTER_ACTION_ID'
+        mock_wait.return_value = (action.RES_OK, 'Everything is Okay')
+
+        res_code, res_msg = action.do_check()
+
+        self.assertEqual(action.RES_OK, res_code)
+        self.assertEqual(0, mock_check.call_count)
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID',
+            [('NODE_1', 'NODE_CHECK',
+              {'name': 'node_check_NODE_1',
+               'cause': consts.CAUSE_DERIVED,
+               'inputs': {}})],
+            nodes=None, force=False)
+
     def test_do_check_cluster_empty(self, mock_load):
         cluster = mock.Mock(id='FAKE_ID', nodes=[], status='old status',
                             status_reason='old reason')
@@ -159,20 +227,18 @@ class ClusterCheckTest(base.SenlinTestCase):
         cluster.eval_status.assert_called_once_with(
             action.context, consts.CLUSTER_CHECK)
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
-    @mock.patch.object(dobj.Dependency, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
-    def test_do_check_failed_waiting(self, mock_wait, mock_start, mock_dep,
-                                     mock_action, mock_update, mock_load):
+    def test_do_check_failed_waiting(self, mock_wait, mock_start, mock_batch,
+                                     mock_load):
         node = mock.Mock(id='NODE_1')
         cluster = mock.Mock(id='CLUSTER_ID', status='old status',
                             status_reason='old reason')
         cluster.do_recover.return_value = True
         cluster.nodes = [node]
         mock_load.return_value = cluster
-        mock_action.return_value = 'NODE_ACTION_ID'
+        mock_batch.return_value = ['NODE_ACTION_ID']
 
         action = ca.ClusterAction('FAKE_CLUSTER', 'CLUSTER_CHECK', self.ctx)
         action.id = 'CLUSTER_ACTION_ID'
@@ -186,16 +252,13 @@ class ClusterCheckTest(base.SenlinTestCase):
 
         mock_load.assert_called_once_with(self.ctx, 'FAKE_CLUSTER')
         cluster.do_check.assert_called_once_with(action.context)
-        mock_action.assert_called_once_with(
-            action.context, 'NODE_1', 'NODE_CHECK',
-            name='node_check_NODE_1',
-            inputs={},
-            cause=consts.CAUSE_DERIVED,
-        )
-        mock_dep.assert_called_once_with(action.context, ['NODE_ACTION_ID'],
-                                         'CLUSTER_ACTION_ID')
-        mock_update.assert_called_once_with(action.context, 'NODE_ACTION_ID',
-                                            {'status': 'READY'})
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID',
+            [('NODE_1', 'NODE_CHECK',
+              {'name': 'node_check_NODE_1',
+               'cause': consts.CAUSE_DERIVED,
+               'inputs': {}})],
+            nodes=None, force=False)
         mock_start.assert_called_once_with()
         mock_wait.assert_called_once_with()
         cluster.eval_status.assert_called_once_with(
@@ -178,6 +178,7 @@ class ClusterActionTest(base.SenlinTestCase):
 
         self.assertEqual(action.RES_RETRY, res_code)
         self.assertEqual('Failed in locking cluster.', res_msg)
+        self.assertEqual(('CLUSTER_ID', False), action.waiting_lock)
         mock_load.assert_called_once_with(action.context, cluster.id)
 
     @mock.patch.object(senlin_lock, 'cluster_lock_acquire')
@@ -211,6 +212,35 @@ class ClusterActionTest(base.SenlinTestCase):
         res = action.cancel()
         self.assertEqual(action.RES_OK, res)
 
+    @mock.patch.object(ab.Action, 'create_batch')
+    @mock.patch.object(dispatcher, 'start_action')
+    def test_start_children(self, mock_start, mock_batch, mock_load):
+        action = ca.ClusterAction('ID', 'CLUSTER_CHECK', self.ctx)
+        action.id = 'CLUSTER_ACTION_ID'
+        children = [('NODE_1', consts.NODE_CHECK, {}),
+                    ('NODE_2', consts.NODE_CHECK, {})]
+        mock_batch.return_value = ['NODE_ACTION_1', 'NODE_ACTION_2']
+
+        res = action._start_children('check', children)
+
+        self.assertEqual(['NODE_ACTION_1', 'NODE_ACTION_2'], res)
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID', children, nodes=None,
+            force=False)
+        mock_start.assert_called_once_with()
+
+    @mock.patch.object(ab.Action, 'create_batch')
+    @mock.patch.object(dispatcher, 'start_action')
+    def test_start_children_failed(self, mock_start, mock_batch, mock_load):
+        action = ca.ClusterAction('ID', 'CLUSTER_CHECK', self.ctx)
+        mock_batch.side_effect = exc.ActionConflict(
+            type=consts.NODE_CHECK, target='NODE_1', actions='ACTION_1')
+
+        self.assertRaises(exc.ActionConflict, action._start_children,
+                          'check', [('NODE_1', consts.NODE_CHECK, {})])
+
+        mock_start.assert_not_called()
+
 
 class CompleteLifecycleProcTest(base.SenlinTestCase):
 
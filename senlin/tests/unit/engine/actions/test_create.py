@@ -18,9 +18,7 @@ from senlin.engine.actions import cluster_action as ca
 from senlin.engine import cluster as cm
 from senlin.engine import dispatcher
 from senlin.engine import node as nm
-from senlin.objects import action as ao
 from senlin.objects import cluster as co
-from senlin.objects import dependency as dobj
 from senlin.tests.unit.common import base
 from senlin.tests.unit.common import utils
 
@@ -32,23 +30,22 @@ class ClusterCreateTest(base.SenlinTestCase):
         super(ClusterCreateTest, self).setUp()
         self.ctx = utils.dummy_context()
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(co.Cluster, 'get_next_index')
     @mock.patch.object(nm, 'Node')
-    @mock.patch.object(dobj.Dependency, 'create')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
-    def test_create_nodes_single(self, mock_wait, mock_start, mock_dep,
-                                 mock_node, mock_index, mock_action,
-                                 mock_update, mock_load):
+    def test_create_nodes_single(self, mock_wait, mock_start, mock_node,
+                                 mock_index, mock_batch, mock_load):
         # prepare mocks
         cluster = mock.Mock(id='CLUSTER_ID', profile_id='FAKE_PROFILE',
                             user='FAKE_USER', project='FAKE_PROJECT',
                             domain='FAKE_DOMAIN',
-                            config={"node.name.format": "node-$3I"})
+                            config={"node.name.format": "node-$3I"},
+                            rt={'profile': 'PROFILE'})
         mock_index.return_value = 123
         node = mock.Mock(id='NODE_ID')
+        node.db_values.return_value = {'name': 'node-123'}
         mock_node.return_value = node
 
         mock_load.return_value = cluster
@@ -58,7 +55,7 @@ class ClusterCreateTest(base.SenlinTestCase):
         mock_wait.return_value = (action.RES_OK, 'All dependents completed')
 
         # node_action is faked
-        mock_action.return_value = 'NODE_ACTION_ID'
+        mock_batch.return_value = ['NODE_ACTION_ID']
 
         # do it
         res_code, res_msg = action._create_nodes(1)
@@ -66,26 +63,25 @@ class ClusterCreateTest(base.SenlinTestCase):
         # assertions
         self.assertEqual(action.RES_OK, res_code)
         self.assertEqual('All dependents completed', res_msg)
-        mock_index.assert_called_once_with(action.context, 'CLUSTER_ID')
+        mock_index.assert_called_once_with(action.context, 'CLUSTER_ID', 1)
         mock_node.assert_called_once_with('node-123',
                                           'FAKE_PROFILE',
                                           'CLUSTER_ID',
-                                          context=action.context,
+                                          id=mock.ANY,
+                                          init_at=mock.ANY,
                                           user='FAKE_USER',
                                           project='FAKE_PROJECT',
                                           domain='FAKE_DOMAIN',
                                           index=123, metadata={})
-        node.store.assert_called_once_with(action.context)
-        mock_action.assert_called_once_with(action.context, 'NODE_ID',
-                                            'NODE_CREATE',
-                                            name='node_create_NODE_ID',
-                                            cluster_id='CLUSTER_ID',
-                                            cause='Derived Action')
-        mock_dep.assert_called_once_with(action.context, ['NODE_ACTION_ID'],
-                                         'CLUSTER_ACTION_ID')
-        mock_update.assert_called_with(
-            action.context, 'NODE_ACTION_ID',
-            {'status': ab.Action.READY})
+        self.assertEqual({'profile': 'PROFILE'}, node.rt)
+        node.store.assert_not_called()
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID',
+            [('NODE_ID', 'NODE_CREATE',
+              {'name': 'node_create_NODE_ID',
+               'cluster_id': 'CLUSTER_ID',
+               'cause': 'Derived Action'})],
+            nodes=[{'id': 'NODE_ID', 'name': 'node-123'}], force=True)
         mock_start.assert_called_once_with()
         mock_wait.assert_called_once_with()
         self.assertEqual({'nodes_added': ['NODE_ID']}, action.outputs)
@@ -103,24 +99,23 @@ class ClusterCreateTest(base.SenlinTestCase):
         self.assertEqual(action.RES_OK, res_code)
         self.assertEqual('', res_msg)
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(co.Cluster, 'get_next_index')
     @mock.patch.object(nm, 'Node')
-    @mock.patch.object(dobj.Dependency, 'create')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
-    def test_create_nodes_multiple(self, mock_wait, mock_start, mock_dep,
-                                   mock_node, mock_index, mock_action,
-                                   mock_update, mock_load):
+    def test_create_nodes_multiple(self, mock_wait, mock_start, mock_node,
+                                   mock_index, mock_batch, mock_load):
         cluster = mock.Mock(id='01234567-123434',
                             config={"node.name.format": "node-$3I"})
         node1 = mock.Mock(id='01234567-abcdef',
                           data={'placement': {'region': 'regionOne'}})
+        node1.db_values.return_value = {}
         node2 = mock.Mock(id='abcdefab-123456',
                           data={'placement': {'region': 'regionTwo'}})
+        node2.db_values.return_value = {}
         mock_node.side_effect = [node1, node2]
-        mock_index.side_effect = [123, 124]
+        mock_index.return_value = 123
 
         mock_load.return_value = cluster
         # cluster action is real
@@ -138,7 +133,7 @@ class ClusterCreateTest(base.SenlinTestCase):
         mock_wait.return_value = (action.RES_OK, 'All dependents completed')
 
         # node_action is faked
-        mock_action.side_effect = ['NODE_ACTION_1', 'NODE_ACTION_2']
+        mock_batch.return_value = ['NODE_ACTION_1', 'NODE_ACTION_2']
 
         # do it
         res_code, res_msg = action._create_nodes(2)
@@ -146,18 +141,15 @@ class ClusterCreateTest(base.SenlinTestCase):
         # assertions
         self.assertEqual(action.RES_OK, res_code)
         self.assertEqual('All dependents completed', res_msg)
-        self.assertEqual(2, mock_index.call_count)
+        mock_index.assert_called_once_with(action.context, cluster.id, 2)
         self.assertEqual(2, mock_node.call_count)
-        node1.store.assert_called_once_with(action.context)
-        node2.store.assert_called_once_with(action.context)
-        self.assertEqual(2, mock_action.call_count)
-        self.assertEqual(1, mock_dep.call_count)
-
-        update_calls = [
-            mock.call(action.context, 'NODE_ACTION_1', {'status': 'READY'}),
-            mock.call(action.context, 'NODE_ACTION_2', {'status': 'READY'})
-        ]
-        mock_update.assert_has_calls(update_calls)
+        node1.store.assert_not_called()
+        node2.store.assert_not_called()
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID',
+            [(node1.id, 'NODE_CREATE', mock.ANY),
+             (node2.id, 'NODE_CREATE', mock.ANY)],
+            nodes=[{'id': node1.id}, {'id': node2.id}], force=True)
         mock_start.assert_called_once_with()
         mock_wait.assert_called_once_with()
         self.assertEqual({'nodes_added': [node1.id, node2.id]}, action.outputs)
@@ -165,12 +157,14 @@ class ClusterCreateTest(base.SenlinTestCase):
         self.assertEqual({'region': 'regionTwo'}, node2.data['placement'])
         mock_node_calls = [
             mock.call('node-123', mock.ANY, '01234567-123434',
+                      id=mock.ANY, init_at=mock.ANY,
                       user=mock.ANY, project=mock.ANY, domain=mock.ANY,
-                      index=123, context=mock.ANY, metadata={},
+                      index=123, metadata={},
                       data={'placement': {'region': 'regionOne'}}),
             mock.call('node-124', mock.ANY, '01234567-123434',
+                      id=mock.ANY, init_at=mock.ANY,
                       user=mock.ANY, project=mock.ANY, domain=mock.ANY,
-                      index=124, context=mock.ANY, metadata={},
+                      index=124, metadata={},
                       data={'placement': {'region': 'regionTwo'}})
         ]
 
@@ -178,20 +172,20 @@ class ClusterCreateTest(base.SenlinTestCase):
         cluster.add_node.assert_has_calls([
             mock.call(node1), mock.call(node2)])
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(co.Cluster, 'get')
+    @mock.patch.object(ab.Action, 'create_batch')
+    @mock.patch.object(co.Cluster, 'get_next_index')
     @mock.patch.object(nm, 'Node')
-    @mock.patch.object(dobj.Dependency, 'create')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
     def test_create_nodes_multiple_failed_wait(self, mock_wait, mock_start,
-                                               mock_dep, mock_node, mock_get,
-                                               mock_update, mock_load):
+                                               mock_node, mock_index,
+                                               mock_batch, mock_load):
         cluster = mock.Mock(id='01234567-123434', config={})
-        db_cluster = mock.Mock(next_index=1)
-        mock_get.return_value = db_cluster
+        mock_index.return_value = 1
         node1 = mock.Mock(id='01234567-abcdef', data={})
+        node1.db_values.return_value = {}
         node2 = mock.Mock(id='abcdefab-123456', data={})
+        node2.db_values.return_value = {}
         mock_node.side_effect = [node1, node2]
 
         mock_load.return_value = cluster
@@ -209,17 +203,13 @@ class ClusterCreateTest(base.SenlinTestCase):
         }
         mock_wait.return_value = (action.RES_ERROR, 'Waiting timed out')
 
-        # node_action is faked
-        n_action_1 = mock.Mock()
-        n_action_2 = mock.Mock()
-        self.patchobject(ab, 'Action', side_effect=[n_action_1, n_action_2])
-
         # do it
         res_code, res_msg = action._create_nodes(2)
 
         # assertions
         self.assertEqual(action.RES_ERROR, res_code)
         self.assertEqual('Failed in creating nodes.', res_msg)
+        cluster.add_node.assert_not_called()
 
     def test_do_create_success(self, mock_load):
         cluster = mock.Mock(id='FAKE_CLUSTER', ACTIVE='ACTIVE')
@@ -20,7 +20,6 @@ from senlin.engine import dispatcher
 from senlin.engine.notifications import message as msg
 from senlin.objects import action as ao
 from senlin.objects import cluster_policy as cpo
-from senlin.objects import dependency as dobj
 from senlin.objects import node as no
 from senlin.objects import receiver as ro
 from senlin.tests.unit.common import base
@@ -34,13 +33,11 @@ class ClusterDeleteTest(base.SenlinTestCase):
         super(ClusterDeleteTest, self).setUp()
         self.ctx = utils.dummy_context()
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
-    @mock.patch.object(dobj.Dependency, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
-    def test_delete_nodes_single(self, mock_wait, mock_start, mock_dep,
-                                 mock_action, mock_update, mock_load):
+    def test_delete_nodes_single(self, mock_wait, mock_start, mock_batch,
+                                 mock_load):
         # prepare mocks
         cluster = mock.Mock(id='FAKE_CLUSTER', desired_capacity=100, config={})
 
@@ -51,7 +48,7 @@ class ClusterDeleteTest(base.SenlinTestCase):
         action.inputs = {'destroy_after_deletion': False}
         action.context = self.ctx
         mock_wait.return_value = (action.RES_OK, 'All dependents completed')
-        mock_action.return_value = 'NODE_ACTION_ID'
+        mock_batch.return_value = ['NODE_ACTION_ID']
 
         # do it
         res_code, res_msg = action._delete_nodes(['NODE_ID'])
@@ -59,28 +56,24 @@ class ClusterDeleteTest(base.SenlinTestCase):
         # assertions
         self.assertEqual(action.RES_OK, res_code)
         self.assertEqual('All dependents completed', res_msg)
-        mock_action.assert_called_once_with(
-            action.context, 'NODE_ID', 'NODE_DELETE',
-            name='node_delete_NODE_ID', cause='Derived Action',
-            cluster_id='FAKE_CLUSTER', inputs={})
-        mock_dep.assert_called_once_with(action.context, ['NODE_ACTION_ID'],
-                                         'CLUSTER_ACTION_ID')
-        mock_update.assert_called_with(action.context,
-                                       'NODE_ACTION_ID',
-                                       {'status': 'READY'})
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID',
+            [('NODE_ID', 'NODE_DELETE',
+              {'name': 'node_delete_NODE_ID',
+               'cluster_id': 'FAKE_CLUSTER',
+               'cause': 'Derived Action',
+               'inputs': {}})],
+            nodes=None, force=False)
         mock_start.assert_called_once_with()
         mock_wait.assert_called_once_with()
         self.assertEqual(['NODE_ID'], action.outputs['nodes_removed'])
         cluster.remove_node.assert_called_once_with('NODE_ID')
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
-    @mock.patch.object(dobj.Dependency, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
     def test_delete_nodes_single_stop_node(self, mock_wait, mock_start,
-                                           mock_dep, mock_action, mock_update,
-                                           mock_load):
+                                           mock_batch, mock_load):
         # prepare mocks
         cluster = mock.Mock(id='FAKE_CLUSTER', desired_capacity=100,
                             config={'cluster.stop_node_before_delete': True})
@@ -91,7 +84,7 @@ class ClusterDeleteTest(base.SenlinTestCase):
         action.id = 'CLUSTER_ACTION_ID'
         action.inputs = {'destroy_after_deletion': False}
         mock_wait.return_value = (action.RES_OK, 'All dependents completed')
-        mock_action.return_value = 'NODE_ACTION_ID'
+        mock_batch.return_value = ['NODE_ACTION_ID']
 
         # do it
         res_code, res_msg = action._delete_nodes(['NODE_ID'])
@@ -100,40 +93,33 @@ class ClusterDeleteTest(base.SenlinTestCase):
         self.assertEqual(action.RES_OK, res_code)
         self.assertEqual('All dependents completed', res_msg)
         create_actions = [
-            mock.call(action.context, 'NODE_ID', 'NODE_OPERATION',
-                      name='node_delete_NODE_ID',
-                      cause='Derived Action',
-                      cluster_id='FAKE_CLUSTER',
-                      inputs={'operation': 'stop',
-                              'update_parent_status': False}),
-            mock.call(action.context, 'NODE_ID', 'NODE_DELETE',
-                      name='node_delete_NODE_ID',
-                      cluster_id='FAKE_CLUSTER',
-                      cause='Derived Action', inputs={})
-        ]
-        mock_action.assert_has_calls(create_actions)
-        dep_calls = [
-            mock.call(action.context, ['NODE_ACTION_ID'], 'CLUSTER_ACTION_ID'),
-            mock.call(action.context, ['NODE_ACTION_ID'], 'CLUSTER_ACTION_ID'),
-        ]
-        mock_dep.assert_has_calls(dep_calls)
-        update_calls = [
-            mock.call(action.context, 'NODE_ACTION_ID', {'status': 'READY'}),
-            mock.call(action.context, 'NODE_ACTION_ID', {'status': 'READY'})
+            mock.call(action.context, 'CLUSTER_ACTION_ID',
+                      [('NODE_ID', 'NODE_OPERATION',
+                        {'name': 'node_delete_NODE_ID',
+                         'cluster_id': 'FAKE_CLUSTER',
+                         'cause': 'Derived Action',
+                         'inputs': {'operation': 'stop',
+                                    'update_parent_status': False}})],
+                      nodes=None, force=False),
+            mock.call(action.context, 'CLUSTER_ACTION_ID',
+                      [('NODE_ID', 'NODE_DELETE',
+                        {'name': 'node_delete_NODE_ID',
+                         'cluster_id': 'FAKE_CLUSTER',
+                         'cause': 'Derived Action',
+                         'inputs': {}})],
+                      nodes=None, force=False)
         ]
-        mock_update.assert_has_calls(update_calls)
+        mock_batch.assert_has_calls(create_actions)
         mock_start.assert_has_calls([mock.call(), mock.call()])
         mock_wait.assert_has_calls([mock.call(), mock.call()])
         self.assertEqual(['NODE_ID'], action.outputs['nodes_removed'])
         cluster.remove_node.assert_called_once_with('NODE_ID')
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
-    @mock.patch.object(dobj.Dependency, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
-    def test_delete_nodes_multi(self, mock_wait, mock_start, mock_dep,
-                                mock_action, mock_update, mock_load):
+    def test_delete_nodes_multi(self, mock_wait, mock_start, mock_batch,
+                                mock_load):
         # prepare mocks
         cluster = mock.Mock(id='CLUSTER_ID', desired_capacity=100, config={})
         mock_load.return_value = cluster
@@ -143,7 +129,7 @@ class ClusterDeleteTest(base.SenlinTestCase):
         action.id = 'CLUSTER_ACTION_ID'
         action.inputs = {'destroy_after_deletion': False}
         mock_wait.return_value = (action.RES_OK, 'All dependents completed')
-        mock_action.side_effect = ['NODE_ACTION_1', 'NODE_ACTION_2']
+        mock_batch.return_value = ['NODE_ACTION_1', 'NODE_ACTION_2']
 
         # do it
         res_code, res_msg = action._delete_nodes(['NODE_1', 'NODE_2'])
@@ -151,13 +137,11 @@ class ClusterDeleteTest(base.SenlinTestCase):
         # assertions
         self.assertEqual(action.RES_OK, res_code)
         self.assertEqual('All dependents completed', res_msg)
-        self.assertEqual(2, mock_action.call_count)
-        update_calls = [
-            mock.call(action.context, 'NODE_ACTION_1', {'status': 'READY'}),
-            mock.call(action.context, 'NODE_ACTION_2', {'status': 'READY'})
-        ]
-        mock_update.assert_has_calls(update_calls)
-        self.assertEqual(1, mock_dep.call_count)
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID',
+            [('NODE_1', 'NODE_DELETE', mock.ANY),
+             ('NODE_2', 'NODE_DELETE', mock.ANY)],
+            nodes=None, force=False)
         mock_start.assert_called_once_with()
         mock_wait.assert_called_once_with()
         self.assertEqual({'nodes_removed': ['NODE_1', 'NODE_2']},
@@ -179,13 +163,11 @@ class ClusterDeleteTest(base.SenlinTestCase):
         self.assertEqual(action.RES_OK, res_code)
         self.assertEqual('', res_msg)
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
-    @mock.patch.object(dobj.Dependency, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
-    def test_delete_nodes_with_pd(self, mock_wait, mock_start, mock_dep,
-                                  mock_action, mock_update, mock_load):
+    def test_delete_nodes_with_pd(self, mock_wait, mock_start, mock_batch,
+                                  mock_load):
         # prepare mocks
         cluster = mock.Mock(id='CLUSTER_ID', desired_capacity=100, config={})
         mock_load.return_value = cluster
@@ -199,30 +181,30 @@ class ClusterDeleteTest(base.SenlinTestCase):
             }
         }
         mock_wait.return_value = (action.RES_OK, 'All dependents completed')
-        mock_action.return_value = 'NODE_ACTION_ID'
+        mock_batch.return_value = ['NODE_ACTION_ID']
         # do it
         res_code, res_msg = action._delete_nodes(['NODE_ID'])
 
         # assertions (other assertions are skipped)
         self.assertEqual(action.RES_OK, res_code)
         self.assertEqual('All dependents completed', res_msg)
-        mock_action.assert_called_once_with(
-            action.context, 'NODE_ID', 'NODE_LEAVE',
-            name='node_delete_NODE_ID', cluster_id='CLUSTER_ID',
-            cause='Derived Action', inputs={})
-
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID',
+            [('NODE_ID', 'NODE_LEAVE',
+              {'name': 'node_delete_NODE_ID',
+               'cluster_id': 'CLUSTER_ID',
+               'cause': 'Derived Action',
+               'inputs': {}})],
+            nodes=None, force=False)
+
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(no.Node, 'get')
-    @mock.patch.object(dobj.Dependency, 'create')
     @mock.patch.object(msg.Message, 'post_lifecycle_hook_message')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
     def test_delete_nodes_with_lifecycle_hook(self, mock_wait, mock_start,
-                                              mock_post, mock_dep,
-                                              mock_node_get,
-                                              mock_action, mock_update,
-                                              mock_load):
+                                              mock_post, mock_node_get,
+                                              mock_batch, mock_load):
         # prepare mocks
         cluster = mock.Mock(id='CLUSTER_ID', desired_capacity=100, config={})
         mock_load.return_value = cluster
@@ -240,7 +222,7 @@ class ClusterDeleteTest(base.SenlinTestCase):
         }
         action.owner = 'OWNER_ID'
         mock_wait.return_value = (action.RES_OK, 'All dependents completed')
-        mock_action.return_value = 'NODE_ACTION_ID'
+        mock_batch.return_value = ['NODE_ACTION_ID']
         mock_node_get.return_value = mock.Mock(
             status=consts.NS_ACTIVE, id='NODE_ID', physical_id="nova-server")
 
@@ -250,57 +232,49 @@ class ClusterDeleteTest(base.SenlinTestCase):
         # assertions (other assertions are skipped)
         self.assertEqual(action.RES_OK, res_code)
         self.assertEqual('All dependents completed', res_msg)
-        self.assertEqual(1, mock_dep.call_count)
-        mock_action.assert_called_once_with(
-            action.context, 'NODE_ID', 'NODE_DELETE',
-            name='node_delete_NODE_ID',
-            cause='Derived Action with Lifecycle Hook',
-            cluster_id='CLUSTER_ID',
-            inputs={})
-        update_calls = [
-            mock.call(action.context, 'NODE_ACTION_ID',
-                      {'status': 'WAITING_LIFECYCLE_COMPLETION',
-                       'owner': 'OWNER_ID'}),
-        ]
-        mock_update.assert_has_calls(update_calls)
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID',
+            [('NODE_ID', 'NODE_DELETE',
+              {'name': 'node_delete_NODE_ID',
+               'cluster_id': 'CLUSTER_ID',
+               'cause': 'Derived Action with Lifecycle Hook',
+               'inputs': {},
+               'status': 'WAITING_LIFECYCLE_COMPLETION',
+               'owner': 'OWNER_ID'})],
+            nodes=None, force=False)
         mock_post.assert_called_once_with('NODE_ACTION_ID', 'NODE_ID',
                                           'nova-server',
                                           consts.LIFECYCLE_NODE_TERMINATION)
         mock_start.assert_called_once_with()
         mock_wait.assert_called_once_with(action.data['hooks']['timeout'])
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(no.Node, 'get')
-    @mock.patch.object(dobj.Dependency, 'create')
     @mock.patch.object(msg.Message, 'post_lifecycle_hook_message')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
     def test_delete_nodes_with_lifecycle_hook_failed_node(
-            self, mock_wait, mock_start, mock_post, mock_dep, mock_node_get,
-            mock_action, mock_update, mock_load):
+            self, mock_wait, mock_start, mock_post, mock_node_get,
+            mock_batch, mock_load):
         self.delete_nodes_with_lifecycle_hook_invalid_node(
             mock.Mock(status=consts.NS_ERROR), mock_wait, mock_start,
-            mock_post, mock_dep, mock_node_get, mock_action, mock_update,
-            mock_load)
+            mock_post, mock_node_get, mock_batch, mock_load)
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(no.Node, 'get')
-    @mock.patch.object(dobj.Dependency, 'create')
     @mock.patch.object(msg.Message, 'post_lifecycle_hook_message')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
     def test_delete_nodes_with_lifecycle_hook_missing_node(
-            self, mock_wait, mock_start, mock_post, mock_dep, mock_node_get,
-            mock_action, mock_update, mock_load):
+            self, mock_wait, mock_start, mock_post, mock_node_get,
+            mock_batch, mock_load):
         self.delete_nodes_with_lifecycle_hook_invalid_node(
-            None, mock_wait, mock_start, mock_post, mock_dep, mock_node_get,
-            mock_action, mock_update, mock_load)
+            None, mock_wait, mock_start, mock_post, mock_node_get,
+            mock_batch, mock_load)
 
     def delete_nodes_with_lifecycle_hook_invalid_node(
-            self, mock_node_obj, mock_wait, mock_start, mock_post, mock_dep,
-            mock_node_get, mock_action, mock_update, mock_load):
+            self, mock_node_obj, mock_wait, mock_start, mock_post,
+            mock_node_get, mock_batch, mock_load):
         # prepare mocks
         cluster = mock.Mock(id='CLUSTER_ID', desired_capacity=100, config={})
         mock_load.return_value = cluster
@@ -318,7 +292,7 @@ class ClusterDeleteTest(base.SenlinTestCase):
         }
         action.owner = None
         mock_wait.return_value = (action.RES_OK, 'All dependents completed')
-        mock_action.return_value = 'NODE_ACTION_ID'
+        mock_batch.return_value = ['NODE_ACTION_ID']
         mock_node_get.return_value = mock_node_obj
         # do it
         res_code, res_msg = action._delete_nodes(['NODE_ID'])
@@ -326,35 +300,30 @@ class ClusterDeleteTest(base.SenlinTestCase):
         # assertions (other assertions are skipped)
         self.assertEqual(action.RES_OK, res_code)
         self.assertEqual('All dependents completed', res_msg)
-        self.assertEqual(1, mock_dep.call_count)
-        mock_action.assert_called_once_with(
-            action.context, 'NODE_ID', 'NODE_DELETE',
-            name='node_delete_NODE_ID',
-            cluster_id='CLUSTER_ID',
-            cause='Derived Action with Lifecycle Hook', inputs={})
-        update_calls = [
-            mock.call(action.context, 'NODE_ACTION_ID',
-                      {'status': 'READY',
-                       'owner': None}),
-        ]
-        mock_update.assert_has_calls(update_calls)
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID',
+            [('NODE_ID', 'NODE_DELETE',
+              {'name': 'node_delete_NODE_ID',
+               'cluster_id': 'CLUSTER_ID',
+               'cause': 'Derived Action with Lifecycle Hook',
+               'inputs': {}})],
+            nodes=None, force=False)
         mock_post.assert_not_called()
         mock_start.assert_called_once_with()
         mock_wait.assert_called_once_with(action.data['hooks']['timeout'])
 
     @mock.patch.object(ao.Action, 'check_status')
     @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(no.Node, 'get')
-    @mock.patch.object(dobj.Dependency, 'create')
     @mock.patch.object(msg.Message, 'post_lifecycle_hook_message')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
     def test_delete_nodes_with_lifecycle_hook_timeout(self, mock_wait,
                                                       mock_start,
-                                                      mock_post, mock_dep,
+                                                      mock_post,
                                                       mock_node_get,
-                                                      mock_action,
+                                                      mock_batch,
                                                       mock_update,
                                                       mock_check_status,
                                                       mock_load):
@@ -378,7 +347,7 @@ class ClusterDeleteTest(base.SenlinTestCase):
             (action.RES_LIFECYCLE_HOOK_TIMEOUT, 'Timeout'),
             (action.RES_OK, 'All dependents completed')
         ]
-        mock_action.return_value = 'NODE_ACTION_ID'
+        mock_batch.return_value = ['NODE_ACTION_ID']
         mock_node_get.return_value = mock.Mock(
             status=consts.NS_ACTIVE, id='NODE_ID', physical_id="nova-server")
         mock_check_status.return_value = 'WAITING_LIFECYCLE_COMPLETION'
@@ -388,21 +357,19 @@ class ClusterDeleteTest(base.SenlinTestCase):
         # assertions (other assertions are skipped)
         self.assertEqual(action.RES_OK, res_code)
         self.assertEqual('All dependents completed', res_msg)
-        self.assertEqual(1, mock_dep.call_count)
-        mock_action.assert_called_once_with(
-            action.context, 'NODE_ID', 'NODE_DELETE',
-            name='node_delete_NODE_ID',
-            cluster_id='CLUSTER_ID',
-            cause='Derived Action with Lifecycle Hook', inputs={})
-        update_calls = [
-            mock.call(action.context, 'NODE_ACTION_ID',
-                      {'status': 'WAITING_LIFECYCLE_COMPLETION',
-                       'owner': 'OWNER_ID'}),
-            mock.call(action.context, 'NODE_ACTION_ID',
-                      {'status': 'READY',
-                       'owner': None}),
-        ]
-        mock_update.assert_has_calls(update_calls)
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID',
+            [('NODE_ID', 'NODE_DELETE',
+              {'name': 'node_delete_NODE_ID',
+               'cluster_id': 'CLUSTER_ID',
+               'cause': 'Derived Action with Lifecycle Hook',
+               'inputs': {},
+               'status': 'WAITING_LIFECYCLE_COMPLETION',
+               'owner': 'OWNER_ID'})],
+            nodes=None, force=False)
+        mock_update.assert_called_once_with(
+            action.context, 'NODE_ACTION_ID',
+            {'status': 'READY', 'owner': None})
         mock_post.assert_called_once_with('NODE_ACTION_ID', 'NODE_ID',
                                           'nova-server',
                                           consts.LIFECYCLE_NODE_TERMINATION)
@@ -413,9 +380,9 @@ class ClusterDeleteTest(base.SenlinTestCase):
         ]
         mock_wait.assert_has_calls(wait_calls)
 
-    @mock.patch.object(ab.Action, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     def test_delete_nodes_with_lifecycle_hook_invalid_type(self,
-                                                           mock_action,
+                                                           mock_batch,
                                                            mock_load):
         # prepare mocks
         cluster = mock.Mock(id='CLUSTER_ID', desired_capacity=100, config={})
@@ -432,7 +399,6 @@ class ClusterDeleteTest(base.SenlinTestCase):
                 }
             }
         }
-        mock_action.return_value = 'NODE_ACTION_ID'
         # do it
         res_code, res_msg = action._delete_nodes(['NODE_ID'])
 
@@ -440,12 +406,11 @@ class ClusterDeleteTest(base.SenlinTestCase):
         self.assertEqual(action.RES_ERROR, res_code)
         self.assertEqual("Failed in deleting nodes: Lifecycle hook type "
                          "'unknown_type' is not implemented", res_msg)
+        mock_batch.assert_not_called()
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     def test_delete_nodes_with_lifecycle_hook_unsupported_webhook(self,
-                                                                  mock_action,
-                                                                  mock_update,
+                                                                  mock_batch,
                                                                   mock_load):
         # prepare mocks
         cluster = mock.Mock(id='CLUSTER_ID', desired_capacity=100, config={})
@@ -462,7 +427,6 @@ class ClusterDeleteTest(base.SenlinTestCase):
                 }
             }
         }
-        mock_action.return_value = 'NODE_ACTION_ID'
         # do it
         res_code, res_msg = action._delete_nodes(['NODE_ID'])
 
@@ -470,6 +434,7 @@ class ClusterDeleteTest(base.SenlinTestCase):
         self.assertEqual(action.RES_ERROR, res_code)
         self.assertEqual("Failed in deleting nodes: Lifecycle hook type "
                          "'webhook' is not implemented", res_msg)
+        mock_batch.assert_not_called()
 
     @mock.patch.object(ca.ClusterAction, '_remove_nodes_normally')
     def test_delete_nodes_failed_remove_stop_node(self, mock_remove,
@@ -873,13 +838,11 @@ class ClusterDeleteTest(base.SenlinTestCase):
 
         self.assertEqual(False, res)
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
-    @mock.patch.object(dobj.Dependency, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
-    def test_remove_nodes_normally(self, mock_wait, mock_start, mock_dep,
-                                   mock_action, mock_update, mock_load):
+    def test_remove_nodes_normally(self, mock_wait, mock_start, mock_batch,
+                                   mock_load):
         # prepare mocks
         cluster = mock.Mock(id='CLUSTER_ID', desired_capacity=100)
         mock_load.return_value = cluster
@@ -889,7 +852,7 @@ class ClusterDeleteTest(base.SenlinTestCase):
         action.id = 'CLUSTER_ACTION_ID'
         action.inputs = {'destroy_after_deletion': False}
         mock_wait.return_value = (action.RES_OK, 'All dependents completed')
-        mock_action.side_effect = ['NODE_ACTION_1', 'NODE_ACTION_2']
+        mock_batch.return_value = ['NODE_ACTION_1', 'NODE_ACTION_2']
 
         # do it
         res_code, res_msg = action._remove_nodes_normally('NODE_REMOVE',
@@ -898,26 +861,29 @@ class ClusterDeleteTest(base.SenlinTestCase):
         # assertions
         self.assertEqual(action.RES_OK, res_code)
         self.assertEqual('All dependents completed', res_msg)
-        self.assertEqual(2, mock_action.call_count)
-        update_calls = [
-            mock.call(action.context, 'NODE_ACTION_1', {'status': 'READY'}),
-            mock.call(action.context, 'NODE_ACTION_2', {'status': 'READY'})
-        ]
-        mock_update.assert_has_calls(update_calls)
-        self.assertEqual(1, mock_dep.call_count)
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID',
+            [('NODE_1', 'NODE_REMOVE',
+              {'name': 'node_delete_NODE_1',
+               'cluster_id': 'CLUSTER_ID',
+               'cause': 'Derived Action',
+               'inputs': {}}),
+             ('NODE_2', 'NODE_REMOVE',
+              {'name': 'node_delete_NODE_2',
+               'cluster_id': 'CLUSTER_ID',
+               'cause': 'Derived Action',
+               'inputs': {}})],
+            nodes=None, force=False)
         mock_start.assert_called_once_with()
         mock_wait.assert_called_once_with()
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(no.Node, 'get')
-    @mock.patch.object(dobj.Dependency, 'create')
     @mock.patch.object(msg.Message, 'post_lifecycle_hook_message')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
     def test_remove_nodes_with_hook(self, mock_wait, mock_start, mock_post,
-                                    mock_dep, mock_node_get, mock_action,
-                                    mock_update, mock_load):
+                                    mock_node_get, mock_batch, mock_load):
         # prepare mocks
         cluster = mock.Mock(id='CLUSTER_ID', desired_capacity=100)
         mock_load.return_value = cluster
@@ -935,7 +901,7 @@ class ClusterDeleteTest(base.SenlinTestCase):
         }
         action.owner = 'OWNER_ID'
         mock_wait.return_value = (action.RES_OK, 'All dependents completed')
-        mock_action.return_value = 'NODE_ACTION_ID'
+        mock_batch.return_value = ['NODE_ACTION_ID']
         mock_node_get.return_value = mock.Mock(
             status=consts.NS_ACTIVE, id='NODE_ID', physical_id="nova-server")
         # do it
@@ -945,31 +911,27 @@ class ClusterDeleteTest(base.SenlinTestCase):
         # assertions (other assertions are skipped)
         self.assertEqual(action.RES_OK, res_code)
         self.assertEqual('All dependents completed', res_msg)
-        self.assertEqual(1, mock_dep.call_count)
-        mock_action.assert_called_once_with(
-            action.context, 'NODE_ID', 'NODE_DELETE',
-            name='node_delete_NODE_ID', cluster_id='CLUSTER_ID',
-            cause='Derived Action with Lifecycle Hook', inputs={})
-        update_calls = [
-            mock.call(action.context, 'NODE_ACTION_ID',
-                      {'status': 'WAITING_LIFECYCLE_COMPLETION',
-                       'owner': 'OWNER_ID'}),
-        ]
-        mock_update.assert_has_calls(update_calls)
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID',
+            [('NODE_ID', 'NODE_DELETE',
+              {'name': 'node_delete_NODE_ID',
+               'cluster_id': 'CLUSTER_ID',
+               'cause': 'Derived Action with Lifecycle Hook',
+               'inputs': {},
+               'status': 'WAITING_LIFECYCLE_COMPLETION',
+               'owner': 'OWNER_ID'})],
+            nodes=None, force=False)
         mock_post.assert_called_once_with('NODE_ACTION_ID', 'NODE_ID',
                                           'nova-server',
                                           consts.LIFECYCLE_NODE_TERMINATION)
         mock_start.assert_called_once_with()
         mock_wait.assert_called_once_with(action.data['hooks']['timeout'])
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
-    @mock.patch.object(dobj.Dependency, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
     def test_remove_nodes_normally_failed_wait(self, mock_wait, mock_start,
-                                               mock_dep, mock_action,
-                                               mock_update, mock_load):
+                                               mock_batch, mock_load):
         # prepare mocks
         cluster = mock.Mock(id='ID', config={})
         mock_load.return_value = cluster
@@ -979,7 +941,7 @@ class ClusterDeleteTest(base.SenlinTestCase):
         action.inputs = {'destroy_after_deletion': False}
         action.data = {}
         mock_wait.return_value = (action.RES_TIMEOUT, 'Timeout!')
-        mock_action.return_value = 'NODE_ACTION_ID'
+        mock_batch.return_value = ['NODE_ACTION_ID']
 
         # do it
         res_code, res_msg = action._remove_nodes_normally('NODE_REMOVE',
@@ -990,14 +952,11 @@ class ClusterDeleteTest(base.SenlinTestCase):
         self.assertEqual('Timeout!', res_msg)
         self.assertEqual({}, action.data)
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
-    @mock.patch.object(dobj.Dependency, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
     def test_remove_nodes_hook_failed_wait(self, mock_wait, mock_start,
-                                           mock_dep, mock_action,
-                                           mock_update, mock_load):
+                                           mock_batch, mock_load):
         # prepare mocks
         cluster = mock.Mock(id='ID', config={})
         mock_load.return_value = cluster
@@ -1015,7 +974,7 @@ class ClusterDeleteTest(base.SenlinTestCase):
             }
         }
         mock_wait.return_value = (action.RES_TIMEOUT, 'Timeout!')
-        mock_action.return_value = 'NODE_ACTION_ID'
+        mock_batch.return_value = ['NODE_ACTION_ID']
 
         # do it
         res_code, res_msg = action._remove_nodes_normally('NODE_REMOVE',
@@ -1025,17 +984,14 @@ class ClusterDeleteTest(base.SenlinTestCase):
         self.assertEqual(action.RES_TIMEOUT, res_code)
         self.assertEqual('Timeout!', res_msg)
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(no.Node, 'get')
-    @mock.patch.object(dobj.Dependency, 'create')
     @mock.patch.object(msg.Message, 'post_lifecycle_hook_message')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
     def test_delete_nodes_with_error_nodes(self, mock_wait, mock_start,
-                                           mock_post, mock_dep,
-                                           mock_node_get, mock_action,
-                                           mock_update, mock_load):
+                                           mock_post, mock_node_get,
+                                           mock_batch, mock_load):
         # prepare mocks
         cluster = mock.Mock(id='CLUSTER_ID', desired_capacity=100)
         mock_load.return_value = cluster
@@ -1053,7 +1009,7 @@ class ClusterDeleteTest(base.SenlinTestCase):
             }
         }
         action.owner = 'OWNER_ID'
-        mock_action.side_effect = ['NODE_ACTION_1', 'NODE_ACTION_2']
+        mock_batch.return_value = ['NODE_ACTION_1', 'NODE_ACTION_2']
         mock_wait.return_value = (action.RES_OK, 'All dependents completed')
         node1 = mock.Mock(status=consts.NS_ACTIVE, id='NODE_1',
                           physical_id=None)
@@ -1067,30 +1023,24 @@ class ClusterDeleteTest(base.SenlinTestCase):
         # assertions
         self.assertEqual(action.RES_OK, res_code)
         self.assertEqual('All dependents completed', res_msg)
-        update_calls = [
-            mock.call(action.context, 'NODE_ACTION_1', {'status': 'READY',
-                                                        'owner': None}),
-            mock.call(action.context, 'NODE_ACTION_2',
-                      {'status': 'WAITING_LIFECYCLE_COMPLETION',
-                       'owner': 'OWNER_ID'})
-        ]
-        mock_update.assert_has_calls(update_calls)
-        create_actions = [
-            mock.call(action.context, 'NODE_1', 'NODE_DELETE',
-                      name='node_delete_NODE_1',
-                      cluster_id='CLUSTER_ID',
-                      cause='Derived Action with Lifecycle Hook', inputs={}),
-            mock.call(action.context, 'NODE_2', 'NODE_DELETE',
-                      name='node_delete_NODE_2',
-                      cluster_id='CLUSTER_ID',
-                      cause='Derived Action with Lifecycle Hook', inputs={})
-        ]
-        mock_action.assert_has_calls(create_actions)
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID',
+            [('NODE_1', 'NODE_DELETE',
+              {'name': 'node_delete_NODE_1',
+               'cluster_id': 'CLUSTER_ID',
+               'cause': 'Derived Action with Lifecycle Hook',
+               'inputs': {}}),
+             ('NODE_2', 'NODE_DELETE',
+              {'name': 'node_delete_NODE_2',
+               'cluster_id': 'CLUSTER_ID',
+               'cause': 'Derived Action with Lifecycle Hook',
+               'inputs': {},
+               'status': 'WAITING_LIFECYCLE_COMPLETION',
+               'owner': 'OWNER_ID'})],
+            nodes=None, force=False)
 
         mock_post.assert_called_once_with('NODE_ACTION_2', 'NODE_2',
                                           node2.physical_id,
                                           consts.LIFECYCLE_NODE_TERMINATION)
         mock_start.assert_called_once_with()
         mock_wait.assert_called_once_with(action.data['hooks']['timeout'])
-
-        self.assertEqual(1, mock_dep.call_count)
@@ -600,6 +600,7 @@ class NodeActionTest(base.SenlinTestCase):
         reason = 'Failed in locking cluster'
         self.assertEqual(action.RES_RETRY, res_code)
         self.assertEqual(reason, res_msg)
+        self.assertEqual(('FAKE_CLUSTER', True), action.waiting_lock)
         mock_load.assert_called_once_with(action.context, node_id='NODE_ID')
         mock_acquire.assert_called_once_with(self.ctx, 'FAKE_CLUSTER',
                                              'ACTION_ID', None,
@@ -734,6 +735,7 @@ class NodeActionTest(base.SenlinTestCase):
         reason = 'Failed in locking node'
         self.assertEqual(action.RES_RETRY, res_code)
         self.assertEqual(reason, res_msg)
+        self.assertEqual(('NODE_ID', False), action.waiting_lock)
         mock_load.assert_called_once_with(action.context, node_id='NODE_ID')
         mock_acquire.assert_called_once_with(self.ctx, 'FAKE_CLUSTER',
                                              'ACTION_ID', None,
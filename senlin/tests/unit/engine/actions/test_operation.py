@@ -17,8 +17,6 @@ from senlin.engine.actions import base as ab
 from senlin.engine.actions import cluster_action as ca
 from senlin.engine import cluster as cm
 from senlin.engine import dispatcher
-from senlin.objects import action as ao
-from senlin.objects import dependency as dobj
 from senlin.tests.unit.common import base
 from senlin.tests.unit.common import utils
 
@@ -30,13 +28,10 @@ class ClusterOperationTest(base.SenlinTestCase):
         super(ClusterOperationTest, self).setUp()
         self.ctx = utils.dummy_context()
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
-    @mock.patch.object(dobj.Dependency, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
-    def test_do_operation(self, mock_wait, mock_start, mock_dep, mock_action,
-                          mock_update, mock_load):
+    def test_do_operation(self, mock_wait, mock_start, mock_batch, mock_load):
         cluster = mock.Mock(id='FAKE_ID')
         cluster.do_operation.return_value = True
         mock_load.return_value = cluster
@@ -47,7 +42,7 @@ class ClusterOperationTest(base.SenlinTestCase):
             'params': {'style': 'tango'},
             'nodes': ['NODE_ID_1', 'NODE_ID_2'],
         }
-        mock_action.side_effect = ['NODE_OP_ID_1', 'NODE_OP_ID_2']
+        mock_batch.return_value = ['NODE_OP_ID_1', 'NODE_OP_ID_2']
         mock_wait.return_value = (action.RES_OK, 'Everything is Okay')
 
         # do it
@@ -59,38 +54,28 @@ class ClusterOperationTest(base.SenlinTestCase):
 
         cluster.do_operation.assert_called_once_with(action.context,
                                                      operation='dance')
-        mock_action.assert_has_calls([
-            mock.call(action.context, 'NODE_ID_1', 'NODE_OPERATION',
-                      name='node_dance_NODE_ID_', cause=consts.CAUSE_DERIVED,
-                      inputs={
-                          'operation': 'dance',
-                          'params': {'style': 'tango'}
-                      }),
-            mock.call(action.context, 'NODE_ID_2', 'NODE_OPERATION',
-                      name='node_dance_NODE_ID_', cause=consts.CAUSE_DERIVED,
-                      inputs={
-                          'operation': 'dance',
-                          'params': {'style': 'tango'}
-                      }),
-        ])
-        mock_dep.assert_called_once_with(
-            action.context, ['NODE_OP_ID_1', 'NODE_OP_ID_2'],
-            'CLUSTER_ACTION_ID')
-        mock_update.assert_has_calls([
-            mock.call(action.context, 'NODE_OP_ID_1', {'status': 'READY'}),
-            mock.call(action.context, 'NODE_OP_ID_2', {'status': 'READY'}),
-        ])
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID',
+            [('NODE_ID_1', 'NODE_OPERATION',
+              {'name': 'node_dance_NODE_ID_',
+               'cause': consts.CAUSE_DERIVED,
+               'inputs': {'operation': 'dance',
+                          'params': {'style': 'tango'}}}),
+             ('NODE_ID_2', 'NODE_OPERATION',
+              {'name': 'node_dance_NODE_ID_',
+               'cause': consts.CAUSE_DERIVED,
+               'inputs': {'operation': 'dance',
+                          'params': {'style': 'tango'}}})],
+            nodes=None, force=False)
         mock_start.assert_called_once_with()
         mock_wait.assert_called_once_with()
         cluster.eval_status.assert_called_once_with(action.context, 'dance')
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
-    @mock.patch.object(dobj.Dependency, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
-    def test_do_operation_failed_wait(self, mock_wait, mock_start, mock_dep,
-                                      mock_action, mock_update, mock_load):
+    def test_do_operation_failed_wait(self, mock_wait, mock_start, mock_batch,
+                                      mock_load):
         cluster = mock.Mock(id='FAKE_ID')
         cluster.do_operation.return_value = True
         mock_load.return_value = cluster
@@ -101,7 +86,7 @@ class ClusterOperationTest(base.SenlinTestCase):
             'params': {'style': 'tango'},
             'nodes': ['NODE_ID_1', 'NODE_ID_2'],
         }
-        mock_action.side_effect = ['NODE_OP_ID_1', 'NODE_OP_ID_2']
+        mock_batch.return_value = ['NODE_OP_ID_1', 'NODE_OP_ID_2']
         mock_wait.return_value = (action.RES_ERROR, 'Something is wrong')
 
         # do it
@@ -113,27 +98,19 @@ class ClusterOperationTest(base.SenlinTestCase):
 
         cluster.do_operation.assert_called_once_with(action.context,
                                                      operation='dance')
-        mock_action.assert_has_calls([
-            mock.call(action.context, 'NODE_ID_1', 'NODE_OPERATION',
-                      name='node_dance_NODE_ID_', cause=consts.CAUSE_DERIVED,
-                      inputs={
-                          'operation': 'dance',
-                          'params': {'style': 'tango'}
-                      }),
-            mock.call(action.context, 'NODE_ID_2', 'NODE_OPERATION',
-                      name='node_dance_NODE_ID_', cause=consts.CAUSE_DERIVED,
-                      inputs={
-                          'operation': 'dance',
-                          'params': {'style': 'tango'}
-                      }),
-        ])
-        mock_dep.assert_called_once_with(
-            action.context, ['NODE_OP_ID_1', 'NODE_OP_ID_2'],
-            'CLUSTER_ACTION_ID')
-        mock_update.assert_has_calls([
-            mock.call(action.context, 'NODE_OP_ID_1', {'status': 'READY'}),
-            mock.call(action.context, 'NODE_OP_ID_2', {'status': 'READY'}),
-        ])
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID',
+            [('NODE_ID_1', 'NODE_OPERATION',
+              {'name': 'node_dance_NODE_ID_',
+               'cause': consts.CAUSE_DERIVED,
+               'inputs': {'operation': 'dance',
+                          'params': {'style': 'tango'}}}),
+             ('NODE_ID_2', 'NODE_OPERATION',
+              {'name': 'node_dance_NODE_ID_',
+               'cause': consts.CAUSE_DERIVED,
+               'inputs': {'operation': 'dance',
+                          'params': {'style': 'tango'}}})],
+            nodes=None, force=False)
         mock_start.assert_called_once_with()
         mock_wait.assert_called_once_with()
         cluster.eval_status.assert_called_once_with(action.context, 'dance')
@@ -19,8 +19,6 @@ from senlin.engine.actions import cluster_action as ca
 from senlin.engine import cluster as cm
 from senlin.engine import dispatcher
 from senlin.engine import node as nm
-from senlin.objects import action as ao
-from senlin.objects import dependency as dobj
 from senlin.objects import node as no
 from senlin.tests.unit.common import base
 from senlin.tests.unit.common import utils
@@ -33,13 +31,10 @@ class ClusterRecoverTest(base.SenlinTestCase):
         super(ClusterRecoverTest, self).setUp()
         self.ctx = utils.dummy_context()
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
-    @mock.patch.object(dobj.Dependency, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
-    def test_do_recover(self, mock_wait, mock_start, mock_dep,
-                        mock_action, mock_update, mock_load):
+    def test_do_recover(self, mock_wait, mock_start, mock_batch, mock_load):
         node1 = mock.Mock(id='NODE_1', cluster_id='FAKE_ID', status='ACTIVE')
         node2 = mock.Mock(id='NODE_2', cluster_id='FAKE_ID', status='ERROR')
 
@@ -53,7 +48,7 @@ class ClusterRecoverTest(base.SenlinTestCase):
         action.id = 'CLUSTER_ACTION_ID'
         action.data = {}
 
-        mock_action.return_value = 'NODE_RECOVER_ID'
+        mock_batch.return_value = ['NODE_RECOVER_ID']
         mock_wait.return_value = (action.RES_OK, 'Everything is Okay')
 
         # do it
@@ -64,30 +59,24 @@ class ClusterRecoverTest(base.SenlinTestCase):
         self.assertEqual('Cluster recovery succeeded.', res_msg)
 
         cluster.do_recover.assert_called_once_with(action.context)
-        mock_action.assert_called_once_with(
-            action.context, 'NODE_2', 'NODE_RECOVER',
-            name='node_recover_NODE_2',
-            cause=consts.CAUSE_DERIVED,
-            inputs={'operation': None, 'operation_params': None}
-        )
-        mock_dep.assert_called_once_with(action.context, ['NODE_RECOVER_ID'],
-                                         'CLUSTER_ACTION_ID')
-        mock_update.assert_called_once_with(action.context, 'NODE_RECOVER_ID',
-                                            {'status': 'READY'})
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID',
+            [('NODE_2', 'NODE_RECOVER',
+              {'name': 'node_recover_NODE_2',
+               'cause': consts.CAUSE_DERIVED,
+               'inputs': {'operation': None, 'operation_params': None}})],
+            nodes=None, force=False)
         mock_start.assert_called_once_with()
         mock_wait.assert_called_once_with()
         cluster.eval_status.assert_called_once_with(
             action.context, consts.CLUSTER_RECOVER)
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
-    @mock.patch.object(dobj.Dependency, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
     @mock.patch.object(ca.ClusterAction, '_check_capacity')
     def test_do_recover_with_input(self, mock_check, mock_wait, mock_start,
-                                   mock_dep, mock_action, mock_update,
-                                   mock_load):
+                                   mock_batch, mock_load):
         node1 = mock.Mock(id='NODE_1', cluster_id='FAKE_ID', status='ERROR')
         cluster = mock.Mock(id='FAKE_ID', RECOVERING='RECOVERING',
                             desired_capacity=2)
@@ -103,7 +92,7 @@ class ClusterRecoverTest(base.SenlinTestCase):
             'check_capacity': True
         }
 
-        mock_action.return_value = 'NODE_RECOVER_ID'
+        mock_batch.return_value = ['NODE_RECOVER_ID']
         mock_wait.return_value = (action.RES_OK, 'Everything is Okay')
 
         # do it
@@ -114,19 +103,14 @@ class ClusterRecoverTest(base.SenlinTestCase):
         self.assertEqual('Cluster recovery succeeded.', res_msg)
 
         cluster.do_recover.assert_called_once_with(action.context)
-        mock_action.assert_called_once_with(
-            action.context, 'NODE_1', 'NODE_RECOVER',
-            name='node_recover_NODE_1',
-            cause=consts.CAUSE_DERIVED,
-            inputs={
-                'operation': consts.RECOVER_REBOOT,
-                'operation_params': None
-            }
-        )
-        mock_dep.assert_called_once_with(action.context, ['NODE_RECOVER_ID'],
-                                         'CLUSTER_ACTION_ID')
-        mock_update.assert_called_once_with(action.context, 'NODE_RECOVER_ID',
-                                            {'status': 'READY'})
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID',
+            [('NODE_1', 'NODE_RECOVER',
+              {'name': 'node_recover_NODE_1',
+               'cause': consts.CAUSE_DERIVED,
+               'inputs': {'operation': consts.RECOVER_REBOOT,
+                          'operation_params': None}})],
+            nodes=None, force=False)
         mock_start.assert_called_once_with()
         mock_wait.assert_called_once_with()
         cluster.eval_status.assert_called_once_with(
@@ -153,21 +137,18 @@ class ClusterRecoverTest(base.SenlinTestCase):
         cluster.eval_status.assert_called_once_with(
             action.context, consts.CLUSTER_RECOVER)
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
-    @mock.patch.object(dobj.Dependency, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
     @mock.patch.object(ca.ClusterAction, '_check_capacity')
-    def test_do_recover_failed_waiting(self, mock_check, mock_wait,
-                                       mock_start, mock_dep, mock_action,
-                                       mock_update, mock_load):
+    def test_do_recover_failed_waiting(self, mock_check, mock_wait, mock_start,
+                                       mock_batch, mock_load):
         node = mock.Mock(id='NODE_1', cluster_id='CID', status='ERROR')
         cluster = mock.Mock(id='CID', desired_capacity=2)
         cluster.do_recover.return_value = True
         cluster.nodes = [node]
         mock_load.return_value = cluster
-        mock_action.return_value = 'NODE_ACTION_ID'
+        mock_batch.return_value = ['NODE_ACTION_ID']
 
         action = ca.ClusterAction('FAKE_CLUSTER', 'CLUSTER_RECOVER', self.ctx)
         action.id = 'CLUSTER_ACTION_ID'
@@ -186,19 +167,14 @@ class ClusterRecoverTest(base.SenlinTestCase):
 
         mock_load.assert_called_once_with(self.ctx, 'FAKE_CLUSTER')
         cluster.do_recover.assert_called_once_with(action.context)
-        mock_action.assert_called_once_with(
-            action.context, 'NODE_1', 'NODE_RECOVER',
-            name='node_recover_NODE_1',
-            cause=consts.CAUSE_DERIVED,
-            inputs={
-                'operation': consts.RECOVER_RECREATE,
-                'operation_params': None
-            }
-        )
-        mock_dep.assert_called_once_with(action.context, ['NODE_ACTION_ID'],
-                                         'CLUSTER_ACTION_ID')
-        mock_update.assert_called_once_with(action.context, 'NODE_ACTION_ID',
-                                            {'status': 'READY'})
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID',
+            [('NODE_1', 'NODE_RECOVER',
+              {'name': 'node_recover_NODE_1',
+               'cause': consts.CAUSE_DERIVED,
+               'inputs': {'operation': consts.RECOVER_RECREATE,
+                          'operation_params': None}})],
+            nodes=None, force=False)
         mock_start.assert_called_once_with()
         mock_wait.assert_called_once_with()
         cluster.eval_status.assert_called_once_with(
@@ -250,16 +226,14 @@ class ClusterRecoverTest(base.SenlinTestCase):
             action.context, consts.CLUSTER_RECOVER)
         self.assertFalse(mock_desired.called)
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
-    @mock.patch.object(dobj.Dependency, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
     @mock.patch.object(ca.ClusterAction, '_check_capacity')
     @mock.patch.object(nm.Node, 'load')
     def test_do_recover_with_check_error(self, mock_node, mock_desired,
-                                         mock_wait, mock_start, mock_dep,
-                                         mock_action, mock_update, mock_load):
+                                         mock_wait, mock_start, mock_batch,
+                                         mock_load):
         node1 = mock.Mock(id='NODE_1', cluster_id='FAKE_ID', status='ACTIVE')
         node2 = mock.Mock(id='NODE_2', cluster_id='FAKE_ID', status='ACTIVE')
 
@@ -280,7 +254,7 @@ class ClusterRecoverTest(base.SenlinTestCase):
         action.inputs = {'check': True,
                          'check_capacity': True}
 
-        mock_action.return_value = 'NODE_RECOVER_ID'
+        mock_batch.return_value = ['NODE_RECOVER_ID']
         mock_wait.return_value = (action.RES_OK, 'Everything is Okay')
 
         def set_status(*args, **kwargs):
@@ -298,13 +272,13 @@ class ClusterRecoverTest(base.SenlinTestCase):
         self.assertEqual('Cluster recovery succeeded.', res_msg)
 
         cluster.do_recover.assert_called_once_with(action.context)
-        mock_action.assert_called_once_with(
-            action.context, 'NODE_2', 'NODE_RECOVER',
-            name='node_recover_NODE_2',
-            cause=consts.CAUSE_DERIVED,
-            inputs={'operation': None,
-                    'operation_params': None}
-        )
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID',
+            [('NODE_2', 'NODE_RECOVER',
+              {'name': 'node_recover_NODE_2',
+               'cause': consts.CAUSE_DERIVED,
+               'inputs': {'operation': None, 'operation_params': None}})],
+            nodes=None, force=False)
         node_calls = [
             mock.call(self.ctx, node_id='NODE_1'),
             mock.call(self.ctx, node_id='NODE_2')
@@ -312,10 +286,6 @@ class ClusterRecoverTest(base.SenlinTestCase):
         mock_node.assert_has_calls(node_calls)
         eng_node1.do_check.assert_called_once_with(self.ctx)
         eng_node2.do_check.assert_called_once_with(self.ctx)
-        mock_dep.assert_called_once_with(action.context, ['NODE_RECOVER_ID'],
-                                         'CLUSTER_ACTION_ID')
-        mock_update.assert_called_once_with(action.context, 'NODE_RECOVER_ID',
-                                            {'status': 'READY'})
         mock_start.assert_called_once_with()
         mock_wait.assert_called_once_with()
         cluster.eval_status.assert_called_once_with(
@@ -17,8 +17,6 @@ from senlin.engine.actions import base as ab
 from senlin.engine.actions import cluster_action as ca
 from senlin.engine import cluster as cm
 from senlin.engine import dispatcher
-from senlin.objects import action as ao
-from senlin.objects import dependency as dobj
 from senlin.objects import node as no
 from senlin.tests.unit.common import base
 from senlin.tests.unit.common import utils
@@ -31,15 +29,12 @@ class ClusterReplaceNodesTest(base.SenlinTestCase):
         super(ClusterReplaceNodesTest, self).setUp()
         self.ctx = utils.dummy_context()
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(no.Node, 'get')
-    @mock.patch.object(dobj.Dependency, 'create')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
-    def test_do_replace_nodes(self, mock_wait, mock_start, mock_dep,
-                              mock_get_node, mock_action, mock_update,
-                              mock_load):
+    def test_do_replace_nodes(self, mock_wait, mock_start, mock_get_node,
+                              mock_batch, mock_load):
         cluster = mock.Mock(id='CLUSTER_ID', desired_capacity=10)
         mock_load.return_value = cluster
 
@@ -53,7 +48,7 @@ class ClusterReplaceNodesTest(base.SenlinTestCase):
         replace_node = mock.Mock(id='R_NODE_1', cluster_id='',
                                  ACTIVE='ACTIVE', status='ACTIVE')
         mock_get_node.side_effect = [origin_node, replace_node]
-        mock_action.side_effect = ['NODE_LEAVE_1', 'NODE_JOIN_1']
+        mock_batch.return_value = ['NODE_LEAVE_1', 'NODE_JOIN_1']
         mock_wait.return_value = (action.RES_OK, 'Free to fly!')
 
         # do the action
@@ -69,32 +64,19 @@ class ClusterReplaceNodesTest(base.SenlinTestCase):
         mock_load.assert_called_once_with(
             action.context,
             'CLUSTER_ID')
-        mock_action.assert_has_calls([
-            mock.call(action.context, 'O_NODE_1', 'NODE_LEAVE',
-                      name='node_leave_O_NODE_1',
-                      cluster_id='CLUSTER_ID',
-                      cause='Derived Action'),
-            mock.call(action.context, 'R_NODE_1', 'NODE_JOIN',
-                      name='node_join_R_NODE_1',
-                      cluster_id='CLUSTER_ID',
-                      cause='Derived Action',
-                      inputs={'cluster_id': 'CLUSTER_ID'})])
-
-        mock_dep.assert_has_calls([
-            mock.call(action.context,
-                      ['NODE_JOIN_1'],
-                      'CLUSTER_ACTION_ID'),
-            mock.call(action.context,
-                      ['NODE_JOIN_1'],
-                      'NODE_LEAVE_1')])
-
-        mock_update.assert_has_calls([
-            mock.call(action.context,
-                      'NODE_JOIN_1',
-                      {'status': 'READY'}),
-            mock.call(action.context,
-                      'NODE_LEAVE_1',
-                      {'status': 'READY'})])
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID',
+            [('O_NODE_1', 'NODE_LEAVE',
+              {'name': 'node_leave_O_NODE_1',
+               'cluster_id': 'CLUSTER_ID',
+               'cause': 'Derived Action'}),
+             ('R_NODE_1', 'NODE_JOIN',
+              {'name': 'node_join_R_NODE_1',
+               'cluster_id': 'CLUSTER_ID',
+               'cause': 'Derived Action',
+               'inputs': {'cluster_id': 'CLUSTER_ID'}})],
+            nodes=None, force=False)
+
         mock_start.assert_called_once_with()
 
         mock_wait.assert_called_once_with()
@@ -236,15 +218,12 @@ class ClusterReplaceNodesTest(base.SenlinTestCase):
         self.assertEqual(action.RES_ERROR, res_code)
         self.assertEqual("Node REPLACE_NODE is not in ACTIVE status.", res_msg)
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(no.Node, 'get')
-    @mock.patch.object(dobj.Dependency, 'create')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
-    def test_do_replace_failed_waiting(self, mock_wait, mock_start, mock_dep,
-                                       mock_get_node, mock_action,
-                                       mock_update, mock_load):
+    def test_do_replace_failed_waiting(self, mock_wait, mock_start,
+                                       mock_get_node, mock_batch, mock_load):
         cluster = mock.Mock(id='CLUSTER_ID', desired_capacity=10)
         mock_load.return_value = cluster
 
@@ -258,39 +237,25 @@ class ClusterReplaceNodesTest(base.SenlinTestCase):
         replace_node = mock.Mock(id='R_NODE_1', cluster_id='',
                                  ACTIVE='ACTIVE', status='ACTIVE')
         mock_get_node.side_effect = [origin_node, replace_node]
-        mock_action.side_effect = ['NODE_LEAVE_1', 'NODE_JOIN_1']
+        mock_batch.return_value = ['NODE_LEAVE_1', 'NODE_JOIN_1']
         mock_wait.return_value = (action.RES_TIMEOUT, 'Timeout!')
 
         # do the action
         res_code, res_msg = action.do_replace_nodes()
 
         # assertions
-        mock_action.assert_has_calls([
-            mock.call(action.context, 'O_NODE_1', 'NODE_LEAVE',
-                      name='node_leave_O_NODE_1',
-                      cluster_id='CLUSTER_ID',
-                      cause='Derived Action'),
-            mock.call(action.context, 'R_NODE_1', 'NODE_JOIN',
-                      name='node_join_R_NODE_1',
-                      cluster_id='CLUSTER_ID',
-                      cause='Derived Action',
-                      inputs={'cluster_id': 'CLUSTER_ID'})])
-
-        mock_dep.assert_has_calls([
-            mock.call(action.context,
-                      ['NODE_JOIN_1'],
-                      'CLUSTER_ACTION_ID'),
-            mock.call(action.context,
-                      ['NODE_JOIN_1'],
-                      'NODE_LEAVE_1')])
-
-        mock_update.assert_has_calls([
-            mock.call(action.context,
-                      'NODE_JOIN_1',
-                      {'status': 'READY'}),
-            mock.call(action.context,
-                      'NODE_LEAVE_1',
-                      {'status': 'READY'})])
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID',
+            [('O_NODE_1', 'NODE_LEAVE',
+              {'name': 'node_leave_O_NODE_1',
+               'cluster_id': 'CLUSTER_ID',
+               'cause': 'Derived Action'}),
+             ('R_NODE_1', 'NODE_JOIN',
+              {'name': 'node_join_R_NODE_1',
+               'cluster_id': 'CLUSTER_ID',
+               'cause': 'Derived Action',
+               'inputs': {'cluster_id': 'CLUSTER_ID'}})],
+            nodes=None, force=False)
 
         self.assertEqual(action.RES_TIMEOUT, res_code)
         self.assertEqual('Timeout!', res_msg)
@@ -17,8 +17,6 @@ from senlin.engine.actions import base as ab
 from senlin.engine.actions import cluster_action as ca
 from senlin.engine import cluster as cm
 from senlin.engine import dispatcher
-from senlin.objects import action as ao
-from senlin.objects import dependency as dobj
 from senlin.tests.unit.common import base
 from senlin.tests.unit.common import utils
 
@@ -159,13 +157,11 @@ class ClusterUpdateTest(base.SenlinTestCase):
             action.context, consts.CLUSTER_UPDATE, profile_id='FAKE_PROFILE',
             updated_at=mock.ANY)
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
-    @mock.patch.object(dobj.Dependency, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
-    def test_update_nodes_no_policy(self, mock_wait, mock_start, mock_dep,
-                                    mock_action, mock_update, mock_load):
+    def test_update_nodes_no_policy(self, mock_wait, mock_start, mock_batch,
+                                    mock_load):
         node1 = mock.Mock(id='node_id1')
         node2 = mock.Mock(id='node_id2')
         cluster = mock.Mock(id='FAKE_ID', nodes=[node1, node2],
@@ -176,7 +172,7 @@ class ClusterUpdateTest(base.SenlinTestCase):
         action.inputs = {'new_profile_id': 'FAKE_PROFILE'}
         action.id = 'CLUSTER_ACTION_ID'
         mock_wait.return_value = (action.RES_OK, 'All dependents completed')
-        mock_action.side_effect = ['NODE_ACTION1', 'NODE_ACTION2']
+        mock_batch.return_value = ['NODE_ACTION1', 'NODE_ACTION2']
         kwargs1 = {
             'name': 'node_update_node_id1',
             'cluster_id': cluster.id,
@@ -198,25 +194,22 @@ class ClusterUpdateTest(base.SenlinTestCase):
                                                 [node1, node2])
         self.assertEqual(res_code, action.RES_OK)
         self.assertEqual(reason, 'Cluster update completed.')
-        mock_action.assert_has_calls([
-            mock.call(action.context, node1.id, consts.NODE_UPDATE, **kwargs1),
-            mock.call(action.context, node2.id, consts.NODE_UPDATE, **kwargs2),
-        ])
-        self.assertEqual(1, mock_dep.call_count)
-        self.assertEqual(2, mock_update.call_count)
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID',
+            [(node1.id, consts.NODE_UPDATE, kwargs1),
+             (node2.id, consts.NODE_UPDATE, kwargs2)],
+            nodes=None, force=False)
         mock_start.assert_called_once_with()
 
         cluster.eval_status.assert_called_once_with(
             action.context, consts.CLUSTER_UPDATE, profile_id='FAKE_PROFILE',
             updated_at=mock.ANY)
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
-    @mock.patch.object(dobj.Dependency, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
-    def test_update_nodes_with_config(self, mock_wait, mock_start, mock_dep,
-                                      mock_action, mock_update, mock_load):
+    def test_update_nodes_with_config(self, mock_wait, mock_start, mock_batch,
+                                      mock_load):
         node1 = mock.Mock(id='node_id1')
         node2 = mock.Mock(id='node_id2')
         cluster = mock.Mock(id='FAKE_ID', nodes=[node1, node2],
@@ -227,7 +220,7 @@ class ClusterUpdateTest(base.SenlinTestCase):
         action.inputs = {'new_profile_id': 'FAKE_PROFILE'}
         action.id = 'CLUSTER_ACTION_ID'
         mock_wait.return_value = (action.RES_OK, 'All dependents completed')
-        mock_action.side_effect = ['NODE_ACTION1', 'NODE_ACTION2']
+        mock_batch.return_value = ['NODE_ACTION1', 'NODE_ACTION2']
         kwargs1 = {
             'name': 'node_update_node_id1',
             'cluster_id': cluster.id,
@@ -251,25 +244,22 @@ class ClusterUpdateTest(base.SenlinTestCase):
                                                 [node1, node2])
         self.assertEqual(res_code, action.RES_OK)
         self.assertEqual(reason, 'Cluster update completed.')
-        mock_action.assert_has_calls([
-            mock.call(action.context, node1.id, consts.NODE_UPDATE, **kwargs1),
-            mock.call(action.context, node2.id, consts.NODE_UPDATE, **kwargs2),
-        ])
-        self.assertEqual(1, mock_dep.call_count)
-        self.assertEqual(2, mock_update.call_count)
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID',
+            [(node1.id, consts.NODE_UPDATE, kwargs1),
+             (node2.id, consts.NODE_UPDATE, kwargs2)],
+            nodes=None, force=False)
         mock_start.assert_called_once_with()
 
         cluster.eval_status.assert_called_once_with(
             action.context, consts.CLUSTER_UPDATE, profile_id='FAKE_PROFILE',
             updated_at=mock.ANY)
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
-    @mock.patch.object(dobj.Dependency, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
-    def test_update_nodes_batch_policy(self, mock_wait, mock_start, mock_dep,
-                                       mock_action, mock_update, mock_load):
+    def test_update_nodes_batch_policy(self, mock_wait, mock_start, mock_batch,
+                                       mock_load):
         node1 = mock.Mock(id='node_id1')
         node2 = mock.Mock(id='node_id2')
         cluster = mock.Mock(id='FAKE_ID', nodes=[node1, node2],
@@ -287,28 +277,31 @@ class ClusterUpdateTest(base.SenlinTestCase):
             }
         }
         mock_wait.return_value = (action.RES_OK, 'All dependents completed')
-        mock_action.side_effect = ['NODE_ACTION1', 'NODE_ACTION2']
+        mock_batch.return_value = ['NODE_ACTION1', 'NODE_ACTION2']
 
         res_code, reason = action._update_nodes('FAKE_PROFILE',
                                                 [node1, node2])
         self.assertEqual(res_code, action.RES_OK)
         self.assertEqual(reason, 'Cluster update completed.')
-        self.assertEqual(2, mock_action.call_count)
-        self.assertEqual(2, mock_dep.call_count)
-        self.assertEqual(2, mock_update.call_count)
+        mock_batch.assert_has_calls([
+            mock.call(action.context, 'CLUSTER_ACTION_ID',
+                      [(node1.id, consts.NODE_UPDATE, mock.ANY)],
+                      nodes=None, force=False),
+            mock.call(action.context, 'CLUSTER_ACTION_ID',
+                      [(node2.id, consts.NODE_UPDATE, mock.ANY)],
+                      nodes=None, force=False),
+        ])
         self.assertEqual(2, mock_start.call_count)
 
         cluster.eval_status.assert_called_once_with(
             action.context, consts.CLUSTER_UPDATE, profile_id='FAKE_PROFILE',
             updated_at=mock.ANY)
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
-    @mock.patch.object(dobj.Dependency, 'create')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
-    def test_update_nodes_fail_wait(self, mock_wait, mock_start, mock_dep,
-                                    mock_action, mock_update, mock_load):
+    def test_update_nodes_fail_wait(self, mock_wait, mock_start, mock_batch,
+                                    mock_load):
         node1 = mock.Mock(id='node_id1')
         node2 = mock.Mock(id='node_id2')
         cluster = mock.Mock(id='FAKE_ID', nodes=[node1, node2],
@@ -319,15 +312,17 @@ class ClusterUpdateTest(base.SenlinTestCase):
         action.inputs = {'new_profile_id': 'FAKE_PROFILE'}
         action.id = 'CLUSTER_ACTION_ID'
         mock_wait.return_value = (action.RES_ERROR, 'Oops!')
-        mock_action.side_effect = ['NODE_ACTION1', 'NODE_ACTION2']
+        mock_batch.return_value = ['NODE_ACTION1', 'NODE_ACTION2']
 
         res_code, reason = action._update_nodes('FAKE_PROFILE',
                                                 [node1, node2])
         self.assertEqual(res_code, action.RES_ERROR)
         self.assertEqual(reason, 'Failed in updating nodes.')
-        self.assertEqual(2, mock_action.call_count)
-        self.assertEqual(1, mock_dep.call_count)
-        self.assertEqual(2, mock_update.call_count)
+        mock_batch.assert_called_once_with(
+            action.context, 'CLUSTER_ACTION_ID',
+            [(node1.id, consts.NODE_UPDATE, mock.ANY),
+             (node2.id, consts.NODE_UPDATE, mock.ANY)],
+            nodes=None, force=False)
         mock_start.assert_called_once_with()
         cluster.eval_status.assert_called_once_with(
             action.context, consts.CLUSTER_UPDATE)
@@ -9,12 +9,15 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
-import eventlet
 from unittest import mock
 
+from oslo_config import cfg
+
 from senlin.engine.actions import base as ab
 from senlin.engine.actions import cluster_action as ca
 from senlin.engine import cluster as cm
+from senlin.engine import dispatcher
+from senlin.engine import waiter
 from senlin.tests.unit.common import base
 from senlin.tests.unit.common import utils
 
@@ -76,8 +79,9 @@ class ClusterActionWaitTest(base.SenlinTestCase):
         self.ctx = utils.dummy_context()
 
     @mock.patch.object(cm.Cluster, 'load')
-    @mock.patch.object(eventlet, 'sleep')
-    def test_wait_dependents(self, mock_reschedule, mock_load):
+    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(waiter, 'wait', return_value=False)
+    def test_wait_dependents(self, mock_wait, mock_start, mock_load):
         action = ca.ClusterAction('ID', 'ACTION', self.ctx)
         action.id = 'FAKE_ID'
         self.patchobject(action, 'get_status', side_effect=self.statuses)
@@ -87,4 +91,68 @@ class ClusterActionWaitTest(base.SenlinTestCase):
         res_code, res_msg = action._wait_for_dependents()
         self.assertEqual(self.code, res_code)
         self.assertEqual(self.message, res_msg)
-        self.assertEqual(self.rescheduled_times, mock_reschedule.call_count)
+        self.assertEqual(self.rescheduled_times, mock_wait.call_count)
+        self.assertEqual(self.rescheduled_times, mock_start.call_count)
+        self.assertFalse(waiter.is_waiting('FAKE_ID'))
+
+
+@mock.patch.object(cm.Cluster, 'load')
+class ClusterActionWakeupTest(base.SenlinTestCase):
+
+    def setUp(self):
+        super(ClusterActionWakeupTest, self).setUp()
+        self.ctx = utils.dummy_context()
+
+    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(waiter, 'wait', return_value=True)
+    def test_wait_dependents_woken(self, mock_wait, mock_start, mock_load):
+        action = ca.ClusterAction('ID', 'ACTION', self.ctx)
+        action.id = 'FAKE_ID'
+        self.patchobject(action, 'get_status',
+                         side_effect=[action.WAITING, action.READY])
+        self.patchobject(action, 'is_cancelled', return_value=False)
+        self.patchobject(action, 'is_timeout', return_value=False)
+
+        res_code, res_msg = action._wait_for_dependents()
+
+        self.assertEqual(action.RES_OK, res_code)
+        mock_wait.assert_called_once_with(
+            'FAKE_ID', cfg.CONF.engine.dependent_wait_interval)
+        self.assertEqual(0, mock_start.call_count)
+        self.assertFalse(waiter.is_waiting('FAKE_ID'))
+
+    @mock.patch.object(ab, 'wallclock', return_value=105)
+    @mock.patch.object(waiter, 'wait', return_value=False)
+    def test_wait_for_wakeup_lifecycle_hook(self, mock_wait, mock_clock,
+                                            mock_load):
+        action = ca.ClusterAction('ID', 'ACTION', self.ctx)
+        action.id = 'FAKE_ID'
+        action.start_time = 100
+
+        res = action._wait_for_wakeup(8)
+
+        self.assertFalse(res)
+        mock_wait.assert_called_once_with('FAKE_ID', 3)
+
+    @mock.patch.object(dispatcher, 'start_action')
+    def test_wait_dependents_real_wakeup(self, mock_start, mock_load):
+        action = ca.ClusterAction('ID', 'ACTION', self.ctx)
+        action.id = 'FAKE_ID'
+
+        def get_status():
+            if mock_status.call_count == 1:
+                # a dependent completes while the action is checking
+                waiter.wake('FAKE_ID')
+                return action.WAITING
+            return action.READY
+
+        mock_status = self.patchobject(action, 'get_status',
+                                       side_effect=get_status)
+        self.patchobject(action, 'is_cancelled', return_value=False)
+        self.patchobject(action, 'is_timeout', return_value=False)
+
+        res_code, res_msg = action._wait_for_dependents()
+
+        self.assertEqual(action.RES_OK, res_code)
+        self.assertEqual(2, mock_status.call_count)
+        self.assertEqual(0, mock_start.call_count)
@@ -495,10 +495,11 @@ class TestMessage(base.SenlinTestCase):
 
         mock_get_name.assert_called_once_with(self.context, 'bogus')
 
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     @mock.patch.object(mmod.Message, '_build_action')
     @mock.patch.object(mmod.Message, 'zaqar')
-    def test_notify(self, mock_zaqar, mock_build_action, mock_start_action):
+    def test_notify(self, mock_zaqar, mock_build_action,
+                    mock_start_actions):
         mock_zc = mock.Mock()
         mock_zaqar.return_value = mock_zc
         mock_claim = mock.Mock()
@@ -526,7 +527,8 @@ class TestMessage(base.SenlinTestCase):
             mock.call(self.context, message2)
         ]
         mock_build_action.assert_has_calls(mock_calls)
-        mock_start_action.assert_called_once_with()
+        mock_start_actions.assert_called_once_with(['action_id1',
+                                                    'action_id2'])
         mock_calls2 = [
             mock.call('queue1', 'ID1', 'claim_id'),
             mock.call('queue1', 'ID2', 'claim_id')
@@ -547,12 +549,12 @@ class TestMessage(base.SenlinTestCase):
         self.assertEqual([], res)
         mock_zc.claim_create.assert_called_once_with('queue1')
 
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     @mock.patch.object(mmod.Message, '_build_action')
     @mock.patch.object(mmod.Message, 'zaqar')
     def test_notify_some_actions_building_failed(self, mock_zaqar,
                                                  mock_build_action,
-                                                 mock_start_action):
+                                                 mock_start_actions):
         mock_zc = mock.Mock()
         mock_zaqar.return_value = mock_zc
         mock_claim = mock.Mock()
@@ -580,7 +582,7 @@ class TestMessage(base.SenlinTestCase):
             mock.call(self.context, message2)
         ]
         mock_build_action.assert_has_calls(mock_calls)
-        mock_start_action.assert_called_once_with()
+        mock_start_actions.assert_called_once_with(['action_id1'])
         mock_calls2 = [
             mock.call('queue1', 'ID1', 'claim_id'),
             mock.call('queue1', 'ID2', 'claim_id')
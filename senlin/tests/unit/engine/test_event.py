@@ -162,6 +162,47 @@ class TestEvent(testtools.TestCase):
         finally:
             event.dispatchers = saved_dispathers
 
+    def _fake_dispatchers(self):
+        db = mock.Mock(obj=mock.Mock())
+        db.name = 'database'
+        msg = mock.Mock(obj=mock.Mock())
+        msg.name = 'message'
+        self.patch(event, 'dispatchers', [db, msg])
+        return db.obj, msg.obj
+
+    def test_start_buffers(self):
+        db, msg = self._fake_dispatchers()
+
+        event.start_buffers()
+
+        db.start_buffer.assert_called_once_with()
+        msg.start_buffer.assert_called_once_with()
+
+    def test_stop_buffers(self):
+        db, msg = self._fake_dispatchers()
+        db.stop_buffer.side_effect = Exception('boom')
+
+        event.stop_buffers()
+
+        db.stop_buffer.assert_called_once_with()
+        msg.stop_buffer.assert_called_once_with()
+
+    def test_buffers_not_loaded(self):
+        self.patch(event, 'dispatchers', None)
+
+        event.start_buffers()
+        event.stop_buffers()
+        self.assertEqual({}, event.buffer_stats())
+
+    def test_buffer_stats(self):
+        db, msg = self._fake_dispatchers()
+        db.buffer_stats.return_value = {'depth': 2}
+        msg.buffer_stats.return_value = None
+
+        res = event.buffer_stats()
+
+        self.assertEqual({'database': {'depth': 2}}, res)
+
 
 @mock.patch.object(event, '_dump')
 class TestLogMethods(testtools.TestCase):
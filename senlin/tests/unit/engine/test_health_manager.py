@@ -10,10 +10,10 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
-import re
 import time
 from unittest import mock
 
+import eventlet
 from oslo_config import cfg
 from oslo_utils import timeutils as tu
 
@@ -28,6 +28,7 @@ from senlin import objects
 from senlin.objects import cluster as obj_cluster
 from senlin.objects import node as obj_node
 from senlin.objects import profile as obj_profile
+from senlin.profiles import base as profile_base
 from senlin.rpc import client as rpc_client
 from senlin.tests.unit.common import base
 
@@ -415,6 +416,10 @@ class TestHealthCheckType(base.SenlinTestCase):
 class TestNodePollStatusHealthCheck(base.SenlinTestCase):
     def setUp(self):
         super(TestNodePollStatusHealthCheck, self).setUp()
+        cfg.CONF.set_override('bulk_status_polling', True,
+                              group='health_manager')
+        cfg.CONF.set_override('bulk_status_polling_min_nodes', 1,
+                              group='health_manager')
 
         self.hc = hm.NodePollStatusHealthCheck(
             cluster_id='CLUSTER_ID',
@@ -500,6 +505,81 @@ class TestNodePollStatusHealthCheck(base.SenlinTestCase):
         self.assertTrue(res)
         mock_tu.assert_called_once_with(node.updated_at, 1)
 
+    @mock.patch.object(profile_base.Profile, 'healthcheck_objects')
+    @mock.patch.object(node_mod.Node, '_from_object')
+    @mock.patch.object(tu, 'is_older_than')
+    def test_run_health_check_bulk(self, mock_tu, mock_node_obj,
+                                   mock_bulk):
+        mock_bulk.return_value = {'FAKE_NODE1': True, 'FAKE_NODE2': False}
+        mock_tu.return_value = True
+        ctx = mock.Mock()
+        node1 = mock.Mock(id='FAKE_NODE1', updated_at=None,
+                          init_at='2018-08-13 17:00:00')
+        node2 = mock.Mock(id='FAKE_NODE2', updated_at=None,
+                          init_at='2018-08-13 17:00:00')
+
+        self.hc.prepare(ctx, [node1, node2])
+
+        self.assertTrue(self.hc.run_health_check(ctx, node1))
+        self.assertFalse(self.hc.run_health_check(ctx, node2))
+        mock_bulk.assert_called_once_with(ctx, [node1, node2],
+                                          consts.NODE_STATUS_POLLING)
+        mock_node_obj.assert_not_called()
+
+    @mock.patch.object(profile_base.Profile, 'healthcheck_objects')
+    @mock.patch.object(node_mod.Node, '_from_object')
+    def test_run_health_check_bulk_unknown(self, mock_node_obj, mock_bulk):
+        # Nodes left out of the bulk result are checked on their own
+        mock_bulk.return_value = {'FAKE_NODE1': True}
+        x_entity = mock.Mock()
+        x_entity.do_healthcheck.return_value = True
+        mock_node_obj.return_value = x_entity
+        ctx = mock.Mock()
+        node1 = mock.Mock(id='FAKE_NODE1')
+        node2 = mock.Mock(id='FAKE_NODE2')
+
+        self.hc.prepare(ctx, [node1, node2])
+
+        self.assertTrue(self.hc.run_health_check(ctx, node1))
+        self.assertTrue(self.hc.run_health_check(ctx, node2))
+        mock_node_obj.assert_called_once_with(ctx, node2)
+        x_entity.do_healthcheck.assert_called_once_with(
+            ctx, consts.NODE_STATUS_POLLING)
+
+    @mock.patch.object(profile_base.Profile, 'healthcheck_objects')
+    @mock.patch.object(node_mod.Node, '_from_object')
+    def test_run_health_check_bulk_failed(self, mock_node_obj, mock_bulk):
+        mock_bulk.side_effect = Exception('boom')
+        x_entity = mock.Mock()
+        x_entity.do_healthcheck.return_value = True
+        mock_node_obj.return_value = x_entity
+        ctx = mock.Mock()
+        node = mock.Mock(id='FAKE_NODE1')
+
+        self.hc.prepare(ctx, [node])
+
+        self.assertTrue(self.hc.run_health_check(ctx, node))
+        x_entity.do_healthcheck.assert_called_once_with(
+            ctx, consts.NODE_STATUS_POLLING)
+
+    @mock.patch.object(profile_base.Profile, 'healthcheck_objects')
+    def test_prepare_bulk_disabled(self, mock_bulk):
+        cfg.CONF.set_override('bulk_status_polling', False,
+                              group='health_manager')
+
+        self.hc.prepare(mock.Mock(), [mock.Mock()])
+
+        mock_bulk.assert_not_called()
+
+    @mock.patch.object(profile_base.Profile, 'healthcheck_objects')
+    def test_prepare_bulk_small_cluster(self, mock_bulk):
+        cfg.CONF.set_override('bulk_status_polling_min_nodes', 3,
+                              group='health_manager')
+
+        self.hc.prepare(mock.Mock(), [mock.Mock(), mock.Mock()])
+
+        mock_bulk.assert_not_called()
+
 
 class TestHypervisorPollStatusHealthCheck(base.SenlinTestCase):
     def setUp(self):
@@ -647,7 +727,8 @@ class TestNodePollUrlHealthCheck(base.SenlinTestCase):
 
         self.assertTrue(res)
         mock_url_fetch.assert_called_once_with('FAKE_EXPANDED_URL', timeout=1,
-                                               verify=True)
+                                               verify=True,
+                                               session=self.hc._session)
 
     @mock.patch.object(tu, "is_older_than")
     @mock.patch.object(hm.NodePollUrlHealthCheck, "_expand_url_template")
@@ -669,7 +750,8 @@ class TestNodePollUrlHealthCheck(base.SenlinTestCase):
 
         self.assertTrue(res)
         mock_url_fetch.assert_called_once_with('FAKE_EXPANDED_URL', timeout=1,
-                                               verify=True)
+                                               verify=True,
+                                               session=self.hc._session)
 
     @mock.patch.object(tu, "is_older_than")
     @mock.patch.object(hm.NodePollUrlHealthCheck, "_expand_url_template")
@@ -691,7 +773,8 @@ class TestNodePollUrlHealthCheck(base.SenlinTestCase):
 
         self.assertTrue(res)
         mock_url_fetch.assert_called_once_with('FAKE_EXPANDED_URL', timeout=10,
-                                               verify=True)
+                                               verify=True,
+                                               session=self.hc._session)
 
     @mock.patch.object(tu, "is_older_than")
     @mock.patch.object(hm.NodePollUrlHealthCheck, "_expand_url_template")
@@ -725,12 +808,15 @@ class TestNodePollUrlHealthCheck(base.SenlinTestCase):
         mock_expand_url.return_value = 'FAKE_EXPANDED_URL'
         mock_url_fetch.return_value = ""
 
+        self.hc.params['poll_url_retry_limit'] = 1
+
         # do it
         res = self.hc.run_health_check(ctx, node)
 
         self.assertTrue(res)
         mock_url_fetch.assert_has_calls(
-            [mock.call('FAKE_EXPANDED_URL', timeout=1, verify=True)])
+            [mock.call('FAKE_EXPANDED_URL', timeout=1, verify=True,
+                       session=self.hc._session)])
 
     @mock.patch.object(tu, "is_older_than")
     @mock.patch.object(hm.NodePollUrlHealthCheck, "_expand_url_template")
@@ -747,12 +833,15 @@ class TestNodePollUrlHealthCheck(base.SenlinTestCase):
         mock_expand_url.return_value = 'FAKE_EXPANDED_URL'
         mock_url_fetch.return_value = ""
 
+        self.hc.params['poll_url_retry_limit'] = 1
+
         # do it
         res = self.hc.run_health_check(ctx, node)
 
         self.assertTrue(res)
         mock_url_fetch.assert_has_calls(
-            [mock.call('FAKE_EXPANDED_URL', timeout=1, verify=True)])
+            [mock.call('FAKE_EXPANDED_URL', timeout=1, verify=True,
+                       session=self.hc._session)])
 
     @mock.patch.object(tu, "is_older_than")
     @mock.patch.object(hm.NodePollUrlHealthCheck, "_expand_url_template")
@@ -767,14 +856,20 @@ class TestNodePollUrlHealthCheck(base.SenlinTestCase):
         mock_expand_url.return_value = 'FAKE_EXPANDED_URL'
         mock_url_fetch.return_value = ""
 
+        # the first failed poll is retried in the next pass
+        res = self.hc.run_health_check(ctx, node)
+        self.assertTrue(res)
+
         # do it
         res = self.hc.run_health_check(ctx, node)
 
         self.assertFalse(res)
         mock_url_fetch.assert_has_calls(
             [
-                mock.call('FAKE_EXPANDED_URL', timeout=1, verify=True),
-                mock.call('FAKE_EXPANDED_URL', timeout=1, verify=True)
+                mock.call('FAKE_EXPANDED_URL', timeout=1, verify=True,
+                          session=self.hc._session),
+                mock.call('FAKE_EXPANDED_URL', timeout=1, verify=True,
+                          session=self.hc._session)
             ]
         )
 
@@ -792,14 +887,20 @@ class TestNodePollUrlHealthCheck(base.SenlinTestCase):
         mock_expand_url.return_value = 'FAKE_EXPANDED_URL'
         mock_url_fetch.side_effect = utils.URLFetchError("Error")
 
+        # the first failed poll is retried in the next pass
+        res = self.hc.run_health_check(ctx, node)
+        self.assertTrue(res)
+
         # do it
         res = self.hc.run_health_check(ctx, node)
 
         self.assertFalse(res)
         mock_url_fetch.assert_has_calls(
             [
-                mock.call('FAKE_EXPANDED_URL', timeout=1, verify=True),
-                mock.call('FAKE_EXPANDED_URL', timeout=1, verify=True)
+                mock.call('FAKE_EXPANDED_URL', timeout=1, verify=True,
+                          session=self.hc._session),
+                mock.call('FAKE_EXPANDED_URL', timeout=1, verify=True,
+                          session=self.hc._session)
             ]
         )
 
@@ -843,10 +944,67 @@ class TestNodePollUrlHealthCheck(base.SenlinTestCase):
         self.assertTrue(res)
         mock_url_fetch.assert_has_calls(
             [
-                mock.call('FAKE_EXPANDED_URL', timeout=1, verify=True),
+                mock.call('FAKE_EXPANDED_URL', timeout=1, verify=True,
+                          session=self.hc._session),
             ]
         )
 
+    @mock.patch.object(hm.NodePollUrlHealthCheck, "_expand_url_template")
+    @mock.patch.object(utils, 'url_fetch')
+    def test_run_health_check_failures_reset(self, mock_url_fetch,
+                                             mock_expand_url):
+        ctx = mock.Mock()
+        node = mock.Mock(id='FAKE_ID', status=consts.NS_ACTIVE)
+        mock_expand_url.return_value = 'FAKE_EXPANDED_URL'
+        mock_url_fetch.side_effect = ['', 'FAKE_HEALTHY_PATTERN', '']
+
+        self.assertTrue(self.hc.run_health_check(ctx, node))
+        self.assertEqual({'FAKE_ID': 1}, self.hc._failures)
+        self.assertTrue(self.hc.run_health_check(ctx, node))
+        self.assertEqual({}, self.hc._failures)
+        # a single failure after a success is not enough
+        self.assertTrue(self.hc.run_health_check(ctx, node))
+
+    @mock.patch.object(hm.NodePollUrlHealthCheck, "_check_node")
+    def test_prepare(self, mock_check):
+        ctx = mock.Mock()
+        node1 = mock.Mock(id='NODE1')
+        node2 = mock.Mock(id='NODE2')
+        mock_check.side_effect = [True, False]
+        self.hc._failures = {'NODE2': 1, 'GONE': 1}
+
+        self.hc.prepare(ctx, [node1, node2])
+
+        mock_check.assert_has_calls([mock.call(node1), mock.call(node2)])
+        self.assertEqual({'NODE2': 1}, self.hc._failures)
+        self.assertTrue(self.hc.run_health_check(ctx, node1))
+        self.assertFalse(self.hc.run_health_check(ctx, node2))
+        self.assertEqual(2, mock_check.call_count)
+
+    @mock.patch.object(utils, 'url_fetch')
+    def test_prepare_concurrent(self, mock_url_fetch):
+        cfg.CONF.set_override('health_check_concurrency', 10,
+                              group='health_manager')
+        nodes = [mock.Mock(id='NODE%s' % i, status=consts.NS_ACTIVE)
+                 for i in range(10)]
+        for n in nodes:
+            n.name = n.id
+        self.hc.params['poll_url'] = 'http://{nodename}/health'
+
+        def fetch(url, **kwargs):
+            # all polls are in flight before any of them completes
+            eventlet.sleep(0.1)
+            return 'FAKE_HEALTHY_PATTERN'
+
+        mock_url_fetch.side_effect = fetch
+
+        start = time.time()
+        self.hc.prepare(mock.Mock(), nodes)
+
+        self.assertLess(time.time() - start, 0.5)
+        self.assertEqual(10, mock_url_fetch.call_count)
+        self.assertTrue(all(self.hc._results.values()))
+
 
 class TestHealthCheck(base.SenlinTestCase):
 
@@ -897,11 +1055,10 @@ class TestHealthCheck(base.SenlinTestCase):
 
     @mock.patch.object(obj_node.Node, 'get_all_by_cluster')
     @mock.patch.object(hm.HealthCheck, "_recover_node")
-    @mock.patch.object(hm.HealthCheck, "_wait_for_action")
     @mock.patch.object(obj_cluster.Cluster, 'get')
     @mock.patch.object(context, 'get_service_context')
     def test_execute_health_check_any_mode_healthy(
-            self, mock_ctx, mock_get, mock_wait, mock_recover, mock_nodes):
+            self, mock_ctx, mock_get, mock_recover, mock_nodes):
         x_cluster = mock.Mock(user='USER_ID', project='PROJECT_ID',
                               id='CID')
         mock_get.return_value = x_cluster
@@ -909,8 +1066,6 @@ class TestHealthCheck(base.SenlinTestCase):
         ctx = mock.Mock()
         mock_ctx.return_value = ctx
 
-        mock_wait.return_value = (True, "")
-
         x_node1 = mock.Mock(id='FAKE_NODE1', status="ERROR")
         x_node2 = mock.Mock(id='FAKE_NODE2', status="ERROR")
         mock_nodes.return_value = [x_node1, x_node2]
@@ -927,11 +1082,11 @@ class TestHealthCheck(base.SenlinTestCase):
 
         for hc_mocks in hc_test_values:
             self.hc.health_check_types = hc_mocks
+            self.hc.recoveries = {}
 
             mock_get.reset_mock()
             mock_ctx.reset_mock()
             mock_recover.reset_mock()
-            mock_wait.reset_mock()
 
             # do it
             self.hc.execute_health_check()
@@ -942,6 +1097,8 @@ class TestHealthCheck(base.SenlinTestCase):
                                              project_id=x_cluster.project)
 
             for mock_hc in hc_mocks:
+                mock_hc.prepare.assert_called_once_with(
+                    ctx, [x_node1, x_node2])
                 mock_hc.run_health_check.assert_has_calls(
                     [
                         mock.call(ctx, x_node1),
@@ -950,15 +1107,18 @@ class TestHealthCheck(base.SenlinTestCase):
                 )
 
             mock_recover.assert_not_called()
-            mock_wait.assert_not_called()
+            self.assertEqual({}, self.hc.recoveries)
+            self.assertEqual(2, self.hc.last_pass['nodes'])
+            self.assertEqual(0, self.hc.last_pass['unhealthy'])
+            self.assertEqual(0, self.hc.last_pass['recovering'])
+            self.assertIn('duration', self.hc.last_pass)
 
     @mock.patch.object(obj_node.Node, 'get_all_by_cluster')
     @mock.patch.object(hm.HealthCheck, "_recover_node")
-    @mock.patch.object(hm.HealthCheck, "_wait_for_action")
     @mock.patch.object(obj_cluster.Cluster, 'get')
     @mock.patch.object(context, 'get_service_context')
     def test_execute_health_check_all_mode_unhealthy(
-            self, mock_ctx, mock_get, mock_wait, mock_recover, mock_nodes):
+            self, mock_ctx, mock_get, mock_recover, mock_nodes):
         self.hc.cluster_id = 'CLUSTER_ID'
         self.hc.interval = 1
         self.hc.recovery_cond = consts.ALL_FAILED
@@ -972,8 +1132,6 @@ class TestHealthCheck(base.SenlinTestCase):
         ctx = mock.Mock()
         mock_ctx.return_value = ctx
 
-        mock_wait.return_value = (True, "")
-
         x_node = mock.Mock(id='FAKE_NODE', status="ERROR")
         mock_nodes.return_value = [x_node]
 
@@ -989,11 +1147,11 @@ class TestHealthCheck(base.SenlinTestCase):
 
         for hc_mocks in hc_test_values:
             self.hc.health_check_types = hc_mocks
+            self.hc.recoveries = {}
 
             mock_get.reset_mock()
             mock_ctx.reset_mock()
             mock_recover.reset_mock()
-            mock_wait.reset_mock()
 
             # do it
             self.hc.execute_health_check()
@@ -1011,8 +1169,40 @@ class TestHealthCheck(base.SenlinTestCase):
                 )
 
             mock_recover.assert_called_once_with(ctx, 'FAKE_NODE')
-            mock_wait.assert_called_once_with(
-                ctx, 'FAKE_ACTION_ID', self.hc.node_update_timeout)
+            self.assertEqual(['FAKE_ACTION_ID'], list(self.hc.recoveries))
+            self.assertEqual(
+                'FAKE_NODE',
+                self.hc.recoveries['FAKE_ACTION_ID']['node_id'])
+            self.assertEqual(1, self.hc.last_pass['recovering'])
+
+    @mock.patch.object(obj_node.Node, 'get_all_by_cluster')
+    @mock.patch.object(hm.HealthCheck, "_recover_node")
+    @mock.patch.object(hm.HealthCheck, "_check_recoveries")
+    @mock.patch.object(obj_cluster.Cluster, 'get')
+    @mock.patch.object(context, 'get_service_context')
+    def test_execute_health_check_skip_recovering(
+            self, mock_ctx, mock_get, mock_check, mock_recover, mock_nodes):
+        ctx = mock.Mock()
+        mock_ctx.return_value = ctx
+        x_node1 = mock.Mock(id='FAKE_NODE1')
+        x_node2 = mock.Mock(id='FAKE_NODE2')
+        mock_nodes.return_value = [x_node1, x_node2]
+        mock_hc = mock.Mock()
+        mock_hc.run_health_check.return_value = True
+        self.hc.health_check_types = [mock_hc]
+        self.hc.recoveries = {
+            'FAKE_ACTION_ID': {'node_id': 'FAKE_NODE1',
+                               'started_at': tu.utcnow(True)}
+        }
+
+        self.hc.execute_health_check()
+
+        mock_check.assert_called_once_with(ctx)
+        mock_hc.prepare.assert_called_once_with(ctx, [x_node2])
+        mock_hc.run_health_check.assert_called_once_with(ctx, x_node2)
+        mock_recover.assert_not_called()
+        self.assertEqual(1, self.hc.last_pass['nodes'])
+        self.assertEqual(1, self.hc.last_pass['recovering'])
 
     @mock.patch.object(obj_cluster.Cluster, 'get')
     @mock.patch.object(context, 'get_service_context')
@@ -1086,110 +1276,40 @@ class TestHealthCheck(base.SenlinTestCase):
         mock_hc_2.run_health_check.assert_called_once_with(ctx, x_node)
         mock_recover.assert_not_called()
 
-    @mock.patch('senlin.objects.ActionGetRequest')
-    def test_wait_for_action(self, mock_action_req):
-        x_req = mock.Mock()
-        mock_action_req.return_value = x_req
-
-        x_action = {'status': consts.ACTION_SUCCEEDED}
-        self.fake_rpc.call.return_value = x_action
+    @mock.patch.object(objects.Action, 'get_all')
+    def test_check_recoveries_none(self, mock_get):
+        self.hc._check_recoveries(mock.Mock())
 
-        ctx = mock.Mock()
-        action_id = 'FAKE_ACTION_ID'
-        timeout = 5
-
-        # do it
-        res, err = self.hc._wait_for_action(ctx, action_id, timeout)
-
-        self.assertTrue(res)
-        self.assertEqual(err, '')
-        self.fake_rpc.call.assert_called_with(ctx, 'action_get', x_req)
-
-    @mock.patch('senlin.objects.ActionGetRequest')
-    def test_wait_for_action_success_before_timeout(self, mock_action_req):
-        x_req = mock.Mock()
-        mock_action_req.return_value = x_req
-
-        x_action1 = {'status': consts.ACTION_RUNNING}
-        x_action2 = {'status': consts.ACTION_SUCCEEDED}
-        self.fake_rpc.call.side_effect = [x_action1, x_action2]
-
-        ctx = mock.Mock()
-        action_id = 'FAKE_ACTION_ID'
-        timeout = 5
-
-        # do it
-        res, err = self.hc._wait_for_action(ctx, action_id, timeout)
-
-        self.assertTrue(res)
-        self.assertEqual(err, '')
-        self.fake_rpc.call.assert_has_calls(
-            [
-                mock.call(ctx, 'action_get', x_req),
-                mock.call(ctx, 'action_get', x_req)
-            ]
-        )
-
-    @mock.patch('senlin.objects.ActionGetRequest')
-    def test_wait_for_action_timeout(self, mock_action_req):
-        x_req = mock.Mock()
-        mock_action_req.return_value = x_req
-
-        x_action = {'status': consts.ACTION_RUNNING}
-        self.fake_rpc.call.return_value = x_action
-
-        ctx = mock.Mock()
-        action_id = 'FAKE_ACTION_ID'
-        timeout = 5
-
-        # do it
-        res, err = self.hc._wait_for_action(ctx, action_id, timeout)
-
-        self.assertFalse(res)
-        self.assertTrue(re.search('timeout', err, re.IGNORECASE))
-        self.fake_rpc.call.assert_has_calls(
-            [
-                mock.call(ctx, 'action_get', x_req)
-            ]
-        )
-
-    @mock.patch('senlin.objects.ActionGetRequest')
-    def test_wait_for_action_failed(self, mock_action_req):
-        x_req = mock.Mock()
-        mock_action_req.return_value = x_req
-
-        x_action = {'status': consts.ACTION_FAILED}
-        self.fake_rpc.call.return_value = x_action
-
-        ctx = mock.Mock()
-        action_id = 'FAKE_ACTION_ID'
-        timeout = 5
-
-        # do it
-        res, err = self.hc._wait_for_action(ctx, action_id, timeout)
-
-        self.assertFalse(res)
-        self.assertEqual(err, 'Cluster check action failed or cancelled')
-        self.fake_rpc.call.assert_called_with(ctx, 'action_get', x_req)
-
-    @mock.patch('senlin.objects.ActionGetRequest')
-    def test_wait_for_action_cancelled(self, mock_action_req):
-        x_req = mock.Mock()
-        mock_action_req.return_value = x_req
-
-        x_action = {'status': consts.ACTION_CANCELLED}
-        self.fake_rpc.call.return_value = x_action
+        mock_get.assert_not_called()
 
+    @mock.patch.object(tu, 'is_older_than')
+    @mock.patch.object(objects.Action, 'get_all')
+    def test_check_recoveries(self, mock_get, mock_older):
         ctx = mock.Mock()
-        action_id = 'FAKE_ACTION_ID'
-        timeout = 5
-
-        # do it
-        res, err = self.hc._wait_for_action(ctx, action_id, timeout)
-
-        self.assertFalse(res)
-        self.assertEqual(err, 'Cluster check action failed or cancelled')
-        self.fake_rpc.call.assert_called_with(ctx, 'action_get', x_req)
+        now = tu.utcnow(True)
+        self.hc.recoveries = dict(
+            (aid, {'node_id': 'NODE_' + aid, 'started_at': now})
+            for aid in ['A1', 'A2', 'A3', 'A4', 'A5', 'A6'])
+        mock_get.return_value = [
+            mock.Mock(id='A1', status=consts.ACTION_SUCCEEDED),
+            mock.Mock(id='A2', status=consts.ACTION_FAILED),
+            mock.Mock(id='A3', status=consts.ACTION_CANCELLED),
+            mock.Mock(id='A4', status=consts.ACTION_RUNNING),
+            mock.Mock(id='A5', status=consts.ACTION_READY),
+        ]
+        mock_older.side_effect = [True, False]
+
+        self.hc._check_recoveries(ctx)
+
+        mock_get.assert_called_once_with(
+            ctx, filters={'id': ['A1', 'A2', 'A3', 'A4', 'A5', 'A6']},
+            project_safe=False, with_deps=False)
+        mock_older.assert_has_calls([
+            mock.call(now, self.hc.node_update_timeout),
+            mock.call(now, self.hc.node_update_timeout),
+        ])
+        # only the action still running within the timeout is kept
+        self.assertEqual(['A5'], list(self.hc.recoveries))
 
     @mock.patch('senlin.objects.NodeRecoverRequest', autospec=True)
     def test_recover_node(self, mock_req):
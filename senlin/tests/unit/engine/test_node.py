@@ -594,6 +594,77 @@ class TestNode(base.SenlinTestCase):
             % node.physical_id,
             physical_id=None)
 
+    @mock.patch.object(node_obj.Node, 'update_batch')
+    @mock.patch.object(pb.Profile, 'check_objects')
+    def test_node_check_batch(self, mock_check, mock_update):
+        nodes = []
+        for i, status in enumerate([consts.NS_ACTIVE, consts.NS_ACTIVE,
+                                    consts.NS_ERROR, consts.NS_WARNING,
+                                    consts.NS_WARNING, consts.NS_ACTIVE,
+                                    consts.NS_ACTIVE, consts.NS_RECOVERING]):
+            node = nodem.Node('node%s' % i, PROFILE_ID, '', id='N%s' % i,
+                              physical_id='S%s' % i, status=status,
+                              status_reason='bad news')
+            nodes.append(node)
+        nodes[6].physical_id = None
+        mock_check.return_value = {'N0': True, 'N1': True, 'N2': True,
+                                   'N3': True, 'N4': False, 'N5': False}
+
+        res = nodem.Node.check_batch(self.context, nodes)
+
+        self.assertEqual([nodes[6], nodes[7]], res)
+        mock_check.assert_called_once_with(self.context, nodes[:6])
+        warning = ("Check: Physical object is ACTIVE but the node status "
+                   "was WARNING. bad news")
+        mock_update.assert_has_calls([
+            mock.call(self.context, ['N0', 'N1'],
+                      {'status': consts.NS_ACTIVE,
+                       'status_reason': 'Check: Node is ACTIVE.',
+                       'updated_at': mock.ANY},
+                      status=consts.NS_ACTIVE),
+            mock.call(self.context, ['N2'],
+                      {'status': consts.NS_ACTIVE,
+                       'status_reason': 'Check: Node is ACTIVE.',
+                       'updated_at': mock.ANY},
+                      status=consts.NS_ERROR),
+            mock.call(self.context, ['N3'],
+                      {'status': consts.NS_WARNING,
+                       'status_reason': warning,
+                       'updated_at': mock.ANY},
+                      status=consts.NS_WARNING),
+            mock.call(self.context, ['N4'],
+                      {'status': consts.NS_ERROR,
+                       'status_reason': 'Check: Node is not ACTIVE.',
+                       'updated_at': mock.ANY},
+                      status=consts.NS_WARNING),
+            mock.call(self.context, ['N5'],
+                      {'status': consts.NS_ERROR,
+                       'status_reason': 'Check: Node is not ACTIVE.',
+                       'updated_at': mock.ANY},
+                      status=consts.NS_ACTIVE),
+        ], any_order=True)
+        self.assertEqual(5, mock_update.call_count)
+        self.assertEqual(consts.NS_ACTIVE, nodes[2].status)
+        self.assertEqual(consts.NS_WARNING, nodes[3].status)
+        self.assertEqual(warning, nodes[3].status_reason)
+        self.assertEqual(consts.NS_ERROR, nodes[5].status)
+        self.assertEqual('Check: Node is not ACTIVE.',
+                         nodes[5].status_reason)
+        self.assertIsNotNone(nodes[0].updated_at)
+        self.assertEqual('bad news', nodes[7].status_reason)
+
+    @mock.patch.object(node_obj.Node, 'update_batch')
+    @mock.patch.object(pb.Profile, 'check_objects')
+    def test_node_check_batch_failed(self, mock_check, mock_update):
+        node = nodem.Node('node1', PROFILE_ID, '', id='N1', physical_id='S1',
+                          status=consts.NS_ACTIVE)
+        mock_check.side_effect = Exception('boom')
+
+        res = nodem.Node.check_batch(self.context, [node])
+
+        self.assertEqual([node], res)
+        self.assertEqual(0, mock_update.call_count)
+
     @mock.patch.object(pb.Profile, 'healthcheck_object')
     def test_node_healthcheck(self, mock_healthcheck):
         node = nodem.Node('node1', PROFILE_ID, '')
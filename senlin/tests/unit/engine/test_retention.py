@@ -0,0 +1,90 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from unittest import mock
+
+import eventlet
+from oslo_config import cfg
+
+from senlin.db import api as db_api
+from senlin.engine import retention
+from senlin.tests.unit.common import base
+
+
+class TestRetention(base.SenlinTestCase):
+
+    def setUp(self):
+        super(TestRetention, self).setUp()
+        cfg.CONF.set_override('purge_batch_size', 2)
+        cfg.CONF.set_override('purge_batch_interval', 0.1)
+        self.sleep = self.patchobject(eventlet, 'sleep')
+
+    def test_purge(self):
+        func = mock.Mock(side_effect=[2, 2, 1])
+        progress = mock.Mock()
+
+        res = retention.purge(func, progress=progress, project=None)
+
+        self.assertEqual(5, res)
+        func.assert_has_calls([mock.call(limit=2, project=None)] * 3)
+        progress.assert_has_calls([mock.call(2), mock.call(4),
+                                   mock.call(5)])
+        self.sleep.assert_has_calls([mock.call(0.1)] * 2)
+        self.assertEqual(2, self.sleep.call_count)
+
+    def test_purge_nothing(self):
+        func = mock.Mock(return_value=0)
+
+        res = retention.purge(func)
+
+        self.assertEqual(0, res)
+        func.assert_called_once_with(limit=2)
+        self.assertFalse(self.sleep.called)
+
+    @mock.patch.object(db_api, 'action_purge')
+    @mock.patch.object(db_api, 'event_purge')
+    def test_apply_retention(self, mock_event, mock_action):
+        cfg.CONF.set_override('event_retention', 30)
+        cfg.CONF.set_override('action_retention', 7)
+        cfg.CONF.set_override('project_retention',
+                              {'P1': '90', 'P2': '0', 'P3': 'bogus'})
+        mock_event.side_effect = [1, 1]
+        mock_action.return_value = 0
+
+        res = retention.apply_retention()
+
+        self.assertEqual({'events': 2, 'actions': 0}, res)
+        mock_event.assert_has_calls([
+            mock.call(limit=2, engine=None, project=None, granularity='days',
+                      age=30, exclude=['P1', 'P2']),
+            mock.call(limit=2, engine=None, project=['P1'],
+                      granularity='days', age=90),
+        ])
+        self.assertEqual(2, mock_event.call_count)
+        mock_action.assert_has_calls([
+            mock.call(limit=2, engine=None, project=None, granularity='days',
+                      age=7, exclude=['P1', 'P2'],
+                      statuses=retention.COMPLETED_STATUSES),
+            mock.call(limit=2, engine=None, project=['P1'],
+                      granularity='days', age=90,
+                      statuses=retention.COMPLETED_STATUSES),
+        ])
+        self.assertEqual(2, mock_action.call_count)
+
+    @mock.patch.object(db_api, 'action_purge')
+    @mock.patch.object(db_api, 'event_purge')
+    def test_apply_retention_disabled(self, mock_event, mock_action):
+        res = retention.apply_retention()
+
+        self.assertEqual({'events': 0, 'actions': 0}, res)
+        self.assertFalse(mock_event.called)
+        self.assertFalse(mock_action.called)
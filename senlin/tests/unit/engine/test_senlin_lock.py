@@ -12,10 +12,15 @@
 
 from unittest import mock
 
+import eventlet
+from oslo_db import exception
+
 from senlin.common import utils as common_utils
+from senlin.engine import dispatcher
 from senlin.engine import senlin_lock as lockm
 from senlin.objects import action as ao
 from senlin.objects import cluster_lock as clo
+from senlin.objects import lock_waiter as lwo
 from senlin.objects import node_lock as nlo
 from senlin.objects import service as svco
 from senlin.tests.unit.common import base
@@ -42,15 +47,16 @@ class SenlinLockTest(base.SenlinTestCase):
         mock_acquire.assert_called_once_with('CLUSTER_A', 'ACTION_XYZ',
                                              lockm.CLUSTER_SCOPE)
 
+    @mock.patch.object(lockm, '_backoff')
     @mock.patch.object(common_utils, 'is_service_dead')
-    @mock.patch.object(svco.Service, 'gc_by_engine')
+    @mock.patch.object(lockm, 'gc_by_engine')
     @mock.patch.object(clo.ClusterLock, "acquire")
     @mock.patch.object(clo.ClusterLock, "steal")
     def test_cluster_lock_acquire_dead_owner(self, mock_steal, mock_acquire,
-                                             mock_gc, mock_dead):
+                                             mock_gc, mock_dead,
+                                             mock_backoff):
         mock_dead.return_value = True
-        mock_acquire.return_value = ['ACTION_ABC']
-        mock_steal.return_value = ['ACTION_XYZ']
+        mock_acquire.side_effect = [['ACTION_ABC']] * 3 + [['ACTION_XYZ']]
 
         res = lockm.cluster_lock_acquire(self.ctx, 'CLUSTER_A', 'ACTION_XYZ',
                                          'NEW_ENGINE')
@@ -58,9 +64,11 @@ class SenlinLockTest(base.SenlinTestCase):
         self.assertTrue(res)
         mock_acquire.assert_called_with("CLUSTER_A", "ACTION_XYZ",
                                         lockm.CLUSTER_SCOPE)
-        self.assertEqual(3, mock_acquire.call_count)
-        mock_steal.assert_called_once_with('CLUSTER_A', 'ACTION_XYZ')
-        mock_gc.assert_called_once_with(mock.ANY)
+        self.assertEqual(4, mock_acquire.call_count)
+        self.stub_get.assert_called_once_with(self.ctx, 'ACTION_ABC')
+        mock_dead.assert_called_once_with(self.ctx, 'ENGINE')
+        mock_gc.assert_called_once_with('ENGINE')
+        self.assertEqual(0, mock_steal.call_count)
 
     @mock.patch.object(common_utils, 'is_service_dead')
     @mock.patch.object(clo.ClusterLock, "acquire")
@@ -108,12 +116,67 @@ class SenlinLockTest(base.SenlinTestCase):
         self.assertEqual(3, mock_acquire.call_count)
         mock_steal.assert_called_once_with('CLUSTER_A', 'ACTION_XY')
 
+    @mock.patch.object(lockm, '_backoff')
+    @mock.patch.object(common_utils, 'is_service_dead')
+    @mock.patch.object(clo.ClusterLock, "acquire")
+    def test_cluster_lock_acquire_backoff(self, mock_acquire, mock_dead,
+                                          mock_backoff):
+        mock_dead.return_value = False
+        mock_acquire.side_effect = [['ACTION_ABC'], ['ACTION_ABC'],
+                                    ['ACTION_XYZ']]
+
+        res = lockm.cluster_lock_acquire(self.ctx, 'CLUSTER_A', 'ACTION_XYZ',
+                                         scope=lockm.NODE_SCOPE)
+
+        self.assertTrue(res)
+        self.assertEqual([mock.call(0), mock.call(1)],
+                         mock_backoff.call_args_list)
+
+    @mock.patch.object(lockm, '_backoff')
+    @mock.patch.object(clo.ClusterLock, "acquire")
+    def test_cluster_lock_acquire_duplicate_entry(self, mock_acquire,
+                                                  mock_backoff):
+        mock_acquire.side_effect = exception.DBDuplicateEntry()
+
+        res = lockm.cluster_lock_acquire(self.ctx, 'CLUSTER_A', 'ACTION_XYZ')
+
+        self.assertFalse(res)
+        self.assertEqual(lockm.CLUSTER_LOCK_ATTEMPTS,
+                         mock_acquire.call_count)
+        self.assertEqual(lockm.CLUSTER_LOCK_ATTEMPTS - 1,
+                         mock_backoff.call_count)
+
+    @mock.patch.object(eventlet, 'sleep')
+    def test_backoff(self, mock_sleep):
+        for attempt in range(10):
+            lockm._backoff(attempt)
+
+        delays = [c[0][0] for c in mock_sleep.call_args_list]
+        self.assertEqual(10, len(delays))
+        for attempt, delay in enumerate(delays):
+            limit = min(lockm.LOCK_BACKOFF_MAX,
+                        lockm.LOCK_BACKOFF_BASE * 2 ** attempt)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, limit)
+
+    @mock.patch.object(lockm, 'lock_wake')
     @mock.patch.object(clo.ClusterLock, "release")
-    def test_cluster_lock_release(self, mock_release):
+    def test_cluster_lock_release(self, mock_release, mock_wake):
         actual = lockm.cluster_lock_release('C', 'A', 'S')
 
         self.assertEqual(mock_release.return_value, actual)
         mock_release.assert_called_once_with('C', 'A', 'S')
+        mock_wake.assert_called_once_with('C')
+
+    @mock.patch.object(lockm, 'lock_wake')
+    @mock.patch.object(clo.ClusterLock, "release")
+    def test_cluster_lock_release_not_owner(self, mock_release, mock_wake):
+        mock_release.return_value = False
+
+        actual = lockm.cluster_lock_release('C', 'A', 'S')
+
+        self.assertFalse(actual)
+        self.assertEqual(0, mock_wake.call_count)
 
     @mock.patch.object(nlo.NodeLock, "acquire")
     def test_node_lock_acquire_already_owner(self, mock_acquire):
@@ -125,24 +188,37 @@ class SenlinLockTest(base.SenlinTestCase):
         mock_acquire.assert_called_once_with('NODE_A', 'ACTION_XYZ')
 
     @mock.patch.object(common_utils, 'is_service_dead')
-    @mock.patch.object(ao.Action, 'mark_failed')
+    @mock.patch.object(lockm, 'gc_by_engine')
     @mock.patch.object(nlo.NodeLock, "acquire")
     @mock.patch.object(nlo.NodeLock, "steal")
     def test_node_lock_acquire_dead_owner(self, mock_steal, mock_acquire,
-                                          mock_action_fail, mock_dead):
+                                          mock_gc, mock_dead):
         mock_dead.return_value = True
-        mock_acquire.side_effect = ['ACTION_ABC']
-        mock_steal.return_value = 'ACTION_XYZ'
+        mock_acquire.side_effect = ['ACTION_ABC', 'ACTION_XYZ']
 
         res = lockm.node_lock_acquire(self.ctx, 'NODE_A', 'ACTION_XYZ',
                                       'NEW_ENGINE')
 
         self.assertTrue(res)
-        mock_acquire.assert_called_once_with('NODE_A', 'ACTION_XYZ')
-        mock_steal.assert_called_once_with('NODE_A', 'ACTION_XYZ')
-        mock_action_fail.assert_called_once_with(
-            self.ctx, 'ACTION_ABC', mock.ANY,
-            'Engine died when executing this action.')
+        mock_acquire.assert_has_calls([mock.call('NODE_A', 'ACTION_XYZ'),
+                                       mock.call('NODE_A', 'ACTION_XYZ')])
+        self.stub_get.assert_called_once_with(self.ctx, 'ACTION_ABC')
+        mock_gc.assert_called_once_with('ENGINE')
+        self.assertEqual(0, mock_steal.call_count)
+
+    @mock.patch.object(common_utils, 'is_service_dead')
+    @mock.patch.object(lockm, 'gc_by_engine')
+    @mock.patch.object(nlo.NodeLock, "acquire")
+    def test_node_lock_acquire_dead_owner_relocked(self, mock_acquire,
+                                                   mock_gc, mock_dead):
+        mock_dead.return_value = True
+        mock_acquire.side_effect = ['ACTION_ABC', 'ACTION_OTHER']
+
+        res = lockm.node_lock_acquire(self.ctx, 'NODE_A', 'ACTION_XYZ',
+                                      'NEW_ENGINE')
+
+        self.assertFalse(res)
+        mock_gc.assert_called_once_with('ENGINE')
 
     @mock.patch.object(common_utils, 'is_service_dead')
     @mock.patch.object(nlo.NodeLock, "acquire")
@@ -183,8 +259,77 @@ class SenlinLockTest(base.SenlinTestCase):
         mock_acquire.assert_called_once_with('NODE_A', 'ACTION_XY')
         mock_steal.assert_called_once_with('NODE_A', 'ACTION_XY')
 
+    @mock.patch.object(lockm, 'lock_wake')
     @mock.patch.object(nlo.NodeLock, "release")
-    def test_node_lock_release(self, mock_release):
+    def test_node_lock_release(self, mock_release, mock_wake):
         actual = lockm.node_lock_release('C', 'A')
         self.assertEqual(mock_release.return_value, actual)
         mock_release.assert_called_once_with('C', 'A')
+        mock_wake.assert_called_once_with('C')
+
+    @mock.patch.object(lockm, 'lock_wake')
+    @mock.patch.object(lwo.LockWaiter, 'wait')
+    def test_lock_wait(self, mock_wait, mock_wake):
+        lockm.lock_wait(self.ctx, 'CLUSTER_A', 'ACTION_A', shared=True,
+                        values={'data': {'retries': 1}})
+
+        mock_wait.assert_called_once_with(
+            self.ctx, 'CLUSTER_A', 'ACTION_A', shared=True,
+            values={'data': {'retries': 1}})
+        mock_wake.assert_called_once_with('CLUSTER_A')
+
+    @mock.patch.object(dispatcher, 'start_actions')
+    @mock.patch.object(lwo.LockWaiter, 'wake')
+    def test_lock_wake(self, mock_wake, mock_start):
+        mock_wake.return_value = ['ACTION_A', 'ACTION_B']
+
+        res = lockm.lock_wake('CLUSTER_A')
+
+        self.assertEqual(['ACTION_A', 'ACTION_B'], res)
+        mock_wake.assert_called_once_with('CLUSTER_A')
+        mock_start.assert_called_once_with(['ACTION_A', 'ACTION_B'])
+
+    @mock.patch.object(dispatcher, 'start_actions')
+    @mock.patch.object(lwo.LockWaiter, 'wake')
+    def test_lock_wake_no_waiter(self, mock_wake, mock_start):
+        mock_wake.return_value = []
+
+        res = lockm.lock_wake('CLUSTER_A')
+
+        self.assertEqual([], res)
+        self.assertEqual(0, mock_start.call_count)
+
+    @mock.patch.object(dispatcher, 'start_actions')
+    @mock.patch.object(lwo.LockWaiter, 'wake')
+    def test_lock_wake_failed(self, mock_wake, mock_start):
+        mock_wake.side_effect = exception.DBError('boom')
+
+        res = lockm.lock_wake('CLUSTER_A')
+
+        self.assertEqual([], res)
+        self.assertEqual(0, mock_start.call_count)
+
+    @mock.patch.object(lockm, 'lock_wake')
+    @mock.patch.object(dispatcher, 'wake_actions')
+    @mock.patch.object(svco.Service, 'gc_by_engine')
+    def test_gc_by_engine(self, mock_gc, mock_wake_actions, mock_lock_wake):
+        mock_gc.return_value = (['ACTION_A'], ['CLUSTER_A', 'NODE_A'])
+
+        lockm.gc_by_engine('ENGINE')
+
+        mock_gc.assert_called_once_with('ENGINE')
+        mock_wake_actions.assert_called_once_with(mock.ANY, ['ACTION_A'])
+        mock_lock_wake.assert_has_calls([mock.call('CLUSTER_A'),
+                                         mock.call('NODE_A')])
+
+    @mock.patch.object(lockm, 'lock_wake')
+    @mock.patch.object(dispatcher, 'wake_actions')
+    @mock.patch.object(svco.Service, 'gc_by_engine')
+    def test_gc_by_engine_nothing(self, mock_gc, mock_wake_actions,
+                                  mock_lock_wake):
+        mock_gc.return_value = ([], [])
+
+        lockm.gc_by_engine('ENGINE')
+
+        self.assertEqual(0, mock_wake_actions.call_count)
+        self.assertEqual(0, mock_lock_wake.call_count)
@@ -20,12 +20,19 @@ from oslo_service import threadgroup
 from oslo_utils import uuidutils
 from osprofiler import profiler
 
+from senlin.common import cache
 from senlin.common import consts
+from senlin.common import liveness
 from senlin.common import messaging
 from senlin.db import api as db_api
 from senlin.engine.actions import base as actionm
 from senlin.engine import dispatcher
+from senlin.engine import event as EVENT
+from senlin.engine import senlin_lock
 from senlin.engine import service
+from senlin.engine import waiter
+from senlin.objects import action as ao
+from senlin.objects import lock_waiter as lw_obj
 from senlin.objects import service as service_obj
 from senlin.tests.unit.common import base
 from senlin.tests.unit.common import utils
@@ -35,6 +42,9 @@ class DummyThread(object):
     def __init__(self, function, *args, **kwargs):
         self.function = function
 
+    def link(self, callback, *args, **kwargs):
+        pass
+
 
 class DummyThreadGroup(object):
     def __init__(self):
@@ -72,6 +82,7 @@ class TestEngine(base.SenlinTestCase):
         self.svc = service.EngineService('HOST', self.topic)
         self.svc.service_id = self.service_id
         self.svc.tg = self.tg
+        self.patchobject(dispatcher, '_client', new=None)
 
     @mock.patch('oslo_service.service.Service.__init__')
     def test_service_thread_numbers(self, mock_service_init):
@@ -100,11 +111,12 @@ class TestEngine(base.SenlinTestCase):
         self.assertEqual(self.tg, self.svc.tg)
         self.assertEqual(self.topic, self.svc.topic)
 
+    @mock.patch.object(EVENT, 'start_buffers')
     @mock.patch.object(uuidutils, 'generate_uuid')
     @mock.patch.object(oslo_messaging, 'get_rpc_server')
     @mock.patch.object(service_obj.Service, 'create')
     def test_service_start(self, mock_service_create, mock_rpc_server,
-                           mock_uuid):
+                           mock_uuid, mock_start_buffers):
         service_uuid = '4db0a14c-dc10-4131-8ed6-7573987ce9b1'
         mock_uuid.return_value = service_uuid
 
@@ -113,34 +125,125 @@ class TestEngine(base.SenlinTestCase):
         mock_uuid.assert_called_once()
         mock_service_create.assert_called_once()
         self.svc.server.start.assert_called_once()
+        mock_start_buffers.assert_called_once_with()
+        self.tg.add_timer.assert_any_call(
+            cfg.CONF.lock_retry_interval,
+            self.svc.service_manage_lock_waiters)
+        self.tg.add_timer.assert_any_call(
+            cfg.CONF.periodic_interval,
+            self.svc.service_manage_ready_actions)
 
         self.assertEqual(service_uuid, self.svc.service_id)
 
+    @mock.patch.object(EVENT, 'stop_buffers')
     @mock.patch.object(service_obj.Service, 'delete')
-    def test_service_stop(self, mock_delete):
+    def test_service_stop(self, mock_delete, mock_stop_buffers):
         self.svc.server = mock.Mock()
 
         self.svc.stop()
 
         self.svc.server.stop.assert_called_once()
         self.svc.server.wait.assert_called_once()
+        mock_stop_buffers.assert_called_once_with()
 
         mock_delete.assert_called_once_with(self.svc.service_id)
 
+    @mock.patch.object(EVENT, 'stop_buffers')
     @mock.patch.object(service_obj.Service, 'delete')
-    def test_service_stop_not_yet_started(self, mock_delete):
+    def test_service_stop_not_yet_started(self, mock_delete,
+                                          mock_stop_buffers):
         self.svc.server = None
 
         self.svc.stop()
 
+        mock_stop_buffers.assert_called_once_with()
         mock_delete.assert_called_once_with(self.svc.service_id)
 
+    @mock.patch.object(EVENT, 'stop_buffers')
+    @mock.patch.object(service_obj.Service, 'delete')
+    def test_service_stop_lock_wait_timer(self, mock_delete,
+                                          mock_stop_buffers):
+        timer = mock.Mock()
+        self.svc.lock_wait_timer = timer
+
+        self.svc.stop()
+
+        timer.stop.assert_called_once_with()
+        self.assertIsNone(self.svc.lock_wait_timer)
+
+    @mock.patch.object(EVENT, 'stop_buffers')
+    @mock.patch.object(service_obj.Service, 'delete')
+    def test_service_stop_ready_scan_timer(self, mock_delete,
+                                           mock_stop_buffers):
+        timer = mock.Mock()
+        self.svc.ready_scan_timer = timer
+
+        self.svc.stop()
+
+        timer.stop.assert_called_once_with()
+        self.assertIsNone(self.svc.ready_scan_timer)
+
+    @mock.patch.object(service.EngineService, 'start_action')
+    def test_service_manage_ready_actions(self, mock_start):
+        self.svc.service_manage_ready_actions()
+
+        mock_start.assert_called_once_with(self.svc.db_session)
+
+    @mock.patch.object(service.EngineService, 'start_action')
+    def test_service_manage_ready_actions_failed(self, mock_start):
+        mock_start.side_effect = Exception('boom')
+
+        # exception logged only
+        self.svc.service_manage_ready_actions()
+
+        mock_start.assert_called_once_with(self.svc.db_session)
+
+    @mock.patch.object(senlin_lock, 'gc_by_engine')
+    def test_gc_engine(self, mock_gc):
+        self.svc._gc_engine('ENGINE_ID')
+
+        mock_gc.assert_called_once_with('ENGINE_ID')
+
+    @mock.patch.object(senlin_lock, 'lock_wake')
+    @mock.patch.object(lw_obj.LockWaiter, 'get_stale')
+    def test_service_manage_lock_waiters(self, mock_stale, mock_wake):
+        mock_stale.return_value = ['CLUSTER_ID', 'NODE_ID']
+
+        self.svc.service_manage_lock_waiters()
+
+        mock_stale.assert_called_once_with(cfg.CONF.lock_retry_interval)
+        mock_wake.assert_has_calls([mock.call('CLUSTER_ID'),
+                                    mock.call('NODE_ID')])
+
+    @mock.patch.object(senlin_lock, 'lock_wake')
+    @mock.patch.object(lw_obj.LockWaiter, 'get_stale')
+    def test_service_manage_lock_waiters_failed(self, mock_stale,
+                                                mock_wake):
+        mock_stale.side_effect = Exception('boom')
+
+        self.svc.service_manage_lock_waiters()
+
+        self.assertEqual(0, mock_wake.call_count)
+
+    @mock.patch.object(EVENT, 'buffer_stats')
+    def test_event_buffer_stats(self, mock_stats):
+        mock_stats.return_value = {'database': {'depth': 3}}
+
+        res = self.svc.event_buffer_stats(self.context)
+
+        self.assertEqual({'database': {'depth': 3}}, res)
+        mock_stats.assert_called_once_with()
+
+    @mock.patch.object(liveness, 'refresh')
     @mock.patch.object(service_obj.Service, 'update')
-    def test_service_manage_report_update(self, mock_update):
+    def test_service_manage_report_update(self, mock_update, mock_refresh):
         mock_update.return_value = mock.Mock()
+        self.svc.actions_running = 3
         self.svc.service_manage_report()
         mock_update.assert_called_once_with(mock.ANY,
-                                            self.svc.service_id)
+                                            self.svc.service_id,
+                                            {'load': 3})
+        mock_refresh.assert_called_once_with(mock.ANY)
 
     @mock.patch.object(service_obj.Service, 'update')
     def test_service_manage_report_with_exception(self, mock_update):
@@ -202,6 +305,105 @@ class TestEngine(base.SenlinTestCase):
 
         mock_context.cast.assert_called_once_with(mock.ANY, 'METHOD')
 
+    @mock.patch.object(messaging, 'get_rpc_client')
+    def test_notify_client_cached(self, mock_rpc):
+        cfg.CONF.set_override('host', 'HOSTNAME')
+
+        dispatcher.notify('METHOD')
+        dispatcher.notify('METHOD', 'FAKE_ENGINE')
+
+        mock_rpc.assert_called_once_with(consts.ENGINE_TOPIC, 'HOSTNAME')
+        self.assertEqual(2, mock_rpc.return_value.prepare.call_count)
+
+        cfg.CONF.set_override('host', 'OTHERHOST')
+        dispatcher.notify('METHOD')
+
+        mock_rpc.assert_called_with(consts.ENGINE_TOPIC, 'OTHERHOST')
+        self.assertEqual(2, mock_rpc.call_count)
+
+    @mock.patch.object(service_obj.Service, 'get_all_alive')
+    def test_select_engine(self, mock_alive):
+        self.patchobject(dispatcher, '_engines',
+                         new={'loads': {}, 'expires': 0})
+        mock_alive.return_value = [
+            mock.Mock(id='ENGINE1', load=3),
+            mock.Mock(id='ENGINE2', load=1),
+            mock.Mock(id='ENGINE3', load=None),
+        ]
+
+        selected = [dispatcher._select_engine() for i in range(5)]
+
+        self.assertEqual(['ENGINE3', 'ENGINE2', 'ENGINE3', 'ENGINE2',
+                          'ENGINE3'], selected)
+        mock_alive.assert_called_once_with(mock.ANY, 'senlin-engine')
+
+    @mock.patch.object(service_obj.Service, 'get_all_alive')
+    def test_select_engine_expired(self, mock_alive):
+        self.patchobject(dispatcher, '_engines',
+                         new={'loads': {'ENGINE1': 0}, 'expires': 0})
+        mock_alive.return_value = []
+
+        self.assertIsNone(dispatcher._select_engine())
+        mock_alive.assert_called_once_with(mock.ANY, 'senlin-engine')
+
+    @mock.patch.object(service_obj.Service, 'get_all_alive')
+    def test_select_engine_failed(self, mock_alive):
+        self.patchobject(dispatcher, '_engines',
+                         new={'loads': {}, 'expires': 0})
+        mock_alive.side_effect = Exception('boom')
+
+        self.assertIsNone(dispatcher._select_engine())
+
+    @mock.patch.object(dispatcher, 'notify')
+    @mock.patch.object(dispatcher, '_select_engine')
+    def test_start_actions(self, mock_select, mock_notify):
+        mock_select.return_value = 'ENGINE1'
+
+        res = dispatcher.start_actions(('ACTION1', 'ACTION2'))
+
+        self.assertEqual(mock_notify.return_value, res)
+        mock_notify.assert_called_once_with(dispatcher.START_ACTIONS,
+                                            'ENGINE1',
+                                            ids=['ACTION1', 'ACTION2'])
+
+    @mock.patch.object(dispatcher, 'notify')
+    @mock.patch.object(dispatcher, '_select_engine')
+    def test_start_actions_no_engine(self, mock_select, mock_notify):
+        mock_select.return_value = None
+
+        dispatcher.start_actions(['ACTION1'])
+
+        mock_notify.assert_called_once_with(dispatcher.START_ACTION, None)
+
+    @mock.patch.object(dispatcher, 'wake_action')
+    @mock.patch.object(ao.Action, 'get_all')
+    @mock.patch.object(waiter, 'wake')
+    def test_wake_actions(self, mock_wake, mock_get_all, mock_cast):
+        ids = ['ACTION1', 'ACTION2', 'ACTION3']
+        mock_wake.side_effect = [True, False, False]
+        mock_get_all.return_value = [
+            mock.Mock(id='ACTION2', owner='ENGINE'),
+            mock.Mock(id='ACTION3', owner=None),
+        ]
+
+        dispatcher.wake_actions(self.context, ids, 123.4)
+
+        mock_wake.assert_has_calls([mock.call(i, 123.4) for i in ids])
+        mock_get_all.assert_called_once_with(
+            self.context, filters={'id': ['ACTION2', 'ACTION3']},
+            project_safe=False, with_deps=False)
+        mock_cast.assert_called_once_with('ENGINE', action_id='ACTION2',
+                                          timestamp=123.4)
+
+    @mock.patch.object(ao.Action, 'get_all')
+    @mock.patch.object(waiter, 'wake', return_value=True)
+    def test_wake_actions_local(self, mock_wake, mock_get_all):
+        dispatcher.wake_actions(self.context, ['ACTION1', 'ACTION2'])
+
+        mock_wake.assert_has_calls([mock.call('ACTION1', None),
+                                    mock.call('ACTION2', None)])
+        mock_get_all.assert_not_called()
+
     @mock.patch.object(profiler, 'get')
     def test_serialize_profile_info(self, mock_profiler_get):
         mock_profiler_get.return_value = None
@@ -245,14 +447,14 @@ class DispatcherActionTest(base.SenlinTestCase):
         self.mock_tg = self.patchobject(threadgroup, 'ThreadGroup')
         self.mock_tg.return_value = self.fake_tg
 
-    @mock.patch.object(db_api, 'action_acquire_first_ready')
+    @mock.patch.object(db_api, 'action_acquire_ready_batch')
     @mock.patch.object(db_api, 'action_acquire')
     def test_start_action(self, mock_action_acquire,
-                          mock_action_acquire_1st):
+                          mock_action_acquire_batch):
         action = mock.Mock()
         action.id = '0123'
         mock_action_acquire.return_value = action
-        mock_action_acquire_1st.return_value = None
+        mock_action_acquire_batch.return_value = []
 
         svc = service.EngineService('HOST', 'TOPIC')
         svc.tg = self.mock_tg
@@ -265,12 +467,12 @@ class DispatcherActionTest(base.SenlinTestCase):
             svc.db_session, '0123'
         )
 
-    @mock.patch.object(db_api, 'action_acquire_first_ready')
+    @mock.patch.object(db_api, 'action_acquire_ready_batch')
     def test_start_action_no_action_id(self, mock_acquire_action):
         mock_action = mock.Mock()
         mock_action.id = '0123'
         mock_action.action = 'CLUSTER_CREATE'
-        mock_acquire_action.side_effect = [mock_action, None]
+        mock_acquire_action.return_value = [mock_action]
 
         svc = service.EngineService('HOST', 'TOPIC')
         svc.tg = self.mock_tg
@@ -284,7 +486,7 @@ class DispatcherActionTest(base.SenlinTestCase):
         )
 
     @mock.patch.object(service, 'sleep')
-    @mock.patch.object(db_api, 'action_acquire_first_ready')
+    @mock.patch.object(db_api, 'action_acquire_ready_batch')
     def test_start_action_batch_control(self, mock_acquire_action, mock_sleep):
         mock_action1 = mock.Mock()
         mock_action1.id = 'ID1'
@@ -295,8 +497,8 @@ class DispatcherActionTest(base.SenlinTestCase):
         mock_action3 = mock.Mock()
         mock_action3.id = 'ID3'
         mock_action3.action = 'NODE_DELETE'
-        mock_acquire_action.side_effect = [mock_action1, mock_action2,
-                                           mock_action3, None]
+        mock_acquire_action.side_effect = [[mock_action1], [mock_action2],
+                                           [mock_action3], []]
         cfg.CONF.set_override('max_actions_per_batch', 1)
         cfg.CONF.set_override('batch_interval', 2)
 
@@ -308,7 +510,7 @@ class DispatcherActionTest(base.SenlinTestCase):
         self.assertEqual(self.mock_tg.add_thread.call_count, 3)
 
     @mock.patch.object(service, 'sleep')
-    @mock.patch.object(db_api, 'action_acquire_first_ready')
+    @mock.patch.object(db_api, 'action_acquire_ready_batch')
     def test_start_action_multiple_batches(self, mock_acquire_action,
                                            mock_sleep):
         action_types = ['NODE_CREATE', 'NODE_DELETE']
@@ -319,10 +521,9 @@ class DispatcherActionTest(base.SenlinTestCase):
             mock_action.action = action_types[index % 2]
             actions.append(mock_action)
 
-        # Add a None at the end to end the process.
-        actions.insert(len(actions), None)
-
-        mock_acquire_action.side_effect = actions
+        # Actions are claimed in batches of 'max_actions_per_batch'
+        mock_acquire_action.side_effect = [actions[0:3], actions[3:6],
+                                           actions[6:9], actions[9:]]
         cfg.CONF.set_override('max_actions_per_batch', 3)
         cfg.CONF.set_override('batch_interval', 5)
 
@@ -333,27 +534,118 @@ class DispatcherActionTest(base.SenlinTestCase):
         self.assertEqual(mock_sleep.call_count, 3)
         self.assertEqual(self.mock_tg.add_thread.call_count, 10)
 
-    @mock.patch.object(db_api, 'action_acquire_first_ready')
+    @mock.patch.object(db_api, 'action_acquire_ready_batch')
     @mock.patch.object(db_api, 'action_acquire')
     def test_start_action_failed_locking_action(self, mock_acquire_action,
-                                                mock_acquire_action_1st):
+                                                mock_acquire_batch):
         mock_acquire_action.return_value = None
-        mock_acquire_action_1st.return_value = None
+        mock_acquire_batch.return_value = []
 
         svc = service.EngineService('HOST', 'TOPIC')
         svc.tg = self.mock_tg
         res = svc.start_action(self.context, '0123')
         self.assertIsNone(res)
 
-    @mock.patch.object(db_api, 'action_acquire_first_ready')
+    @mock.patch.object(db_api, 'action_acquire_ready_batch')
     def test_start_action_no_action_ready(self, mock_acquire_action):
-        mock_acquire_action.return_value = None
+        mock_acquire_action.return_value = []
 
         svc = service.EngineService('HOST', 'TOPIC')
         svc.tg = self.mock_tg
         res = svc.start_action('4567')
         self.assertIsNone(res)
 
+    @mock.patch.object(db_api, 'action_acquire_ready_batch')
+    def test_start_action_claim_batch_size(self, mock_acquire_action):
+        actions = []
+        for index in range(3):
+            mock_action = mock.Mock()
+            mock_action.id = 'ID%d' % index
+            mock_action.action = 'CLUSTER_CREATE'
+            actions.append(mock_action)
+        mock_acquire_action.side_effect = [actions[0:2], actions[2:]]
+        cfg.CONF.set_override('action_claim_batch_size', 2, group='engine')
+
+        svc = service.EngineService('HOST', 'TOPIC')
+        svc.tg = self.mock_tg
+        svc.start_action(self.context)
+
+        self.assertEqual(2, mock_acquire_action.call_count)
+        mock_acquire_action.assert_called_with(svc.db_session,
+                                               svc.service_id, mock.ANY, 2,
+                                               ids=None)
+        self.assertEqual(3, self.mock_tg.add_thread.call_count)
+        stats = svc.action_queue_stats(self.context)
+        self.assertEqual(2, stats['claims'])
+        self.assertEqual(3, stats['claimed'])
+        self.assertEqual(3, stats['depth'])
+
+    @mock.patch.object(db_api, 'action_acquire_ready_batch')
+    def test_start_action_queue_full(self, mock_acquire_action):
+        mock_action = mock.Mock()
+        mock_action.id = 'ID1'
+        mock_action.action = 'NODE_CREATE'
+        mock_acquire_action.return_value = [mock_action]
+        cfg.CONF.set_override('action_queue_size', 1, group='engine')
+
+        svc = service.EngineService('HOST', 'TOPIC')
+        svc.tg = self.mock_tg
+        svc.start_action(self.context)
+
+        mock_acquire_action.assert_called_once_with(svc.db_session,
+                                                    svc.service_id,
+                                                    mock.ANY, 1, ids=None)
+        self.assertTrue(svc.queue_throttled)
+        self.assertEqual(1, svc.queue_stats['throttled'])
+
+        # completion of the running action resumes claiming
+        mock_acquire_action.reset_mock()
+        mock_acquire_action.return_value = []
+        svc._action_done(mock.Mock())
+
+        self.assertFalse(svc.queue_throttled)
+        self.assertEqual(0, svc.actions_running)
+        mock_acquire_action.assert_called_once_with(svc.db_session,
+                                                    svc.service_id,
+                                                    mock.ANY, 1, ids=None)
+
+    @mock.patch.object(db_api, 'action_acquire_ready_batch')
+    def test_start_actions(self, mock_acquire_action):
+        mock_action = mock.Mock()
+        mock_action.id = 'ID1'
+        mock_acquire_action.return_value = [mock_action]
+
+        svc = service.EngineService('HOST', 'TOPIC')
+        svc.tg = self.mock_tg
+        svc.start_actions(self.context, ['ID1', 'ID2'])
+
+        mock_acquire_action.assert_called_once_with(
+            svc.db_session, svc.service_id, mock.ANY,
+            cfg.CONF.engine.action_queue_size, ids=['ID1', 'ID2'])
+        self.mock_tg.add_thread.assert_called_once_with(
+            svc._start_with_trace, oslo_context.get_current(),
+            None, actionm.ActionProc, svc.db_session, 'ID1')
+        self.assertFalse(svc.queue_throttled)
+
+    @mock.patch.object(db_api, 'action_acquire_ready_batch')
+    def test_start_actions_queue_full(self, mock_acquire_action):
+        cfg.CONF.set_override('action_queue_size', 1, group='engine')
+        mock_acquire_action.return_value = []
+
+        svc = service.EngineService('HOST', 'TOPIC')
+        svc.tg = self.mock_tg
+        svc.start_actions(self.context, ['ID1', 'ID2'])
+
+        mock_acquire_action.assert_called_once_with(
+            svc.db_session, svc.service_id, mock.ANY, 1, ids=['ID1', 'ID2'])
+        self.assertTrue(svc.queue_throttled)
+
+        mock_acquire_action.reset_mock()
+        svc.actions_running = 1
+        svc.start_actions(self.context, ['ID3'])
+
+        self.assertEqual(0, mock_acquire_action.call_count)
+
     def test_cancel_action(self):
         mock_action = mock.Mock()
         mock_load = self.patchobject(actionm.Action, 'load',
@@ -366,6 +658,30 @@ class DispatcherActionTest(base.SenlinTestCase):
                                           project_safe=False)
         mock_action.signal.assert_called_once_with(mock_action.SIG_CANCEL)
 
+    @mock.patch.object(waiter, 'wake')
+    def test_wake_action(self, mock_wake):
+        svc = service.EngineService('HOST', 'TOPIC')
+        svc.wake_action(self.context, 'action0123', timestamp=123.4)
+
+        mock_wake.assert_called_once_with('action0123', 123.4)
+
+    @mock.patch.object(cache, 'invalidate')
+    def test_invalidate_cache(self, mock_invalidate):
+        svc = service.EngineService('HOST', 'TOPIC')
+        svc.invalidate_cache(self.context, cache.PROFILE, 'PROFILE_ID',
+                             updated_at='2020-01-01T00:00:00')
+
+        mock_invalidate.assert_called_once_with(
+            cache.PROFILE, 'PROFILE_ID', '2020-01-01T00:00:00')
+
+    def test_cache_stats(self):
+        svc = service.EngineService('HOST', 'TOPIC')
+
+        res = svc.cache_stats(self.context)
+
+        self.assertEqual({cache.PROFILE, cache.POLICY}, set(res))
+        self.assertEqual(0, res[cache.PROFILE]['hits'])
+
     def test_suspend_action(self):
         mock_action = mock.Mock()
         mock_load = self.patchobject(actionm.Action, 'load',
@@ -0,0 +1,76 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from unittest import mock
+
+import eventlet
+
+from senlin.engine import waiter
+from senlin.tests.unit.common import base
+
+
+class WaiterTest(base.SenlinTestCase):
+
+    def setUp(self):
+        super(WaiterTest, self).setUp()
+        self.patchobject(waiter, '_WAITERS', new={})
+        self.patchobject(waiter, '_LATENCY',
+                         new=[0] * len(waiter.LATENCY_BUCKETS))
+
+    def test_register_unregister(self):
+        waiter.register('ACTION_ID')
+        self.assertTrue(waiter.is_waiting('ACTION_ID'))
+
+        waiter.unregister('ACTION_ID')
+        self.assertFalse(waiter.is_waiting('ACTION_ID'))
+
+        # unregister twice is harmless
+        waiter.unregister('ACTION_ID')
+
+    def test_wake_not_waiting(self):
+        self.assertFalse(waiter.wake('ACTION_ID'))
+
+    def test_wait_not_registered(self):
+        self.assertFalse(waiter.wait('ACTION_ID', 0))
+
+    def test_wait_timeout(self):
+        waiter.register('ACTION_ID')
+
+        self.assertFalse(waiter.wait('ACTION_ID', 0.01))
+
+    def test_wake_before_wait(self):
+        waiter.register('ACTION_ID')
+
+        self.assertTrue(waiter.wake('ACTION_ID'))
+        # a second wake-up before the wait is coalesced
+        self.assertTrue(waiter.wake('ACTION_ID'))
+
+        self.assertTrue(waiter.wait('ACTION_ID', 0))
+        self.assertFalse(waiter.wait('ACTION_ID', 0))
+
+    def test_wake_during_wait(self):
+        waiter.register('ACTION_ID')
+        eventlet.spawn_after(0, waiter.wake, 'ACTION_ID')
+
+        self.assertTrue(waiter.wait('ACTION_ID', 5))
+
+    @mock.patch('time.time', return_value=100.2)
+    def test_latency_histogram(self, mock_time):
+        waiter.register('ACTION_ID')
+        waiter.wake('ACTION_ID', 100)
+
+        waiter.wait('ACTION_ID', 0)
+
+        res = waiter.latency_histogram()
+        self.assertEqual(1, res['0.5'])
+        self.assertEqual(1, sum(res.values()))
+        self.assertEqual(len(waiter.LATENCY_BUCKETS), len(res))
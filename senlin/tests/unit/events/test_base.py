@@ -10,11 +10,13 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from oslo_config import cfg
 import testtools
 from unittest import mock
 
 from senlin.common import consts
 from senlin.events import base
+from senlin.events import buffer as event_buffer
 from senlin.tests.unit.common import utils
 
 CLUSTER_ID = '2c5139a6-24ba-4a6f-bd53-a268f61536de'
@@ -71,3 +73,76 @@ class TestEventBackend(testtools.TestCase):
         self.assertRaises(NotImplementedError,
                           base.EventBackend.dump,
                           '1', '2')
+
+    def test_write(self):
+        self.assertRaises(NotImplementedError,
+                          base.EventBackend._write, [])
+
+    def _backend(self):
+        class FakeBackend(base.EventBackend):
+            _write = mock.Mock()
+
+        return FakeBackend
+
+    def test_submit_no_buffer(self):
+        backend = self._backend()
+
+        backend._submit('RECORD')
+
+        backend._write.assert_called_once_with(['RECORD'])
+
+    def test_submit_buffer(self):
+        backend = self._backend()
+        backend.buffer = mock.Mock()
+
+        backend._submit('RECORD')
+
+        backend.buffer.put.assert_called_once_with('RECORD')
+        self.assertEqual(0, backend._write.call_count)
+
+    @mock.patch.object(event_buffer, 'EventBuffer')
+    def test_start_buffer(self, mock_buffer):
+        self.addCleanup(cfg.CONF.clear_override, 'buffer_full_policy',
+                        group='dispatchers')
+        cfg.CONF.set_override('buffer_full_policy', 'drop',
+                              group='dispatchers')
+        backend = self._backend()
+
+        backend.start_buffer()
+
+        mock_buffer.assert_called_once_with(
+            'FakeBackend', backend._write, 1000, 100, 1.0, policy='drop')
+        mock_buffer.return_value.start.assert_called_once_with()
+        self.assertEqual(mock_buffer.return_value, backend.buffer)
+        self.assertIsNone(base.EventBackend.buffer)
+
+    @mock.patch.object(event_buffer, 'EventBuffer')
+    def test_start_buffer_disabled(self, mock_buffer):
+        self.addCleanup(cfg.CONF.clear_override, 'buffer_size',
+                        group='dispatchers')
+        cfg.CONF.set_override('buffer_size', 0, group='dispatchers')
+        backend = self._backend()
+
+        backend.start_buffer()
+
+        self.assertEqual(0, mock_buffer.call_count)
+        self.assertIsNone(backend.buffer)
+
+    def test_stop_buffer(self):
+        backend = self._backend()
+        buf = mock.Mock()
+        buf.stop.side_effect = lambda: self.assertIsNone(backend.buffer)
+        backend.buffer = buf
+
+        backend.stop_buffer()
+
+        buf.stop.assert_called_once_with()
+        self.assertIsNone(backend.buffer)
+
+    def test_buffer_stats(self):
+        backend = self._backend()
+        self.assertIsNone(backend.buffer_stats())
+
+        backend.buffer = mock.Mock()
+        backend.buffer.stats.return_value = {'depth': 1}
+        self.assertEqual({'depth': 1}, backend.buffer_stats())
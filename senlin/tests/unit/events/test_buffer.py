@@ -0,0 +1,118 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import eventlet
+import testtools
+from unittest import mock
+
+from senlin.events import buffer as event_buffer
+
+
+class TestEventBuffer(testtools.TestCase):
+
+    def setUp(self):
+        super(TestEventBuffer, self).setUp()
+        self.batches = []
+
+    def _write(self, records):
+        self.batches.append(list(records))
+
+    def test_flush_on_batch_size(self):
+        buf = event_buffer.EventBuffer('test', self._write, 10, 2, 60)
+        buf.start()
+
+        for i in range(4):
+            self.assertTrue(buf.put(i))
+        eventlet.sleep(0)
+
+        self.assertEqual([[0, 1], [2, 3]], self.batches)
+        buf.stop()
+        stats = buf.stats()
+        self.assertEqual(4, stats['written'])
+        self.assertEqual(2, stats['flushes'])
+        self.assertEqual(0, stats['depth'])
+
+    def test_flush_on_interval(self):
+        buf = event_buffer.EventBuffer('test', self._write, 10, 100, 0.01)
+        buf.start()
+
+        buf.put('a')
+        buf.put('b')
+        eventlet.sleep(0.1)
+
+        self.assertEqual([['a', 'b']], self.batches)
+        buf.stop()
+
+    def test_stop_flushes_buffered(self):
+        buf = event_buffer.EventBuffer('test', self._write, 10, 100, 60)
+        buf.start()
+
+        buf.put('a')
+        buf.put('b')
+        buf.stop()
+
+        self.assertEqual([['a', 'b']], self.batches)
+        self.assertEqual(2, buf.stats()['written'])
+
+    def test_stop_not_started(self):
+        buf = event_buffer.EventBuffer('test', self._write, 10, 100, 60)
+
+        buf.stop()
+
+        self.assertEqual([], self.batches)
+
+    def test_put_full_drop(self):
+        buf = event_buffer.EventBuffer('test', self._write, 2, 100, 60,
+                                       policy=event_buffer.DROP)
+
+        self.assertTrue(buf.put('a'))
+        self.assertTrue(buf.put('b'))
+        self.assertFalse(buf.put('c'))
+
+        stats = buf.stats()
+        self.assertEqual(2, stats['depth'])
+        self.assertEqual(2, stats['capacity'])
+        self.assertEqual(1, stats['dropped'])
+
+    def test_put_full_block(self):
+        buf = event_buffer.EventBuffer('test', self._write, 1, 100, 60)
+        buf.put('a')
+
+        writer = eventlet.spawn(buf.put, 'b')
+        eventlet.sleep(0)
+        self.assertEqual(1, buf.stats()['depth'])
+
+        buf.start()
+        self.assertTrue(writer.wait())
+        buf.stop()
+
+        self.assertEqual(['a', 'b'],
+                         [r for batch in self.batches for r in batch])
+        self.assertEqual(0, buf.stats()['dropped'])
+
+    def test_write_failure(self):
+        write = mock.Mock(side_effect=[Exception('boom'), None])
+        buf = event_buffer.EventBuffer('test', write, 10, 1, 60)
+        buf.start()
+
+        buf.put('a')
+        buf.put('b')
+        buf.stop()
+
+        self.assertEqual([mock.call(['a']), mock.call(['b'])],
+                         write.call_args_list)
+        stats = buf.stats()
+        self.assertEqual(1, stats['failed'])
+        self.assertEqual(1, stats['written'])
+        self.assertEqual(2, stats['flushes'])
+        self.assertGreaterEqual(stats['flush_latency_max'],
+                                stats['flush_latency_last'])
@@ -120,3 +120,28 @@ class TestDatabase(testtools.TestCase):
                 'status_reason': 'REASON',
                 'meta_data': {}
             })
+
+    @mock.patch.object(eo.Event, 'create_batch')
+    def test_write_batch(self, mock_create_batch):
+        records = [(self.context, {'oid': 'N1'}),
+                   (self.context, {'oid': 'N2'})]
+
+        DB.DBEvent._write(records)
+
+        mock_create_batch.assert_called_once_with(
+            self.context, [{'oid': 'N1'}, {'oid': 'N2'}])
+
+    @mock.patch.object(DB.DBEvent, 'buffer')
+    @mock.patch.object(eo.Event, 'create')
+    def test_dump_buffered(self, mock_create, mock_buffer):
+        entity = mock.Mock(id='NODE_ID', cluster_id='CLUSTER_ID')
+        entity.name = 'node1'
+        action = mock.Mock(context=self.context, action='ACTION',
+                           entity=entity)
+        DB.DBEvent.dump('LEVEL', action, phase='STATUS', reason='REASON')
+
+        self.assertEqual(0, mock_create.call_count)
+        ctx, values = mock_buffer.put.call_args[0][0]
+        self.assertEqual(self.context, ctx)
+        self.assertEqual('NODE_ID', values['oid'])
+        self.assertEqual('CLUSTER_ID', values['cluster_id'])
@@ -265,3 +265,12 @@ class TestMessageEvent(testtools.TestCase):
         mock_check.assert_called_once_with(entity)
         mock_notify.assert_called_once_with(self.ctx, logging.INFO, entity,
                                             action)
+
+    def test_write(self):
+        n1 = mock.Mock()
+        n2 = mock.Mock()
+
+        MSG.MessageEvent._write([(self.ctx, n1), (self.ctx, n2)])
+
+        n1.emit.assert_called_once_with(self.ctx)
+        n2.emit.assert_called_once_with(self.ctx)
@@ -109,7 +109,7 @@ class TestHealthManager(base.SenlinTestCase):
         mock_update.return_value = mock.Mock()
         self.svc.service_manage_report()
         mock_update.assert_called_once_with(mock.ANY,
-                                            self.svc.service_id)
+                                            self.svc.service_id, None)
 
     @mock.patch.object(service_obj.Service, 'update')
     def test_service_manage_report_with_exception(self, mock_update):
@@ -147,6 +147,16 @@ class TestHealthManager(base.SenlinTestCase):
         self.svc.health_registry.disable_cluster.assert_called_once_with(
             'CID')
 
+    def test_health_check_stats(self):
+        entry = mock.Mock(last_pass={'nodes': 3, 'unhealthy': 1,
+                                     'duration': 1.5})
+        self.svc.health_registry = mock.Mock(registries={'CID': entry})
+
+        res = self.svc.health_check_stats(self.context)
+
+        self.assertEqual({'CID': {'nodes': 3, 'unhealthy': 1,
+                                  'duration': 1.5}}, res)
+
     def test_register_cluster(self):
         self.svc.health_registry = mock.Mock()
         self.svc.register_cluster(self.context, 'CID', 60, 160, {}, True)
@@ -16,6 +16,7 @@ from oslo_utils import uuidutils
 import testtools
 
 from senlin.common import exception as exc
+from senlin.db import api as db_api
 from senlin.objects import action as ao
 
 
@@ -25,66 +26,74 @@ class TestAction(testtools.TestCase):
         super(TestAction, self).setUp()
         self.ctx = mock.Mock()
 
-    @mock.patch.object(ao.Action, 'get')
-    def test_find_by_uuid(self, mock_get):
-        x_action = mock.Mock()
-        mock_get.return_value = x_action
-        aid = uuidutils.generate_uuid()
-
-        result = ao.Action.find(self.ctx, aid)
-
-        self.assertEqual(x_action, result)
-        mock_get.assert_called_once_with(self.ctx, aid)
-
-    @mock.patch.object(ao.Action, 'get_by_name')
-    @mock.patch.object(ao.Action, 'get')
-    def test_find_by_uuid_as_name(self, mock_get, mock_name):
-        mock_get.return_value = None
-        x_action = mock.Mock()
-        mock_name.return_value = x_action
+    @mock.patch.object(ao.Action, '_from_db_object')
+    @mock.patch.object(db_api, 'action_find')
+    def test_find(self, mock_find, mock_from_db):
+        x_obj = mock.Mock()
+        mock_find.return_value = x_obj
         aid = uuidutils.generate_uuid()
 
         result = ao.Action.find(self.ctx, aid, project_safe=False)
 
-        self.assertEqual(x_action, result)
-        mock_get.assert_called_once_with(self.ctx, aid, project_safe=False)
-        mock_name.assert_called_once_with(self.ctx, aid, project_safe=False)
-
-    @mock.patch.object(ao.Action, 'get_by_name')
-    def test_find_by_name(self, mock_name):
-        x_action = mock.Mock()
-        mock_name.return_value = x_action
-        aid = 'not-a-uuid'
-
-        result = ao.Action.find(self.ctx, aid, project_safe=True)
-
-        self.assertEqual(x_action, result)
-        mock_name.assert_called_once_with(self.ctx, aid, project_safe=True)
-
-    @mock.patch.object(ao.Action, 'get_by_short_id')
-    @mock.patch.object(ao.Action, 'get_by_name')
-    def test_find_by_short_id(self, mock_name, mock_shortid):
-        mock_name.return_value = None
-        x_action = mock.Mock()
-        mock_shortid.return_value = x_action
-        aid = 'abcdef'
-
-        result = ao.Action.find(self.ctx, aid)
-
-        self.assertEqual(x_action, result)
-        mock_name.assert_called_once_with(self.ctx, aid)
-        mock_shortid.assert_called_once_with(self.ctx, aid)
-
-    @mock.patch.object(ao.Action, 'get_by_name')
-    @mock.patch.object(ao.Action, 'get_by_short_id')
-    def test_find_not_found(self, mock_shortid, mock_name):
-        mock_name.return_value = None
-        mock_shortid.return_value = None
-
-        ex = self.assertRaises(exc.ResourceNotFound,
-                               ao.Action.find,
-                               self.ctx, 'BOGUS')
-        self.assertEqual("The action 'BOGUS' could not be found.",
-                         str(ex))
-        mock_name.assert_called_once_with(self.ctx, 'BOGUS')
-        mock_shortid.assert_called_once_with(self.ctx, 'BOGUS')
+        self.assertEqual(mock_from_db.return_value, result)
+        mock_find.assert_called_once_with(self.ctx, aid, project_safe=False)
+        mock_from_db.assert_called_once_with(self.ctx, mock.ANY, x_obj)
+
+    @mock.patch.object(db_api, 'action_find')
+    def test_find_not_found(self, mock_find):
+        mock_find.return_value = None
+
+        self.assertRaises(exc.ResourceNotFound,
+                          ao.Action.find,
+                          self.ctx, 'bogus')
+
+        mock_find.assert_called_once_with(self.ctx, 'bogus')
+
+    @mock.patch.object(db_api, 'dependency_get_all')
+    def test_load_dependencies(self, mock_deps):
+        ids = [uuidutils.generate_uuid() for i in range(4)]
+        a1 = ao.Action(id=ids[0], dep_on=[], dep_by=[])
+        a2 = ao.Action(id=ids[1], dep_on=[], dep_by=[])
+        mock_deps.return_value = [
+            mock.Mock(depended=ids[0], dependent=ids[1]),
+            mock.Mock(depended=ids[2], dependent=ids[0]),
+            mock.Mock(depended=ids[1], dependent=ids[3]),
+        ]
+
+        ao.Action._load_dependencies(self.ctx, [a1, a2])
+
+        mock_deps.assert_called_once_with(self.ctx, ids[:2])
+        self.assertEqual([ids[2]], a1.dep_on)
+        self.assertEqual([ids[1]], a1.dep_by)
+        self.assertEqual([ids[0]], a2.dep_on)
+        self.assertEqual([ids[3]], a2.dep_by)
+        self.assertNotIn('dep_on', a1.obj_what_changed())
+        self.assertNotIn('dep_by', a1.obj_what_changed())
+
+    @mock.patch.object(ao.Action, '_load_dependencies')
+    @mock.patch.object(ao.Action, '_from_db_object')
+    @mock.patch.object(db_api, 'action_get_all')
+    def test_get_all(self, mock_get_all, mock_from_db, mock_load):
+        mock_get_all.return_value = ['R1', 'R2']
+        mock_from_db.side_effect = ['A1', 'A2']
+
+        res = ao.Action.get_all(self.ctx, filters={'status': 'READY'})
+
+        self.assertEqual(['A1', 'A2'], res)
+        mock_get_all.assert_called_once_with(self.ctx,
+                                             filters={'status': 'READY'})
+        mock_load.assert_called_once_with(self.ctx, ['A1', 'A2'])
+
+    @mock.patch.object(ao.Action, '_load_dependencies')
+    @mock.patch.object(ao.Action, '_from_db_object')
+    @mock.patch.object(db_api, 'action_get_all')
+    def test_get_all_without_deps(self, mock_get_all, mock_from_db,
+                                  mock_load):
+        mock_get_all.return_value = ['R1']
+        mock_from_db.side_effect = ['A1']
+
+        res = ao.Action.get_all(self.ctx, with_deps=False)
+
+        self.assertEqual(['A1'], res)
+        mock_get_all.assert_called_once_with(self.ctx)
+        mock_load.assert_not_called()
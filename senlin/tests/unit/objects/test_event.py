@@ -16,6 +16,7 @@ from oslo_utils import uuidutils
 import testtools
 
 from senlin.common import exception as exc
+from senlin.db import api as db_api
 from senlin.objects import event as eo
 
 
@@ -25,49 +26,24 @@ class TestEvent(testtools.TestCase):
         super(TestEvent, self).setUp()
         self.ctx = mock.Mock()
 
-    @mock.patch.object(eo.Event, 'get')
-    def test_find_by_uuid(self, mock_get):
+    @mock.patch.object(db_api, 'event_find')
+    def test_find(self, mock_find):
         x_event = mock.Mock()
-        mock_get.return_value = x_event
-        aid = uuidutils.generate_uuid()
-
-        result = eo.Event.find(self.ctx, aid)
-
-        self.assertEqual(x_event, result)
-        mock_get.assert_called_once_with(self.ctx, aid)
-
-    @mock.patch.object(eo.Event, 'get_by_short_id')
-    @mock.patch.object(eo.Event, 'get')
-    def test_find_by_short_id(self, mock_get, mock_shortid):
-        mock_get.return_value = None
-        x_event = mock.Mock()
-        mock_shortid.return_value = x_event
+        mock_find.return_value = x_event
         aid = uuidutils.generate_uuid()
 
         result = eo.Event.find(self.ctx, aid, project_safe=False)
 
         self.assertEqual(x_event, result)
-        mock_get.assert_called_once_with(self.ctx, aid, project_safe=False)
-        mock_shortid.assert_called_once_with(self.ctx, aid, project_safe=False)
-
-    @mock.patch.object(eo.Event, 'get_by_short_id')
-    def test_find_by_short_id_directly(self, mock_shortid):
-        x_event = mock.Mock()
-        mock_shortid.return_value = x_event
-        aid = 'abcdef'
-
-        result = eo.Event.find(self.ctx, aid, project_safe=True)
-
-        self.assertEqual(x_event, result)
-        mock_shortid.assert_called_once_with(self.ctx, aid, project_safe=True)
+        mock_find.assert_called_once_with(self.ctx, aid, project_safe=False)
 
-    @mock.patch.object(eo.Event, 'get_by_short_id')
-    def test_find_not_found(self, mock_shortid):
-        mock_shortid.return_value = None
+    @mock.patch.object(db_api, 'event_find')
+    def test_find_not_found(self, mock_find):
+        mock_find.return_value = None
 
         ex = self.assertRaises(exc.ResourceNotFound,
                                eo.Event.find,
                                self.ctx, 'BOGUS')
         self.assertEqual("The event 'BOGUS' could not be found.",
                          str(ex))
-        mock_shortid.assert_called_once_with(self.ctx, 'BOGUS')
+        mock_find.assert_called_once_with(self.ctx, 'BOGUS')
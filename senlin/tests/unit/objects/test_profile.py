@@ -16,6 +16,7 @@ from oslo_utils import uuidutils
 import testtools
 
 from senlin.common import exception as exc
+from senlin.db import api as db_api
 from senlin.objects import profile as po
 
 
@@ -25,69 +26,25 @@ class TestProfile(testtools.TestCase):
         super(TestProfile, self).setUp()
         self.ctx = mock.Mock()
 
-    @mock.patch.object(po.Profile, 'get')
-    def test_find_by_uuid(self, mock_get):
-        x_profile = mock.Mock()
-        mock_get.return_value = x_profile
+    @mock.patch.object(po.Profile, '_from_db_object')
+    @mock.patch.object(db_api, 'profile_find')
+    def test_find(self, mock_find, mock_from_db):
+        x_obj = mock.Mock()
+        mock_find.return_value = x_obj
         aid = uuidutils.generate_uuid()
 
-        result = po.Profile.find(self.ctx, aid, project_safe=True)
-
-        self.assertEqual(x_profile, result)
-        mock_get.assert_called_once_with(self.ctx, aid, project_safe=True)
-
-    @mock.patch.object(po.Profile, 'get_by_name')
-    @mock.patch.object(po.Profile, 'get')
-    def test_find_by_uuid_as_name(self, mock_get, mock_get_name):
-        x_profile = mock.Mock()
-        mock_get_name.return_value = x_profile
-        mock_get.return_value = None
-        aid = uuidutils.generate_uuid()
-
-        result = po.Profile.find(self.ctx, aid, project_safe=False)
-
-        self.assertEqual(x_profile, result)
-        mock_get.assert_called_once_with(self.ctx, aid, project_safe=False)
-        mock_get_name.assert_called_once_with(self.ctx, aid,
-                                              project_safe=False)
-
-    @mock.patch.object(po.Profile, 'get_by_name')
-    def test_find_by_name(self, mock_get_name):
-        x_profile = mock.Mock()
-        mock_get_name.return_value = x_profile
-
-        aid = 'this-is-not-uuid'
-        result = po.Profile.find(self.ctx, aid, project_safe=True)
-
-        self.assertEqual(x_profile, result)
-        mock_get_name.assert_called_once_with(self.ctx, aid, project_safe=True)
-
-    @mock.patch.object(po.Profile, 'get_by_short_id')
-    @mock.patch.object(po.Profile, 'get_by_name')
-    def test_find_by_shortid(self, mock_get_name, mock_get_shortid):
-        x_profile = mock.Mock()
-        mock_get_shortid.return_value = x_profile
-        mock_get_name.return_value = None
-
-        aid = 'abcd-1234-abcd'
         result = po.Profile.find(self.ctx, aid, project_safe=False)
 
-        self.assertEqual(x_profile, result)
-        mock_get_name.assert_called_once_with(self.ctx, aid,
-                                              project_safe=False)
-        mock_get_shortid.assert_called_once_with(self.ctx, aid,
-                                                 project_safe=False)
+        self.assertEqual(mock_from_db.return_value, result)
+        mock_find.assert_called_once_with(self.ctx, aid, project_safe=False)
+        mock_from_db.assert_called_once_with(self.ctx, mock.ANY, x_obj)
 
-    @mock.patch.object(po.Profile, 'get_by_short_id')
-    @mock.patch.object(po.Profile, 'get_by_name')
-    def test_find_not_found(self, mock_get_name, mock_get_shortid):
-        mock_get_name.return_value = None
-        mock_get_shortid.return_value = None
+    @mock.patch.object(db_api, 'profile_find')
+    def test_find_not_found(self, mock_find):
+        mock_find.return_value = None
 
-        ex = self.assertRaises(exc.ResourceNotFound,
-                               po.Profile.find,
-                               self.ctx, 'Bogus')
+        self.assertRaises(exc.ResourceNotFound,
+                          po.Profile.find,
+                          self.ctx, 'bogus')
 
-        self.assertEqual("The profile 'Bogus' could not be found.",
-                         str(ex))
-        mock_get_name.assert_called_once_with(self.ctx, 'Bogus')
+        mock_find.assert_called_once_with(self.ctx, 'bogus')
@@ -363,7 +363,7 @@ class TestLoadBalancingPolicy(base.SenlinTestCase):
 
     @mock.patch.object(lb_policy.LoadBalancingPolicy, '_build_policy_data')
     @mock.patch.object(policy_base.Policy, 'attach')
-    @mock.patch.object(no.Node, 'update')
+    @mock.patch.object(no.Node, 'update_data')
     def test_attach_succeeded(self, m_update, m_attach, m_build):
         cluster = mock.Mock(id='CLUSTER_ID', data={})
         node1 = mock.Mock(id='fake1', data={})
@@ -401,10 +401,8 @@ class TestLoadBalancingPolicy(base.SenlinTestCase):
         ]
         self.lb_driver.member_add.assert_has_calls(member_add_calls)
         node_update_calls = [
-            mock.call(mock.ANY, node1.id,
-                      {'data': {'lb_member': 'MEMBER1_ID'}}),
-            mock.call(mock.ANY, node2.id,
-                      {'data': {'lb_member': 'MEMBER2_ID'}})
+            mock.call(mock.ANY, node1.id, {'lb_member': 'MEMBER1_ID'}),
+            mock.call(mock.ANY, node2.id, {'lb_member': 'MEMBER2_ID'})
         ]
         m_update.assert_has_calls(node_update_calls)
         expected = {
@@ -837,7 +835,7 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
         self.assertIsNone(res)
 
     @mock.patch.object(no.Node, 'get')
-    @mock.patch.object(no.Node, 'update')
+    @mock.patch.object(no.Node, 'update_data')
     def test_add_member(self, m_node_update, m_node_get,
                         m_extract, m_load):
         node1 = mock.Mock(id='NODE1_ID', data={})
@@ -883,8 +881,8 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
         ]
         m_node_get.assert_has_calls(calls_node_get)
         calls_node_update = [
-            mock.call(action.context, 'NODE1_ID', mock.ANY),
-            mock.call(action.context, 'NODE2_ID', mock.ANY)
+            mock.call(action.context, 'NODE1_ID', {'lb_member': mock.ANY}),
+            mock.call(action.context, 'NODE2_ID', {'lb_member': mock.ANY})
         ]
         m_node_update.assert_has_calls(calls_node_update)
         calls_member_add = [
@@ -1125,7 +1123,7 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
         self.assertFalse(m_remove.called)
 
     @mock.patch.object(no.Node, 'get')
-    @mock.patch.object(no.Node, 'update')
+    @mock.patch.object(no.Node, 'update_data')
     def test_remove_member(self, m_node_update, m_node_get,
                            m_extract, m_load):
         node1 = mock.Mock(id='NODE1', data={'lb_member': 'MEM_ID1'})
@@ -1168,8 +1166,8 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
         ]
         m_node_get.assert_has_calls(calls_node_get)
         calls_node_update = [
-            mock.call(action.context, 'NODE1', mock.ANY),
-            mock.call(action.context, 'NODE2', mock.ANY)
+            mock.call(action.context, 'NODE1', removed=['lb_member']),
+            mock.call(action.context, 'NODE2', removed=['lb_member'])
         ]
         m_node_update.assert_has_calls(calls_node_update)
         calls_member_del = [
@@ -1180,7 +1178,7 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
         self.assertEqual([], res)
 
     @mock.patch.object(no.Node, 'get')
-    @mock.patch.object(no.Node, 'update')
+    @mock.patch.object(no.Node, 'update_data')
     def test_remove_member_not_in_pool(self, m_node_update, m_node_get,
                                        m_extract, m_load):
         node1 = mock.Mock(id='NODE1', data={'lb_member': 'MEM_ID1'})
@@ -1223,7 +1221,7 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
         ]
         m_node_get.assert_has_calls(calls_node_get)
         m_node_update.assert_called_once_with(
-            action.context, 'NODE1', mock.ANY)
+            action.context, 'NODE1', removed=['lb_member'])
         self.lb_driver.member_remove.assert_called_once_with(
             'LB_ID', 'POOL_ID', 'MEM_ID1')
         self.assertEqual([], res)
@@ -1324,7 +1322,7 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
         m_remove.assert_called_once_with(action.context, ['NODE1_ID'],
                                          mock.ANY, self.lb_driver)
 
-    @mock.patch.object(no.Node, 'update')
+    @mock.patch.object(no.Node, 'update_data')
     def test_process_recovery_not_lb_member(self, m_update, m1, m2):
         node = mock.Mock(id='NODE', data={})
         action = mock.Mock(
@@ -1338,7 +1336,8 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
         res = policy._process_recovery(['NODE'], cp, self.lb_driver, action)
 
         self.assertEqual(['NODE'], res)
-        m_update.assert_called_once_with(action.context, 'NODE', {'data': {}})
+        m_update.assert_called_once_with(action.context, 'NODE',
+                                         removed=['recovery'])
 
     @mock.patch.object(no.Node, 'update')
     @mock.patch.object(lb_policy.LoadBalancingPolicy, '_remove_member')
@@ -1359,7 +1358,7 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
         self.assertFalse(m_remove.called)
         self.assertFalse(m_update.called)
 
-    @mock.patch.object(no.Node, 'update')
+    @mock.patch.object(no.Node, 'update_data')
     @mock.patch.object(lb_policy.LoadBalancingPolicy, '_remove_member')
     def test_process_recovery_recreate(self, m_remove, m_update, m1, m2):
         node = mock.Mock(id='NODE', data={'lb_member': 'mem_1',
@@ -1377,4 +1376,5 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
         self.assertEqual(['NODE'], res)
         m_remove.assert_called_once_with(action.context, ['NODE'], cp,
                                          self.lb_driver, handle_err=False)
-        m_update.assert_called_once_with(action.context, 'NODE', {'data': {}})
+        m_update.assert_called_once_with(
+            action.context, 'NODE', removed=['recovery', 'lb_member'])
@@ -15,6 +15,7 @@ from unittest import mock
 from oslo_context import context as oslo_ctx
 from oslo_utils import timeutils
 
+from senlin.common import cache
 from senlin.common import consts
 from senlin.common import context as senlin_ctx
 from senlin.common import exception
@@ -210,6 +211,33 @@ class TestPolicyBase(base.SenlinTestCase):
         self.assertIsNotNone(res)
         self.assertEqual(policy.id, res.id)
 
+    def test_load_cached(self):
+        policy = utils.create_policy(self.ctx, UUID1)
+        pb.Policy.load(self.ctx, policy.id)
+
+        with mock.patch.object(po.Policy, 'get') as mock_get:
+            res = pb.Policy.load(self.ctx, policy.id)
+
+        self.assertEqual(policy.id, res.id)
+        self.assertEqual(0, mock_get.call_count)
+        self.assertEqual(1, cache.stats()[cache.POLICY]['hits'])
+
+    def test_load_cached_after_update_and_delete(self):
+        policy = self._create_policy('test-policy')
+        policy_id = policy.store(self.ctx)
+        pb.Policy.load(self.ctx, policy_id)
+
+        policy.name = 'test-policy-1'
+        policy.store(self.ctx)
+
+        res = pb.Policy.load(self.ctx, policy_id)
+        self.assertEqual('test-policy-1', res.name)
+
+        pb.Policy.delete(self.ctx, policy_id)
+        self.assertRaises(exception.ResourceNotFound,
+                          pb.Policy.load,
+                          self.ctx, policy_id)
+
     def test_load_not_found(self):
         ex = self.assertRaises(exception.ResourceNotFound,
                                pb.Policy.load,
@@ -18,6 +18,7 @@ from oslo_utils import encodeutils
 
 from senlin.common import consts
 from senlin.common import exception as exc
+from senlin.drivers import base as driver_base
 from senlin.objects import node as node_ob
 from senlin.profiles import base as profiles_base
 from senlin.profiles.os.nova import server
@@ -1869,6 +1870,118 @@ class TestNovaServerBasic(base.SenlinTestCase):
         cc.hypervisor_find.assert_called_once_with('FAKE_HV')
         self.assertFalse(res)
 
+    @mock.patch.object(driver_base, 'SenlinDriver')
+    def test_do_healthcheck_batch(self, mock_driver):
+        profile = server.ServerProfile('t', self.spec)
+        self.patchobject(profile, '_build_conn_params',
+                         return_value='PARAMS')
+        cc = mock_driver.return_value.compute.return_value
+        cc.server_list.return_value = [
+            mock.Mock(id='S1', status='ACTIVE'),
+            mock.Mock(id='S2', status='ERROR'),
+        ]
+        profile._computeclient = cc
+        nodes = [
+            mock.Mock(id='N1', physical_id='S1', user='U', project='P'),
+            mock.Mock(id='N2', physical_id='S2', user='U', project='P'),
+            mock.Mock(id='N3', physical_id='S3', user='U', project='P'),
+        ]
+
+        res = profile.do_healthcheck_batch(nodes, consts.NODE_STATUS_POLLING)
+
+        # N3 is not in the listing, e.g. created after it
+        self.assertEqual({'N1': True, 'N2': False}, res)
+        profile._build_conn_params.assert_called_once_with('U', 'P')
+        mock_driver.return_value.compute.assert_called_once_with('PARAMS')
+        cc.server_list.assert_called_once_with()
+        self.assertEqual(0, cc.server_get.call_count)
+
+    @mock.patch.object(driver_base, 'SenlinDriver')
+    def test_do_healthcheck_batch_list_failed(self, mock_driver):
+        profile = server.ServerProfile('t', self.spec)
+        self.patchobject(profile, '_build_conn_params',
+                         return_value='PARAMS')
+        cc = mock_driver.return_value.compute.return_value
+        cc.server_list.side_effect = exc.InternalError(code=500,
+                                                       message='BOOM')
+        profile._computeclient = cc
+        nodes = [
+            mock.Mock(id='N1', physical_id='S1', user='U', project='P'),
+        ]
+
+        res = profile.do_healthcheck_batch(nodes, consts.NODE_STATUS_POLLING)
+
+        self.assertEqual({}, res)
+        self.assertEqual(0, cc.server_get.call_count)
+
+    @mock.patch.object(driver_base, 'SenlinDriver')
+    def test_list_servers(self, mock_driver):
+        profile = server.ServerProfile('t', self.spec)
+        self.patchobject(profile, '_build_conn_params',
+                         side_effect=['PARAMS1', 'PARAMS2'])
+        cc1 = mock.Mock()
+        s1 = mock.Mock(id='S1')
+        cc1.server_list.return_value = [s1]
+        cc2 = mock.Mock()
+        cc2.server_list.side_effect = exc.InternalError(code=500,
+                                                        message='BOOM')
+        mock_driver.return_value.compute.side_effect = [cc1, cc2]
+        nodes = [
+            mock.Mock(id='N1', physical_id='S1', user='U1', project='P1'),
+            mock.Mock(id='N2', physical_id='S2', user='U2', project='P2'),
+            mock.Mock(id='N3', physical_id='S3', user='U1', project='P1'),
+        ]
+
+        res = profile._list_servers(nodes)
+
+        self.assertEqual({'P1': {'S1': s1}, 'P2': None}, res)
+        profile._build_conn_params.assert_has_calls([
+            mock.call('U1', 'P1'), mock.call('U2', 'P2')])
+        cc1.server_list.assert_called_once_with()
+        cc2.server_list.assert_called_once_with()
+
+    @mock.patch.object(driver_base, 'SenlinDriver')
+    def test_do_check_batch(self, mock_driver):
+        profile = server.ServerProfile('t', self.spec)
+        self.patchobject(profile, '_build_conn_params',
+                         return_value='PARAMS')
+        cc = mock_driver.return_value.compute.return_value
+        cc.server_list.return_value = [
+            mock.Mock(id='S1', status='ACTIVE'),
+            mock.Mock(id='S2', status='SHUTOFF'),
+        ]
+        nodes = [
+            mock.Mock(id='N1', physical_id='S1', user='U', project='P'),
+            mock.Mock(id='N2', physical_id='S2', user='U', project='P'),
+            mock.Mock(id='N3', physical_id='S3', user='U', project='P'),
+            mock.Mock(id='N4', physical_id=None, user='U', project='P'),
+        ]
+
+        res = profile.do_check_batch(nodes)
+
+        self.assertEqual({'N1': True, 'N2': False, 'N3': None, 'N4': None},
+                         res)
+        profile._build_conn_params.assert_called_once_with('U', 'P')
+        mock_driver.return_value.compute.assert_called_once_with('PARAMS')
+        cc.server_list.assert_called_once_with()
+        self.assertEqual(0, cc.server_get.call_count)
+
+    @mock.patch.object(driver_base, 'SenlinDriver')
+    def test_do_check_batch_list_failed(self, mock_driver):
+        profile = server.ServerProfile('t', self.spec)
+        self.patchobject(profile, '_build_conn_params',
+                         return_value='PARAMS')
+        cc = mock_driver.return_value.compute.return_value
+        cc.server_list.side_effect = exc.InternalError(code=500,
+                                                       message='BOOM')
+        nodes = [
+            mock.Mock(id='N1', physical_id='S1', user='U', project='P'),
+        ]
+
+        res = profile.do_check_batch(nodes)
+
+        self.assertEqual({'N1': None}, res)
+
     def test_do_healthcheck_hv_disabled(self):
         profile = server.ServerProfile('t', self.spec)
 
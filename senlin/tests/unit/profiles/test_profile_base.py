@@ -15,6 +15,7 @@ from unittest import mock
 
 from oslo_context import context as oslo_ctx
 
+from senlin.common import cache
 from senlin.common import consts
 from senlin.common import context as senlin_ctx
 from senlin.common import exception
@@ -273,6 +274,46 @@ class TestProfileBase(base.SenlinTestCase):
 
         self.assertEqual(profile.id, res.id)
 
+    def test_load_cached(self):
+        obj = self._create_profile('test-profile-cc')
+        profile_id = obj.store(self.ctx)
+        pb.Profile.load(self.ctx, profile_id=profile_id)
+
+        with mock.patch.object(po.Profile, 'get') as mock_get:
+            res1 = pb.Profile.load(self.ctx, profile_id=profile_id)
+            res2 = pb.Profile.load(self.ctx, profile_id=profile_id)
+
+        self.assertEqual(profile_id, res1.id)
+        # each caller gets its own instance
+        self.assertIsNot(res1, res2)
+        self.assertEqual(0, mock_get.call_count)
+        self.assertEqual(2, cache.stats()[cache.PROFILE]['hits'])
+
+    def test_load_cached_diff_project(self):
+        obj = self._create_profile('test-profile-cc')
+        profile_id = obj.store(self.ctx)
+        pb.Profile.load(self.ctx, profile_id=profile_id)
+        ctx = utils.dummy_context(project='a-different-project')
+
+        self.assertRaises(exception.ResourceNotFound,
+                          pb.Profile.load,
+                          ctx, profile_id=profile_id)
+
+    @mock.patch.object(cache, 'notify_invalidate')
+    def test_load_after_update(self, mock_notify):
+        mock_notify.side_effect = cache.invalidate
+        obj = self._create_profile('test-profile-cc')
+        profile_id = obj.store(self.ctx)
+        pb.Profile.load(self.ctx, profile_id=profile_id)
+
+        obj.name = 'new-name'
+        obj.store(self.ctx)
+
+        res = pb.Profile.load(self.ctx, profile_id=profile_id)
+        self.assertEqual('new-name', res.name)
+        mock_notify.assert_called_once_with(cache.PROFILE, profile_id,
+                                            obj.updated_at)
+
     @mock.patch.object(po.Profile, 'get')
     def test_load_not_found(self, mock_get):
         mock_get.return_value = None
@@ -316,11 +357,14 @@ class TestProfileBase(base.SenlinTestCase):
         self.assertEqual("Failed in creating profile my_profile: "
                          "Boom", str(ex))
 
+    @mock.patch.object(cache, 'notify_invalidate')
     @mock.patch.object(po.Profile, 'delete')
-    def test_delete(self, mock_delete):
+    def test_delete(self, mock_delete, mock_notify):
         res = pb.Profile.delete(self.ctx, 'FAKE_ID')
         self.assertIsNone(res)
         mock_delete.assert_called_once_with(self.ctx, 'FAKE_ID')
+        mock_notify.assert_called_once_with(cache.PROFILE, 'FAKE_ID',
+                                            cache.DELETED)
 
     @mock.patch.object(po.Profile, 'delete')
     def test_delete_busy(self, mock_delete):
@@ -420,6 +464,98 @@ class TestProfileBase(base.SenlinTestCase):
         res_obj = profile.do_check.return_value
         self.assertEqual(res_obj, res)
 
+    @mock.patch.object(pb.Profile, 'load')
+    def test_healthcheck_objects(self, mock_load):
+        profile1 = mock.Mock(type='os.nova.server-1.0', context={})
+        profile1.do_healthcheck_batch.return_value = {'N1': True,
+                                                      'N3': False}
+        profile2 = mock.Mock(type='os.heat.stack-1.0', context={})
+        profile2.do_healthcheck_batch.return_value = {'N2': True}
+        mock_load.side_effect = [profile1, profile2]
+        obj1 = mock.Mock(id='N1', profile_id='P1')
+        obj2 = mock.Mock(id='N2', profile_id='P2')
+        obj3 = mock.Mock(id='N3', profile_id='P1')
+
+        res = pb.Profile.healthcheck_objects(self.ctx, [obj1, obj2, obj3],
+                                             consts.NODE_STATUS_POLLING)
+
+        self.assertEqual({'N1': True, 'N2': True, 'N3': False}, res)
+        mock_load.assert_has_calls([
+            mock.call(self.ctx, profile_id='P1'),
+            mock.call(self.ctx, profile_id='P2'),
+        ])
+        profile1.do_healthcheck_batch.assert_called_once_with(
+            [obj1, obj3], consts.NODE_STATUS_POLLING)
+        profile2.do_healthcheck_batch.assert_called_once_with(
+            [obj2], consts.NODE_STATUS_POLLING)
+
+    @mock.patch.object(senlin_ctx, 'get_service_credentials')
+    def test_do_healthcheck_batch(self, mock_creds):
+        mock_creds.return_value = {}
+        profile = self._create_profile('test-profile')
+        self.patchobject(profile, 'do_healthcheck')
+        obj1 = mock.Mock(id='N1')
+        obj2 = mock.Mock(id='N2')
+
+        res = profile.do_healthcheck_batch([obj1, obj2],
+                                           consts.NODE_STATUS_POLLING)
+
+        self.assertEqual({}, res)
+        self.assertEqual(0, profile.do_healthcheck.call_count)
+
+    @mock.patch.object(pb.Profile, 'load')
+    def test_check_objects(self, mock_load):
+        profile1 = mock.Mock(type='os.nova.server-1.0', context={})
+        profile1.do_check_batch.return_value = {'N1': True, 'N3': None}
+        profile2 = mock.Mock(type='os.heat.stack-1.0', context={})
+        profile2.do_check_batch.return_value = {'N2': False}
+        mock_load.side_effect = [profile1, profile2]
+        obj1 = mock.Mock(id='N1', profile_id='P1')
+        obj2 = mock.Mock(id='N2', profile_id='P2')
+        obj3 = mock.Mock(id='N3', profile_id='P1')
+
+        res = pb.Profile.check_objects(self.ctx, [obj1, obj2, obj3])
+
+        self.assertEqual({'N1': True, 'N2': False, 'N3': None}, res)
+        mock_load.assert_has_calls([
+            mock.call(self.ctx, profile_id='P1'),
+            mock.call(self.ctx, profile_id='P2'),
+        ])
+        profile1.do_check_batch.assert_called_once_with([obj1, obj3])
+        profile2.do_check_batch.assert_called_once_with([obj2])
+
+    @mock.patch.object(pb.Profile, 'load')
+    def test_load_batches(self, mock_load):
+        # Profiles of the same type and context share a batch
+        profile1 = mock.Mock(type='os.nova.server-1.0',
+                             context={'region_name': 'R1'})
+        profile2 = mock.Mock(type='os.nova.server-1.0',
+                             context={'region_name': 'R1'})
+        profile3 = mock.Mock(type='os.nova.server-1.0',
+                             context={'region_name': 'R2'})
+        mock_load.side_effect = [profile1, profile2, profile3]
+        obj1 = mock.Mock(id='N1', profile_id='P1')
+        obj2 = mock.Mock(id='N2', profile_id='P2')
+        obj3 = mock.Mock(id='N3', profile_id='P3')
+        obj4 = mock.Mock(id='N4', profile_id='P1')
+
+        res = pb.Profile._load_batches(self.ctx, [obj1, obj2, obj3, obj4])
+
+        self.assertEqual([(profile1, [obj1, obj2, obj4]),
+                          (profile3, [obj3])], res)
+        self.assertEqual(3, mock_load.call_count)
+
+    @mock.patch.object(senlin_ctx, 'get_service_credentials')
+    def test_do_check_batch(self, mock_creds):
+        mock_creds.return_value = {}
+        profile = self._create_profile('test-profile')
+        obj1 = mock.Mock(id='N1')
+        obj2 = mock.Mock(id='N2')
+
+        res = profile.do_check_batch([obj1, obj2])
+
+        self.assertEqual({'N1': None, 'N2': None}, res)
+
     @mock.patch.object(pb.Profile, 'load')
     def test_delete_object(self, mock_load):
         profile = mock.Mock()
@@ -0,0 +1,241 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import datetime
+import time
+from unittest import mock
+
+from oslo_config import cfg
+
+from senlin.common import cache
+from senlin.common import consts
+from senlin.common import messaging
+from senlin.tests.unit.common import base
+from senlin.tests.unit.common import utils
+
+T1 = datetime.datetime(2020, 1, 1, 0, 0, 1)
+T2 = datetime.datetime(2020, 1, 1, 0, 0, 2)
+
+
+class TestVersionedCache(base.SenlinTestCase):
+
+    def test_get_put(self):
+        c = cache.VersionedCache(2)
+
+        self.assertIsNone(c.get('K1'))
+        c.put('K1', T1, 'V1')
+        self.assertEqual('V1', c.get('K1'))
+
+        stats = c.stats()
+        self.assertEqual(1, stats['hits'])
+        self.assertEqual(1, stats['misses'])
+        self.assertEqual(1, stats['size'])
+        self.assertEqual(2, stats['capacity'])
+
+    def test_lru_eviction(self):
+        c = cache.VersionedCache(2)
+        c.put('K1', None, 'V1')
+        c.put('K2', None, 'V2')
+        # K1 becomes the most recently used entry
+        c.get('K1')
+
+        c.put('K3', None, 'V3')
+
+        self.assertEqual('V1', c.get('K1'))
+        self.assertIsNone(c.get('K2'))
+        self.assertEqual('V3', c.get('K3'))
+        self.assertEqual(1, c.stats()['evictions'])
+
+    def test_put_disabled(self):
+        c = cache.VersionedCache(0)
+
+        c.put('K1', None, 'V1')
+
+        self.assertIsNone(c.get('K1'))
+
+    def test_put_older_version(self):
+        c = cache.VersionedCache(2)
+        c.put('K1', T2, 'NEW')
+
+        c.put('K1', T1, 'OLD')
+
+        self.assertEqual('NEW', c.get('K1'))
+
+    def test_put_newer_version(self):
+        c = cache.VersionedCache(2)
+        c.put('K1', T1, 'OLD')
+
+        c.put('K1', T2, 'NEW')
+
+        self.assertEqual('NEW', c.get('K1'))
+
+    def test_invalidate(self):
+        c = cache.VersionedCache(2)
+        c.put('K1', T1, 'OLD')
+
+        c.invalidate('K1', T2)
+
+        self.assertIsNone(c.get('K1'))
+        # a load racing with the update cannot cache the stale object
+        c.put('K1', T1, 'OLD')
+        self.assertIsNone(c.get('K1'))
+        # the updated object can be cached
+        c.put('K1', T2, 'NEW')
+        self.assertEqual('NEW', c.get('K1'))
+        self.assertEqual(1, c.stats()['invalidations'])
+
+    def test_invalidate_string_version(self):
+        c = cache.VersionedCache(2)
+
+        c.invalidate('K1', T2.isoformat())
+
+        c.put('K1', T1, 'OLD')
+        self.assertIsNone(c.get('K1'))
+        c.put('K1', T2.replace(microsecond=123), 'NEW')
+        self.assertEqual('NEW', c.get('K1'))
+
+    def test_invalidate_deleted(self):
+        c = cache.VersionedCache(2)
+        c.put('K1', T1, 'V1')
+
+        c.invalidate('K1', cache.DELETED)
+
+        c.put('K1', T2, 'V1')
+        self.assertIsNone(c.get('K1'))
+        self.assertEqual(0, c.stats()['size'])
+
+    def test_invalidate_unknown(self):
+        c = cache.VersionedCache(2)
+
+        c.invalidate('K1')
+
+        c.put('K1', None, 'V1')
+        self.assertEqual('V1', c.get('K1'))
+
+
+class TestTTLCache(base.SenlinTestCase):
+
+    @mock.patch.object(time, 'time')
+    def test_get_put(self, mock_time):
+        mock_time.return_value = 1000
+        c = cache.TTLCache(10, 60)
+
+        self.assertIsNone(c.get(('U', 'P')))
+        c.put(('U', 'P'), 'TRUST')
+        self.assertEqual('TRUST', c.get(('U', 'P')))
+        self.assertIsNone(c.get(('U', 'P2')))
+
+        # the entry expires after the ttl
+        mock_time.return_value = 1060
+        self.assertIsNone(c.get(('U', 'P')))
+        self.assertEqual({'size': 0, 'capacity': 10, 'hits': 1,
+                          'misses': 3}, c.stats())
+
+    def test_lru_eviction(self):
+        c = cache.TTLCache(2, 60)
+        c.put('K1', 'T1')
+        c.put('K2', 'T2')
+        c.get('K1')
+
+        c.put('K3', 'T3')
+
+        self.assertEqual('T1', c.get('K1'))
+        self.assertIsNone(c.get('K2'))
+        self.assertEqual('T3', c.get('K3'))
+
+    def test_invalidate(self):
+        c = cache.TTLCache(2, 60)
+        c.put('K1', 'T1')
+
+        c.invalidate('K1')
+        c.invalidate('K2')
+
+        self.assertIsNone(c.get('K1'))
+
+    @mock.patch.object(time, 'time')
+    def test_put_ttl(self, mock_time):
+        mock_time.return_value = 1000
+        c = cache.TTLCache(2, 60)
+
+        c.put('K1', 'T1', ttl=0)
+        c.put('K2', 'T2', ttl=10)
+        c.put('K3', 'T3', ttl=600)
+
+        self.assertIsNone(c.get('K1'))
+        mock_time.return_value = 1010
+        self.assertIsNone(c.get('K2'))
+        # the TTL of an entry cannot exceed the TTL of the cache
+        self.assertEqual('T3', c.get('K3'))
+        mock_time.return_value = 1060
+        self.assertIsNone(c.get('K3'))
+
+
+class TestCacheModule(base.SenlinTestCase):
+
+    def setUp(self):
+        super(TestCacheModule, self).setUp()
+        self.ctx = utils.dummy_context(project='P1')
+        self.obj = mock.Mock(id='ID', project='P1', updated_at=None)
+
+    def test_get_cache_size(self):
+        cfg.CONF.set_override('object_cache_size', 5)
+
+        self.assertEqual(5, cache.get_cache(cache.PROFILE).size)
+        self.assertIs(cache.get_cache(cache.PROFILE),
+                      cache.get_cache(cache.PROFILE))
+        self.assertIsNot(cache.get_cache(cache.PROFILE),
+                         cache.get_cache(cache.POLICY))
+
+    def test_get_put(self):
+        cache.put(cache.PROFILE, self.obj)
+
+        self.assertEqual(self.obj, cache.get(cache.PROFILE, 'ID', self.ctx))
+        self.assertIsNone(cache.get(cache.POLICY, 'ID', self.ctx))
+
+    def test_get_project_safe(self):
+        cache.put(cache.PROFILE, self.obj)
+        ctx = utils.dummy_context(project='P2')
+
+        self.assertIsNone(cache.get(cache.PROFILE, 'ID', ctx))
+        self.assertEqual(self.obj, cache.get(cache.PROFILE, 'ID', ctx,
+                                             project_safe=False))
+        admin = utils.dummy_context(project='P2', is_admin=True)
+        self.assertEqual(self.obj, cache.get(cache.PROFILE, 'ID', admin))
+
+    def test_stats(self):
+        cache.put(cache.POLICY, self.obj)
+        cache.get(cache.POLICY, 'ID', self.ctx)
+
+        res = cache.stats()
+
+        self.assertEqual(0, res[cache.PROFILE]['hits'])
+        self.assertEqual(1, res[cache.POLICY]['hits'])
+        self.assertEqual(1, res[cache.POLICY]['size'])
+
+    @mock.patch.object(messaging, 'get_rpc_client')
+    def test_notify_invalidate(self, mock_client):
+        cache.put(cache.PROFILE, self.obj)
+        prepared = mock_client.return_value.prepare.return_value
+
+        cache.notify_invalidate(cache.PROFILE, 'ID', T2)
+
+        self.assertIsNone(cache.get(cache.PROFILE, 'ID', self.ctx))
+        mock_client.assert_has_calls([
+            mock.call(consts.ENGINE_TOPIC, cfg.CONF.host),
+            mock.call(consts.CONDUCTOR_TOPIC, cfg.CONF.host),
+            mock.call(consts.HEALTH_MANAGER_TOPIC, cfg.CONF.host),
+        ], any_order=True)
+        mock_client.return_value.prepare.assert_called_with(fanout=True)
+        self.assertEqual(3, prepared.cast.call_count)
+        prepared.cast.assert_called_with(
+            mock.ANY, 'invalidate_cache', kind=cache.PROFILE, obj_id='ID',
+            updated_at=T2.isoformat())
@@ -0,0 +1,78 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from unittest import mock
+
+from oslo_utils import timeutils
+
+from senlin.common import liveness
+from senlin.objects import service as service_obj
+from senlin.tests.unit.common import base
+
+
+class TestLiveness(base.SenlinTestCase):
+
+    def setUp(self):
+        super(TestLiveness, self).setUp()
+        self.ctx = mock.Mock()
+        self.addCleanup(liveness.reset)
+
+    @mock.patch.object(service_obj.Service, 'get_all')
+    def test_refresh(self, mock_get_all):
+        now = timeutils.utcnow(True)
+        mock_get_all.return_value = [
+            mock.Mock(id='ENGINE1', updated_at=now),
+            mock.Mock(id='ENGINE2', updated_at=None),
+        ]
+
+        liveness.refresh(self.ctx)
+
+        mock_get_all.assert_called_once_with(self.ctx)
+        self.assertEqual(now, liveness.heartbeat('ENGINE1'))
+        self.assertIsNone(liveness.heartbeat('ENGINE2'))
+        self.assertIsNone(liveness.heartbeat('ENGINE3'))
+
+    @mock.patch.object(service_obj.Service, 'get_all')
+    def test_refresh_drops_deleted(self, mock_get_all):
+        now = timeutils.utcnow(True)
+        mock_get_all.side_effect = [
+            [mock.Mock(id='ENGINE1', updated_at=now)],
+            [],
+        ]
+
+        liveness.refresh(self.ctx)
+        liveness.refresh(self.ctx)
+
+        self.assertIsNone(liveness.heartbeat('ENGINE1'))
+
+    @mock.patch.object(service_obj.Service, 'get_all')
+    def test_refresh_failed(self, mock_get_all):
+        now = timeutils.utcnow(True)
+        mock_get_all.side_effect = [
+            [mock.Mock(id='ENGINE1', updated_at=now)],
+            Exception('boom'),
+        ]
+
+        liveness.refresh(self.ctx)
+        liveness.refresh(self.ctx)
+
+        self.assertEqual(now, liveness.heartbeat('ENGINE1'))
+
+    @mock.patch.object(service_obj.Service, 'get_all')
+    def test_reset(self, mock_get_all):
+        mock_get_all.return_value = [
+            mock.Mock(id='ENGINE1', updated_at=timeutils.utcnow(True))]
+        liveness.refresh(self.ctx)
+
+        liveness.reset()
+
+        self.assertIsNone(liveness.heartbeat('ENGINE1'))
@@ -22,6 +22,7 @@ import requests
 from oslo_config import cfg
 
 from senlin.common import exception
+from senlin.common import liveness
 from senlin.common import utils
 from senlin.objects import service as service_obj
 from senlin.tests.unit.common import base
@@ -91,6 +92,19 @@ class UrlFetchTest(base.SenlinTestCase):
         self.patchobject(requests, 'get', return_value=Response(data))
         self.assertEqual(data, utils.url_fetch(url))
 
+    def test_http_scheme_session(self):
+        url = 'http://example.com/somedata'
+        data = '{ "foo": "bar" }'
+        session = mock.Mock()
+        session.get.return_value = Response(data)
+        mock_get = self.patchobject(requests, 'get')
+
+        self.assertEqual(data, utils.url_fetch(url, session=session))
+
+        session.get.assert_called_once_with(url, stream=True, verify=True,
+                                            timeout=1)
+        mock_get.assert_not_called()
+
     def test_http_error(self):
         url = 'http://example.com/somedata'
 
@@ -262,6 +276,29 @@ class EngineDeathTest(base.SenlinTestCase):
     def setUp(self):
         super(EngineDeathTest, self).setUp()
         self.ctx = mock.Mock()
+        self.addCleanup(liveness.reset)
+
+    @mock.patch.object(service_obj.Service, 'get')
+    def test_engine_alive_in_view(self, mock_svc):
+        self.patchobject(liveness, 'heartbeat',
+                         return_value=timeutils.utcnow(True))
+
+        res = utils.is_service_dead(self.ctx, 'fake_engine_id')
+
+        self.assertFalse(res)
+        self.assertEqual(0, mock_svc.call_count)
+
+    @mock.patch.object(service_obj.Service, 'get')
+    def test_engine_expired_in_view(self, mock_svc):
+        delta = datetime.timedelta(seconds=3 * cfg.CONF.periodic_interval)
+        self.patchobject(liveness, 'heartbeat',
+                         return_value=timeutils.utcnow(True) - delta)
+        mock_svc.return_value = mock.Mock(updated_at=timeutils.utcnow(True))
+
+        res = utils.is_service_dead(self.ctx, 'fake_engine_id')
+
+        self.assertFalse(res)
+        mock_svc.assert_called_once_with(self.ctx, 'fake_engine_id')
 
     @mock.patch.object(service_obj.Service, 'get')
     def test_engine_is_none(self, mock_service):